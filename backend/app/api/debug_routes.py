@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Query
 from typing import Optional
-from app.db.sqlite import get_conn
+from app.db.sqlite import db_readers
 
 router = APIRouter(prefix="/debug", tags=["debug"])
 
@@ -11,9 +11,7 @@ router = APIRouter(prefix="/debug", tags=["debug"])
 
 @router.get("/market_timeline/count")
 def market_timeline_count():
-    conn = get_conn()
-    cur = conn.execute("SELECT COUNT(*) AS cnt FROM market_timeline")
-    return cur.fetchone()["cnt"]
+    return db_readers.fetchone("SELECT COUNT(*) AS cnt FROM market_timeline")["cnt"]
 
 
 @router.get("/market_timeline/latest")
@@ -21,13 +19,11 @@ def market_timeline_latest(
     limit: int = Query(10, ge=1, le=500),
     symbol: Optional[str] = None,
 ):
-    conn = get_conn()
-
     if symbol:
-        cur = conn.execute(
+        rows = db_readers.fetchall(
             """
             SELECT *
-            FROM market_timeline
+            FROM market_timeline_decoded
             WHERE symbol = ?
             ORDER BY id DESC
             LIMIT ?
@@ -35,17 +31,16 @@ def market_timeline_latest(
             (symbol, limit),
         )
     else:
-        cur = conn.execute(
+        rows = db_readers.fetchall(
             """
             SELECT *
-            FROM market_timeline
+            FROM market_timeline_decoded
             ORDER BY id DESC
             LIMIT ?
             """,
             (limit,),
         )
 
-    rows = cur.fetchall()
     if not rows:
         return {"columns": [], "rows": []}
 
@@ -64,9 +59,7 @@ def market_timeline_latest(
 
 @router.get("/trades/count")
 def trades_count():
-    conn = get_conn()
-    cur = conn.execute("SELECT COUNT(*) AS cnt FROM trades")
-    return cur.fetchone()["cnt"]
+    return db_readers.fetchone("SELECT COUNT(*) AS cnt FROM trades")["cnt"]
 
 
 @router.get("/trades/latest")
@@ -74,10 +67,8 @@ def trades_latest(
     limit: int = Query(20, ge=1, le=200),
     symbol: Optional[str] = None,
 ):
-    conn = get_conn()
-
     if symbol:
-        cur = conn.execute(
+        rows = db_readers.fetchall(
             """
             SELECT *
             FROM trades
@@ -88,7 +79,7 @@ def trades_latest(
             (symbol, limit),
         )
     else:
-        cur = conn.execute(
+        rows = db_readers.fetchall(
             """
             SELECT *
             FROM trades
@@ -98,7 +89,6 @@ def trades_latest(
             (limit,),
         )
 
-    rows = cur.fetchall()
     if not rows:
         return {"columns": [], "rows": []}
 
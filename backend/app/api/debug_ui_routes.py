@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Query
 from typing import Optional
-from app.db.sqlite import get_conn
+from app.db.sqlite import db_readers
 from fastapi.responses import HTMLResponse
 
 router = APIRouter(prefix="/debug/ui", tags=["debug-ui"])
@@ -126,8 +126,6 @@ def ui_trades(
     state: Optional[str] = None,
     refresh: Optional[int] = Query(None, ge=1, le=60),
 ):
-    conn = get_conn()
-
     q = "SELECT * FROM trades WHERE 1=1"
     params = []
 
@@ -142,8 +140,7 @@ def ui_trades(
     q += " ORDER BY entry_time DESC LIMIT ?"
     params.append(limit)
 
-    cur = conn.execute(q, tuple(params))
-    rows = cur.fetchall()
+    rows = db_readers.fetchall(q, tuple(params))
 
     if not rows:
         return render_table("trades (empty)", [], [], refresh)
@@ -166,8 +163,6 @@ def ui_market_timeline(
     symbol: Optional[str] = None,
     refresh: Optional[int] = Query(None, ge=1, le=60),
 ):
-    conn = get_conn()
-
     BASE_QUERY = """
     SELECT
         id,
@@ -201,11 +196,11 @@ def ui_market_timeline(
         strategy_version,
         mode,
         created_at
-    FROM market_timeline
+    FROM market_timeline_decoded
     """
 
     if symbol:
-        cur = conn.execute(
+        rows = db_readers.fetchall(
             BASE_QUERY + """
             WHERE symbol = ?
             ORDER BY id DESC
@@ -214,7 +209,7 @@ def ui_market_timeline(
             (symbol, limit),
         )
     else:
-        cur = conn.execute(
+        rows = db_readers.fetchall(
             BASE_QUERY + """
             ORDER BY id DESC
             LIMIT ?
@@ -222,8 +217,6 @@ def ui_market_timeline(
             (limit,),
         )
 
-
-    rows = cur.fetchall()
     if not rows:
         return render_table("market_timeline (empty)", [], [], refresh)
 
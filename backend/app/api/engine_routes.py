@@ -0,0 +1,236 @@
+from fastapi import APIRouter, HTTPException, Query
+
+from app.db.housekeeping import housekeeper
+from app.db.sqlite import db_stats
+from app.db.timeline_archive import timeline_archive
+from app.engine.latency_tracker import LATENCY
+from app.marketdata.zerodha_tick_engine import get_active_engine
+from app.persistence.timeline_writer import timeline_writer
+from app.utils.candle_debug_logger import LEVELS, candle_debug_sink
+
+router = APIRouter(prefix="/engine", tags=["engine"])
+
+
+# =========================
+# Candle pipeline
+# =========================
+
+@router.get("/pipeline")
+def get_pipeline_stats():
+    """
+    Candle pipeline queue depth + counters.
+    Pure in-memory read. SAFE to poll.
+    """
+    engine = get_active_engine()
+    if engine is None:
+        return {"running": False}
+
+    return {
+        "running": True,
+        **engine.pipeline_stats(),
+    }
+
+
+# =========================
+# Startup / re-centre warmup
+# =========================
+
+@router.get("/warmup")
+def get_warmup_report():
+    """
+    Last warmup batch: total time, fetch vs warm split, candles per symbol.
+    """
+    engine = get_active_engine()
+    if engine is None:
+        return {"running": False}
+
+    return {
+        "running": True,
+        **engine.warmup_report,
+    }
+
+
+# =========================
+# Strategies (shared indicators)
+# =========================
+
+@router.get("/strategies")
+def get_strategies():
+    """
+    Registered strategies (primary first) + shared indicator cache:
+    engines actually running vs strategy instances reading them.
+    """
+    engine = get_active_engine()
+    if engine is None:
+        return {"running": False}
+
+    return {
+        "running": True,
+        **engine.strategy_stats(),
+    }
+
+
+# =========================
+# Indicator checkpoints
+# =========================
+
+@router.get("/checkpoints")
+def get_checkpoint_stats():
+    """
+    Indicator state checkpoints: saves / loads / errors, cadence, dir.
+    """
+    engine = get_active_engine()
+    if engine is None or engine.checkpoints is None:
+        return {"running": engine is not None, "enabled": False}
+
+    return {
+        "running": True,
+        "enabled": True,
+        **engine.checkpoints.stats(),
+    }
+
+
+@router.post("/checkpoints/save")
+def save_checkpoints():
+    """
+    Checkpoint every token now (e.g. before a planned restart).
+    """
+    engine = get_active_engine()
+    if engine is None:
+        return {"running": False}
+    return {"running": True, "queued": engine.request_checkpoints()}
+
+
+# =========================
+# Candle boundary close
+# =========================
+
+@router.get("/candles")
+def get_candle_close_stats(per_token: bool = Query(False)):
+    """
+    Timer-driven candle close: close lag (emit − candle end), late ticks.
+    """
+    engine = get_active_engine()
+    if engine is None:
+        return {"running": False}
+
+    return {
+        "running": True,
+        **engine.candle_close_stats(per_token=per_token),
+    }
+
+
+# =========================
+# market_timeline writer
+# =========================
+
+@router.get("/timeline")
+def get_timeline_writer_stats():
+    """
+    Group-commit batches: rows, per-batch latency, queue depth, drops.
+    """
+    return timeline_writer.stats()
+
+
+# =========================
+# SQLite writer / readers
+# =========================
+
+@router.get("/db")
+def get_db_stats():
+    """
+    Writer thread: queue wait + exec time per job, depth, failures.
+    Readers: per-thread connections, query time.
+    """
+    return db_stats()
+
+
+@router.get("/archive")
+def get_timeline_archive_stats():
+    """
+    market_timeline archive passes: rows moved, files written, last run.
+    """
+    return timeline_archive.stats()
+
+
+@router.get("/housekeeping")
+def get_housekeeping_stats():
+    """
+    Retention + maintenance passes: rows deleted, time spent,
+    DB / WAL size per pass and the trend across the kept history.
+    """
+    return housekeeper.stats()
+
+
+# =========================
+# Candle debug TSV sink
+# =========================
+
+@router.get("/candle_debug")
+def get_candle_debug_stats():
+    """
+    Shared candle debug sink: pending / written / dropped lines, level.
+    """
+    return candle_debug_sink.stats()
+
+
+@router.post("/candle_debug")
+def set_candle_debug(
+    level: str = Query(None, description="off | signals | all"),
+    sample_every: int = Query(None, ge=1),
+):
+    if level is not None:
+        if level.lower() not in LEVELS:
+            raise HTTPException(status_code=400, detail="level must be off / signals / all")
+        candle_debug_sink.configure(level=LEVELS[level.lower()])
+    candle_debug_sink.configure(sample_every=sample_every)
+    return candle_debug_sink.stats()
+
+
+# =========================
+# WS subscription modes
+# =========================
+
+@router.get("/subscriptions")
+def get_subscription_stats():
+    """
+    Tokens / ticks / estimated bytes per WS mode (FULL / QUOTE / LTP).
+    """
+    engine = get_active_engine()
+    if engine is None:
+        return {"running": False}
+
+    return {
+        "running": True,
+        **engine.subscriptions.stats(),
+    }
+
+
+# =========================
+# Tick → order latency
+# =========================
+
+@router.get("/latency")
+def get_latency(per_token: bool = Query(False)):
+    """
+    Per-stage latency histograms (p50 / p95 / p99 / max, in ms).
+    """
+    return LATENCY.snapshot(per_token=per_token)
+
+
+@router.post("/latency/enable")
+def set_latency_enabled(enabled: bool = Query(True)):
+    LATENCY.set_enabled(enabled)
+    return {"enabled": LATENCY.enabled}
+
+
+@router.post("/latency/reset")
+def reset_latency():
+    LATENCY.reset()
+    return {"status": "ok"}
+
+
+@router.post("/latency/dump")
+def dump_latency():
+    path = LATENCY.dump_daily()
+    return {"path": str(path) if path else None}
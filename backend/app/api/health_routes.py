@@ -1,13 +1,12 @@
 from fastapi import APIRouter
-from app.db.sqlite import get_conn
+from app.db.sqlite import read_conn
 
 router = APIRouter(tags=["health"])
 
 @router.get("/health")
 def health():
     try:
-        conn = get_conn()
-        conn.execute("SELECT 1")
+        read_conn().execute("SELECT 1")
         db_ok = True
     except Exception:
         db_ok = False
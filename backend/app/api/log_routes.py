@@ -1,7 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query
 from datetime import date
 from pathlib import Path
 
+from app.event_bus.audit_logger import LEVELS, audit_log
 from app.utils.app_paths import LOG_DIR
 
 router = APIRouter(tags=["logs"])
@@ -30,3 +31,23 @@ def get_today_logs(tail: int = 1000):
         "date": today,
         "lines": lines,
     }
+
+
+@router.get("/logs/audit/stats")
+def get_audit_log_stats():
+    """
+    Audit log writer: queue depth, dropped / filtered lines, fsyncs.
+    """
+    return audit_log.stats()
+
+
+@router.post("/logs/audit/level")
+def set_audit_log_level(level: str = Query(..., description="DEBUG / INFO / WARN / ERROR")):
+    """
+    Runtime level switch (e.g. INFO hides [ROUTER][DEBUG] traces).
+    """
+    value = LEVELS.get(level.upper())
+    if value is None:
+        raise HTTPException(status_code=400, detail="level must be DEBUG / INFO / WARN / ERROR")
+    audit_log.set_level(value)
+    return audit_log.stats()
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 from typing import List, Dict, Any
-from app.db.sqlite import get_conn
+from app.db.sqlite import db_readers
 from app.event_bus.audit_logger import write_audit_log
 
 router = APIRouter(tags=["paper-trades"])
@@ -16,10 +16,8 @@ def get_paper_trades():
     - Matches frontend contract
     """
 
-    conn = get_conn()
-
     try:
-        cur = conn.execute(
+        rows = db_readers.fetchall(
             """
             SELECT
                 paper_trade_id,
@@ -64,8 +62,6 @@ def get_paper_trades():
             """
         )
 
-        rows = cur.fetchall()
-
         open_trades: List[Dict[str, Any]] = []
         closed_trades: List[Dict[str, Any]] = []
 
@@ -22,7 +22,7 @@ from app.license.machine_id import get_machine_id
 from app.license.license_validator import validate_license
 from app.license.license_state import LicenseStatus
 from app.license import license_state
-from app.event_bus.audit_logger import write_audit_log
+from app.event_bus.audit_logger import audit_log, write_audit_log
 
 # --------------------------------------------------
 # TEMPORARY: DISABLE LICENSE CHECKING
@@ -62,6 +62,7 @@ from app.api.ltp_routes import router as ltp_router
 from app.api.market_indices_routes import router as market_indices_router
 from app.api.paper_trades_routes import router as paper_trades_router
 from app.api.system_routes import router as system_router
+from app.api.engine_routes import router as engine_router
 
 # --------------------------------------------------
 # JOBS
@@ -83,6 +84,8 @@ from app.marketdata.load_index_prev_close import (
 # --------------------------------------------------
 
 from app.engine.selection_engine import selection_loop
+from app.marketdata.zerodha_tick_engine import get_active_engine
+from app.engine.latency_tracker import LATENCY, latency_daily_dump_job
 from app.engine.exit_boot import start_exit_engine
 from app.engine.startup_reconciliation import StartupReconciliation
 from app.engine.broker_reconciliation import BrokerReconciliationJob
@@ -95,6 +98,7 @@ from app.execution.zerodha_executor import ZerodhaOrderExecutor
 from app.trading.trade_state_manager import TradeStateManager
 from app.trading.recovery import recover_trades_from_zerodha
 from app.trading.gtt_reconciler import gtt_reconciliation_loop
+from app.trading.paper_trade_index import OpenPaperTradeIndex
 
 # --------------------------------------------------
 # BROKER
@@ -107,9 +111,9 @@ from app.brokers.zerodha_manager import ZerodhaManager
 # DB
 # --------------------------------------------------
 
-from app.db.sqlite import init_db
+from app.db.sqlite import db_writer, init_db
 from app.db.migrations.runner import run_migrations
-from app.db.housekeeping import run_housekeeping, housekeeping_loop
+from app.db.housekeeping import housekeeping_loop
 
 # --------------------------------------------------
 # LOGGING
@@ -134,6 +138,7 @@ app = FastAPI(title="Scalp App Backend")
 # --------------------------------------------------
 
 app.include_router(system_router)
+app.include_router(engine_router)
 app.include_router(log_router)
 app.include_router(config_router)
 app.include_router(debug_router)
@@ -231,12 +236,14 @@ async def on_startup():
     run_migrations(conn)
     write_audit_log("[DB] Migrations completed")
 
+    # 1️⃣b OPEN PAPER TRADES (DB → MEMORY, tick-time exits)
+    OpenPaperTradeIndex.rebuild()
+
     # 2️⃣ LOG HOUSEKEEPING
     run_log_housekeeping()
     write_audit_log("[SYSTEM] Log housekeeping completed")
 
-    # 3️⃣ DB HOUSEKEEPING
-    run_housekeeping()
+    # 3️⃣ DB HOUSEKEEPING (worker thread, first pass after startup settles)
     asyncio.create_task(housekeeping_loop())
     write_audit_log("[SYSTEM] DB housekeeping started")
 
@@ -301,6 +308,35 @@ async def on_startup():
 
     write_audit_log("[SYSTEM] Paper trade EOD scheduler started")
 
+    # LATENCY DAILY DUMP (only when instrumentation is enabled)
+    scheduler.add_job(
+        latency_daily_dump_job,
+        trigger="cron",
+        hour=15,
+        minute=35,
+        id="latency_daily_dump",
+        replace_existing=True,
+    )
+
+# --------------------------------------------------
+# SHUTDOWN (DRAIN CANDLE PIPELINE)
+# --------------------------------------------------
+
+@app.on_event("shutdown")
+def on_shutdown():
+    engine = get_active_engine()
+    if engine is not None:
+        drained = engine.shutdown(timeout=10.0)
+        write_audit_log(f"[SYSTEM] Tick engine stopped (drained={drained})")
+
+    # after the engine: its last timeline batch is a writer job
+    db_writer.stop(timeout=10.0)
+
+    if LATENCY.enabled:
+        LATENCY.dump_daily()
+
+    audit_log.flush(timeout=5.0)
+
 # --------------------------------------------------
 # ENTRYPOINT (STEP A2 — DESKTOP MODE)
 # --------------------------------------------------
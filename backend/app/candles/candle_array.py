@@ -0,0 +1,346 @@
+# backend/app/candles/candle_array.py
+
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from app.marketdata.candle import Candle, CandleSource
+
+
+# Sentinels (int64 columns)
+_NO_BUCKET = -1
+_NEVER = np.iinfo(np.int64).min
+
+# ts upper bound for the grouped running-max trick (≈ year 2242)
+_TS_SPAN = 1 << 33
+
+
+class CandleBatch(NamedTuple):
+    """
+    Closed candles emitted by ONE on_ticks() call (column arrays).
+    Rows are grouped by token, oldest first within a token.
+    """
+    token: np.ndarray
+    start_ts: np.ndarray
+    end_ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self):
+        return len(self.token)
+
+    def candles(self, source=CandleSource.LIVE) -> List[Candle]:
+        return [
+            Candle(
+                start_ts=int(s),
+                end_ts=int(e),
+                open=float(o),
+                high=float(h),
+                low=float(l),
+                close=float(c),
+                source=source,
+            )
+            for s, e, o, h, l, c in zip(
+                self.start_ts, self.end_ts,
+                self.open, self.high, self.low, self.close,
+            )
+        ]
+
+
+def _empty_batch() -> CandleBatch:
+    i = np.empty(0, dtype=np.int64)
+    f = np.empty(0, dtype=np.float64)
+    return CandleBatch(i, i, i, f, f, f, f, f)
+
+
+class CandleArrayBuilder:
+    """
+    Struct-of-arrays candle aggregator for MANY instruments.
+
+    Same semantics as CandleBuilder.on_tick, per token:
+    - bucket = (ts // tf) * tf (strict time buckets, TV parity)
+    - any bucket change (even backwards) closes the current candle
+    - a closed candle is emitted only if end_ts > last_emitted_end_ts
+
+    Tokens map to dense slots; one on_ticks() call processes a whole
+    WS batch and returns every candle it closed as ONE CandleBatch.
+
+    volume = sum of the per-tick quantities passed in (optional).
+    """
+
+    def __init__(self, timeframe_sec: int, capacity: int = 256):
+        self.tf = int(timeframe_sec)
+
+        self._slot: Dict[int, int] = {}
+        self._free: List[int] = []
+        self._n = 0
+
+        # sorted token → slot lookup (rebuilt lazily after add / remove)
+        self._keys: Optional[np.ndarray] = None
+        self._vals: Optional[np.ndarray] = None
+
+        self._alloc(max(1, int(capacity)))
+
+    # -------------------------------------------------
+    # Token registry
+    # -------------------------------------------------
+
+    def add(self, token: int, last_candle_end_ts: Optional[int] = None) -> int:
+        token = int(token)
+        slot = self._slot.get(token)
+        if slot is None:
+            if self._free:
+                slot = self._free.pop()
+            else:
+                if self._n == len(self.token):
+                    self._grow()
+                slot = self._n
+                self._n += 1
+            self._slot[token] = slot
+            self.token[slot] = token
+            self._keys = None
+
+        self._clear(slot)
+        if last_candle_end_ts is not None:
+            self.last_emit[slot] = int(last_candle_end_ts)
+        return slot
+
+    def remove(self, token: int):
+        slot = self._slot.pop(int(token), None)
+        if slot is None:
+            return
+        self._clear(slot)
+        self.token[slot] = -1
+        self._free.append(slot)
+        self._keys = None
+
+    def slot_of(self, token: int) -> Optional[int]:
+        return self._slot.get(int(token))
+
+    def slots_for(self, tokens) -> np.ndarray:
+        """
+        Raw tokens → slot array (-1 = unknown token). Vectorized.
+        """
+        tokens = np.asarray(tokens, dtype=np.int64)
+
+        if self._keys is None:
+            keys = np.fromiter(self._slot.keys(), dtype=np.int64, count=len(self._slot))
+            vals = np.fromiter(self._slot.values(), dtype=np.int64, count=len(self._slot))
+            order = np.argsort(keys)
+            self._keys, self._vals = keys[order], vals[order]
+
+        if not len(self._keys):
+            return np.full(len(tokens), -1, dtype=np.int64)
+
+        pos = np.searchsorted(self._keys, tokens)
+        pos[pos == len(self._keys)] = 0
+        return np.where(self._keys[pos] == tokens, self._vals[pos], -1)
+
+    def __contains__(self, token) -> bool:
+        return int(token) in self._slot
+
+    def __len__(self) -> int:
+        return len(self._slot)
+
+    def current(self, token: int) -> Optional[dict]:
+        """
+        In-progress (unclosed) bar for `token`, if any.
+        """
+        slot = self._slot.get(int(token))
+        if slot is None or self.start[slot] == _NO_BUCKET:
+            return None
+        return {
+            "start_ts": int(self.start[slot]),
+            "end_ts": int(self.start[slot]) + self.tf,
+            "open": float(self.o[slot]),
+            "high": float(self.h[slot]),
+            "low": float(self.l[slot]),
+            "close": float(self.c[slot]),
+            "volume": float(self.v[slot]),
+        }
+
+    # -------------------------------------------------
+    # Ticks
+    # -------------------------------------------------
+
+    def on_ticks(self, tokens, ltp, ts, volume=None) -> CandleBatch:
+        """
+        Raw instrument tokens; unknown tokens are ignored.
+        """
+        return self.on_slot_ticks(self.slots_for(tokens), ltp, ts, volume)
+
+    def on_slot_ticks(self, slots, ltp, ts, volume=None) -> CandleBatch:
+        """
+        Apply a batch of ticks (arrival order) and return closed candles.
+        """
+        slots = np.asarray(slots, dtype=np.int64)
+        px = np.asarray(ltp, dtype=np.float64)
+        ts = np.asarray(ts, dtype=np.int64)
+        qty = (
+            np.zeros(len(slots), dtype=np.float64)
+            if volume is None
+            else np.asarray(volume, dtype=np.float64)
+        )
+
+        known = slots >= 0
+        if not known.all():
+            slots, px, ts, qty = slots[known], px[known], ts[known], qty[known]
+
+        if not len(slots):
+            return _empty_batch()
+
+        # Group by slot, keeping arrival order inside each slot
+        order = np.argsort(slots, kind="stable")
+        slots, px, qty = slots[order], px[order], qty[order]
+        bucket = (ts[order] // self.tf) * self.tf
+
+        n = len(slots)
+        group_first = np.empty(n, dtype=bool)
+        group_first[0] = True
+        np.not_equal(slots[1:], slots[:-1], out=group_first[1:])
+
+        seg_first = group_first.copy()
+        seg_first[1:] |= bucket[1:] != bucket[:-1]
+
+        # -----------------------------
+        # Runs of equal bucket → segments
+        # -----------------------------
+        seg_idx = np.flatnonzero(seg_first)
+        seg_last = np.empty(len(seg_idx), dtype=np.int64)
+        seg_last[:-1] = seg_idx[1:] - 1
+        seg_last[-1] = n - 1
+
+        s_slot = slots[seg_idx]
+        s_start = bucket[seg_idx]
+        s_open = px[seg_idx]
+        s_high = np.maximum.reduceat(px, seg_idx)
+        s_low = np.minimum.reduceat(px, seg_idx)
+        s_close = px[seg_last]
+        s_vol = np.add.reduceat(qty, seg_idx)
+
+        s_group_first = group_first[seg_idx]
+        s_group_last = np.empty(len(seg_idx), dtype=bool)
+        s_group_last[:-1] = s_group_first[1:]
+        s_group_last[-1] = True
+
+        # -----------------------------
+        # First segment vs. open bar in state
+        # -----------------------------
+        g_seg = np.flatnonzero(s_group_first)
+        g_slot = s_slot[g_seg]
+        st_start = self.start[g_slot]
+
+        cont = st_start == s_start[g_seg]
+        if cont.any():
+            cs, sl = g_seg[cont], g_slot[cont]
+            s_open[cs] = self.o[sl]
+            s_high[cs] = np.maximum(s_high[cs], self.h[sl])
+            s_low[cs] = np.minimum(s_low[cs], self.l[sl])
+            s_vol[cs] += self.v[sl]
+
+        # Open bar in a DIFFERENT bucket → it closes first
+        flush = (~cont) & (st_start != _NO_BUCKET)
+        f_slot = g_slot[flush]
+
+        # -----------------------------
+        # Closed candles (per-slot order)
+        # -----------------------------
+        closed_seg = np.flatnonzero(~s_group_last)
+
+        c_slot = np.concatenate([f_slot, s_slot[closed_seg]])
+        c_start = np.concatenate([self.start[f_slot], s_start[closed_seg]])
+        c_open = np.concatenate([self.o[f_slot], s_open[closed_seg]])
+        c_high = np.concatenate([self.h[f_slot], s_high[closed_seg]])
+        c_low = np.concatenate([self.l[f_slot], s_low[closed_seg]])
+        c_close = np.concatenate([self.c[f_slot], s_close[closed_seg]])
+        c_vol = np.concatenate([self.v[f_slot], s_vol[closed_seg]])
+
+        # state bar sorts just before its group's first segment
+        c_key = np.concatenate([2 * g_seg[flush], 2 * closed_seg + 1])
+        c_order = np.argsort(c_key, kind="stable")
+
+        # -----------------------------
+        # New open bar = last segment of each slot
+        # -----------------------------
+        last = np.flatnonzero(s_group_last)
+        ls = s_slot[last]
+        self.start[ls] = s_start[last]
+        self.o[ls] = s_open[last]
+        self.h[ls] = s_high[last]
+        self.l[ls] = s_low[last]
+        self.c[ls] = s_close[last]
+        self.v[ls] = s_vol[last]
+
+        if not len(c_slot):
+            return _empty_batch()
+
+        c_slot = c_slot[c_order]
+        c_start = c_start[c_order]
+        c_end = c_start + self.tf
+
+        emit = self._dedup(c_slot, c_end)
+
+        return CandleBatch(
+            token=self.token[c_slot[emit]],
+            start_ts=c_start[emit],
+            end_ts=c_end[emit],
+            open=c_open[c_order][emit],
+            high=c_high[c_order][emit],
+            low=c_low[c_order][emit],
+            close=c_close[c_order][emit],
+            volume=c_vol[c_order][emit],
+        )
+
+    # -------------------------------------------------
+    # Internal
+    # -------------------------------------------------
+
+    def _dedup(self, c_slot: np.ndarray, c_end: np.ndarray) -> np.ndarray:
+        """
+        Emit iff end_ts > max(last_emitted, ends closed before it).
+        Grouped running max: rank * SPAN + end keeps groups apart.
+        """
+        first = np.empty(len(c_slot), dtype=bool)
+        first[0] = True
+        np.not_equal(c_slot[1:], c_slot[:-1], out=first[1:])
+        rank = np.cumsum(first) - 1
+
+        run = np.maximum.accumulate(rank * _TS_SPAN + c_end)
+        prev = np.empty(len(c_slot), dtype=np.int64)
+        prev[0] = -1
+        prev[1:] = run[:-1]
+
+        prev_end = np.where(first, _NEVER, prev - rank * _TS_SPAN)
+        threshold = np.maximum(prev_end, self.last_emit[c_slot])
+
+        np.maximum.at(self.last_emit, c_slot, c_end)
+        return c_end > threshold
+
+    def _alloc(self, capacity: int):
+        self.token = np.full(capacity, -1, dtype=np.int64)
+        self.start = np.full(capacity, _NO_BUCKET, dtype=np.int64)
+        self.last_emit = np.full(capacity, _NEVER, dtype=np.int64)
+        self.o = np.zeros(capacity, dtype=np.float64)
+        self.h = np.zeros(capacity, dtype=np.float64)
+        self.l = np.zeros(capacity, dtype=np.float64)
+        self.c = np.zeros(capacity, dtype=np.float64)
+        self.v = np.zeros(capacity, dtype=np.float64)
+
+    def _grow(self):
+        old = (self.token, self.start, self.last_emit,
+               self.o, self.h, self.l, self.c, self.v)
+        n = len(self.token)
+        self._alloc(n * 2)
+        new = (self.token, self.start, self.last_emit,
+               self.o, self.h, self.l, self.c, self.v)
+        for a, b in zip(new, old):
+            a[:n] = b
+
+    def _clear(self, slot: int):
+        self.start[slot] = _NO_BUCKET
+        self.last_emit[slot] = _NEVER
+        self.o[slot] = self.h[slot] = self.l[slot] = self.c[slot] = 0.0
+        self.v[slot] = 0.0
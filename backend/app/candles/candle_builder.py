@@ -3,6 +3,11 @@ from app.marketdata.candle import Candle
 from app.event_bus.audit_logger import write_audit_log
 
 
+# Late tick policy (tick for a bucket that is already closed / behind)
+LATE_REOPEN = "reopen"   # legacy: close the open bar, restart in the old bucket
+LATE_DROP = "drop"       # ignore the tick for OHLC (counted in late_ticks)
+
+
 class CandleBuilder:
     """
     Builds OHLC candles from LTP-only ticks using STRICT time buckets.
@@ -11,6 +16,10 @@ class CandleBuilder:
     This implementation is TradingView-parity:
     - Candle boundaries are bucket-based, NOT tick-driven
     - Late ticks do NOT shift candle closes
+
+    close_due() lets a timer close the bar at the boundary instead of
+    waiting for the next bucket's first tick. Pair it with LATE_DROP:
+    ticks for an already-emitted (or older) bucket are then ignored.
     """
 
     def __init__(
@@ -18,9 +27,12 @@ class CandleBuilder:
         instrument_token: int,
         timeframe_sec: int,
         last_candle_end_ts: Optional[int] = None,
+        late_policy: str = LATE_REOPEN,
     ):
         self.instrument_token = instrument_token
         self.tf = int(timeframe_sec)
+        self.late_policy = late_policy
+        self.late_ticks = 0
 
         self.current_bucket_start: Optional[int] = None
         self.current_bucket_end: Optional[int] = None
@@ -47,6 +59,20 @@ class CandleBuilder:
         bucket_start = (ts // self.tf) * self.tf
         bucket_end = bucket_start + self.tf
 
+        # Late tick (bucket already emitted, or behind the open bar)
+        if self.late_policy == LATE_DROP and (
+            (
+                self.last_emitted_end_ts is not None
+                and bucket_end <= self.last_emitted_end_ts
+            )
+            or (
+                self.current_bucket_start is not None
+                and bucket_start < self.current_bucket_start
+            )
+        ):
+            self.late_ticks += 1
+            return None
+
         # First tick ever
         if self.current_bucket_start is None:
             self._start_bucket(bucket_start, bucket_end, ltp)
@@ -60,15 +86,7 @@ class CandleBuilder:
         # -----------------------------
         # BUCKET ROLLOVER
         # -----------------------------
-        finished = Candle(
-            start_ts=self.current_bucket_start,
-            end_ts=self.current_bucket_end,
-            open=self.o,
-            high=self.h,
-            low=self.l,
-            close=self.c,
-            source="ZERODHA_WS",
-        )
+        finished = self._finished()
 
         # ✅ SAFE: finished exists here
         #write_audit_log(
@@ -90,10 +108,44 @@ class CandleBuilder:
         return None
 
 
+    def close_due(self, now_ts: int) -> Optional[Candle]:
+        """
+        Timer close: emit the open bar if its bucket ended at/before now_ts.
+        The next tick starts a fresh bucket.
+        """
+        if self.current_bucket_end is None or self.current_bucket_end > now_ts:
+            return None
+
+        finished = self._finished()
+
+        self.current_bucket_start = None
+        self.current_bucket_end = None
+        self.o = self.h = self.l = self.c = None
+
+        if (
+            self.last_emitted_end_ts is None
+            or finished.end_ts > self.last_emitted_end_ts
+        ):
+            self.last_emitted_end_ts = finished.end_ts
+            return finished
+
+        return None
+
     # --------------------------------------------------
     # Internal helpers
     # --------------------------------------------------
 
+    def _finished(self) -> Candle:
+        return Candle(
+            start_ts=self.current_bucket_start,
+            end_ts=self.current_bucket_end,
+            open=self.o,
+            high=self.h,
+            low=self.l,
+            close=self.c,
+            source="ZERODHA_WS",
+        )
+
     def _start_bucket(self, start_ts: int, end_ts: int, ltp: float):
         self.current_bucket_start = start_ts
         self.current_bucket_end = end_ts
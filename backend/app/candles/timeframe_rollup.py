@@ -0,0 +1,147 @@
+# backend/app/candles/timeframe_rollup.py
+
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from app.marketdata.candle import Candle
+from app.utils.market_hours import MARKET_CLOSE, MARKET_OPEN
+
+
+IST_OFFSET_SEC = 5 * 3600 + 30 * 60
+DAY_SEC = 86400
+
+SESSION_OPEN_SEC = MARKET_OPEN.hour * 3600 + MARKET_OPEN.minute * 60
+SESSION_CLOSE_SEC = MARKET_CLOSE.hour * 3600 + MARKET_CLOSE.minute * 60
+
+RECENT_KEEP = 200
+
+
+def timeframe_label(minutes: int) -> str:
+    return f"{int(minutes)}m"
+
+
+def session_bucket(ts: int, size_sec: int) -> Tuple[int, int]:
+    """
+    (bucket_start, session_close) for epoch `ts`.
+
+    Buckets are anchored at the IST session open (09:15), like Kite /
+    TradingView intraday bars, so N need not divide the day.
+    """
+    day = (ts + IST_OFFSET_SEC) // DAY_SEC * DAY_SEC - IST_OFFSET_SEC
+    anchor = day + SESSION_OPEN_SEC
+    start = anchor + (ts - anchor) // size_sec * size_sec
+    return start, day + SESSION_CLOSE_SEC
+
+
+class _Partial:
+    __slots__ = ("start", "end", "o", "h", "l", "c", "minutes")
+
+    def __init__(self, start: int, end: int, c: Candle):
+        self.start = start
+        self.end = end
+        self.o = c.open
+        self.h = c.high
+        self.l = c.low
+        self.c = c.close
+        self.minutes = 1
+
+
+class TimeframeRollup:
+    """
+    Incremental N-minute candles from CLOSED 1m candles (one token).
+
+    RULES:
+    - O(1) per 1m candle per timeframe, no history re-scan
+    - a bar is emitted as soon as its LAST minute closes
+      (or when a later minute / the session close proves it finished)
+    - the first bar after start is dropped if it began mid-bucket
+      (incomplete history → would not match Kite / TradingView)
+    - end_ts is strictly increasing per timeframe (dedup)
+    """
+
+    def __init__(self, minutes: Iterable[int], base_sec: int = 60):
+        self.base_sec = int(base_sec)
+        self.minutes = sorted({int(m) for m in minutes if int(m) > 1})
+
+        self._partial: Dict[int, Optional[_Partial]] = {m: None for m in self.minutes}
+        self._seeded: Dict[int, bool] = {m: False for m in self.minutes}
+        self._last_end: Dict[int, int] = {m: 0 for m in self.minutes}
+
+        self.recent: Dict[str, Deque[Candle]] = {
+            timeframe_label(m): deque(maxlen=RECENT_KEEP) for m in self.minutes
+        }
+
+    # -------------------------------------------------
+
+    def on_candle(self, candle: Candle) -> List[Tuple[str, Candle]]:
+        """
+        Feed one closed 1m candle → [(label, rolled candle), ...] closed.
+        """
+        out: List[Tuple[str, Candle]] = []
+
+        for m in self.minutes:
+            size = m * self.base_sec
+            start, session_close = session_bucket(candle.start_ts, size)
+            end = min(start + size, session_close)
+
+            p = self._partial[m]
+
+            # later bucket → previous bar is finished (gap / missed minute)
+            if p is not None and start != p.start:
+                self._emit(m, p, out)
+                p = None
+
+            if p is None:
+                # seed: first bucket must start with its first minute
+                if not self._seeded[m] and candle.start_ts != start:
+                    continue
+                self._seeded[m] = True
+                p = self._partial[m] = _Partial(start, end, candle)
+            else:
+                if candle.high > p.h:
+                    p.h = candle.high
+                if candle.low < p.l:
+                    p.l = candle.low
+                p.c = candle.close
+                p.minutes += 1
+
+            if candle.end_ts >= p.end:
+                self._emit(m, p, out)
+
+        return out
+
+    def current(self, minutes: int) -> Optional[dict]:
+        p = self._partial.get(int(minutes))
+        if p is None:
+            return None
+        return {
+            "start_ts": p.start,
+            "end_ts": p.end,
+            "open": p.o,
+            "high": p.h,
+            "low": p.l,
+            "close": p.c,
+            "minutes": p.minutes,
+        }
+
+    # -------------------------------------------------
+
+    def _emit(self, m: int, p: _Partial, out: List[Tuple[str, Candle]]):
+        self._partial[m] = None
+
+        if p.end <= self._last_end[m]:
+            return
+        self._last_end[m] = p.end
+
+        rolled = Candle(
+            start_ts=p.start,
+            end_ts=p.end,
+            open=p.o,
+            high=p.h,
+            low=p.l,
+            close=p.c,
+            source="ROLLUP",
+        )
+        label = timeframe_label(m)
+        self.recent[label].append(rolled)
+        out.append((label, rolled))
@@ -1,8 +1,11 @@
 import json
 import os
 import tempfile
+import threading
+import time
 from copy import deepcopy
 from pathlib import Path
+from typing import Callable, List, Optional, Tuple
 
 # --------------------------------------------------
 # CONFIG PATH (CROSS-PLATFORM SAFE)
@@ -10,6 +13,9 @@ from pathlib import Path
 
 CONFIG_PATH = Path.home() / ".scalp-app" / "strategy_config.json"
 
+# Hand edits of the file are picked up within this many seconds
+CHECK_INTERVAL_SEC = 1.0
+
 # --------------------------------------------------
 # 🔒 SINGLE SOURCE OF TRUTH DEFAULTS
 # --------------------------------------------------
@@ -69,32 +75,167 @@ DEFAULT_CONFIG = {
 }
 
 # --------------------------------------------------
-# LOAD CONFIG
+# CONFIG CACHE (IN-PROCESS)
 # --------------------------------------------------
 
-def load_strategy_config() -> dict:
+class StrategyConfigStore:
     """
-    Always returns a COMPLETE config.
-    Never returns {}.
-    Never enables trading implicitly.
+    Merged strategy config, parsed ONCE and shared.
+
+    RULES:
+    - get() returns the SAME dict until the config changes → READ ONLY
+      (use load_strategy_config() for a private copy)
+    - the file is re-checked with ONE stat() at most every
+      CHECK_INTERVAL_SEC (mtime / size / inode) → hand edits still apply
+    - save_strategy_config() updates the cache directly (no re-read)
+    - subscribers get callback(new_cfg, old_cfg) on every change;
+      their errors are logged, never raised
     """
-    if not CONFIG_PATH.exists():
-        save_strategy_config(DEFAULT_CONFIG)
-        return deepcopy(DEFAULT_CONFIG)
 
+    def __init__(self, check_interval: float = CHECK_INTERVAL_SEC):
+        self.check_interval = check_interval
+
+        self._lock = threading.Lock()
+        self._cfg: Optional[dict] = None
+        self._key: Optional[Tuple] = None
+        self._checked_at = 0.0
+        self._subscribers: List[Callable[[dict, Optional[dict]], None]] = []
+
+        self.reloads = 0
+        self.saves = 0
+
+    # -------------------------------------------------
+
+    def get(self) -> dict:
+        cfg = self._cfg
+        if cfg is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return cfg
+
+        with self._lock:
+            self._checked_at = time.monotonic()
+            key = _stat_key()
+            if self._cfg is not None and key == self._key:
+                return self._cfg
+            cfg, key = self._read()
+            old = self._swap(cfg, key)
+            self.reloads += 1
+
+        if old is not None:
+            self._notify(cfg, old)
+        return cfg
+
+    def saved(self, cfg: dict):
+        """
+        Called by save_strategy_config() right after the atomic write.
+        """
+        merged = _merge_defaults(cfg)
+        with self._lock:
+            old = self._swap(merged, _stat_key())
+            self._checked_at = time.monotonic()
+            self.saves += 1
+        self._notify(merged, old)
+
+    def invalidate(self):
+        with self._lock:
+            self._checked_at = 0.0
+            self._key = None
+
+    def subscribe(self, callback: Callable[[dict, Optional[dict]], None]):
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[dict, Optional[dict]], None]):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def stats(self) -> dict:
+        return {
+            "path": str(CONFIG_PATH),
+            "check_interval_sec": self.check_interval,
+            "reloads": self.reloads,
+            "saves": self.saves,
+            "subscribers": len(self._subscribers),
+        }
+
+    # -------------------------------------------------
+
+    def _read(self) -> Tuple[dict, Optional[Tuple]]:
+        """
+        Never returns {}. Missing / corrupt file → defaults written back
+        (same as the uncached loader always did).
+        """
+        if not CONFIG_PATH.exists():
+            _write_config(DEFAULT_CONFIG)
+            return deepcopy(DEFAULT_CONFIG), _stat_key()
+
+        try:
+            with CONFIG_PATH.open("r", encoding="utf-8") as f:
+                cfg = json.load(f)
+        except Exception:
+            _write_config(DEFAULT_CONFIG)
+            return deepcopy(DEFAULT_CONFIG), _stat_key()
+
+        return _merge_defaults(cfg), _stat_key()
+
+    def _swap(self, cfg: dict, key: Optional[Tuple]) -> Optional[dict]:
+        old = self._cfg
+        self._cfg = cfg
+        self._key = key
+        return old
+
+    def _notify(self, cfg: dict, old: Optional[dict]):
+        if old is not None and cfg == old:
+            return
+
+        for callback in list(self._subscribers):
+            try:
+                callback(cfg, old)
+            except Exception as e:
+                # lazy import: audit logger must not load at config import
+                from app.event_bus.audit_logger import write_audit_log
+                write_audit_log(f"[CONFIG][SUBSCRIBER][ERROR] {e}")
+
+
+strategy_config = StrategyConfigStore()
+
+
+def _stat_key() -> Optional[Tuple]:
     try:
-        with CONFIG_PATH.open("r", encoding="utf-8") as f:
-            cfg = json.load(f)
-    except Exception:
-        save_strategy_config(DEFAULT_CONFIG)
-        return deepcopy(DEFAULT_CONFIG)
+        st = CONFIG_PATH.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
 
+def _merge_defaults(cfg: dict) -> dict:
     # ---- Merge with defaults (forward compatible) ----
     merged = deepcopy(DEFAULT_CONFIG)
     deep_update(merged, cfg)
-
     return merged
 
+# --------------------------------------------------
+# LOAD CONFIG
+# --------------------------------------------------
+
+def get_strategy_config() -> dict:
+    """
+    Shared, cached, COMPLETE config for hot paths. DO NOT MUTATE.
+    """
+    return strategy_config.get()
+
+
+def load_strategy_config() -> dict:
+    """
+    Always returns a COMPLETE config.
+    Never returns {}.
+    Never enables trading implicitly.
+
+    Private copy (safe to modify, e.g. before save_strategy_config).
+    """
+    return deepcopy(strategy_config.get())
+
 # --------------------------------------------------
 # SAVE CONFIG (WINDOWS-SAFE, ATOMIC)
 # --------------------------------------------------
@@ -103,7 +244,14 @@ def save_strategy_config(cfg: dict):
     """
     Atomic write to avoid PermissionError on Windows.
     Safe across macOS / Linux / Windows.
+
+    The cache (and its subscribers) see the new config immediately.
     """
+    _write_config(cfg)
+    strategy_config.saved(cfg)
+
+
+def _write_config(cfg: dict):
     CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
 
     # Write to temp file first (same directory)
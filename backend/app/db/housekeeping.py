@@ -1,69 +1,285 @@
 import asyncio
+import os
 import time
-import sqlite3  
-from datetime import datetime, timedelta, date
+import sqlite3
+from collections import deque
+from datetime import datetime
+from typing import Optional
 
-from app.db.sqlite import get_conn
+from app.db import sqlite as db
+from app.db.sqlite import db_writer
+from app.db.timeline_archive import TimelineArchive, day_bounds, timeline_archive, trading_day
 from app.event_bus.audit_logger import write_audit_log
+from app.utils.market_hours import IST, is_market_open
 
 
-MARKET_TIMELINE_KEEP_DAYS = 8     #8 days only
+MARKET_TIMELINE_KEEP_DAYS = 8     # hot window in SQLite; older days → archive
 TRADES_KEEP_DAYS = 90              # closed trades
 
+HOUSEKEEPING_INTERVAL_SEC = 600    # every 10 minutes
 
-async def housekeeping_loop():
-    await asyncio.sleep(30)  # allow app startup
+DELETE_BATCH_ROWS = 500            # rows per writer job
+BATCH_PAUSE_SEC = 0.05             # between batches / archived series
+VACUUM_BATCH_PAGES = 2000          # pages freed per incremental_vacuum job
+REBUILD_TIMEOUT_SEC = 3600.0       # ANALYZE / full VACUUM wait (past the writer default)
+HISTORY_RUNS = 144                 # ~1 day of passes kept for trends
 
-    while True:
-        try:
-            run_housekeeping()
-        except Exception as e:
-            write_audit_log(f"[HOUSEKEEPING][ERROR] {e}")
 
-        await asyncio.sleep(600)  # every 10 minutes
+def _size(path) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
 
 
-def run_housekeeping():
-    try:
-        conn = get_conn()
-        now = int(time.time())
-
-        # -----------------------------
-        # market_timeline cleanup
-        # -----------------------------
-        cutoff_date = date.today() - timedelta(days=MARKET_TIMELINE_KEEP_DAYS)
-        cutoff_ts = int(datetime.combine(cutoff_date, datetime.min.time()).timestamp())
-
-        cur1 = conn.execute(
-            "DELETE FROM market_timeline WHERE ts < ?",
-            (cutoff_ts,),
+def db_file_sizes() -> dict:
+    path = str(db.DB_PATH)
+    return {
+        "db_bytes": _size(path),
+        "wal_bytes": _size(path + "-wal"),
+    }
+
+
+class Housekeeper:
+    """
+    SQLite retention + maintenance. Runs in a worker thread, never on
+    the event loop; every write goes through db_writer in short jobs.
+
+    EVERY PASS:
+    - market_timeline past the hot window → archive (one job per series-day)
+    - closed trades past retention → deleted DELETE_BATCH_ROWS at a time
+
+    OUTSIDE MARKET HOURS ONLY:
+    - once per IST day: ANALYZE + incremental vacuum (auto_vacuum is
+      switched to INCREMENTAL once, with a full VACUUM)
+    - every pass: PRAGMA optimize, then wal_checkpoint(TRUNCATE)
+    """
+
+    def __init__(
+        self,
+        archive: TimelineArchive = timeline_archive,
+        *,
+        batch_rows: int = DELETE_BATCH_ROWS,
+        pause: float = BATCH_PAUSE_SEC,
+        vacuum_pages: int = VACUUM_BATCH_PAGES,
+    ):
+        self.archive = archive
+        self.batch_rows = batch_rows
+        self.pause = pause
+        self.vacuum_pages = vacuum_pages
+
+        self.runs = 0
+        self.errors = 0
+        self.last_daily: Optional[str] = None      # IST day of last ANALYZE / vacuum
+        self.history: deque = deque(maxlen=HISTORY_RUNS)
+
+    # -------------------------
+    # Retention
+    # -------------------------
+    def delete_closed_trades(self, cutoff_ts: int) -> dict:
+        deleted = batches = 0
+        while True:
+            n = db_writer.execute(
+                """
+                DELETE FROM trades
+                WHERE rowid IN (
+                    SELECT rowid FROM trades
+                    WHERE exit_time IS NOT NULL
+                    AND exit_time < ?
+                    LIMIT ?
+                )
+                """,
+                (cutoff_ts, self.batch_rows),
+                label="housekeeping",
+            )
+            deleted += n
+            batches += 1
+            if n < self.batch_rows:
+                return {"rows": deleted, "batches": batches}
+            time.sleep(self.pause)
+
+    # -------------------------
+    # Maintenance
+    # -------------------------
+    def checkpoint(self) -> dict:
+        busy, log, done = db_writer.run(
+            lambda conn: tuple(conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()),
+            label="housekeeping_checkpoint",
         )
+        return {"busy": bool(busy), "wal_pages": log, "checkpointed": done}
+
+    def optimize(self):
+        db_writer.run(lambda conn: conn.execute("PRAGMA optimize"), label="housekeeping_optimize")
 
-        # -----------------------------
-        # trades cleanup (closed only)
-        # -----------------------------
-        trades_cutoff = now - (TRADES_KEEP_DAYS * 86400)
-
-        cur2 = conn.execute(
-            """
-            DELETE FROM trades
-            WHERE exit_time IS NOT NULL
-            AND exit_time < ?
-            """,
-            (trades_cutoff,),
+    def analyze(self):
+        db_writer.run(
+            lambda conn: conn.execute("ANALYZE"),
+            label="housekeeping_analyze",
+            timeout=REBUILD_TIMEOUT_SEC,
         )
 
-        conn.commit()
+    def incremental_vacuum(self) -> dict:
+        def _mode(conn):
+            return conn.execute("PRAGMA auto_vacuum").fetchone()[0]
 
-        if cur1.rowcount or cur2.rowcount:
-            write_audit_log(
-                f"[HOUSEKEEPING] "
-                f"market_timeline={cur1.rowcount} "
-                f"trades={cur2.rowcount}"
+        def _freelist(conn):
+            return conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+        if db_writer.run(_mode, label="housekeeping_vacuum") != 2:
+            # auto_vacuum only changes on an existing DB through a full rebuild
+            def _convert(conn):
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.execute("VACUUM")
+                return _mode(conn)
+
+            mode = db_writer.run(_convert, label="housekeeping_vacuum", timeout=REBUILD_TIMEOUT_SEC)
+            return {"converted": mode == 2, "pages_freed": 0}
+
+        before = db_writer.run(_freelist, label="housekeeping_vacuum")
+        left = before
+        while left:
+            db_writer.run(
+                lambda conn: conn.execute(f"PRAGMA incremental_vacuum({int(self.vacuum_pages)})").fetchall(),
+                label="housekeeping_vacuum",
             )
-    except sqlite3.DatabaseError as e:
-        write_audit_log(f"[HOUSEKEEPING][ERROR] Database error (skipping): {e}")
-        return  # Skip housekeeping if DB is corrupted
-    except Exception as e:
-        write_audit_log(f"[HOUSEKEEPING][ERROR] {e}")
-        raise
+            now_left = db_writer.run(_freelist, label="housekeeping_vacuum")
+            if now_left >= left:
+                break
+            left = now_left
+            time.sleep(self.pause)
+        return {"converted": False, "pages_freed": before - left}
+
+    # -------------------------
+    # One pass
+    # -------------------------
+    def run(self, *, market_open: Optional[bool] = None, now: Optional[int] = None) -> dict:
+        now = int(time.time()) if now is None else int(now)
+        if market_open is None:
+            market_open = is_market_open()
+
+        t0 = time.perf_counter()
+        report = {
+            "ts": now,
+            "market_open": market_open,
+            "before": db_file_sizes(),
+            "maintenance": [],
+            "errors": [],
+        }
+
+        # both cutoffs from `now`; timeline on an IST day boundary (= archive days)
+        cutoff_ts = day_bounds(trading_day(now - MARKET_TIMELINE_KEEP_DAYS * 86400))[0]
+        trades_cutoff = now - TRADES_KEEP_DAYS * 86400
+
+        steps = [
+            ("market_timeline", lambda: self.archive.archive_before(cutoff_ts, pause=self.pause)),
+            ("trades", lambda: self.delete_closed_trades(trades_cutoff)),
+        ]
+        today = datetime.fromtimestamp(now, tz=IST).date().isoformat()
+        daily = not market_open and self.last_daily != today
+        if daily:
+            steps += [("analyze", self.analyze), ("vacuum", self.incremental_vacuum)]
+        if not market_open:
+            # last: also truncates the WAL the steps above just wrote
+            steps += [("optimize", self.optimize), ("checkpoint", self.checkpoint)]
+
+        for name, fn in steps:
+            s0 = time.perf_counter()
+            try:
+                out = fn()
+            except sqlite3.DatabaseError as e:
+                report["errors"].append(f"{name}: {e}")
+                continue
+            ms = round((time.perf_counter() - s0) * 1000.0, 1)
+            if name in ("market_timeline", "trades"):
+                report[name] = {**(out or {}), "ms": ms}
+            else:
+                report["maintenance"].append({"step": name, "ms": ms, **(out or {})})
+
+        if daily and not any(e.startswith(("analyze:", "vacuum:")) for e in report["errors"]):
+            self.last_daily = today
+
+        report["after"] = db_file_sizes()
+        report["elapsed_ms"] = round((time.perf_counter() - t0) * 1000.0, 1)
+
+        self.runs += 1
+        self.errors += len(report["errors"])
+        self.history.append(report)
+        self._log(report)
+        return report
+
+    def _log(self, report: dict):
+        timeline = report.get("market_timeline", {})
+        trades = report.get("trades", {})
+        if not (timeline.get("rows_deleted") or trades.get("rows") or report["maintenance"] or report["errors"]):
+            return
+        write_audit_log(
+            f"[HOUSEKEEPING] "
+            f"market_timeline={timeline.get('rows_deleted', 0)} "
+            f"archived_files={timeline.get('files', 0)} "
+            f"trades={trades.get('rows', 0)} "
+            f"maintenance={','.join(m['step'] for m in report['maintenance']) or '-'} "
+            f"db={report['after']['db_bytes']} wal={report['after']['wal_bytes']} "
+            f"ms={report['elapsed_ms']}"
+        )
+        for err in report["errors"]:
+            write_audit_log(f"[HOUSEKEEPING][ERROR] Database error (skipped): {err}")
+
+    # -------------------------
+    # Metrics
+    # -------------------------
+    def stats(self) -> dict:
+        runs = list(self.history)
+        first, last = (runs[0], runs[-1]) if runs else (None, None)
+        return {
+            "runs": self.runs,
+            "errors": self.errors,
+            "last_daily": self.last_daily,
+            "rows_deleted": {
+                "market_timeline": sum(r.get("market_timeline", {}).get("rows_deleted", 0) for r in runs),
+                "trades": sum(r.get("trades", {}).get("rows", 0) for r in runs),
+            },
+            "elapsed_ms_total": round(sum(r["elapsed_ms"] for r in runs), 1),
+            "sizes": db_file_sizes(),
+            "trend": None if first is None else {
+                "since_ts": first["ts"],
+                "db_bytes": last["after"]["db_bytes"] - first["before"]["db_bytes"],
+                "wal_bytes": last["after"]["wal_bytes"] - first["before"]["wal_bytes"],
+            },
+            "history": [
+                {
+                    "ts": r["ts"],
+                    "market_open": r["market_open"],
+                    "market_timeline": r.get("market_timeline", {}).get("rows_deleted", 0),
+                    "trades": r.get("trades", {}).get("rows", 0),
+                    "maintenance": [m["step"] for m in r["maintenance"]],
+                    "db_bytes": r["after"]["db_bytes"],
+                    "wal_bytes": r["after"]["wal_bytes"],
+                    "elapsed_ms": r["elapsed_ms"],
+                }
+                for r in runs
+            ],
+            "last_run": last,
+        }
+
+
+# -------------------------
+# Singleton
+# -------------------------
+housekeeper = Housekeeper()
+
+
+async def housekeeping_loop():
+    await asyncio.sleep(30)  # allow app startup
+
+    while True:
+        try:
+            # worker thread: archive I/O + DB waits never stall the loop
+            await asyncio.to_thread(run_housekeeping)
+        except Exception as e:
+            write_audit_log(f"[HOUSEKEEPING][ERROR] {e}")
+
+        await asyncio.sleep(HOUSEKEEPING_INTERVAL_SEC)
+
+
+def run_housekeeping() -> dict:
+    return housekeeper.run()
@@ -0,0 +1,23 @@
+-- =====================================================
+-- 009_market_timeline_unique_key.sql
+-- SAFE, IDEMPOTENT
+-- =====================================================
+-- Purpose:
+--   market_timeline is written as ONE upsert per candle
+--   (INSERT ... ON CONFLICT(symbol, timeframe, ts) DO UPDATE),
+--   which needs a UNIQUE key on (symbol, timeframe, ts).
+--
+--   Older DBs may hold duplicates (INSERT OR IGNORE never
+--   ignored anything without a unique key) → keep the
+--   newest row per key, drop the rest.
+-- =====================================================
+
+DELETE FROM market_timeline
+WHERE id NOT IN (
+    SELECT MAX(id)
+    FROM market_timeline
+    GROUP BY symbol, timeframe, ts
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uniq_market_timeline_symbol_tf_ts
+ON market_timeline(symbol, timeframe, ts);
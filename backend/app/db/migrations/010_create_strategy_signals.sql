@@ -0,0 +1,38 @@
+-- =====================================================
+-- 010_create_strategy_signals.sql
+-- SAFE, IDEMPOTENT
+-- =====================================================
+-- Purpose:
+--   market_timeline holds ONE row per candle for the PRIMARY
+--   strategy (strategy_version tag). Secondary strategies that
+--   share its indicators write their per-candle output here,
+--   one row per (strategy_version, symbol, timeframe, ts).
+--
+--   conditions: JSON object {cond_key: 0/1} of that strategy's
+--   rule set (rule sets differ per strategy → no fixed columns).
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS strategy_signals (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+
+    symbol TEXT NOT NULL,
+    timeframe TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    strategy_version TEXT NOT NULL,
+
+    cond_all INTEGER,
+    conditions TEXT,
+
+    signal TEXT,
+    entry_price REAL,
+    sl REAL,
+    tp REAL,
+
+    created_at INTEGER
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uniq_strategy_signals_version_symbol_tf_ts
+ON strategy_signals(strategy_version, symbol, timeframe, ts);
+
+CREATE INDEX IF NOT EXISTS idx_strategy_signals_symbol_ts
+ON strategy_signals(symbol, timeframe, ts);
@@ -0,0 +1,31 @@
+-- =====================================================
+-- 011_market_timeline_warmup_index.sql
+-- SAFE, IDEMPOTENT, NO DATA LOSS
+-- =====================================================
+-- Purpose:
+--   Warmup reads the last N candles per symbol:
+--
+--     SELECT ts, open, high, low, close
+--     FROM market_timeline
+--     WHERE symbol = ? AND timeframe = ?
+--     ORDER BY ts DESC LIMIT ?
+--
+--   With only the (symbol, timeframe, ts) key every row is
+--   a second lookup into the wide table row (indicators +
+--   12 condition columns). This index carries OHLC too,
+--   so the whole read is one backwards index range scan.
+--
+--   idx_market_timeline_symbol_ts (002) is NOT a prefix of
+--   the (symbol, timeframe, ts) unique key (009). Dropping it
+--   is still safe: every current query either pins timeframe
+--   (served by 009 / this index) or filters on symbol alone
+--   (served by the symbol prefix of 009). Writes maintain
+--   2 indexes, not 3.
+-- =====================================================
+
+CREATE INDEX IF NOT EXISTS idx_market_timeline_warmup
+ON market_timeline(symbol, timeframe, ts, open, high, low, close);
+
+DROP INDEX IF EXISTS idx_market_timeline_symbol_ts;
+
+ANALYZE market_timeline;
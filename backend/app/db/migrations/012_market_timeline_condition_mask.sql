@@ -0,0 +1,139 @@
+-- =====================================================
+-- 012_market_timeline_condition_mask.sql
+-- TABLE REBUILD, NO DATA LOSS
+-- =====================================================
+-- Purpose:
+--   12 INTEGER condition columns + unused conditions_json
+--   → ONE cond_mask INTEGER (bit registry: CONDITION_BITS in
+--   app/engine/condition_engine_v1_9.py — positions are STABLE).
+--
+--   - NULL cond_mask = conditions not evaluated (all columns NULL)
+--   - market_timeline_decoded exposes the old cond_* columns
+--     (NULL mask → NULL flags) for debug UI / ad-hoc SQL
+--
+--   SQLite cannot drop 13 columns in place on every version we
+--   ship → copy into the new layout, swap, recreate indexes.
+-- =====================================================
+
+BEGIN;
+
+CREATE TABLE market_timeline_new (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+
+    symbol TEXT NOT NULL,
+    timeframe TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+
+    ema8 REAL,
+    ema20_low REAL,
+    ema20_high REAL,
+
+    rsi_raw REAL,
+
+    cond_mask INTEGER,
+    signal TEXT,
+
+    strategy_version TEXT,
+    mode TEXT,
+
+    created_at INTEGER
+);
+
+INSERT INTO market_timeline_new (
+    id, symbol, timeframe, ts,
+    open, high, low, close,
+    ema8, ema20_low, ema20_high, rsi_raw,
+    cond_mask, signal,
+    strategy_version, mode, created_at
+)
+SELECT
+    id, symbol, timeframe, ts,
+    open, high, low, close,
+    ema8, ema20_low, ema20_high, rsi_raw,
+    CASE
+        WHEN
+            cond_close_gt_open IS NULL
+            AND cond_close_gt_ema8 IS NULL
+            AND cond_close_ge_ema20 IS NULL
+            AND cond_close_not_above_ema20 IS NULL
+            AND cond_not_touching_high IS NULL
+            AND cond_rsi_ge_40 IS NULL
+            AND cond_rsi_le_65 IS NULL
+            AND cond_rsi_range IS NULL
+            AND cond_rsi_rising IS NULL
+            AND cond_is_trading_time IS NULL
+            AND cond_no_open_trade IS NULL
+            AND cond_all IS NULL
+        THEN NULL
+        ELSE
+              ((COALESCE(cond_close_gt_open, 0) != 0) << 0)
+            | ((COALESCE(cond_close_gt_ema8, 0) != 0) << 1)
+            | ((COALESCE(cond_close_ge_ema20, 0) != 0) << 2)
+            | ((COALESCE(cond_close_not_above_ema20, 0) != 0) << 3)
+            | ((COALESCE(cond_not_touching_high, 0) != 0) << 4)
+            | ((COALESCE(cond_rsi_ge_40, 0) != 0) << 5)
+            | ((COALESCE(cond_rsi_le_65, 0) != 0) << 6)
+            | ((COALESCE(cond_rsi_range, 0) != 0) << 7)
+            | ((COALESCE(cond_rsi_rising, 0) != 0) << 8)
+            | ((COALESCE(cond_is_trading_time, 0) != 0) << 9)
+            | ((COALESCE(cond_no_open_trade, 0) != 0) << 10)
+            | ((COALESCE(cond_all, 0) != 0) << 11)
+    END,
+    signal,
+    strategy_version, mode, created_at
+FROM market_timeline;
+
+DROP TABLE market_timeline;
+ALTER TABLE market_timeline_new RENAME TO market_timeline;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uniq_market_timeline_symbol_tf_ts
+ON market_timeline(symbol, timeframe, ts);
+
+CREATE INDEX IF NOT EXISTS idx_market_timeline_warmup
+ON market_timeline(symbol, timeframe, ts, open, high, low, close);
+
+-- =====================================================
+-- DECODED VIEW (same columns the table used to have)
+-- =====================================================
+CREATE VIEW IF NOT EXISTS market_timeline_decoded AS
+SELECT
+    id,
+    symbol,
+    timeframe,
+    ts,
+
+    open, high, low, close,
+
+    ema8,
+    ema20_low,
+    ema20_high,
+    rsi_raw,
+
+    (cond_mask >> 0) & 1 AS cond_close_gt_open,
+    (cond_mask >> 1) & 1 AS cond_close_gt_ema8,
+    (cond_mask >> 2) & 1 AS cond_close_ge_ema20,
+    (cond_mask >> 3) & 1 AS cond_close_not_above_ema20,
+    (cond_mask >> 4) & 1 AS cond_not_touching_high,
+    (cond_mask >> 5) & 1 AS cond_rsi_ge_40,
+    (cond_mask >> 6) & 1 AS cond_rsi_le_65,
+    (cond_mask >> 7) & 1 AS cond_rsi_range,
+    (cond_mask >> 8) & 1 AS cond_rsi_rising,
+    (cond_mask >> 9) & 1 AS cond_is_trading_time,
+    (cond_mask >> 10) & 1 AS cond_no_open_trade,
+    (cond_mask >> 11) & 1 AS cond_all,
+    cond_mask,
+
+    signal,
+    strategy_version,
+    mode,
+    created_at
+FROM market_timeline;
+
+COMMIT;
+
+ANALYZE market_timeline;
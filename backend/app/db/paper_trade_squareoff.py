@@ -1,6 +1,7 @@
-from app.db.sqlite import get_conn
+from app.db.sqlite import db_readers, db_writer
 from app.event_bus.audit_logger import write_audit_log
 from app.marketdata.ltp_provider import get_ltp_for_token
+from app.trading.paper_trade_index import OpenPaperTradeIndex
 
 EXIT_REASON_EOD = "EOD_SQUARE_OFF"
 
@@ -12,9 +13,7 @@ def square_off_open_paper_trades():
     Uses LTP provider; handles market-closed scenario gracefully.
     """
 
-    conn = get_conn()
-
-    rows = conn.execute(
+    rows = db_readers.fetchall(
         """
         SELECT
             paper_trade_id,
@@ -24,7 +23,7 @@ def square_off_open_paper_trades():
         FROM paper_trades
         WHERE state = 'OPEN'
         """
-    ).fetchall()
+    )
 
     if not rows:
         write_audit_log("[EOD][PAPER] No open trades to square off")
@@ -36,6 +35,7 @@ def square_off_open_paper_trades():
 
     closed_count = 0
     skipped_count = 0
+    exits = []
 
     for r in rows:
         trade_id = r["paper_trade_id"]
@@ -56,8 +56,11 @@ def square_off_open_paper_trades():
                 f"Using entry price {entry_price} for EOD square-off."
             )
 
+        exits.append((float(ltp), EXIT_REASON_EOD, trade_id, qty))
 
-        conn.execute(
+    # All exits in ONE writer transaction
+    def _close_all(conn):
+        conn.executemany(
             """
             UPDATE paper_trades
             SET
@@ -68,21 +71,19 @@ def square_off_open_paper_trades():
             WHERE paper_trade_id = ?
               AND state = 'OPEN'
             """,
-            (
-                float(ltp),
-                EXIT_REASON_EOD,
-                trade_id,
-            ),
+            [e[:3] for e in exits],
         )
 
+    db_writer.run(_close_all, label="paper_squareoff", transaction=True)
+
+    for ltp, _, trade_id, qty in exits:
+        OpenPaperTradeIndex.remove(trade_id)
         closed_count += 1
 
         write_audit_log(
             f"[EOD][PAPER] Trade {trade_id} CLOSED @ {ltp} qty={qty}"
         )
 
-    conn.commit()
-
     write_audit_log(
         f"[EOD][PAPER] Square-off completed | closed={closed_count}, skipped={skipped_count}"
     )
@@ -1,5 +1,5 @@
 import math
-from app.db.sqlite import get_conn
+from app.db.sqlite import db_readers, db_writer
 from app.event_bus.audit_logger import write_audit_log
 
 
@@ -12,9 +12,7 @@ def reconcile_closed_paper_trades():
     Zerodha OPTION charges – LOCKED v2
     """
 
-    conn = get_conn()
-
-    rows = conn.execute(
+    rows = db_readers.fetchall(
         """
         SELECT
             paper_trade_id,
@@ -28,13 +26,13 @@ def reconcile_closed_paper_trades():
           AND qty IS NOT NULL
           AND net_pnl IS NULL
         """
-    ).fetchall()
+    )
 
     write_audit_log(
         f"[RECONCILE][PAPER] Found {len(rows)} unreconciled CLOSED trades"
     )
 
-    updated = 0
+    updates = []
 
     for r in rows:
         trade_id = r["paper_trade_id"]
@@ -73,7 +71,25 @@ def reconcile_closed_paper_trades():
 
         net_pnl = pnl_value - total_charges
 
-        conn.execute(
+        updates.append((
+            pnl_points,
+            pnl_value,
+
+            brokerage,
+            stt,
+            exchange_charges,
+            sebi_charges,
+            stamp_duty,
+            gst,
+
+            total_charges,
+            net_pnl,
+            trade_id,
+        ))
+
+    # All rows in ONE writer transaction
+    def _apply(conn):
+        conn.executemany(
             """
             UPDATE paper_trades
             SET
@@ -91,26 +107,12 @@ def reconcile_closed_paper_trades():
                 net_pnl = ?
             WHERE paper_trade_id = ?
             """,
-            (
-                pnl_points,
-                pnl_value,
-
-                brokerage,
-                stt,
-                exchange_charges,
-                sebi_charges,
-                stamp_duty,
-                gst,
-
-                total_charges,
-                net_pnl,
-                trade_id,
-            ),
+            updates,
         )
 
-        updated += 1
-
-    conn.commit()
+    if updates:
+        db_writer.run(_apply, label="paper_reconcile", transaction=True)
+    updated = len(updates)
 
     write_audit_log(
         f"[RECONCILE][PAPER] Updated {updated} CLOSED trades"
@@ -1,8 +1,9 @@
 import time
-from app.db.sqlite import get_conn
+from app.db.sqlite import db_readers, db_writer
 from app.event_bus.audit_logger import write_audit_log
 from app.db.db_lock import DB_LOCK
 from app.trading.zerodha_charges_calc import calculate_option_charges
+from app.trading.paper_trade_index import OpenPaperTradeIndex
 
 
 # ==================================================
@@ -14,9 +15,7 @@ def has_open_paper_trade(
     strategy_name: str,
     symbol: str,
 ) -> bool:
-    conn = get_conn()
-
-    cur = conn.execute(
+    row = db_readers.fetchone(
         """
         SELECT 1
         FROM paper_trades
@@ -28,7 +27,7 @@ def has_open_paper_trade(
         (strategy_name, symbol),
     )
 
-    return cur.fetchone() is not None
+    return row is not None
 
 
 # ==================================================
@@ -52,11 +51,9 @@ def insert_paper_trade(
     lot_size: int,
     qty: int,
 ):
-    conn = get_conn()
-
     try:
 
-        conn.execute(
+        db_writer.execute(
             """
             INSERT INTO paper_trades (
                 paper_trade_id,
@@ -97,8 +94,8 @@ def insert_paper_trade(
                 qty,
                 int(time.time()),
             ),
+            label="paper_insert",
         )
-        conn.commit()
 
         write_audit_log(
             f"[DB][PAPER] OPEN trade_id={paper_trade_id} symbol={symbol}"
@@ -116,8 +113,7 @@ def insert_paper_trade(
 # ==================================================
 
 def get_open_paper_trades_for_symbol(*, strategy_name: str, symbol: str):
-    conn = get_conn()
-    cur = conn.execute(
+    return db_readers.fetchall(
         """
         SELECT paper_trade_id, sl_price, tp_price
         FROM paper_trades
@@ -127,7 +123,6 @@ def get_open_paper_trades_for_symbol(*, strategy_name: str, symbol: str):
         """,
         (strategy_name, symbol),
     )
-    return cur.fetchall()
 
 
 # ==================================================
@@ -140,9 +135,8 @@ def close_paper_trade(
     exit_price: float,
     exit_reason: str,
 ):
-    conn = get_conn()
-
-    try:
+    # SELECT + UPDATE run as ONE writer job: no second close interleaves
+    def _close(conn):
         cur = conn.execute(
             """
             SELECT entry_price, qty
@@ -162,6 +156,9 @@ def close_paper_trade(
 
         entry_price, qty = row
 
+        # Index first: the tick path must never see a closing trade
+        OpenPaperTradeIndex.remove(paper_trade_id)
+
         # -------------------------------------------------
         # Zerodha OPTION charges (AUTHORITATIVE)
         # -------------------------------------------------
@@ -219,8 +216,6 @@ def close_paper_trade(
             ),
         )
 
-        conn.commit()
-
         write_audit_log(
             f"[DB][PAPER] CLOSED trade_id={paper_trade_id} "
             f"gross={charges.gross_pnl:.2f} "
@@ -228,6 +223,9 @@ def close_paper_trade(
             f"net={charges.net_pnl:.2f}"
         )
 
+    try:
+        db_writer.run(_close, label="paper_close")
+
     except Exception as e:
         write_audit_log(
             f"[DB][PAPER][ERROR] CLOSE FAILED trade_id={paper_trade_id} ERR={e}"
@@ -1,11 +1,17 @@
 # backend/app/db/sqlite.py
 
-import sqlite3
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Optional
+from queue import Empty, Queue
+from typing import Callable, List, Optional
+import sqlite3
+import threading
+import time
+import weakref
 
 # 🔐 SINGLE SOURCE OF TRUTH FOR PATHS
 from app.utils.app_paths import DATA_DIR, ensure_app_dirs
+from app.engine.latency_tracker import LatencyHistogram
 
 # --------------------------------------------------
 # DATABASE PATH (CANONICAL)
@@ -13,31 +19,43 @@ from app.utils.app_paths import DATA_DIR, ensure_app_dirs
 
 DB_PATH = DATA_DIR / "app.db"
 
+
+def _connect(*, query_only: bool = False) -> sqlite3.Connection:
+    ensure_app_dirs()
+
+    conn = sqlite3.connect(
+        DB_PATH,
+        check_same_thread=False,
+        timeout=30.0,
+        isolation_level=None  # ← Autocommit mode - no manual transactions
+    )
+    conn.row_factory = sqlite3.Row
+
+    # Enable WAL mode for better concurrency
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if query_only:
+        conn.execute("PRAGMA query_only=ON")
+    return conn
+
+
 # --------------------------------------------------
-# CONNECTION SINGLETON
+# CONNECTION SINGLETON (bootstrap / offline tools)
 # --------------------------------------------------
 
 _conn: Optional[sqlite3.Connection] = None
 
 
 def get_conn() -> sqlite3.Connection:
+    """
+    Shared process connection: migrations, backtests, offline tools.
+    Live code writes through `db_writer` and reads through `read_conn()`.
+    """
     global _conn
 
     if _conn is None:
-        ensure_app_dirs()
-
-        _conn = sqlite3.connect(
-            DB_PATH,
-            check_same_thread=False,
-            timeout=30.0,
-            isolation_level=None  # ← Autocommit mode - no manual transactions
-        )
-        _conn.row_factory = sqlite3.Row
-        
-        # Enable WAL mode for better concurrency
-        _conn.execute("PRAGMA journal_mode=WAL")
-        _conn.execute("PRAGMA synchronous=NORMAL")
-        
+        _conn = _connect()
+
     return _conn
 
 def init_db() -> sqlite3.Connection:
@@ -53,3 +71,354 @@ def init_db() -> sqlite3.Connection:
       - return a valid connection to the canonical DB
     """
     return get_conn()
+
+
+# ==================================================
+# READ CONNECTIONS (one per thread, WAL snapshot reads)
+# ==================================================
+
+class _ReaderSlot:
+    """
+    Thread-local holder of one reader connection. Dropped with the
+    thread's locals when the thread exits → its finalizer closes the
+    connection.
+    """
+
+    __slots__ = ("conn", "generation", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection, generation: int):
+        self.conn = conn
+        self.generation = generation
+
+
+class ReadConnections:
+    """
+    Read-only WAL connections, ONE per calling thread.
+
+    RULES:
+    - readers never share a connection (no cross-thread serialization)
+    - query_only: a stray write fails loudly instead of racing the writer
+    - a thread's connection is closed when the thread exits (short-lived
+      BUY / recentre threads do not leak handles)
+    - reset() closes every handed-out connection (threads reopen lazily)
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._conns: List[sqlite3.Connection] = []
+        self._generation = 0
+
+        self.query_hist = LatencyHistogram()
+        self.opened = 0
+        self.closed = 0
+
+    def get(self) -> sqlite3.Connection:
+        slot = getattr(self._local, "slot", None)
+        if slot is None or slot.generation != self._generation:
+            conn = _connect(query_only=True)
+            with self._lock:
+                self._conns.append(conn)
+                self.opened += 1
+            slot = _ReaderSlot(conn, self._generation)
+            weakref.finalize(slot, self._release, conn)
+            self._local.slot = slot
+        return slot.conn
+
+    def _release(self, conn: sqlite3.Connection):
+        with self._lock:
+            if conn not in self._conns:
+                return          # reset() already closed it
+            self._conns.remove(conn)
+            self.closed += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def fetchall(self, sql: str, params=()) -> list:
+        """
+        Run one read on this thread's connection, timed.
+        """
+        t0 = time.perf_counter_ns()
+        rows = self.get().execute(sql, params).fetchall()
+        us = (time.perf_counter_ns() - t0) // 1000
+        with self._lock:
+            self.query_hist.record(us)
+        return rows
+
+    def fetchone(self, sql: str, params=()):
+        rows = self.fetchall(sql, params)
+        return rows[0] if rows else None
+
+    def reset(self):
+        with self._lock:
+            conns, self._conns = self._conns, []
+            self._generation += 1
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "open": len(self._conns),
+                "opened": self.opened,
+                "closed": self.closed,
+                "query": self.query_hist.summary(),
+            }
+
+
+# ==================================================
+# WRITER THREAD (single owner of the write connection)
+# ==================================================
+
+_STOP = object()
+
+
+class DBWriter:
+    """
+    ONE thread owns the write connection; every live write is a job.
+
+    RULES:
+    - submit(fn) → Future; fn(conn) runs on the writer thread, in order
+    - run(fn) blocks for the result (errors re-raised in the caller);
+      called FROM the writer thread it runs inline (no self-deadlock)
+    - transaction=True wraps the job in BEGIN / COMMIT (ROLLBACK on error)
+    - run() waits RUN_TIMEOUT_SEC by default (pass timeout= for VACUUM-class jobs)
+    - the write connection fails to open → every queued job fails with
+      that error (next submit retries the open)
+    - metrics: queue wait (submit → start) and exec time per job
+    """
+
+    RUN_TIMEOUT_SEC = 60.0
+
+    def __init__(self):
+        self._q: "Queue" = Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._owner: Optional[int] = None
+
+        self.wait_hist = LatencyHistogram()
+        self.exec_hist = LatencyHistogram()
+        self.jobs = 0
+        self.failed = 0
+        self.max_depth = 0
+        self.by_label: dict = {}
+        self.connect_errors = 0
+        self.last_error: Optional[str] = None
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run,
+                name="DBWriter",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> bool:
+        """
+        Drain queued jobs, close the connection. Returns True if drained.
+        """
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return True
+        self._q.put(_STOP)
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def on_writer_thread(self) -> bool:
+        return threading.get_ident() == self._owner
+
+    # -------------------------
+    # Jobs
+    # -------------------------
+    def submit(
+        self,
+        fn: Callable[[sqlite3.Connection], object],
+        *,
+        label: str = "job",
+        transaction: bool = False,
+    ) -> Future:
+        if self._thread is None or not self._thread.is_alive():
+            self.start()
+
+        fut: Future = Future()
+        self._q.put((fn, label, transaction, fut, time.perf_counter_ns()))
+
+        depth = self._q.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+        return fut
+
+    def run(
+        self,
+        fn: Callable[[sqlite3.Connection], object],
+        *,
+        label: str = "job",
+        transaction: bool = False,
+        timeout: Optional[float] = RUN_TIMEOUT_SEC,
+    ):
+        if self.on_writer_thread():
+            return self._execute(fn, transaction)
+        return self.submit(fn, label=label, transaction=transaction).result(timeout)
+
+    def execute(self, sql: str, params=(), *, label: str = "execute") -> int:
+        """
+        One statement, blocking. Returns rowcount.
+        """
+        return self.run(lambda conn: conn.execute(sql, params).rowcount, label=label)
+
+    def _execute(self, fn, transaction: bool):
+        conn = self._conn
+        if not transaction or conn.in_transaction:
+            return fn(conn)
+
+        conn.execute("BEGIN")
+        try:
+            result = fn(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return result
+
+    def _run(self):
+        try:
+            conn = _connect()
+        except Exception as e:
+            self._fail_pending(e)
+            return
+
+        self._owner = threading.get_ident()
+        self._conn = conn
+        try:
+            while True:
+                try:
+                    item = self._q.get(timeout=1.0)
+                except Empty:
+                    if self._thread is not threading.current_thread():
+                        break
+                    continue
+
+                if item is _STOP:
+                    break
+
+                fn, label, transaction, fut, queued_ns = item
+                if not fut.set_running_or_notify_cancel():
+                    continue
+
+                start_ns = time.perf_counter_ns()
+                try:
+                    result = self._execute(fn, transaction)
+                    ok = True
+                except BaseException as e:
+                    ok = False
+                    fut.set_exception(e)
+                end_ns = time.perf_counter_ns()
+
+                with self._lock:
+                    self.wait_hist.record((start_ns - queued_ns) // 1000)
+                    self.exec_hist.record((end_ns - start_ns) // 1000)
+                    self.jobs += 1
+                    self.by_label[label] = self.by_label.get(label, 0) + 1
+                    if not ok:
+                        self.failed += 1
+
+                if ok:
+                    fut.set_result(result)
+        finally:
+            conn, self._conn = self._conn, None
+            self._owner = None
+            if conn is not None:
+                conn.close()
+
+    def _fail_pending(self, error: Exception):
+        """
+        No write connection: give up the thread and fail what is queued.
+        """
+        with self._lock:
+            self.connect_errors += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+            if self._thread is threading.current_thread():
+                self._thread = None
+
+        while True:
+            try:
+                item = self._q.get_nowait()
+            except Empty:
+                return
+            if item is _STOP:
+                continue
+            fut = item[3]
+            if fut.set_running_or_notify_cancel():
+                fut.set_exception(error)
+                with self._lock:
+                    self.failed += 1
+
+    # -------------------------
+    # Metrics
+    # -------------------------
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "running": bool(self._thread and self._thread.is_alive()),
+                "queue_depth": self._q.qsize(),
+                "max_queue_depth": self.max_depth,
+                "jobs": self.jobs,
+                "failed": self.failed,
+                "connect_errors": self.connect_errors,
+                "last_error": self.last_error,
+                "by_label": dict(self.by_label),
+                "wait": self.wait_hist.summary(),
+                "exec": self.exec_hist.summary(),
+            }
+
+
+# -------------------------
+# Singletons
+# -------------------------
+db_writer = DBWriter()
+db_readers = ReadConnections()
+
+
+def read_conn() -> sqlite3.Connection:
+    """
+    This thread's read-only connection.
+    """
+    return db_readers.get()
+
+
+def db_stats() -> dict:
+    return {
+        "path": str(DB_PATH),
+        "writer": db_writer.stats(),
+        "readers": db_readers.stats(),
+    }
+
+
+def reset_connections(path: Optional[Path] = None):
+    """
+    Close every connection (writer, readers, shared) and optionally
+    repoint DB_PATH. Tools / tests only.
+    """
+    global DB_PATH, _conn
+
+    db_writer.stop()
+    db_readers.reset()
+    if _conn is not None:
+        _conn.close()
+        _conn = None
+    if path is not None:
+        DB_PATH = Path(path)
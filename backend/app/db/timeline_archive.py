@@ -0,0 +1,331 @@
+# backend/app/db/timeline_archive.py
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional
+from urllib.parse import quote, unquote
+import os
+import time
+
+import numpy as np
+
+from app.db.sqlite import db_readers, db_writer
+from app.event_bus.audit_logger import write_audit_log
+from app.utils.app_paths import TIMELINE_ARCHIVE_DIR
+
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+# Archived columns (market_timeline minus id). NULL encoding:
+#   float → NaN, text → ""
+#   nullable int → 0 + False in "<name>_valid" (no in-band sentinel:
+#   every int is a legal cond_mask / timestamp)
+FLOAT_COLUMNS = ("open", "high", "low", "close", "ema8", "ema20_low", "ema20_high", "rsi_raw")
+INT_COLUMNS = ("ts", "cond_mask", "created_at")
+NULLABLE_INT_COLUMNS = ("cond_mask", "created_at")
+TEXT_COLUMNS = ("signal", "strategy_version", "mode")
+ARCHIVE_COLUMNS = ("ts",) + FLOAT_COLUMNS + ("cond_mask", "signal", "strategy_version", "mode", "created_at")
+VALID_COLUMNS = tuple(f"{c}_valid" for c in NULLABLE_INT_COLUMNS)
+STORED_COLUMNS = ARCHIVE_COLUMNS + VALID_COLUMNS
+
+_SELECT = ", ".join(ARCHIVE_COLUMNS)
+
+
+def trading_day(ts: int) -> str:
+    """
+    IST calendar day of a candle ts → 'YYYY-MM-DD'.
+    """
+    return datetime.fromtimestamp(int(ts), tz=IST).date().isoformat()
+
+
+def day_bounds(day: str):
+    """
+    [start, end) unix seconds of an IST day.
+    """
+    start = datetime.fromisoformat(day).replace(tzinfo=IST)
+    return int(start.timestamp()), int((start + timedelta(days=1)).timestamp())
+
+
+def rows_to_arrays(rows) -> Dict[str, np.ndarray]:
+    """
+    sqlite rows (ARCHIVE_COLUMNS order) → one numpy array per column
+    (STORED_COLUMNS: nullable ints also get their validity array).
+    """
+    cols = list(zip(*rows)) if rows else [()] * len(ARCHIVE_COLUMNS)
+    out: Dict[str, np.ndarray] = {}
+    for name, values in zip(ARCHIVE_COLUMNS, cols):
+        if name in FLOAT_COLUMNS:
+            out[name] = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        elif name in INT_COLUMNS:
+            out[name] = np.array([0 if v is None else v for v in values], dtype=np.int64)
+            if name in NULLABLE_INT_COLUMNS:
+                out[f"{name}_valid"] = np.array([v is not None for v in values], dtype=bool)
+        else:
+            out[name] = np.array(["" if v is None else v for v in values], dtype=str)
+    return out
+
+
+def _empty() -> Dict[str, np.ndarray]:
+    return rows_to_arrays([])
+
+
+def _concat(parts: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    parts = [p for p in parts if len(p["ts"])]
+    if not parts:
+        return _empty()
+    return {c: np.concatenate([p[c] for p in parts]) for c in STORED_COLUMNS}
+
+
+def column_values(arrays: Dict[str, np.ndarray], name: str) -> list:
+    """
+    One column back as Python values, NULL → None
+    (e.g. cond_mask → ConditionEngine.unpack()).
+    """
+    values = arrays[name].tolist()
+    if name in NULLABLE_INT_COLUMNS:
+        return [v if ok else None for v, ok in zip(values, arrays[f"{name}_valid"].tolist())]
+    if name in FLOAT_COLUMNS:
+        return [None if v != v else v for v in values]
+    if name in TEXT_COLUMNS:
+        return [v or None for v in values]
+    return values
+
+
+def _dedup_last(arrays: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Sort by ts; on duplicate ts keep the LAST part's row (hot wins).
+    """
+    ts = arrays["ts"]
+    if not len(ts):
+        return arrays
+    rev = ts[::-1]
+    _, first_in_rev = np.unique(rev, return_index=True)
+    keep = len(ts) - 1 - first_in_rev          # ascending ts
+    return {c: a[keep] for c, a in arrays.items()}
+
+
+class TimelineArchive:
+    """
+    Cold tier for market_timeline: ONE compressed .npz per
+    (timeframe, IST trading day, symbol).
+
+        <root>/<timeframe>/<YYYY-MM-DD>/<quoted symbol>.npz
+
+    RULES:
+    - archive first, delete after: SQLite rows go only once their
+      day file is on disk (fsync + atomic rename)
+    - re-archiving a day merges into the existing file (idempotent)
+    - load() stitches archived days + hot SQLite rows, hot wins on
+      the same ts
+    """
+
+    def __init__(self, root: Path = TIMELINE_ARCHIVE_DIR):
+        self.root = Path(root)
+        self._lock = Lock()      # one archive pass at a time
+
+        self.runs = 0
+        self.rows_archived = 0
+        self.rows_deleted = 0
+        self.files_written = 0
+        self.errors = 0
+        self.last_run: Optional[dict] = None
+
+    # -------------------------
+    # Paths
+    # -------------------------
+    def path(self, symbol: str, timeframe: str, day: str) -> Path:
+        return self.root / timeframe / day / f"{quote(symbol, safe='')}.npz"
+
+    def days(self, symbol: str, timeframe: str) -> List[str]:
+        base = self.root / timeframe
+        if not base.is_dir():
+            return []
+        name = f"{quote(symbol, safe='')}.npz"
+        return sorted(d.name for d in base.iterdir() if (d / name).is_file())
+
+    def symbols(self, timeframe: str, day: str) -> List[str]:
+        d = self.root / timeframe / day
+        if not d.is_dir():
+            return []
+        return sorted(unquote(p.stem) for p in d.glob("*.npz"))
+
+    # -------------------------
+    # Files
+    # -------------------------
+    def read_day(self, symbol: str, timeframe: str, day: str) -> Dict[str, np.ndarray]:
+        path = self.path(symbol, timeframe, day)
+        if not path.is_file():
+            return _empty()
+        with np.load(path, allow_pickle=False) as z:
+            return {c: z[c] for c in STORED_COLUMNS}
+
+    def write_day(self, symbol: str, timeframe: str, day: str, arrays: Dict[str, np.ndarray]) -> int:
+        """
+        Merge `arrays` into the day file (new rows win). Returns bytes on disk.
+        """
+        path = self.path(symbol, timeframe, day)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        merged = _dedup_last(_concat([self.read_day(symbol, timeframe, day), arrays]))
+
+        tmp = path.with_name(f".{path.name}.tmp")
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, **merged)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        return path.stat().st_size
+
+    # -------------------------
+    # Archive pass (SQLite → files → DELETE)
+    # -------------------------
+    def archive_before(self, cutoff_ts: int, *, pause: float = 0.0) -> dict:
+        """
+        Move every market_timeline row with ts < cutoff_ts to day files.
+        A (symbol, timeframe) whose files fail to write keeps its rows.
+
+        Deletes are one writer job per (series, day), with `pause`
+        seconds between series so live writes interleave.
+        """
+        with self._lock:
+            t0 = time.perf_counter()
+            report = {
+                "cutoff_ts": int(cutoff_ts),
+                "series": 0,
+                "rows_archived": 0,
+                "rows_deleted": 0,
+                "files": 0,
+                "bytes": 0,
+                "errors": 0,
+            }
+
+            groups = db_readers.fetchall(
+                """
+                SELECT symbol, timeframe, MAX(id)
+                FROM market_timeline
+                WHERE ts < ?
+                GROUP BY symbol, timeframe
+                """,
+                (int(cutoff_ts),),
+            )
+
+            for i, (symbol, timeframe, max_id) in enumerate(groups):
+                if i and pause:
+                    time.sleep(pause)
+                try:
+                    self._archive_series(symbol, timeframe, int(cutoff_ts), int(max_id), report)
+                except Exception as e:
+                    report["errors"] += 1
+                    write_audit_log(
+                        f"[TIMELINE][ARCHIVE][ERROR] symbol={symbol} tf={timeframe} ERR={e}"
+                    )
+
+            report["elapsed_ms"] = round((time.perf_counter() - t0) * 1000.0, 1)
+
+            self.runs += 1
+            self.rows_archived += report["rows_archived"]
+            self.rows_deleted += report["rows_deleted"]
+            self.files_written += report["files"]
+            self.errors += report["errors"]
+            self.last_run = report
+            return report
+
+    def _archive_series(self, symbol: str, timeframe: str, cutoff_ts: int, max_id: int, report: dict):
+        # id <= max_id: rows landing after the GROUP BY wait for the next pass
+        rows = db_readers.fetchall(
+            f"""
+            SELECT {_SELECT}
+            FROM market_timeline
+            WHERE symbol = ? AND timeframe = ? AND ts < ? AND id <= ?
+            ORDER BY ts
+            """,
+            (symbol, timeframe, cutoff_ts, max_id),
+        )
+        if not rows:
+            return
+
+        arrays = rows_to_arrays(rows)
+        days = np.array([trading_day(t) for t in arrays["ts"]])
+
+        for day in np.unique(days):
+            mask = days == day
+            report["bytes"] += self.write_day(
+                symbol, timeframe, str(day), {c: a[mask] for c, a in arrays.items()}
+            )
+            report["files"] += 1
+            report["rows_archived"] += int(mask.sum())
+
+            # day file is on disk → drop exactly that day's rows
+            d_lo, d_hi = day_bounds(str(day))
+            report["rows_deleted"] += db_writer.execute(
+                """
+                DELETE FROM market_timeline
+                WHERE symbol = ? AND timeframe = ? AND ts >= ? AND ts < ? AND id <= ?
+                """,
+                (symbol, timeframe, d_lo, min(d_hi, cutoff_ts), max_id),
+                label="timeline_archive",
+            )
+
+        report["series"] += 1
+
+    # -------------------------
+    # Read API (archive + hot)
+    # -------------------------
+    def load(
+        self,
+        symbol: str,
+        timeframe: str = "1m",
+        *,
+        start_ts: Optional[int] = None,
+        end_ts: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        One series over [start_ts, end_ts) from archived days + SQLite,
+        ts ascending, one row per ts. Columns: STORED_COLUMNS
+        (NULL → NaN / "" / <name>_valid False; column_values() → None).
+        """
+        lo = -(1 << 62) if start_ts is None else int(start_ts)
+        hi = (1 << 62) if end_ts is None else int(end_ts)
+
+        parts = []
+        for day in self.days(symbol, timeframe):
+            d_lo, d_hi = day_bounds(day)
+            if d_hi <= lo or d_lo >= hi:
+                continue
+            arrays = self.read_day(symbol, timeframe, day)
+            keep = (arrays["ts"] >= lo) & (arrays["ts"] < hi)
+            parts.append({c: a[keep] for c, a in arrays.items()})
+
+        hot = db_readers.fetchall(
+            f"""
+            SELECT {_SELECT}
+            FROM market_timeline
+            WHERE symbol = ? AND timeframe = ? AND ts >= ? AND ts < ?
+            ORDER BY ts
+            """,
+            (symbol, timeframe, lo, hi),
+        )
+        parts.append(rows_to_arrays(hot))
+
+        return _dedup_last(_concat(parts))
+
+    # -------------------------
+    # Metrics
+    # -------------------------
+    def stats(self) -> dict:
+        return {
+            "root": str(self.root),
+            "runs": self.runs,
+            "rows_archived": self.rows_archived,
+            "rows_deleted": self.rows_deleted,
+            "files_written": self.files_written,
+            "errors": self.errors,
+            "last_run": self.last_run,
+        }
+
+
+# -------------------------
+# Singleton
+# -------------------------
+timeline_archive = TimelineArchive()
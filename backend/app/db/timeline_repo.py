@@ -1,7 +1,7 @@
 # app/db/timeline_repo.py
 
-from typing import List
-from app.db.sqlite import get_conn
+from typing import Dict, List
+from app.db.sqlite import db_writer, get_conn, read_conn
 from app.db.db_lock import DB_LOCK
 
 
@@ -16,11 +16,7 @@ def insert_timeline_row(data: dict):
     """
     from app.event_bus.audit_logger import write_audit_log
     
-    conn = get_conn()
-
-    # ❌ REMOVE DB_LOCK - it's causing deadlock!
-    cur = conn.cursor()
-    cur.execute(
+    rows_affected = db_writer.execute(
         """
         INSERT OR IGNORE INTO market_timeline (
             symbol, timeframe, ts,
@@ -42,10 +38,9 @@ def insert_timeline_row(data: dict):
             data["close"],
             data["strategy_version"],
         ),
+        label="timeline_insert",
     )
     
-    rows_affected = cur.rowcount
-    
     #write_audit_log(
         #f"[DB INSERT] ✅ {data['symbol']} ts={data['ts']} "
         #f"rows={rows_affected}"
@@ -67,36 +62,19 @@ def update_timeline_row(
     Update indicators / conditions / signal
     for an EXISTING candle row.
 
+    data["cond_mask"]: packed conditions (ConditionEngineV19.pack)
+
     RETURNS: number of rows updated (0 or 1)
     """
-    conn = get_conn()
-
-    cur = conn.cursor()
-    cur.execute(
+    return db_writer.execute(
         """
         UPDATE market_timeline SET
             ema8 = ?,
             ema20_low = ?,
             ema20_high = ?,
             rsi_raw = ?,
-
-            cond_close_gt_open = ?,
-            cond_close_gt_ema8 = ?,
-            cond_close_ge_ema20 = ?,
-            cond_close_not_above_ema20 = ?,
-            cond_not_touching_high = ?,
-
-            cond_rsi_ge_40 = ?,
-            cond_rsi_le_65 = ?,
-            cond_rsi_range = ?,
-            cond_rsi_rising = ?,
-
-            cond_is_trading_time = ?,
-            cond_no_open_trade = ?,
-
-            cond_all = ?,
+            cond_mask = ?,
             signal = ?
-
         WHERE symbol = ?
             AND timeframe = ?
             AND ts = ?
@@ -106,57 +84,126 @@ def update_timeline_row(
             data.get("ema20_low"),
             data.get("ema20_high"),
             data.get("rsi_raw"),
-
-            _b(data.get("cond_close_gt_open")),
-            _b(data.get("cond_close_gt_ema8")),
-            _b(data.get("cond_close_ge_ema20")),
-            _b(data.get("cond_close_not_above_ema20")),
-            _b(data.get("cond_not_touching_high")),
-
-            _b(data.get("cond_rsi_ge_40")),
-            _b(data.get("cond_rsi_le_65")),
-            _b(data.get("cond_rsi_range")),
-            _b(data.get("cond_rsi_rising")),
-
-            _b(data.get("cond_is_trading_time")),
-            _b(data.get("cond_no_open_trade")),
-
-            _b(data.get("cond_all")),
+            data.get("cond_mask"),
             data.get("signal"),
 
             symbol,
             timeframe,
             ts,
         ),
+        label="timeline_update",
+    )
+
+
+# --------------------------------------------------
+# UPSERT: ONE statement per candle (batch friendly)
+# --------------------------------------------------
+
+TIMELINE_COLUMNS = (
+    "symbol", "timeframe", "ts",
+    "open", "high", "low", "close",
+    "ema8", "ema20_low", "ema20_high", "rsi_raw",
+    "cond_mask",
+    "signal",
+    "strategy_version",
+    "created_at",
+)
+
+_KEY_COLUMNS = ("symbol", "timeframe", "ts")
+
+UPSERT_TIMELINE_SQL = (
+    f"INSERT INTO market_timeline ({', '.join(TIMELINE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in TIMELINE_COLUMNS)}) "
+    f"ON CONFLICT(symbol, timeframe, ts) DO UPDATE SET "
+    + ", ".join(
+        f"{c} = excluded.{c}"
+        for c in TIMELINE_COLUMNS
+        if c not in _KEY_COLUMNS and c != "created_at"
     )
+)
+
 
-    updated = cur.rowcount
-    return updated
+def upsert_timeline_rows(rows: List[dict], conn=None) -> int:
+    """
+    Upsert complete candle rows (OHLC + indicators + conditions + signal).
+    Caller owns the transaction. Returns rows written.
+    """
+    if not rows:
+        return 0
+
+    conn = conn or get_conn()
+    conn.executemany(
+        UPSERT_TIMELINE_SQL,
+        [tuple(r.get(c) for c in TIMELINE_COLUMNS) for r in rows],
+    )
+    return len(rows)
+
+
+# --------------------------------------------------
+# UPSERT: per-strategy signal rows (secondary strategies)
+# --------------------------------------------------
+
+STRATEGY_SIGNAL_COLUMNS = (
+    "symbol", "timeframe", "ts", "strategy_version",
+    "cond_all", "conditions", "signal",
+    "entry_price", "sl", "tp",
+    "created_at",
+)
+
+UPSERT_STRATEGY_SIGNAL_SQL = (
+    f"INSERT INTO strategy_signals ({', '.join(STRATEGY_SIGNAL_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in STRATEGY_SIGNAL_COLUMNS)}) "
+    f"ON CONFLICT(strategy_version, symbol, timeframe, ts) DO UPDATE SET "
+    + ", ".join(
+        f"{c} = excluded.{c}"
+        for c in STRATEGY_SIGNAL_COLUMNS
+        if c not in ("symbol", "timeframe", "ts", "strategy_version", "created_at")
+    )
+)
+
+
+def upsert_strategy_signal_rows(rows: List[dict], conn=None) -> int:
+    """
+    Upsert secondary-strategy rows. Caller owns the transaction.
+    """
+    if not rows:
+        return 0
+
+    conn = conn or get_conn()
+    conn.executemany(
+        UPSERT_STRATEGY_SIGNAL_SQL,
+        [tuple(r.get(c) for c in STRATEGY_SIGNAL_COLUMNS) for r in rows],
+    )
+    return len(rows)
 
 
 # --------------------------------------------------
 # READ: Warmup candles (SESSION SAFE)
 # --------------------------------------------------
 
+# Served entirely by idx_market_timeline_warmup (migration 011):
+# backwards range scan, no table lookups.
+WARMUP_SQL = """
+    SELECT
+        ts, open, high, low, close
+    FROM market_timeline
+    WHERE symbol = ?
+      AND timeframe = ?
+    ORDER BY ts DESC
+    LIMIT ?
+"""
+
+
 def fetch_recent_candles_for_warmup(
     *,
     symbol: str,
     timeframe: str,
     limit: int,
 ) -> List[dict]:
-    conn = get_conn()
-    cur = conn.cursor()
+    cur = read_conn().cursor()
 
     cur.execute(
-        """
-        SELECT
-            ts, open, high, low, close
-        FROM market_timeline
-        WHERE symbol = ?
-          AND timeframe = ?
-        ORDER BY ts DESC
-        LIMIT ?
-        """,
+        WARMUP_SQL,
         (
             symbol,
             timeframe,
@@ -179,6 +226,60 @@ def fetch_recent_candles_for_warmup(
     ]
 
 
+def fetch_recent_candles_for_warmup_bulk(
+    *,
+    symbols: List[str],
+    timeframe: str,
+    limit: int,
+    chunk_size: int = 50,
+) -> Dict[str, List[dict]]:
+    """
+    Warmup window for MANY symbols: last `limit` candles per symbol,
+    oldest first.
+
+    One statement per `chunk_size` symbols: a UNION ALL of per-symbol
+    `ORDER BY ts DESC LIMIT ?` branches, so every branch is a short
+    index range scan (reads `limit` rows, not the whole history).
+    """
+    out: Dict[str, List[dict]] = {s: [] for s in symbols}
+    if not symbols:
+        return out
+
+    branch = (
+        "SELECT * FROM ("
+        "SELECT symbol, ts, open, high, low, close "
+        "FROM market_timeline "
+        "WHERE symbol = ? AND timeframe = ? "
+        "ORDER BY ts DESC LIMIT ?)"
+    )
+
+    cur = read_conn().cursor()
+
+    for i in range(0, len(symbols), chunk_size):
+        chunk = symbols[i:i + chunk_size]
+
+        params: list = []
+        for sym in chunk:
+            params.extend((sym, timeframe, limit))
+
+        cur.execute(" UNION ALL ".join(branch for _ in chunk), params)
+
+        for r in cur.fetchall():
+            out[r[0]].append({
+                "ts": r[1],
+                "open": r[2],
+                "high": r[3],
+                "low": r[4],
+                "close": r[5],
+            })
+
+    # branches come newest-first
+    for rows in out.values():
+        rows.reverse()
+
+    return out
+
+
 # --------------------------------------------------
 # Helpers
 # --------------------------------------------------
@@ -2,7 +2,7 @@ import sqlite3
 import time
 from typing import Optional
 
-from app.db.sqlite import get_conn
+from app.db.sqlite import db_writer
 from app.event_bus.audit_logger import write_audit_log
 
 
@@ -25,9 +25,8 @@ def insert_trade(
     state: str = "BUY_PLACED",        # ✅ DEFAULT OK
     sl_order_id: Optional[str] = None,
 ):
-    conn = get_conn()
     try:
-        conn.execute(
+        db_writer.execute(
             """
             INSERT INTO trades (
                 trade_id, slot, symbol, token,
@@ -52,8 +51,8 @@ def insert_trade(
                 tp_mode,
                 state,
             ),
+            label="trade_insert",
         )
-        conn.commit()
 
         write_audit_log(
             f"[DB] TRADE INSERTED trade_id={trade_id} slot={slot} state={state}"
@@ -75,9 +74,8 @@ def update_gtt(
     trade_id: str,
     gtt_id: str,
 ):
-    conn = get_conn()
     try:
-        conn.execute(
+        db_writer.execute(
             """
             UPDATE trades
             SET
@@ -87,8 +85,8 @@ def update_gtt(
               AND exit_time IS NULL
             """,
             (gtt_id, trade_id),
+            label="trade_gtt",
         )
-        conn.commit()
 
         write_audit_log(
             f"[DB] GTT LINKED trade_id={trade_id} gtt_id={gtt_id}"
@@ -112,9 +110,8 @@ def close_trade(
     exit_order_id: Optional[str],
     exit_reason: str,
 ):
-    conn = get_conn()
     try:
-        cur = conn.execute(
+        rowcount = db_writer.execute(
             """
             UPDATE trades
             SET
@@ -133,11 +130,10 @@ def close_trade(
                 exit_reason,
                 trade_id,
             ),
+            label="trade_close",
         )
 
-        conn.commit()
-
-        if cur.rowcount == 0:
+        if rowcount == 0:
             write_audit_log(
                 f"[DB][SKIP] CLOSE IGNORED trade_id={trade_id}"
             )
@@ -0,0 +1,306 @@
+# backend/app/engine/candle_pipeline.py
+
+from collections import deque
+from enum import IntEnum
+from typing import Callable, Deque, Dict, List, Optional
+import threading
+import time
+
+from app.event_bus.audit_logger import write_audit_log
+
+
+# =========================
+# Priorities
+# =========================
+
+class JobPriority(IntEnum):
+    """
+    Lower value runs FIRST inside a lane.
+    """
+    SIGNAL = 0      # indicators → conditions → strategy → router
+    PERSIST = 1     # stateful follow-up: releases, checkpoints, fan-out (never dropped)
+    DEBUG = 2       # debug / diagnostics (evictable)
+
+
+# Per-priority lane capacity (per worker); soft for PERSIST
+DEFAULT_CAPACITY: Dict[JobPriority, int] = {
+    JobPriority.SIGNAL: 1024,
+    JobPriority.PERSIST: 2048,
+    JobPriority.DEBUG: 512,
+}
+
+
+class _Job:
+    __slots__ = ("token", "fn", "priority", "label", "enqueued_at")
+
+    def __init__(self, token: int, fn: Callable[[], None], priority: JobPriority, label: str):
+        self.token = token
+        self.fn = fn
+        self.priority = priority
+        self.label = label
+        self.enqueued_at = time.monotonic()
+
+
+# =========================
+# Lane (ONE worker thread)
+# =========================
+
+class _Lane:
+    """
+    One worker thread + one bounded queue per priority.
+    A token is ALWAYS served by the same lane → strict per-token order.
+    """
+
+    def __init__(self, pipeline: "CandlePipeline", index: int):
+        self.pipeline = pipeline
+        self.index = index
+
+        self.cond = threading.Condition()
+        self.queues: List[Deque[_Job]] = [deque() for _ in JobPriority]
+
+        self.busy = False
+        self.stopping = False
+
+        self.thread = threading.Thread(
+            target=self._run,
+            name=f"{pipeline.name}-lane-{index}",
+            daemon=True,
+        )
+
+    # -------------------------------------------------
+
+    def depth(self) -> int:
+        return sum(len(q) for q in self.queues)
+
+    def put(self, job: _Job) -> bool:
+        p = self.pipeline
+        q = self.queues[job.priority]
+        cap = p.capacity[job.priority]
+
+        with self.cond:
+            if self.stopping:
+                p._count("rejected", job.priority)
+                return False
+
+            if len(q) >= cap:
+                if job.priority == JobPriority.SIGNAL:
+                    # 🔒 Never evict queued signal work (indicator continuity)
+                    p._count("dropped", job.priority)
+                    p._warn_full(job, "DROP")
+                    return False
+
+                if job.priority == JobPriority.PERSIST:
+                    # 🔒 Stateful work is never dropped → accepted past capacity
+                    p._count("overflow", job.priority)
+                    p._warn_full(job, "OVERFLOW")
+                else:
+                    # Debug → keep the NEWEST work
+                    q.popleft()
+                    p._count("dropped", job.priority)
+
+            q.append(job)
+            p._count("submitted", job.priority)
+            p._observe_depth(self.depth())
+            self.cond.notify()
+
+        return True
+
+    def _next(self) -> Optional[_Job]:
+        for q in self.queues:
+            if q:
+                return q.popleft()
+        return None
+
+    def _run(self):
+        p = self.pipeline
+
+        while True:
+            with self.cond:
+                job = self._next()
+                while job is None:
+                    self.busy = False
+                    self.cond.notify_all()
+                    if self.stopping:
+                        return
+                    self.cond.wait()
+                    job = self._next()
+                self.busy = True
+
+            waited = time.monotonic() - job.enqueued_at
+            p._observe_wait(job, waited)
+
+            try:
+                job.fn()
+                p._count("completed", job.priority)
+            except Exception as e:
+                p._count("failed", job.priority)
+                write_audit_log(
+                    f"[PIPELINE][ERROR] lane={self.index} token={job.token} "
+                    f"job={job.label} ERR={e}"
+                )
+
+
+# =========================
+# Pipeline
+# =========================
+
+class CandlePipeline:
+    """
+    Bounded, per-token ordered candle-processing stage.
+
+    RULES (DO NOT BREAK):
+    - submit() NEVER blocks (called from the WS thread)
+    - token → lane mapping is FIXED → per-token ordering is guaranteed
+    - SIGNAL work runs ahead of PERSIST / DEBUG work in the same lane
+    - queued SIGNAL work is never evicted; overflow rejects the NEW job
+    - PERSIST work is never dropped; overflow is accepted and counted
+    - DEBUG overflow evicts the OLDEST job
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = 4,
+        capacity: Optional[Dict[JobPriority, int]] = None,
+        late_after_sec: float = 5.0,
+        name: str = "candle",
+    ):
+        self.name = name
+        self.workers = max(1, int(workers))
+        self.capacity = dict(DEFAULT_CAPACITY)
+        if capacity:
+            self.capacity.update(capacity)
+        self.late_after_sec = float(late_after_sec)
+
+        self._stats_lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {
+            k: {p.name: 0 for p in JobPriority}
+            for k in ("submitted", "completed", "failed", "dropped", "overflow", "rejected", "late")
+        }
+        self._max_depth = 0
+        self._max_wait_ms = 0.0
+        self._last_drop_log = 0.0
+
+        self._lanes = [_Lane(self, i) for i in range(self.workers)]
+        for lane in self._lanes:
+            lane.thread.start()
+
+        self._closed = False
+
+    # -------------------------------------------------
+    # Public API
+    # -------------------------------------------------
+
+    def submit(
+        self,
+        token: int,
+        fn: Callable[[], None],
+        *,
+        priority: JobPriority = JobPriority.SIGNAL,
+        label: str = "",
+    ) -> bool:
+        """
+        Enqueue work for ONE token. Returns False if the job was not accepted.
+        """
+        lane = self._lanes[int(token) % self.workers]
+        return lane.put(_Job(int(token), fn, priority, label))
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every lane is empty and idle.
+        Returns False on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        for lane in self._lanes:
+            with lane.cond:
+                while lane.depth() or lane.busy:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    lane.cond.wait(remaining)
+
+        return True
+
+    def shutdown(self, *, drain: bool = True, timeout: float = 10.0) -> bool:
+        """
+        Stop accepting work, optionally drain, then stop workers.
+        Safe to call multiple times.
+        """
+        if self._closed:
+            return True
+
+        drained = self.drain(timeout) if drain else False
+
+        for lane in self._lanes:
+            with lane.cond:
+                lane.stopping = True
+                if not drain:
+                    for q in lane.queues:
+                        q.clear()
+                lane.cond.notify_all()
+
+        for lane in self._lanes:
+            lane.thread.join(timeout=1.0)
+
+        self._closed = True
+
+        write_audit_log(
+            f"[PIPELINE] {self.name} shutdown drained={drained} "
+            f"completed={sum(self._counters['completed'].values())}"
+        )
+        return drained
+
+    def stats(self) -> dict:
+        """
+        UI / API safe snapshot of queue depth + counters.
+        """
+        depth = {p.name: 0 for p in JobPriority}
+        for lane in self._lanes:
+            with lane.cond:
+                for p in JobPriority:
+                    depth[p.name] += len(lane.queues[p])
+
+        with self._stats_lock:
+            return {
+                "name": self.name,
+                "workers": self.workers,
+                "capacity": {p.name: c for p, c in self.capacity.items()},
+                "depth": depth,
+                "max_depth": self._max_depth,
+                "max_wait_ms": round(self._max_wait_ms, 3),
+                "late_after_sec": self.late_after_sec,
+                **{k: dict(v) for k, v in self._counters.items()},
+            }
+
+    # -------------------------------------------------
+    # Internal metrics
+    # -------------------------------------------------
+
+    def _count(self, key: str, priority: JobPriority, n: int = 1):
+        with self._stats_lock:
+            self._counters[key][priority.name] += n
+
+    def _observe_depth(self, depth: int):
+        if depth > self._max_depth:
+            with self._stats_lock:
+                self._max_depth = max(self._max_depth, depth)
+
+    def _observe_wait(self, job: _Job, waited: float):
+        with self._stats_lock:
+            ms = waited * 1000.0
+            if ms > self._max_wait_ms:
+                self._max_wait_ms = ms
+            if waited > self.late_after_sec:
+                self._counters["late"][job.priority.name] += 1
+
+    def _warn_full(self, job: _Job, action: str):
+        # Rate-limited: at most one line per 5s
+        now = time.monotonic()
+        if now - self._last_drop_log < 5.0:
+            return
+        self._last_drop_log = now
+        write_audit_log(
+            f"[PIPELINE][{action}] {self.name} lane full "
+            f"priority={job.priority.name} token={job.token} job={job.label}"
+        )
@@ -1,15 +1,91 @@
 # backend/app/engine/condition_engine_v1_9.py
 
-from typing import Dict
+from typing import Dict, Optional
+
+import numpy as np
+
+from app.engine.condition_rules import compile_rules
 from app.marketdata.candle import Candle
 
 
+# -------------------------------------------------
+# V1.9 BUY rules (single source of truth)
+# -------------------------------------------------
+# - HARD GATE: only green candles are evaluated
+# - indicator completeness checked AFTER the gate
+# - RSI rules use RAW RSI
+# - key order == CONDITION_BITS (market_timeline.cond_mask)
+V19_RULES = {
+    "name": "V1.9",
+    "context": ["is_trading_time", "no_open_trade"],
+    "gate": "cond_close_gt_open",
+    "requires": ["ema8", "ema20_low", "ema20_high", "rsi_raw", "rsi_rising"],
+    "conditions": [
+        {"name": "cond_close_gt_open", "left": "close", "op": ">", "right": "open"},
+        {"name": "cond_close_gt_ema8", "left": "close", "op": ">", "right": "ema8"},
+        {"name": "cond_close_ge_ema20", "left": "close", "op": ">=", "right": "ema20_low"},
+        {"name": "cond_close_not_above_ema20", "left": "close", "op": "<=", "right": "ema20_high"},
+        # when EMA8 < EMA20_high, candle high must be strictly below EMA20_high
+        {
+            "name": "cond_not_touching_high",
+            "left": "high", "op": "<", "right": "ema20_high",
+            "when": {"left": "ema8", "op": "<", "right": "ema20_high"},
+        },
+        {"name": "cond_rsi_ge_40", "left": "rsi_raw", "op": ">=", "right": 40},
+        {"name": "cond_rsi_le_65", "left": "rsi_raw", "op": "<=", "right": 65},
+        {"name": "cond_rsi_range", "all": ["cond_rsi_ge_40", "cond_rsi_le_65"]},
+        {"name": "cond_rsi_rising", "is": "rsi_rising"},
+        {"name": "cond_is_trading_time", "is": "is_trading_time"},
+        {"name": "cond_no_open_trade", "is": "no_open_trade"},
+    ],
+    "final": "cond_all",
+}
+
+
+# -------------------------------------------------
+# Bit registry: market_timeline.cond_mask
+# -------------------------------------------------
+# STABLE: stored rows and the market_timeline_decoded view
+# (migration 012) depend on these positions.
+# - never renumber / reuse a bit
+# - new conditions take the next free bit
+CONDITION_BITS = {
+    "cond_close_gt_open": 0,
+    "cond_close_gt_ema8": 1,
+    "cond_close_ge_ema20": 2,
+    "cond_close_not_above_ema20": 3,
+    "cond_not_touching_high": 4,
+    "cond_rsi_ge_40": 5,
+    "cond_rsi_le_65": 6,
+    "cond_rsi_range": 7,
+    "cond_rsi_rising": 8,
+    "cond_is_trading_time": 9,
+    "cond_no_open_trade": 10,
+    "cond_all": 11,
+}
+
+
 class ConditionEngineV19:
     """
     Evaluates BUY-side conditions for V1.9 strategy.
     Pure logic. No DB. No broker. No state mutation.
+
+    Rules live in V19_RULES and are compiled ONCE:
+    - evaluate()        → per-candle dict (live path)
+    - evaluate_arrays() → bool masks over a whole series (backtest / parity)
+
+    pack() / unpack(): condition dict <-> cond_mask (CONDITION_BITS).
+    Keys outside the registry are not stored in market_timeline.
     """
 
+    BITS = CONDITION_BITS
+    _BIT_ITEMS = tuple((k, 1 << b) for k, b in CONDITION_BITS.items())
+
+    def __init__(self, rules: Optional[dict] = None):
+        self.rules = compile_rules(rules or V19_RULES)
+        self.keys = self.rules.keys
+        self._evaluate = self.rules.evaluate
+
     def evaluate(
         self,
         *,
@@ -21,114 +97,74 @@ class ConditionEngineV19:
         """
         Returns all atomic condition flags + final gate (cond_all)
         """
-
-        close = candle.close
-        open_ = candle.open
-        high = candle.high
-
-        # -------------------------------------------------
-        # 🔒 HARD GATE: ONLY GREEN CANDLES ARE EVALUATED
-        # -------------------------------------------------
-        cond_close_gt_open = close > open_
-
-        if not cond_close_gt_open:
-            return {
-                "cond_close_gt_open": False,
-                "cond_close_gt_ema8": False,
-                "cond_close_ge_ema20": False,
-                "cond_close_not_above_ema20": False,
-                "cond_not_touching_high": False,
-                "cond_rsi_ge_40": False,
-                "cond_rsi_le_65": False,
-                "cond_rsi_range": False,
-                "cond_rsi_rising": False,
-                "cond_is_trading_time": is_trading_time,
-                "cond_no_open_trade": no_open_trade,
-                "cond_all": False,
-            }
-
-        # -------------------------------------------------
-        # Indicator fetch (AFTER green candle check)
-        # -------------------------------------------------
-        ema8 = indicators.get("ema8")
-        ema20_low = indicators.get("ema20_low")
-        ema20_high = indicators.get("ema20_high")
-        rsi_raw = indicators.get("rsi_raw")
-        rsi_rising = indicators.get("rsi_rising")
-
-        # -------------------------------------------------
-        # 🔒 SAFETY: indicator completeness
-        # -------------------------------------------------
-        if any(v is None for v in (
-            ema8,
-            ema20_low,
-            ema20_high,
-            rsi_raw,
-            rsi_rising,
-        )):
-            return {
-                "cond_close_gt_open": True,
-                "cond_close_gt_ema8": False,
-                "cond_close_ge_ema20": False,
-                "cond_close_not_above_ema20": False,
-                "cond_not_touching_high": False,
-                "cond_rsi_ge_40": False,
-                "cond_rsi_le_65": False,
-                "cond_rsi_range": False,
-                "cond_rsi_rising": False,
-                "cond_is_trading_time": is_trading_time,
-                "cond_no_open_trade": no_open_trade,
-                "cond_all": False,
-            }
-
-        # -------------------------------------------------
-        # Atomic conditions (VALID candle only)
-        # -------------------------------------------------
-        cond_close_gt_ema8 = close > ema8
-        cond_close_ge_ema20 = close >= ema20_low
-        cond_close_not_above_ema20 = close <= ema20_high
-
-        # V1.9 rule:
-        # when EMA8 < EMA20_high, candle high must be strictly below EMA20_high
-        cond_not_touching_high = (
-            high < ema20_high if ema8 < ema20_high else True
+        return self._evaluate(
+            candle,
+            indicators,
+            is_trading_time=is_trading_time,
+            no_open_trade=no_open_trade,
         )
 
-        # RSI rules (RAW RSI)
-        cond_rsi_ge_40 = rsi_raw >= 40
-        cond_rsi_le_65 = rsi_raw <= 65
-        cond_rsi_range = cond_rsi_ge_40 and cond_rsi_le_65
-        cond_rsi_rising = bool(rsi_rising)
-
-        cond_is_trading_time = is_trading_time
-        cond_no_open_trade = no_open_trade
-
-        # -------------------------------------------------
-        # Final gate (exact Pine logic)
-        # -------------------------------------------------
-        cond_all = (
-            cond_close_gt_open
-            and cond_close_gt_ema8
-            and cond_close_ge_ema20
-            and cond_close_not_above_ema20
-            and cond_not_touching_high
-            and cond_rsi_range
-            and cond_rsi_rising
-            and cond_is_trading_time
-            and cond_no_open_trade
-        )
+    def evaluate_arrays(
+        self,
+        *,
+        open,
+        high,
+        low,
+        close,
+        indicators,
+        is_trading_time=True,
+        no_open_trade=True,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Vectorized evaluate(): one bool array per condition key.
 
-        return {
-            "cond_close_gt_open": cond_close_gt_open,
-            "cond_close_gt_ema8": cond_close_gt_ema8,
-            "cond_close_ge_ema20": cond_close_ge_ema20,
-            "cond_close_not_above_ema20": cond_close_not_above_ema20,
-            "cond_not_touching_high": cond_not_touching_high,
-            "cond_rsi_ge_40": cond_rsi_ge_40,
-            "cond_rsi_le_65": cond_rsi_le_65,
-            "cond_rsi_range": cond_rsi_range,
-            "cond_rsi_rising": cond_rsi_rising,
-            "cond_is_trading_time": cond_is_trading_time,
-            "cond_no_open_trade": cond_no_open_trade,
-            "cond_all": cond_all,
+        indicators: IndicatorBatchV19 or mapping of arrays (NaN = na).
+        Context flags: scalar or per-candle arrays.
+        """
+        arrays = {
+            "open": np.asarray(open, dtype=float),
+            "high": np.asarray(high, dtype=float),
+            "low": np.asarray(low, dtype=float),
+            "close": np.asarray(close, dtype=float),
         }
+        for name in self.rules.indicator_fields:
+            value = (
+                indicators[name]
+                if isinstance(indicators, dict)
+                else getattr(indicators, name)
+            )
+            arrays[name] = np.asarray(value)
+
+        return self.rules.evaluate_arrays(
+            arrays,
+            is_trading_time=is_trading_time,
+            no_open_trade=no_open_trade,
+        )
+
+    # -------------------------------------------------
+    # cond_mask
+    # -------------------------------------------------
+    @classmethod
+    def pack(cls, conditions: Optional[Dict]) -> Optional[int]:
+        """
+        Condition dict → bitmask. None when nothing was evaluated
+        (indicators not ready) — stored as NULL, not 0.
+        """
+        if not conditions:
+            return None
+        mask = 0
+        seen = False
+        for key, bit in cls._BIT_ITEMS:
+            v = conditions.get(key)
+            if v is None:
+                continue
+            seen = True
+            if v:
+                mask |= bit
+        return mask if seen else None
+
+    @classmethod
+    def unpack(cls, mask: Optional[int]) -> Dict[str, Optional[bool]]:
+        if mask is None:
+            return {key: None for key, _ in cls._BIT_ITEMS}
+        return {key: bool(mask & bit) for key, bit in cls._BIT_ITEMS}
@@ -0,0 +1,313 @@
+# backend/app/engine/condition_rules.py
+
+import re
+from typing import Callable, Dict, List, Mapping
+
+import numpy as np
+
+
+# =========================
+# Rule format (plain data, JSON-safe)
+# =========================
+#
+# {
+#   "name": "V1.9",
+#   "context": ["is_trading_time", "no_open_trade"],   # caller-supplied flags
+#   "gate": "cond_close_gt_open",        # False → every other cond False
+#   "requires": ["ema8", ...],           # any None / NaN → only gate kept
+#   "conditions": [
+#     {"name": "c1", "left": "close", "op": ">", "right": "ema8"},
+#     {"name": "c2", "left": "rsi_raw", "op": ">=", "right": 40},
+#     {"name": "c3", "field": "rsi_raw", "between": [40, 65]},
+#     {"name": "c4", "left": "high", "op": "<", "right": "ema20_high",
+#      "when": {"left": "ema8", "op": "<", "right": "ema20_high"}},   # else True
+#     {"name": "c5", "all": ["c2", "c3"]},           # AND of earlier conds
+#     {"name": "c6", "is": "rsi_rising"},            # truthiness of a field
+#   ],
+#   "final": "cond_all",                 # AND of every condition above
+# }
+#
+# Fields: candle.open / high / low / close, indicator keys, context names.
+# Context conditions ({"is": <context name>}) are evaluated even when the
+# gate fails or indicators are missing (V1.9 behaviour).
+
+CANDLE_FIELDS = ("open", "high", "low", "close")
+
+OPS = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+_IDENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class RuleError(ValueError):
+    pass
+
+
+class CompiledRules:
+    """
+    ONE rule set, compiled twice:
+
+    - evaluate(candle, indicators, **context) → dict   (live, per candle)
+      generated straight-line Python: no per-condition calls / loops
+    - evaluate_arrays(arrays, **context) → dict of bool arrays  (offline)
+      arrays: {"open": ..., "ema8": ..., ...}; NaN = Pine na
+    """
+
+    def __init__(self, rules: dict):
+        self.rules = rules
+        self.name = rules.get("name", "")
+        self.context: List[str] = list(rules.get("context", ()))
+        self.gate = rules.get("gate")
+        self.requires: List[str] = list(rules.get("requires", ()))
+        self.conditions: List[dict] = list(rules["conditions"])
+        self.final = rules.get("final", "cond_all")
+
+        self._validate()
+
+        self.keys = tuple(c["name"] for c in self.conditions) + (self.final,)
+        self.indicator_fields = tuple(
+            f for f in self._fields()
+            if f not in CANDLE_FIELDS and f not in self.context
+        )
+        self.source = self._scalar_source()
+
+        namespace: dict = {}
+        exec(compile(self.source, f"<rules:{self.name}>", "exec"), namespace)
+        self.evaluate: Callable[..., Dict[str, bool]] = namespace["evaluate"]
+
+    # -------------------------------------------------
+    # Vectorized (NumPy masks)
+    # -------------------------------------------------
+
+    def evaluate_arrays(self, arrays: Mapping[str, np.ndarray], **context) -> Dict[str, np.ndarray]:
+        n = len(arrays["close"])
+
+        def col(name):
+            if name in context:
+                return np.broadcast_to(np.asarray(context[name], dtype=bool), (n,))
+            return np.asarray(arrays[name])
+
+        def operand(x):
+            return col(x) if isinstance(x, str) else x
+
+        gate = np.ones(n, dtype=bool)
+        if self.gate is not None:
+            gate = self._vector_cond(self._by_name[self.gate], col, operand, {})
+
+        complete = np.ones(n, dtype=bool)
+        for f in self.requires:
+            a = col(f)
+            if a.dtype.kind == "f":
+                complete &= ~np.isnan(a)
+            elif a.dtype == object:
+                complete &= np.array([v is not None for v in a], dtype=bool)
+
+        valid = gate & complete
+
+        out: Dict[str, np.ndarray] = {}
+        final = np.ones(n, dtype=bool)
+        for c in self.conditions:
+            name = c["name"]
+            if name == self.gate:
+                m = gate
+            else:
+                with np.errstate(invalid="ignore"):
+                    m = self._vector_cond(c, col, operand, out)
+                if not self._is_context(c):
+                    m = m & valid
+            out[name] = m
+            final = final & m
+
+        out[self.final] = final
+        return out
+
+    def _vector_cond(self, c: dict, col, operand, done: dict) -> np.ndarray:
+        if "all" in c:
+            m = done[c["all"][0]]
+            for k in c["all"][1:]:
+                m = m & done[k]
+            return m
+
+        if "is" in c:
+            a = col(c["is"])
+            return a.astype(bool) if a.dtype != object else np.array([bool(v) for v in a])
+
+        if "between" in c:
+            lo, hi = c["between"]
+            a = col(c["field"])
+            return (a >= lo) & (a <= hi)
+
+        m = OPS[c["op"]](col(c["left"]), operand(c["right"]))
+        if "when" in c:
+            w = c["when"]
+            m = ~OPS[w["op"]](col(w["left"]), operand(w["right"])) | m
+        return m
+
+    # -------------------------------------------------
+    # Scalar (generated source)
+    # -------------------------------------------------
+
+    def _scalar_source(self) -> str:
+        candle = [f for f in self._fields() if f in CANDLE_FIELDS]
+        ind = self.indicator_fields
+
+        ctx_args = "".join(f", {k}" for k in self.context)
+        lines = [f"def evaluate(candle, ind, *{ctx_args}):"]
+        if not self.context:
+            lines[0] = "def evaluate(candle, ind):"
+
+        for f in candle:
+            lines.append(f"    {f} = candle.{f}")
+
+        names = [c["name"] for c in self.conditions]
+        ctx_conds = {c["name"]: c for c in self.conditions if self._is_context(c)}
+
+        def early(gate_value: bool) -> List[str]:
+            body = []
+            for name in names:
+                if name in ctx_conds:
+                    body.append(f"        {name!r}: {ctx_conds[name]['is']},")
+                elif name == self.gate:
+                    body.append(f"        {name!r}: {gate_value},")
+                else:
+                    body.append(f"        {name!r}: False,")
+            body.append(f"        {self.final!r}: False,")
+            return ["    return {"] + body + ["    }"]
+
+        if self.gate is not None:
+            lines.append(f"    if not ({self._scalar_expr(self._by_name[self.gate])}):")
+            lines += ["    " + x for x in early(False)]
+
+        for f in ind:
+            lines.append(f"    {f} = ind.get({f!r})")
+
+        if self.requires:
+            test = " or ".join(f"{f} is None" for f in self.requires)
+            lines.append(f"    if {test}:")
+            lines += ["    " + x for x in early(True)]
+
+        for c in self.conditions:
+            if c["name"] == self.gate:
+                lines.append(f"    {c['name']} = True")
+            else:
+                lines.append(f"    {c['name']} = {self._scalar_expr(c)}")
+
+        lines.append(f"    {self.final} = " + " and ".join(names))
+        lines.append("    return {")
+        for name in names + [self.final]:
+            lines.append(f"        {name!r}: {name},")
+        lines.append("    }")
+        return "\n".join(lines) + "\n"
+
+    def _scalar_expr(self, c: dict) -> str:
+        if "all" in c:
+            return " and ".join(c["all"])
+        if "is" in c:
+            # context flags pass through as given; fields are coerced
+            return c["is"] if self._is_context(c) else f"bool({c['is']})"
+        if "between" in c:
+            lo, hi = c["between"]
+            return f"({c['field']} >= {_lit(lo)} and {c['field']} <= {_lit(hi)})"
+
+        expr = f"{c['left']} {c['op']} {_lit(c['right'])}"
+        if "when" in c:
+            w = c["when"]
+            expr = f"({expr} if {w['left']} {w['op']} {_lit(w['right'])} else True)"
+        return expr
+
+    # -------------------------------------------------
+    # Validation
+    # -------------------------------------------------
+
+    def _is_context(self, c: dict) -> bool:
+        return "is" in c and c["is"] in self.context
+
+    def _fields(self) -> List[str]:
+        seen: List[str] = []
+
+        def add(x):
+            if isinstance(x, str) and x not in seen:
+                seen.append(x)
+
+        for c in self.conditions:
+            if "all" in c:
+                continue
+            if "is" in c:
+                add(c["is"])
+            elif "between" in c:
+                add(c["field"])
+            else:
+                add(c["left"])
+                add(c["right"])
+                if "when" in c:
+                    add(c["when"]["left"])
+                    add(c["when"]["right"])
+        for f in self.requires:
+            add(f)
+        return seen
+
+    def _validate(self):
+        self._by_name: Dict[str, dict] = {}
+
+        for c in self.conditions:
+            name = c.get("name")
+            if not isinstance(name, str) or not _IDENT.match(name):
+                raise RuleError(f"[RULES] bad condition name {name!r}")
+            if name in self._by_name:
+                raise RuleError(f"[RULES] duplicate condition {name}")
+
+            if "all" in c:
+                for k in c["all"]:
+                    if k not in self._by_name:
+                        raise RuleError(f"[RULES] {name}: 'all' refers to unknown / later {k}")
+            elif "between" in c:
+                lo, hi = c["between"]
+                if isinstance(lo, str) or isinstance(hi, str):
+                    raise RuleError(f"[RULES] {name}: 'between' bounds must be numbers")
+                _lit(lo), _lit(hi)
+            elif "is" not in c:
+                checks = [c] + ([c["when"]] if "when" in c else [])
+                for x in checks:
+                    if x.get("op") not in OPS:
+                        raise RuleError(f"[RULES] {name}: unknown op {x.get('op')!r}")
+                    _lit(x["left"]), _lit(x["right"])
+
+            self._by_name[name] = c
+
+        for f in self._fields():
+            if not _IDENT.match(f):
+                raise RuleError(f"[RULES] bad field name {f!r}")
+
+        if self.gate is not None:
+            g = self._by_name.get(self.gate)
+            if g is None or "left" not in g or "when" in g:
+                raise RuleError(f"[RULES] gate {self.gate} must be a plain comparison")
+            for x in (g["left"], g["right"]):
+                if isinstance(x, str) and x not in CANDLE_FIELDS:
+                    raise RuleError(f"[RULES] gate {self.gate} may only use candle fields")
+        if not _IDENT.match(self.final) or self.final in self._by_name:
+            raise RuleError(f"[RULES] bad final name {self.final!r}")
+
+
+def _lit(x) -> str:
+    """
+    Field name → as is; number → exact literal. Anything else rejected
+    (generated source only ever contains identifiers and numbers).
+    """
+    if isinstance(x, str):
+        if not _IDENT.match(x):
+            raise RuleError(f"[RULES] bad field name {x!r}")
+        return x
+    if isinstance(x, bool) or not isinstance(x, (int, float)):
+        raise RuleError(f"[RULES] threshold must be a number, got {x!r}")
+    return repr(x)
+
+
+def compile_rules(rules: dict) -> CompiledRules:
+    return CompiledRules(rules)
@@ -0,0 +1,356 @@
+# backend/app/engine/indicator_batch_v1_9.py
+
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from app.engine.indicator_engine_pine_v1_9 import IndicatorEnginePineV19
+from app.indicators.ema import RESYNC_EVERY
+from app.marketdata.candle import Candle
+
+
+# Same lengths as IndicatorEnginePineV19 (LOCKED)
+EMA8_LEN = 8
+EMA20_LEN = 20
+EMA20_SMOOTH_LEN = 9
+RSI_LEN = 5
+RSI_SMOOTH_LEN = 5
+
+# Block size for the blocked linear recurrence (EMA / Wilder RMA)
+_BLOCK = 64
+
+
+@dataclass
+class IndicatorBatchV19:
+    """
+    Whole-series V1.9 indicators. NaN = Pine `na` (not seeded yet).
+
+    Index i holds what IndicatorEnginePineV19.update() had in `values`
+    after candle i; `ready[i]` is its ready latch.
+    """
+    ema8: np.ndarray
+    ema20_low: np.ndarray
+    ema20_high: np.ndarray
+    rsi_raw: np.ndarray
+    rsi_smoothed: np.ndarray
+    rsi_rising: np.ndarray
+    ready: np.ndarray
+
+    # final recurrence state (for seeding the sequential engine)
+    state: dict
+
+    def __len__(self):
+        return len(self.ema8)
+
+    def values_at(self, i: int) -> dict:
+        return {
+            "ema8": _opt(self.ema8[i]),
+            "ema20_low": _opt(self.ema20_low[i]),
+            "ema20_high": _opt(self.ema20_high[i]),
+            "rsi_raw": _opt(self.rsi_raw[i]),
+            "rsi_smoothed": _opt(self.rsi_smoothed[i]),
+            "rsi_rising": bool(self.rsi_rising[i]),
+        }
+
+    def to_engine(self) -> IndicatorEnginePineV19:
+        """
+        Sequential engine positioned right after the last candle.
+        """
+        return IndicatorEnginePineV19.from_state(self.state)
+
+
+# =========================
+# Entry points
+# =========================
+
+def compute_v19_from_candles(candles: Sequence[Candle], *, exact: bool = True) -> IndicatorBatchV19:
+    n = len(candles)
+    high = np.fromiter((float(c.high) for c in candles), dtype=np.float64, count=n)
+    low = np.fromiter((float(c.low) for c in candles), dtype=np.float64, count=n)
+    close = np.fromiter((float(c.close) for c in candles), dtype=np.float64, count=n)
+    return compute_v19(high, low, close, exact=exact)
+
+
+def compute_v19(high, low, close, *, exact: bool = True) -> IndicatorBatchV19:
+    """
+    IndicatorEnginePineV19 over whole arrays (oldest first), one pass.
+
+    exact=True  → recurrences (EMA, Wilder RMA, running-sum SMA) run as
+                  tight scalar loops with the engine's exact float ops:
+                  BIT-FOR-BIT identical values, flags and final state.
+                  Everything else (gains/losses, RSI, flags, ready) is
+                  vectorized.
+    exact=False → recurrences as blocked Toeplitz matmuls, SMA as window
+                  sums: faster, values within ~1e-12; flags can differ
+                  on exact ties (e.g. RSI on a flat bar).
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+
+    ema8, ema8_state = _ema(close, EMA8_LEN, exact)
+    ema20_low_raw, low_state = _ema(low, EMA20_LEN, exact)
+    ema20_high_raw, high_state = _ema(high, EMA20_LEN, exact)
+
+    ema20_low, low_smooth_state = _sma(ema20_low_raw, EMA20_SMOOTH_LEN, exact)
+    ema20_high, high_smooth_state = _sma(ema20_high_raw, EMA20_SMOOTH_LEN, exact)
+
+    rsi_raw, rsi_state = _rsi_raw(close, RSI_LEN, exact)
+    rsi_smoothed, rsi_smooth_state = _sma(rsi_raw, RSI_SMOOTH_LEN, exact)
+
+    rsi_rising = np.zeros(len(close), dtype=bool)
+    with np.errstate(invalid="ignore"):
+        rsi_rising[1:] = rsi_raw[1:] > rsi_raw[:-1]    # NaN → False
+
+    ready = (
+        ~np.isnan(ema8)
+        & ~np.isnan(ema20_low)
+        & ~np.isnan(ema20_high)
+        & ~np.isnan(rsi_raw)
+        & ~np.isnan(rsi_smoothed)
+    )
+
+    # -----------------------------
+    # Final state (IndicatorEnginePineV19.get_state() layout)
+    # -----------------------------
+    n = len(close)
+    rsi_state["sma_buf"] = rsi_smooth_state["buf"]
+    rsi_state["sma_total"] = rsi_smooth_state["total"]
+    rsi_state["sma_since_resync"] = rsi_smooth_state["since_resync"]
+    rsi_state["rsi_smoothed"] = _opt(rsi_smoothed[-1]) if n else None
+    rsi_state["prev_rsi_raw"] = _opt(rsi_raw[-2]) if n >= 2 else None
+
+    batch = IndicatorBatchV19(
+        ema8=ema8,
+        ema20_low=ema20_low,
+        ema20_high=ema20_high,
+        rsi_raw=rsi_raw,
+        rsi_smoothed=rsi_smoothed,
+        rsi_rising=rsi_rising,
+        ready=ready,
+        state={},
+    )
+
+    batch.state = {
+        "version": IndicatorEnginePineV19.STATE_VERSION,
+        "ema8": ema8_state,
+        "ema20_low_raw": low_state,
+        "ema20_high_raw": high_state,
+        "ema20_low_smooth": low_smooth_state,
+        "ema20_high_smooth": high_smooth_state,
+        "rsi": rsi_state,
+        "prev_rsi_raw": _opt(rsi_raw[-1]) if n else None,
+        "values": batch.values_at(n - 1) if n else {},
+        "ready": bool(ready[-1]) if n else False,
+        "last_red_low": None,       # LIVE ONLY (never set by warmup)
+    }
+    return batch
+
+
+# =========================
+# Primitives
+# =========================
+
+def _ema(x: np.ndarray, length: int, exact: bool):
+    """
+    Pine EMA: na for the first length-1 bars, seeded with SMA(length).
+    """
+    n = len(x)
+    out = np.full(n, np.nan)
+
+    if n < length:
+        return out, {"value": None, "buf": x.tolist()}
+
+    # seed exactly like the sequential engine (Python sum, left→right)
+    seed = sum(x[:length].tolist()) / length
+    out[length - 1] = seed
+
+    alpha = 2 / (length + 1)
+    if exact:
+        out[length:] = _ema_exact(x[length:].tolist(), alpha, seed)
+    else:
+        out[length:] = _linear_recurrence(x[length:], alpha, 1 - alpha, seed)
+
+    return out, {"value": float(out[-1]), "buf": []}
+
+
+def _sma(x: np.ndarray, length: int, exact: bool):
+    """
+    SMA over the non-na tail of `x` (na until `length` values exist).
+    """
+    n = len(x)
+    out = np.full(n, np.nan)
+
+    valid = np.flatnonzero(~np.isnan(x))
+    if not len(valid):
+        return out, {"buf": [], "total": 0.0, "since_resync": 0}
+
+    first = valid[0]
+    tail = x[first:]
+
+    if exact:
+        means, total, since = _sma_exact(tail.tolist(), length)
+        if len(tail) >= length:
+            out[first + length - 1:] = means
+    else:
+        if len(tail) >= length:
+            windows = np.lib.stride_tricks.sliding_window_view(tail, length)
+            out[first + length - 1:] = windows.sum(axis=1) / length
+        total = float(tail[-length:].sum())
+        since = max(0, len(tail) - length + 1) % RESYNC_EVERY
+
+    return out, {"buf": tail[-length:].tolist(), "total": total, "since_resync": since}
+
+
+def _rsi_raw(close: np.ndarray, length: int, exact: bool):
+    """
+    ta.rsi(close, length) with Wilder RMA seeded by SMA of gains/losses.
+    """
+    n = len(close)
+    out = np.full(n, np.nan)
+
+    state = {
+        "prev_close": float(close[-1]) if n else None,
+        "avg_gain": None,
+        "avg_loss": None,
+        "rsi_raw": None,
+        "prev_rsi_raw": None,
+        "init_gains": [],
+        "init_losses": [],
+    }
+
+    if n < 2:
+        return out, state
+
+    delta = np.diff(close)
+    gain = np.maximum(delta, 0.0)
+    loss = np.maximum(-delta, 0.0)
+
+    if len(delta) < length:
+        state["init_gains"] = gain.tolist()
+        state["init_losses"] = loss.tolist()
+        return out, state
+
+    g0 = sum(gain[:length].tolist()) / length
+    l0 = sum(loss[:length].tolist()) / length
+
+    avg_gain = np.empty(len(delta) - length + 1)
+    avg_loss = np.empty(len(delta) - length + 1)
+    avg_gain[0], avg_loss[0] = g0, l0
+
+    if exact:
+        avg_gain[1:] = _wilder_exact(gain[length:].tolist(), length, g0)
+        avg_loss[1:] = _wilder_exact(loss[length:].tolist(), length, l0)
+    else:
+        k = 1.0 / length
+        avg_gain[1:] = _linear_recurrence(gain[length:], k, 1 - k, g0)
+        avg_loss[1:] = _linear_recurrence(loss[length:], k, 1 - k, l0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(
+            avg_loss == 0,
+            100.0,
+            100.0 - (100.0 / (1.0 + avg_gain / avg_loss)),
+        )
+
+    out[length:] = rsi
+
+    state["avg_gain"] = float(avg_gain[-1])
+    state["avg_loss"] = float(avg_loss[-1])
+    state["rsi_raw"] = float(rsi[-1])
+    return out, state
+
+
+# -------------------------
+# Exact scalar recurrences (same float ops as the sequential primitives)
+# -------------------------
+
+def _ema_exact(xs: List[float], alpha: float, y: float) -> List[float]:
+    out = [0.0] * len(xs)
+    for i, p in enumerate(xs):
+        y = alpha * p + (1 - alpha) * y
+        out[i] = y
+    return out
+
+
+def _wilder_exact(xs: List[float], length: int, y: float) -> List[float]:
+    out = [0.0] * len(xs)
+    m = length - 1
+    for i, g in enumerate(xs):
+        y = ((y * m) + g) / length
+        out[i] = y
+    return out
+
+
+def _sma_exact(xs: List[float], length: int):
+    """
+    Mirrors SMA.update (running sum + RESYNC_EVERY re-sum).
+    Returns (means from the first full window, total, since_resync).
+    """
+    buf = deque(maxlen=length)
+    total = 0.0
+    since = 0
+    means: List[float] = []
+
+    for v in xs:
+        if len(buf) == length:
+            total += v - buf[0]
+        else:
+            total += v
+        buf.append(v)
+
+        if len(buf) < length:
+            continue
+
+        since += 1
+        if since >= RESYNC_EVERY:
+            total = sum(buf)
+            since = 0
+        means.append(total / length)
+
+    return means, total, since
+
+
+# -------------------------
+# Blocked recurrence (exact=False)
+# -------------------------
+
+def _linear_recurrence(x: np.ndarray, a: float, d: float, y0: float) -> np.ndarray:
+    """
+    y[t] = a * x[t] + d * y[t-1], y[-1] = y0   (EMA / Wilder RMA)
+
+    Blocked: inside a block of B bars the recurrence is a lower-
+    triangular Toeplitz matmul; only the block carry is sequential.
+    """
+    n = len(x)
+    if n == 0:
+        return np.empty(0)
+
+    B = min(_BLOCK, n)
+    nb = -(-n // B)
+
+    xb = np.zeros(nb * B)
+    xb[:n] = x
+    xb = xb.reshape(nb, B)
+
+    j = np.arange(B)
+    lag = j[:, None] - j[None, :]
+    L = np.where(lag >= 0, a * d ** np.maximum(lag, 0), 0.0)
+    powers = d ** (j + 1)
+
+    z = xb @ L.T
+
+    y = np.empty_like(z)
+    carry = y0
+    for b in range(nb):
+        y[b] = z[b] + powers * carry
+        carry = y[b, -1]
+
+    return y.reshape(-1)[:n]
+
+
+def _opt(v) -> Optional[float]:
+    v = float(v)
+    return None if np.isnan(v) else v
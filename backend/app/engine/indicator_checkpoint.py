@@ -0,0 +1,192 @@
+# backend/app/engine/indicator_checkpoint.py
+
+from pathlib import Path
+from typing import List, Optional
+import json
+import os
+import tempfile
+import threading
+import time
+
+from app.event_bus.audit_logger import write_audit_log
+
+
+# Per-token checkpoint cadence (seconds between saves, per token)
+CHECKPOINT_EVERY_SEC = 300
+
+# Checkpoints untouched this long are removed (expired contracts)
+KEEP_DAYS = 7
+
+
+def checkpoint_dir() -> Path:
+    app_home = os.environ.get("SCALP_APP_HOME")
+    base = Path(app_home) if app_home else Path.home() / ".scalp-app"
+    return base / "state" / "indicators"
+
+
+def rows_after_checkpoint(checkpoint: dict, rows: List[dict]) -> Optional[List[dict]]:
+    """
+    Warmup rows (oldest first) the restored state has NOT seen yet.
+
+    None → checkpoint cannot be continued from these rows (the DB has
+    candles newer than the checkpoint but not the checkpoint candle
+    itself, i.e. a gap) → caller must do a full warmup instead.
+    """
+    last_ts = int(checkpoint["last_ts"])
+
+    if not rows or int(rows[-1]["ts"]) <= last_ts:
+        return []
+
+    if int(rows[0]["ts"]) > last_ts:
+        return None
+
+    return [r for r in rows if int(r["ts"]) > last_ts]
+
+
+class IndicatorCheckpointStore:
+    """
+    Per-symbol indicator state on disk (one small JSON file each).
+
+    File layout (v1):
+        {
+          "symbol": ..., "token": ..., "timeframe": "1m",
+          "last_ts": <end_ts of the last candle fed == its market_timeline ts>,
+          "saved_at": <epoch sec>,
+          "state": IndicatorEnginePineV19.get_state()
+        }
+
+    RULES:
+    - writes are atomic (tmp + os.replace) → a crash never leaves a
+      half-written checkpoint
+    - NEVER raises into the caller (restart falls back to full warmup)
+    """
+
+    def __init__(
+        self,
+        base_dir: Optional[Path] = None,
+        every_sec: float = CHECKPOINT_EVERY_SEC,
+        keep_days: int = KEEP_DAYS,
+    ):
+        self.base_dir = base_dir or checkpoint_dir()
+        self.every_sec = every_sec
+        self.keep_days = keep_days
+
+        self._lock = threading.Lock()
+        self._saved_at: dict = {}       # symbol → monotonic of last save
+
+        self.saved = 0
+        self.save_errors = 0
+        self.loaded = 0
+        self.load_errors = 0
+
+        self._prune()
+
+    # -------------------------------------------------
+
+    def path(self, symbol: str, timeframe: str = "1m") -> Path:
+        return self.base_dir / f"{symbol}_{timeframe}.json"
+
+    def due(self, symbol: str) -> bool:
+        last = self._saved_at.get(symbol)
+        return last is None or time.monotonic() - last >= self.every_sec
+
+    def save(
+        self,
+        *,
+        symbol: str,
+        token: int,
+        last_ts: int,
+        state: dict,
+        timeframe: str = "1m",
+    ) -> bool:
+        payload = {
+            "symbol": symbol,
+            "token": int(token),
+            "timeframe": timeframe,
+            "last_ts": int(last_ts),
+            "saved_at": int(time.time()),
+            "state": state,
+        }
+
+        path = self.path(symbol, timeframe)
+        tmp_path = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=str(path.parent),
+                prefix=f".{symbol}_",
+                suffix=".tmp",
+            )
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+            tmp_path = None
+        except Exception as e:
+            with self._lock:
+                self.save_errors += 1
+            write_audit_log(f"[CHECKPOINT][ERROR] save {symbol}: {e}")
+            return False
+        finally:
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except Exception:
+                    pass
+
+        with self._lock:
+            self._saved_at[symbol] = time.monotonic()
+            self.saved += 1
+        return True
+
+    def load(self, symbol: str, timeframe: str = "1m") -> Optional[dict]:
+        path = self.path(symbol, timeframe)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+            if payload.get("timeframe") != timeframe or "state" not in payload:
+                raise ValueError("unexpected layout")
+            int(payload["last_ts"])
+        except Exception as e:
+            with self._lock:
+                self.load_errors += 1
+            write_audit_log(f"[CHECKPOINT][ERROR] load {symbol}: {e}")
+            return None
+
+        with self._lock:
+            self.loaded += 1
+        return payload
+
+    def discard(self, symbol: str, timeframe: str = "1m"):
+        try:
+            self.path(symbol, timeframe).unlink()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            write_audit_log(f"[CHECKPOINT][ERROR] discard {symbol}: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "dir": str(self.base_dir),
+                "every_sec": self.every_sec,
+                "saved": self.saved,
+                "save_errors": self.save_errors,
+                "loaded": self.loaded,
+                "load_errors": self.load_errors,
+            }
+
+    # -------------------------------------------------
+
+    def _prune(self):
+        try:
+            if not self.base_dir.exists():
+                return
+            cutoff = time.time() - self.keep_days * 86400
+            for p in self.base_dir.glob("*.json"):
+                if p.stat().st_mtime < cutoff:
+                    p.unlink()
+        except Exception as e:
+            write_audit_log(f"[CHECKPOINT][ERROR] prune: {e}")
@@ -13,8 +13,20 @@ class IndicatorEnginePineV19:
     """
     Sequential indicator engine.
     Feeds candles one-by-one exactly like TradingView.
+
+    `values` is ONE dict updated in place (no per-candle allocation);
+    use snapshot() for a copy that outlives the next update.
     """
 
+    __slots__ = (
+        "ema8",
+        "ema20_low_raw", "ema20_high_raw",
+        "ema20_low_smooth", "ema20_high_smooth",
+        "rsi_engine", "_prev_rsi_raw",
+        "values", "ready", "_ready_logged",
+        "_last_red_low", "_is_warmup",
+    )
+
     def __init__(self):
         # EMA 8 (close)
         self.ema8 = EMA(8)
@@ -83,9 +95,10 @@ class IndicatorEnginePineV19:
         )
 
         # --- RSI ---
-        rsi_out = self.rsi_engine.update(c)
-        rsi_raw = rsi_out["rsi_raw"]
-        rsi_smoothed = rsi_out["rsi_smoothed"]
+        rsi = self.rsi_engine
+        rsi.step(c)
+        rsi_raw = rsi.rsi_raw
+        rsi_smoothed = rsi.rsi_smoothed
 
         rsi_rising = (
             self._prev_rsi_raw is not None
@@ -94,19 +107,24 @@ class IndicatorEnginePineV19:
         )
         self._prev_rsi_raw = rsi_raw
 
-        # Store latest values
-        self.values = {
-            "ema8": ema8_val,
-            "ema20_low": ema20_low,
-            "ema20_high": ema20_high,
-            "rsi_raw": rsi_raw,
-            "rsi_smoothed": rsi_smoothed,
-            "rsi_rising": rsi_rising,
-        }
+        # Store latest values (in place)
+        values = self.values
+        values["ema8"] = ema8_val
+        values["ema20_low"] = ema20_low
+        values["ema20_high"] = ema20_high
+        values["rsi_raw"] = rsi_raw
+        values["rsi_smoothed"] = rsi_smoothed
+        values["rsi_rising"] = rsi_rising
 
         # 🔒 READY LATCH (once true, always true)
         if not self.ready:
-            self.ready = all(v is not None for v in self.values.values())
+            self.ready = (
+                ema8_val is not None
+                and ema20_low is not None
+                and ema20_high is not None
+                and rsi_raw is not None
+                and rsi_smoothed is not None
+            )
 
         # Indicator ready log (LIVE ONLY, once)
         if self.ready and not self._ready_logged and not self._is_warmup:
@@ -158,6 +176,55 @@ class IndicatorEnginePineV19:
 
         self._is_warmup = False
 
+    # -------------------------------------------------
+    # State (seed from batch / restore)
+    # -------------------------------------------------
+
+    STATE_VERSION = 1
+
+    def get_state(self) -> dict:
+        """
+        Plain-data state (JSON-safe): enough to continue update()
+        exactly where this engine stopped.
+        """
+        return {
+            "version": self.STATE_VERSION,
+            "ema8": self.ema8.get_state(),
+            "ema20_low_raw": self.ema20_low_raw.get_state(),
+            "ema20_high_raw": self.ema20_high_raw.get_state(),
+            "ema20_low_smooth": self.ema20_low_smooth.get_state(),
+            "ema20_high_smooth": self.ema20_high_smooth.get_state(),
+            "rsi": self.rsi_engine.get_state(),
+            "prev_rsi_raw": self._prev_rsi_raw,
+            "values": dict(self.values),
+            "ready": self.ready,
+            "last_red_low": self._last_red_low,
+        }
+
+    def load_state(self, state: dict):
+        if state.get("version") != self.STATE_VERSION:
+            raise ValueError(
+                f"[INDICATOR] state version {state.get('version')} "
+                f"!= {self.STATE_VERSION}"
+            )
+
+        self.ema8.load_state(state["ema8"])
+        self.ema20_low_raw.load_state(state["ema20_low_raw"])
+        self.ema20_high_raw.load_state(state["ema20_high_raw"])
+        self.ema20_low_smooth.load_state(state["ema20_low_smooth"])
+        self.ema20_high_smooth.load_state(state["ema20_high_smooth"])
+        self.rsi_engine.load_state(state["rsi"])
+        self._prev_rsi_raw = state["prev_rsi_raw"]
+        self.values = dict(state["values"])
+        self.ready = bool(state["ready"])
+        self._last_red_low = state.get("last_red_low")
+
+    @classmethod
+    def from_state(cls, state: dict) -> "IndicatorEnginePineV19":
+        engine = cls()
+        engine.load_state(state)
+        return engine
+
     # -------------------------------------------------
 
     def is_ready(self) -> bool:
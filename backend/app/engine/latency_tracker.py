@@ -0,0 +1,242 @@
+# backend/app/engine/latency_tracker.py
+
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional, Tuple
+import json
+import os
+import time
+
+from app.event_bus.audit_logger import write_audit_log
+
+
+# =========================
+# Stages (tick → order)
+# =========================
+
+STAGES = (
+    "tick",             # _on_ticks batch (WS thread)
+    "candle_queue",     # closing tick received → pipeline lane picks candle
+    "indicator",        # IndicatorEnginePineV19.update
+    "condition",        # ConditionEngineV19.evaluate
+    "strategy",         # StrategyEngine.on_candle
+    "route",            # signal_router.route_buy_signal
+    "tick_to_signal",   # closing tick received → router returned
+    "order",            # ZerodhaOrderExecutor.place_buy
+    "tick_to_order",    # closing tick received → place_buy returned
+)
+
+
+# =========================
+# Histogram (HDR-style)
+# =========================
+
+class LatencyHistogram:
+    """
+    Log-linear histogram over MICROSECONDS.
+
+    - exact below 32µs
+    - 16 sub-buckets per power of two above (≈6% precision)
+    - O(1) record, sparse storage
+    """
+
+    __slots__ = ("counts", "count", "total_us", "max_us")
+
+    SUB_BITS = 4
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    def record(self, us: int):
+        if us < 0:
+            us = 0
+
+        shift = us.bit_length() - (self.SUB_BITS + 1)
+        if shift < 0:
+            shift = 0
+        key = (shift << (self.SUB_BITS + 1)) | (us >> shift)
+
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.count += 1
+        self.total_us += us
+        if us > self.max_us:
+            self.max_us = us
+
+    def _upper(self, key: int) -> int:
+        bits = self.SUB_BITS + 1
+        shift = key >> bits
+        mantissa = key & ((1 << bits) - 1)
+        return ((mantissa + 1) << shift) - 1
+
+    def percentile(self, pct: float) -> int:
+        if not self.count:
+            return 0
+
+        target = max(1, int(round(self.count * pct / 100.0)))
+        seen = 0
+        for key in sorted(self.counts):
+            seen += self.counts[key]
+            if seen >= target:
+                return min(self._upper(key), self.max_us)
+
+        return self.max_us
+
+    def summary(self) -> dict:
+        def ms(us):
+            return round(us / 1000.0, 3)
+
+        return {
+            "count": self.count,
+            "mean_ms": ms(self.total_us / self.count) if self.count else 0.0,
+            "p50_ms": ms(self.percentile(50)),
+            "p95_ms": ms(self.percentile(95)),
+            "p99_ms": ms(self.percentile(99)),
+            "max_ms": ms(self.max_us),
+        }
+
+
+# =========================
+# Tracker (singleton)
+# =========================
+
+class LatencyTracker:
+    """
+    Tick-to-order latency instrumentation.
+
+    RULES:
+    - Callers MUST guard with `if LATENCY.enabled:` (zero work when off)
+    - Monotonic clock only (perf_counter_ns)
+    - Never raises into the trading path
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+
+        self._lock = Lock()
+        self._stages: Dict[str, LatencyHistogram] = {}
+        self._per_token: Dict[Tuple[str, int], LatencyHistogram] = {}
+
+        # symbol → perf_counter_ns of the tick that closed its latest candle
+        self._origins: Dict[str, int] = {}
+
+        self.started_at = time.time()
+
+    # -------------------------------------------------
+
+    @staticmethod
+    def now() -> int:
+        return time.perf_counter_ns()
+
+    def record(self, stage: str, start_ns: int, token: Optional[int] = None):
+        """
+        Record `now - start_ns` under `stage` (and per token if given).
+        """
+        try:
+            us = (time.perf_counter_ns() - start_ns) // 1000
+
+            with self._lock:
+                h = self._stages.get(stage)
+                if h is None:
+                    h = self._stages[stage] = LatencyHistogram()
+                h.record(us)
+
+                if token is not None:
+                    key = (stage, int(token))
+                    th = self._per_token.get(key)
+                    if th is None:
+                        th = self._per_token[key] = LatencyHistogram()
+                    th.record(us)
+        except Exception:
+            return
+
+    # -------------------------------------------------
+    # Cross-thread origin (candle → order thread)
+    # -------------------------------------------------
+
+    def mark_origin(self, symbol: str, start_ns: int):
+        self._origins[symbol] = start_ns
+
+    def origin(self, symbol: str) -> Optional[int]:
+        """
+        Consumed once: a later order without a fresh candle gets None
+        (no stale tick_to_order sample, no unbounded map).
+        """
+        return self._origins.pop(symbol, None)
+
+    # -------------------------------------------------
+    # Control / reporting
+    # -------------------------------------------------
+
+    def set_enabled(self, enabled: bool):
+        self.enabled = bool(enabled)
+        write_audit_log(f"[LATENCY] enabled={self.enabled}")
+
+    def reset(self):
+        with self._lock:
+            self._stages = {}
+            self._per_token = {}
+            self._origins = {}
+            self.started_at = time.time()
+
+    def snapshot(self, *, per_token: bool = False) -> dict:
+        with self._lock:
+            out = {
+                "enabled": self.enabled,
+                "since": int(self.started_at),
+                "stages": {
+                    s: self._stages[s].summary()
+                    for s in STAGES
+                    if s in self._stages
+                },
+            }
+
+            if per_token:
+                tokens: Dict[str, dict] = {}
+                for (stage, token), h in self._per_token.items():
+                    tokens.setdefault(str(token), {})[stage] = h.summary()
+                out["tokens"] = tokens
+
+        return out
+
+    def dump_daily(self, log_dir: Optional[Path] = None) -> Optional[Path]:
+        """
+        Write snapshot to logs/latency/latency_<YYYY-MM-DD>.json.
+        """
+        try:
+            base = log_dir or _latency_dir()
+            base.mkdir(parents=True, exist_ok=True)
+
+            path = base / f"latency_{datetime.now().strftime('%Y-%m-%d')}.json"
+            path.write_text(json.dumps(self.snapshot(per_token=True), indent=2))
+
+            write_audit_log(f"[LATENCY] Dumped → {path}")
+            return path
+        except Exception as e:
+            write_audit_log(f"[LATENCY][ERROR] dump failed: {e}")
+            return None
+
+
+def _latency_dir() -> Path:
+    app_home = os.environ.get("SCALP_APP_HOME")
+    base = Path(app_home) if app_home else Path.home() / ".scalp-app"
+    return base / "logs" / "latency"
+
+
+# -------------------------
+# Singleton (OFF unless SCALP_LATENCY=1)
+# -------------------------
+LATENCY = LatencyTracker(
+    enabled=os.environ.get("SCALP_LATENCY", "0") == "1",
+)
+
+
+def latency_daily_dump_job():
+    """
+    Scheduler job: dump today's histograms (no-op when disabled).
+    """
+    if LATENCY.enabled:
+        LATENCY.dump_daily()
@@ -6,7 +6,7 @@ from app.fetcher.zerodha_instruments import (
     load_nifty_weekly_options,
     load_nifty_weekly_universe,
 )
-from app.config.strategy_loader import load_strategy_config
+from app.config.strategy_loader import get_strategy_config
 from app.utils.selection_persistence import save_selection
 from app.event_bus.audit_logger import write_audit_log
 from app.marketdata.zerodha_tick_engine import ZerodhaTickEngine
@@ -28,6 +28,7 @@ TRADE_MODE = "BOTH"
 ATM_RANGE = 800
 STRIKE_STEP = 50
 RECHECK_INTERVAL = 120  # seconds
+UNIVERSE_RECENTER_STRIKES = 2  # re-centre WS universe when ATM drifts this many strikes
 
 
 # =========================
@@ -85,7 +86,7 @@ async def selection_loop(broker_manager: ZerodhaManager):
                 await asyncio.sleep(RECHECK_INTERVAL)
                 continue
 
-            cfg = load_strategy_config()
+            cfg = get_strategy_config()
             premium_cfg = cfg.get("option_premium", {})
 
             # --------------------------------------------------
@@ -190,6 +191,9 @@ async def selection_loop(broker_manager: ZerodhaManager):
                     kite_data=kite_data,
                     instrument_tokens=tokens,
                     timeframe_sec=60,
+                    atm_range=ATM_RANGE,
+                    strike_step=STRIKE_STEP,
+                    recenter_strikes=UNIVERSE_RECENTER_STRIKES,
                 )
                 _WS_ENGINE.start()
 
@@ -237,6 +241,14 @@ async def selection_loop(broker_manager: ZerodhaManager):
                     + ", ".join(o["tradingsymbol"] for o in final)
                 )
 
+            # --------------------------------------------------
+            # 6️⃣ WS MODE TIERS (FULL = selected / traded)
+            # --------------------------------------------------
+            if _WS_ENGINE is not None:
+                _WS_ENGINE.refresh_subscription_modes(
+                    {o["tradingsymbol"] for o in final}
+                )
+
         except Exception as e:
             write_audit_log(f"[ENGINE] ERROR {repr(e)}")
             #_WS_ENGINE = None
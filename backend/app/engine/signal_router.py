@@ -8,7 +8,7 @@ import traceback
 from app.trading.trade_state_manager import TradeStateManager
 from app.event_bus.audit_logger import write_audit_log
 
-from app.config.strategy_loader import load_strategy_config
+from app.config.strategy_loader import get_strategy_config
 from app.risk.max_loss_guard import check_max_loss
 from app.utils.session_utils import is_within_session
 
@@ -108,7 +108,7 @@ class SignalRouter:
         )
 
         key = (symbol, candle_ts)
-        cfg = load_strategy_config()
+        cfg = get_strategy_config()
 
         # -------------------------
         # HARD SAFETY GATES
@@ -270,7 +270,7 @@ class SignalRouter:
         is_ce = symbol.endswith("CE")
         is_pe = symbol.endswith("PE")
 
-        mode = load_strategy_config().get("trade_side_mode", "BOTH")
+        mode = get_strategy_config().get("trade_side_mode", "BOTH")
 
         if mode == "CE" and is_pe:
             return None
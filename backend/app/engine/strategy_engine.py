@@ -132,8 +132,8 @@ class StrategyEngine:
         max_sl = None
 
         try:
-            from app.config.strategy_loader import load_strategy_config
-            cfg = load_strategy_config()
+            from app.config.strategy_loader import get_strategy_config
+            cfg = get_strategy_config()
             min_sl = cfg.get("min_sl_points", min_sl)
             rr = cfg.get("risk_reward_ratio", rr)
             max_sl = cfg.get("max_sl_points")
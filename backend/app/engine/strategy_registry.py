@@ -0,0 +1,243 @@
+# backend/app/engine/strategy_registry.py
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+import threading
+
+from app.engine.condition_engine_v1_9 import V19_RULES, ConditionEngineV19
+from app.engine.indicator_engine_pine_v1_9 import IndicatorEnginePineV19
+from app.engine.strategy_engine import StrategyEngine
+from app.indicators.ema import EMA
+from app.marketdata.candle import Candle
+
+
+# =========================
+# Indicator specs
+# =========================
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """
+    (indicator, params) — the cache key. Two strategies asking for the
+    same spec on the same token share ONE engine.
+    """
+    name: str
+    params: Tuple[Tuple[str, object], ...] = ()
+
+    @classmethod
+    def of(cls, name: str, **params) -> "IndicatorSpec":
+        return cls(name, tuple(sorted(params.items())))
+
+    @property
+    def kwargs(self) -> dict:
+        return dict(self.params)
+
+    def __str__(self):
+        if not self.params:
+            return self.name
+        return f"{self.name}(" + ",".join(f"{k}={v}" for k, v in self.params) + ")"
+
+
+class EmaIndicator:
+    """
+    Single EMA on one candle field. Output key: ema{length} (close)
+    or ema{length}_{source}.
+    """
+
+    __slots__ = ("source", "key", "ema", "values")
+
+    def __init__(self, length: int, source: str = "close"):
+        self.source = source
+        self.key = f"ema{length}" if source == "close" else f"ema{length}_{source}"
+        self.ema = EMA(int(length))
+        self.values: dict = {}
+
+    def update(self, candle: Candle):
+        value = self.ema.update(float(getattr(candle, self.source)))
+        self.values[self.key] = value
+        return self.values if value is not None else None
+
+    def warmup(self, candles: List[Candle], *, use_history: bool = True, history_lookback: int = 200):
+        for candle in candles[-history_lookback:]:
+            self.update(candle)
+
+    def is_ready(self) -> bool:
+        return self.values.get(self.key) is not None
+
+
+# name → factory(**params)
+INDICATOR_FACTORIES: Dict[str, Callable[..., object]] = {
+    "pine_v1_9": IndicatorEnginePineV19,
+    "ema": EmaIndicator,
+}
+
+V19_INDICATORS = IndicatorSpec.of("pine_v1_9")
+
+
+def make_indicator(spec: IndicatorSpec):
+    factory = INDICATOR_FACTORIES.get(spec.name)
+    if factory is None:
+        raise ValueError(f"[STRATEGY] unknown indicator {spec.name}")
+    return factory(**spec.kwargs)
+
+
+# =========================
+# Strategy specs
+# =========================
+
+@dataclass
+class StrategySpec:
+    """
+    One registered strategy.
+
+    - version: tag written with every row it produces
+    - engine: indicator handed to the strategy (SL helper, snapshot)
+    - indicators: extra specs merged into the condition inputs
+    - rules: condition rule set (compiled once, shared by all tokens)
+    - routes: BUY signals go to the order router (else shadow only)
+    """
+    version: str
+    engine: IndicatorSpec = V19_INDICATORS
+    indicators: Tuple[IndicatorSpec, ...] = ()
+    rules: dict = field(default_factory=lambda: V19_RULES)
+    routes: bool = False
+    strategy_factory: Callable[..., StrategyEngine] = StrategyEngine
+
+    conditions: Optional[ConditionEngineV19] = field(default=None, repr=False)
+
+    @property
+    def all_indicators(self) -> Tuple[IndicatorSpec, ...]:
+        return (self.engine,) + tuple(s for s in self.indicators if s != self.engine)
+
+
+class StrategyRegistry:
+    """
+    Strategies that run on EVERY token, in registration order.
+    The FIRST one is primary: it owns market_timeline rows, the
+    checkpointed indicator engine and (by default) order routing.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._specs: Dict[str, StrategySpec] = {}
+
+    def register(self, spec: StrategySpec) -> StrategySpec:
+        if spec.engine.name != "pine_v1_9":
+            raise ValueError(f"[STRATEGY] {spec.version}: engine must be pine_v1_9")
+        for s in spec.all_indicators:
+            if s.name not in INDICATOR_FACTORIES:
+                raise ValueError(f"[STRATEGY] {spec.version}: unknown indicator {s.name}")
+
+        spec.conditions = ConditionEngineV19(spec.rules)
+
+        with self._lock:
+            if spec.version in self._specs:
+                raise ValueError(f"[STRATEGY] {spec.version} already registered")
+            self._specs[spec.version] = spec
+        return spec
+
+    def unregister(self, version: str) -> bool:
+        with self._lock:
+            if self._specs and next(iter(self._specs)) == version:
+                raise ValueError("[STRATEGY] primary strategy cannot be removed")
+            return self._specs.pop(version, None) is not None
+
+    def specs(self) -> List[StrategySpec]:
+        with self._lock:
+            return list(self._specs.values())
+
+    @property
+    def primary(self) -> StrategySpec:
+        with self._lock:
+            return next(iter(self._specs.values()))
+
+    def indicator_specs(self) -> List[IndicatorSpec]:
+        """
+        Unique specs across all strategies (primary engine first).
+        """
+        out: List[IndicatorSpec] = []
+        for spec in self.specs():
+            for s in spec.all_indicators:
+                if s not in out:
+                    out.append(s)
+        return out
+
+    def describe(self) -> List[dict]:
+        return [
+            {
+                "version": s.version,
+                "primary": i == 0,
+                "routes": s.routes,
+                "indicators": [str(x) for x in s.all_indicators],
+                "conditions": list(s.conditions.keys),
+            }
+            for i, s in enumerate(self.specs())
+        ]
+
+
+# =========================
+# Per-token indicator cache
+# =========================
+
+class IndicatorCache:
+    """
+    ONE engine per unique IndicatorSpec for ONE token.
+
+    RULES:
+    - update(candle) runs every engine exactly once per candle,
+      however many strategies read it (repeat calls are no-ops)
+    - engine(spec).values is the live dict (valid until next update)
+    - runs on the token's pipeline lane only (no locking)
+    """
+
+    __slots__ = ("engines", "_ts", "updates", "reuses")
+
+    def __init__(self, specs: List[IndicatorSpec], *, engines: Optional[dict] = None):
+        # `engines`: pre-built ones to adopt (e.g. the checkpointed engine)
+        engines = engines or {}
+        self.engines: Dict[IndicatorSpec, object] = {
+            spec: engines.get(spec) or make_indicator(spec)
+            for spec in specs
+        }
+        self._ts: Optional[int] = None
+        self.updates = 0
+        self.reuses = 0
+
+    def update(self, candle: Candle):
+        if candle.start_ts == self._ts:
+            self.reuses += 1
+            return
+        for engine in self.engines.values():
+            engine.update(candle)
+        self._ts = candle.start_ts
+        self.updates += 1
+
+    def engine(self, spec: IndicatorSpec):
+        return self.engines[spec]
+
+    def is_ready(self, specs) -> bool:
+        return all(self.engines[s].is_ready() for s in specs)
+
+    def inputs(self, strategy: StrategySpec) -> dict:
+        """
+        Condition inputs for `strategy`: its engine's values, plus extra
+        indicator outputs merged in (copy only when there are extras).
+        """
+        values = self.engines[strategy.engine].values
+        if not strategy.indicators:
+            return values
+        merged = dict(values)
+        for s in strategy.indicators:
+            merged.update(self.engines[s].values)
+        return merged
+
+    def warmup(self, candles: List[Candle], *, skip=(), history_lookback: int = 200):
+        for spec, engine in self.engines.items():
+            if spec in skip:
+                continue
+            engine.warmup(candles, use_history=True, history_lookback=history_lookback)
+
+
+# ONE registry per process (V1.9 = primary, routed)
+strategy_registry = StrategyRegistry()
+strategy_registry.register(StrategySpec(version="V1.9", routes=True))
@@ -1,18 +1,17 @@
+from collections import deque
 from pathlib import Path
-from datetime import datetime
-import pytz
+from typing import Deque, Optional
+import atexit
 import os
 import threading
+import time
 
 # --------------------------------------------------
 # TIMEZONE
 # --------------------------------------------------
+# IST is a fixed +05:30 (no DST) → epoch + offset, no tz lookups per line
 
-IST = pytz.timezone("Asia/Kolkata")
-
-
-def _now():
-    return datetime.now(IST)
+IST_OFFSET_SEC = 5 * 3600 + 30 * 60
 
 
 # --------------------------------------------------
@@ -40,38 +39,340 @@ LOG_DIR.mkdir(parents=True, exist_ok=True)
 
 
 # --------------------------------------------------
-# LOG FILE (DAILY ROTATION)
+# LEVELS / FSYNC POLICY
 # --------------------------------------------------
+# Level comes from the message tags ("[ROUTER][DEBUG] ..." → DEBUG,
+# "[WS][WARN]" → WARN, "[ERROR]" / "[FATAL]" / "[CRITICAL]" → ERROR),
+# so call sites stay unchanged. SCALP_AUDIT_LEVEL=INFO drops DEBUG.
+
+DEBUG = 10
+INFO = 20
+WARN = 30
+ERROR = 40
+
+LEVELS = {"DEBUG": DEBUG, "INFO": INFO, "WARN": WARN, "ERROR": ERROR}
 
-def _log_file() -> Path:
-    today = _now().strftime("%Y-%m-%d")
-    return LOG_DIR / f"{today}.log"
+# Trade-critical lines: written + fsync'ed without waiting for a batch
+CRITICAL_PREFIXES = (
+    "[ZERODHA-BUY-PLACED]",
+    "[ZERODHA-GTT-PLACED]",
+    "[ORDER",
+    "[PAPER][ENTRY]",
+    "[PAPER][EXIT",
+    "[EOD][PAPER]",
+    "[RECON]",
+    "[SAFETY]",
+)
+
+# "critical" → fsync batches holding a critical / FATAL line
+# "always"   → fsync every batch
+# "never"    → OS decides
+FSYNC_POLICIES = ("critical", "always", "never")
+
+MAX_QUEUE = 100_000         # pending lines; beyond this non-critical lines drop
+FLUSH_BATCH = 256           # writer wakes as soon as this many are pending
+FLUSH_INTERVAL_SEC = 0.2    # ... and at least this often
+
+
+def classify(message: str):
+    """
+    (level, critical) from the leading tags. Cheap: looks at ~48 chars.
+    """
+    head = message[:48]
+
+    if "[DEBUG]" in head or head.startswith("[TRACE]"):
+        level = DEBUG
+    elif "[FATAL]" in head or "[CRITICAL]" in head:
+        return ERROR, True
+    elif "[ERROR]" in head:
+        level = ERROR
+    elif "[WARN]" in head:
+        level = WARN
+    else:
+        level = INFO
+
+    return level, head.startswith(CRITICAL_PREFIXES)
 
 
 # --------------------------------------------------
-# INTERNAL WRITE LOCK (THREAD SAFE)
+# WRITER (ONE THREAD, ONE HANDLE)
 # --------------------------------------------------
 
-_LOG_LOCK = threading.Lock()
+class AuditLogWriter:
+    """
+    Queue-backed audit log writer.
+
+    RULES:
+    - write() never does file IO and NEVER raises
+    - ONE long-lived append handle, re-opened on IST day change
+    - batches flushed on size (FLUSH_BATCH) or interval
+    - ERROR / critical lines wake the writer immediately; critical
+      batches are fsync'ed (FSYNC policy)
+    - queue full → non-critical lines dropped + counted
+    - after shutdown (atexit): direct synchronous append, so late lines
+      from other exit hooks are not lost
+    """
+
+    def __init__(
+        self,
+        log_dir: Path = None,
+        *,
+        level: Optional[int] = None,
+        fsync: Optional[str] = None,
+        max_queue: int = MAX_QUEUE,
+        flush_interval: float = FLUSH_INTERVAL_SEC,
+    ):
+        self.log_dir = Path(log_dir) if log_dir is not None else LOG_DIR
+        self.level = (
+            level
+            if level is not None
+            else LEVELS.get(os.environ.get("SCALP_AUDIT_LEVEL", "DEBUG").upper(), DEBUG)
+        )
+        fsync = (fsync or os.environ.get("SCALP_AUDIT_FSYNC", "critical")).lower()
+        self.fsync = fsync if fsync in FSYNC_POLICIES else "critical"
+        self.max_queue = max_queue
+        self.flush_interval = flush_interval
+
+        self._q: Deque[tuple] = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._wake = False
+        self._writing = False
+        self._stopped = False
+        self._atexit = False
+
+        self._fh = None
+        self._fh_day: Optional[str] = None
+
+        self.written = 0
+        self.dropped = 0
+        self.filtered = 0
+        self.fsyncs = 0
+        self.batches = 0
+        self.errors = 0
+        self.max_depth = 0
+
+    # -------------------------------------------------
+    # Producer side
+    # -------------------------------------------------
+
+    def write(self, message: str, level: Optional[int] = None, critical: Optional[bool] = None):
+        try:
+            lvl, crit = classify(message)
+            if level is not None:
+                lvl = level
+            if critical is not None:
+                crit = critical
+
+            if lvl < self.level and not crit:
+                self.filtered += 1
+                return
+
+            rec = (time.time(), message, crit)
+
+            with self._cond:
+                if self._stopped:
+                    self._write_direct(rec)
+                    return
+
+                depth = len(self._q)
+                if depth >= self.max_queue and not crit:
+                    self.dropped += 1
+                    return
+
+                self._q.append(rec)
+                if depth >= self.max_depth:
+                    self.max_depth = depth + 1
+
+                if self._thread is None:
+                    self._start()
+                elif crit or lvl >= ERROR or depth + 1 >= FLUSH_BATCH:
+                    self._wake = True
+                    self._cond.notify()
+
+        except Exception as e:
+            # LAST RESORT: never crash the app due to logging
+            print(f"[LOGGER_ERROR] {e} :: {message}")
+
+    # -------------------------------------------------
+    # Control
+    # -------------------------------------------------
+
+    def set_level(self, level: int):
+        self.level = int(level)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Block until every queued line has been written (or timeout).
+        """
+        with self._cond:
+            if self._thread is None:
+                return not self._q
+            self._wake = True
+            self._cond.notify_all()
+            return self._cond.wait_for(
+                lambda: not self._q and not self._writing,
+                timeout=timeout,
+            )
+
+    def shutdown(self, timeout: float = 5.0) -> bool:
+        done = self.flush(timeout)
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        with self._cond:
+            self._close()
+        return done
+
+    def stats(self) -> dict:
+        with self._cond:
+            depth = len(self._q)
+        return {
+            "level": {v: k for k, v in LEVELS.items()}.get(self.level, self.level),
+            "fsync": self.fsync,
+            "queue_depth": depth,
+            "max_queue_depth": self.max_depth,
+            "written": self.written,
+            "dropped": self.dropped,
+            "filtered": self.filtered,
+            "batches": self.batches,
+            "fsyncs": self.fsyncs,
+            "errors": self.errors,
+        }
+
+    # -------------------------------------------------
+    # Writer thread
+    # -------------------------------------------------
+
+    def _start(self):
+        self._thread = threading.Thread(
+            target=self._run,
+            name="audit-log-writer",
+            daemon=True,
+        )
+        self._thread.start()
+        if not self._atexit:
+            atexit.register(self.shutdown, 2.0)
+            self._atexit = True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._stopped or self._wake or len(self._q) >= FLUSH_BATCH,
+                    timeout=self.flush_interval,
+                )
+                self._wake = False
+                if not self._q:
+                    self._cond.notify_all()
+                    if self._stopped:
+                        self._thread = None
+                        return
+                    continue
+                batch, self._q = self._q, deque()
+                self._writing = True
+
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                self.errors += 1
+                print(f"[LOGGER_ERROR] {e} :: {len(batch)} lines")
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
+    def _write_batch(self, batch: Deque[tuple]):
+        day = None
+        lines = []
+        critical = False
+
+        for t, message, crit in batch:
+            day_t, line = _format(t, message)
+            if day_t != day:
+                if lines:
+                    self._emit(day, lines, critical)
+                    lines, critical = [], False
+                day = day_t
+            lines.append(line)
+            critical = critical or crit
+
+        if lines:
+            self._emit(day, lines, critical)
+
+    def _emit(self, day: str, lines: list, critical: bool):
+        try:
+            if day != self._fh_day:
+                self._open(day)
+            fh = self._fh
+            fh.write("".join(lines))
+            fh.flush()
+            if self.fsync == "always" or (critical and self.fsync == "critical"):
+                os.fsync(fh.fileno())
+                self.fsyncs += 1
+            self.written += len(lines)
+            self.batches += 1
+        except Exception as e:
+            self.errors += 1
+            self._close()
+            print(f"[LOGGER_ERROR] {e} :: {len(lines)} lines")
+
+    def _write_direct(self, rec: tuple):
+        t, message, crit = rec
+        day, line = _format(t, message)
+        try:
+            with (self.log_dir / f"{day}.log").open("a", encoding="utf-8") as f:
+                f.write(line)
+                if crit and self.fsync != "never":
+                    f.flush()
+                    os.fsync(f.fileno())
+            self.written += 1
+        except Exception as e:
+            print(f"[LOGGER_ERROR] {e} :: {line}")
+
+    def _open(self, day: str):
+        self._close()
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self._fh = (self.log_dir / f"{day}.log").open("a", encoding="utf-8")
+        self._fh_day = day
+
+    def _close(self):
+        fh, self._fh = self._fh, None
+        self._fh_day = None
+        if fh is not None:
+            try:
+                fh.close()
+            except Exception:
+                pass
+
+
+def _format(t: float, message: str):
+    ist = time.gmtime(t + IST_OFFSET_SEC)
+    return (
+        time.strftime("%Y-%m-%d", ist),
+        f"[{time.strftime('%H:%M:%S', ist)}] {message}\n",
+    )
+
+
+# ONE writer per process
+audit_log = AuditLogWriter()
 
 
 # --------------------------------------------------
 # PUBLIC API
 # --------------------------------------------------
 
-def write_audit_log(message: str):
+def write_audit_log(message: str, *, level: Optional[int] = None, critical: Optional[bool] = None):
     """
     Append a single line to today's audit log.
     Safe for multi-thread + multi-engine usage.
     Never allowed to crash caller.
-    """
-    ts = _now().strftime("%H:%M:%S")
-    line = f"[{ts}] {message}\n"
 
-    try:
-        with _LOG_LOCK:
-            with _log_file().open("a", encoding="utf-8") as f:
-                f.write(line)
-    except Exception as e:
-        # LAST RESORT: never crash the app due to logging
-        print(f"[LOGGER_ERROR] {e} :: {line}")
+    Queued: the line reaches the file within FLUSH_INTERVAL_SEC
+    (critical lines immediately, fsync'ed). level / critical override
+    what the message tags imply.
+    """
+    audit_log.write(message, level, critical)
@@ -5,10 +5,11 @@ from kiteconnect import KiteConnect
 
 from app.execution.base_executor import BaseOrderExecutor
 from app.config.trading_config import MAX_QTY_PER_ORDER
-from app.config.strategy_loader import load_strategy_config
+from app.config.strategy_loader import get_strategy_config
 from app.brokers.zerodha_manager import ZerodhaManager
 from app.marketdata.ltp_store import LTPStore
 from app.event_bus.audit_logger import write_audit_log
+from app.engine.latency_tracker import LATENCY
 
 
 class TradingDisabledError(RuntimeError):
@@ -45,7 +46,7 @@ class ZerodhaOrderExecutor(BaseOrderExecutor):
         return self.broker_manager.get_trade_kite()
 
     def _ensure_trading_enabled(self):
-        cfg = load_strategy_config()
+        cfg = get_strategy_config()
         if not cfg.get("trade_on", False):
             raise TradingDisabledError("TRADING_DISABLED (executor gate)")
 
@@ -84,6 +85,24 @@ class ZerodhaOrderExecutor(BaseOrderExecutor):
         symbol: str,
         token: int,
         qty: int,
+    ):
+        if not LATENCY.enabled:
+            return self._place_buy(symbol, token, qty)
+
+        t0 = LATENCY.now()
+        try:
+            return self._place_buy(symbol, token, qty)
+        finally:
+            LATENCY.record("order", t0, token)
+            origin = LATENCY.origin(symbol)
+            if origin:
+                LATENCY.record("tick_to_order", origin, token)
+
+    def _place_buy(
+        self,
+        symbol: str,
+        token: int,
+        qty: int,
     ):
         self._ensure_trading_enabled()
 
@@ -1,7 +1,14 @@
 from collections import deque
 
 
+# Running sums are re-summed from the window this often
+# (bounds float drift vs Pine's fresh sum over `length` values)
+RESYNC_EVERY = 256
+
+
 class EMA:
+    __slots__ = ("length", "alpha", "value", "_buf")
+
     def __init__(self, length: int):
         self.length = length
         self.alpha = 2 / (length + 1)
@@ -19,20 +26,61 @@ class EMA:
 
             # First EMA seed = SMA(length)
             self.value = sum(self._buf) / self.length
+            self._buf.clear()   # never read again
             return self.value
 
         # Normal EMA update
         self.value = self.alpha * price + (1 - self.alpha) * self.value
         return self.value
 
+    def get_state(self) -> dict:
+        return {"value": self.value, "buf": list(self._buf)}
+
+    def load_state(self, state: dict):
+        self.value = state["value"]
+        self._buf = deque(state["buf"], maxlen=self.length)
+
 
 class SMA:
+    """
+    O(1) rolling mean: running sum, re-summed every RESYNC_EVERY updates.
+    """
+
+    __slots__ = ("length", "buf", "total", "_since_resync")
+
     def __init__(self, length: int):
         self.length = length
         self.buf = deque(maxlen=length)
+        self.total = 0.0
+        self._since_resync = 0
 
     def update(self, value: float):
-        self.buf.append(value)
-        if len(self.buf) < self.length:
+        buf = self.buf
+
+        if len(buf) == self.length:
+            self.total += value - buf[0]
+        else:
+            self.total += value
+        buf.append(value)
+
+        if len(buf) < self.length:
             return None
-        return sum(self.buf) / self.length
+
+        self._since_resync += 1
+        if self._since_resync >= RESYNC_EVERY:
+            self.total = sum(buf)
+            self._since_resync = 0
+
+        return self.total / self.length
+
+    def get_state(self) -> dict:
+        return {
+            "buf": list(self.buf),
+            "total": self.total,
+            "since_resync": self._since_resync,
+        }
+
+    def load_state(self, state: dict):
+        self.buf = deque(state["buf"], maxlen=self.length)
+        self.total = state.get("total", float(sum(self.buf)))
+        self._since_resync = state.get("since_resync", 0)
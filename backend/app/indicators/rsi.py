@@ -1,6 +1,8 @@
 from collections import deque
 from typing import Optional
 
+from app.indicators.ema import RESYNC_EVERY
+
 
 class RSIEnginePine:
     """
@@ -10,8 +12,18 @@ class RSIEnginePine:
     - ta.rsi() using Wilder RMA
     - Optional SMA smoothing
     - rsiRaw > rsiRaw[1] logic
+
+    step() updates state only (no dict); update() = step() + snapshot.
     """
 
+    __slots__ = (
+        "rsi_length", "smooth_length",
+        "prev_close", "avg_gain", "avg_loss",
+        "rsi_raw", "prev_rsi_raw",
+        "rsi_sma_buf", "rsi_sma_total", "_since_resync", "rsi_smoothed",
+        "_init_gains", "_init_losses",
+    )
+
     def __init__(
         self,
         rsi_length: int = 5,
@@ -31,8 +43,10 @@ class RSIEnginePine:
         self.rsi_raw: Optional[float] = None
         self.prev_rsi_raw: Optional[float] = None
 
-        # Smoothing buffer (SMA of RSI)
+        # Smoothing buffer (SMA of RSI, running sum)
         self.rsi_sma_buf = deque(maxlen=smooth_length)
+        self.rsi_sma_total = 0.0
+        self._since_resync = 0
         self.rsi_smoothed: Optional[float] = None
 
         # Warm-up counters
@@ -48,10 +62,17 @@ class RSIEnginePine:
         Call once per completed candle.
         Returns dict with RSI values & flags.
         """
+        ready = self.step(close)
+        return self._snapshot(ready=ready)
+
+    def step(self, close: float) -> bool:
+        """
+        Call once per completed candle. Returns readiness.
+        """
 
         if self.prev_close is None:
             self.prev_close = close
-            return self._snapshot(ready=False)
+            return False
 
         # Price change
         delta = close - self.prev_close
@@ -68,11 +89,13 @@ class RSIEnginePine:
             self._init_losses.append(loss)
 
             if len(self._init_gains) < self.rsi_length:
-                return self._snapshot(ready=False)
+                return False
 
             # First Wilder seed = SMA of gains/losses
             self.avg_gain = sum(self._init_gains) / self.rsi_length
             self.avg_loss = sum(self._init_losses) / self.rsi_length
+            self._init_gains = []
+            self._init_losses = []
 
         else:
             # --------------------------------------------------
@@ -100,12 +123,54 @@ class RSIEnginePine:
         # --------------------------------------------------
         # RSI SMOOTHED (SMA of RSI Raw)
         # --------------------------------------------------
-        self.rsi_sma_buf.append(self.rsi_raw)
+        buf = self.rsi_sma_buf
+
+        if len(buf) == self.smooth_length:
+            self.rsi_sma_total += self.rsi_raw - buf[0]
+        else:
+            self.rsi_sma_total += self.rsi_raw
+        buf.append(self.rsi_raw)
+
+        if len(buf) == self.smooth_length:
+            self._since_resync += 1
+            if self._since_resync >= RESYNC_EVERY:
+                self.rsi_sma_total = sum(buf)
+                self._since_resync = 0
+            self.rsi_smoothed = self.rsi_sma_total / self.smooth_length
 
-        if len(self.rsi_sma_buf) == self.smooth_length:
-            self.rsi_smoothed = sum(self.rsi_sma_buf) / self.smooth_length
+        return self.is_ready()
+
+    # --------------------------------------------------
+    # State (seed / restore)
+    # --------------------------------------------------
+
+    def get_state(self) -> dict:
+        return {
+            "prev_close": self.prev_close,
+            "avg_gain": self.avg_gain,
+            "avg_loss": self.avg_loss,
+            "rsi_raw": self.rsi_raw,
+            "prev_rsi_raw": self.prev_rsi_raw,
+            "sma_buf": list(self.rsi_sma_buf),
+            "sma_total": self.rsi_sma_total,
+            "sma_since_resync": self._since_resync,
+            "rsi_smoothed": self.rsi_smoothed,
+            "init_gains": list(self._init_gains),
+            "init_losses": list(self._init_losses),
+        }
 
-        return self._snapshot(ready=self.is_ready())
+    def load_state(self, state: dict):
+        self.prev_close = state["prev_close"]
+        self.avg_gain = state["avg_gain"]
+        self.avg_loss = state["avg_loss"]
+        self.rsi_raw = state["rsi_raw"]
+        self.prev_rsi_raw = state["prev_rsi_raw"]
+        self.rsi_sma_buf = deque(state["sma_buf"], maxlen=self.smooth_length)
+        self.rsi_sma_total = state.get("sma_total", float(sum(self.rsi_sma_buf)))
+        self._since_resync = state.get("sma_since_resync", 0)
+        self.rsi_smoothed = state["rsi_smoothed"]
+        self._init_gains = list(state["init_gains"])
+        self._init_losses = list(state["init_losses"])
 
     # --------------------------------------------------
     # Helpers
@@ -52,6 +52,11 @@ class MarketIndicesState:
     # Read APIs (UI SAFE)
     # -------------------------
 
+    @classmethod
+    def get_ltp(cls, index: str) -> Optional[float]:
+        with cls._lock:
+            return cls._ltp.get(index)
+
     @classmethod
     def snapshot(cls) -> Dict[str, dict]:
         out = {}
@@ -0,0 +1,175 @@
+# backend/app/marketdata/subscription_manager.py
+
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Set
+import time
+
+from app.event_bus.audit_logger import write_audit_log
+
+
+MODE_LTP = "ltp"
+MODE_QUOTE = "quote"
+MODE_FULL = "full"
+
+# Kite binary packet sizes (bytes, per tick) — used for bandwidth estimates
+MODE_BYTES = {
+    MODE_LTP: 8,
+    MODE_QUOTE: 44,
+    MODE_FULL: 184,
+}
+
+
+class SubscriptionManager:
+    """
+    Per-token WebSocket mode assignment.
+
+    Tiers:
+      FULL   → selected / traded symbols (need exchange_timestamp)
+      QUOTE  → near-ATM band (|strike - ATM| <= near_atm_strikes * step)
+      LTP    → far wings + indices (engine only reads last_price)
+
+    NOTE:
+    - LTP / QUOTE packets carry NO exchange_timestamp; the tick engine
+      buckets those tokens on receive time + measured exchange clock
+      skew (FULL tokens: exchange_timestamp). Strategies still run on
+      every tier; only selected / traded symbols need the exact clock.
+    - Only CHANGED tokens are sent to set_mode().
+    """
+
+    def __init__(
+        self,
+        *,
+        strike_step: int = 50,
+        near_atm_strikes: int = 4,
+    ):
+        self.strike_step = strike_step
+        self.near_atm_strikes = near_atm_strikes
+
+        self._lock = Lock()
+        self._modes: Dict[int, str] = {}
+
+        self._ticks = {m: 0 for m in MODE_BYTES}
+        self._bytes = {m: 0 for m in MODE_BYTES}
+        self._changes = 0
+        self._since = time.time()
+
+    # -------------------------------------------------
+    # Planning
+    # -------------------------------------------------
+
+    def plan(
+        self,
+        *,
+        token_strikes: Dict[int, float],
+        focus_tokens: Set[int],
+        index_tokens: Iterable[int],
+        atm: Optional[float],
+    ) -> Dict[int, str]:
+        """
+        Desired mode per token (pure — no side effects).
+        """
+        band = self.near_atm_strikes * self.strike_step
+        desired: Dict[int, str] = {}
+
+        for token, strike in token_strikes.items():
+            if token in focus_tokens:
+                desired[token] = MODE_FULL
+            elif atm is None:
+                # No spot yet → safe middle tier
+                desired[token] = MODE_QUOTE
+            elif abs(float(strike) - atm) <= band:
+                desired[token] = MODE_QUOTE
+            else:
+                desired[token] = MODE_LTP
+
+        for token in index_tokens:
+            desired[int(token)] = MODE_LTP
+
+        return desired
+
+    def apply(self, ws, desired: Dict[int, str]) -> int:
+        """
+        Push CHANGED modes to the socket. Returns tokens changed.
+        """
+        with self._lock:
+            changed: Dict[str, List[int]] = {}
+            for token, mode in desired.items():
+                if self._modes.get(token) != mode:
+                    changed.setdefault(mode, []).append(token)
+
+        if not changed:
+            return 0
+
+        ws_modes = {
+            MODE_FULL: ws.MODE_FULL,
+            MODE_QUOTE: ws.MODE_QUOTE,
+            MODE_LTP: ws.MODE_LTP,
+        }
+
+        n = 0
+        for mode, tokens in changed.items():
+            ws.set_mode(ws_modes[mode], tokens)
+            with self._lock:
+                for t in tokens:
+                    self._modes[t] = mode
+            n += len(tokens)
+
+        with self._lock:
+            self._changes += n
+
+        write_audit_log(
+            "[WS][MODES] "
+            + " ".join(f"{m}={len(t)}" for m, t in changed.items())
+            + f" | totals {self.counts()}"
+        )
+        return n
+
+    def forget(self, tokens: Iterable[int]):
+        with self._lock:
+            for t in tokens:
+                self._modes.pop(int(t), None)
+
+    def reset(self):
+        """
+        Socket reconnected → server-side modes are gone.
+        """
+        with self._lock:
+            self._modes = {}
+
+    # -------------------------------------------------
+    # Accounting (WS thread — cheap)
+    # -------------------------------------------------
+
+    def account(self, ticks: List[dict]):
+        modes = self._modes
+        for t in ticks:
+            mode = modes.get(t.get("instrument_token"))
+            if mode is None:
+                continue
+            self._ticks[mode] += 1
+            self._bytes[mode] += MODE_BYTES[mode]
+
+    # -------------------------------------------------
+    # Reporting
+    # -------------------------------------------------
+
+    def mode_of(self, token: int) -> Optional[str]:
+        return self._modes.get(token)
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            out = {m: 0 for m in MODE_BYTES}
+            for mode in self._modes.values():
+                out[mode] += 1
+            return out
+
+    def stats(self) -> dict:
+        elapsed = max(1.0, time.time() - self._since)
+        return {
+            "tokens": self.counts(),
+            "ticks": dict(self._ticks),
+            "bytes_est": dict(self._bytes),
+            "bytes_per_sec_est": round(sum(self._bytes.values()) / elapsed, 1),
+            "mode_changes": self._changes,
+            "near_atm_strikes": self.near_atm_strikes,
+        }
@@ -0,0 +1,274 @@
+# backend/app/marketdata/tick_journal.py
+
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional
+import mmap
+import os
+import struct
+import threading
+import time
+
+from app.event_bus.audit_logger import write_audit_log
+
+
+# =========================
+# File format (LOCKED v1)
+# =========================
+#
+# HEADER (32 bytes)
+#   magic      4s   b"SCTJ"
+#   version    H
+#   rec_size   H
+#   count      Q    records written (updated every batch)
+#   day        8s   b"YYYYMMDD"
+#   reserved   8x
+#
+# RECORD (44 bytes, little-endian, no padding)
+#   token        I
+#   exchange_ts  q   epoch ms (0 = missing)
+#   recv_ts      q   epoch ns (wall clock, batch receive time)
+#   ltp          d
+#   volume       q
+#   oi           q
+
+MAGIC = b"SCTJ"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHHQ8s8x")
+RECORD = struct.Struct("<Iqqdqq")
+
+GROW_BYTES = 32 * 1024 * 1024      # mmap growth step
+KEEP_DAYS = 5                      # journal retention
+
+
+class JournalTick(NamedTuple):
+    token: int
+    exchange_ts_ms: int
+    recv_ts_ns: int
+    ltp: float
+    volume: int
+    oi: int
+
+
+def journal_dir() -> Path:
+    app_home = os.environ.get("SCALP_APP_HOME")
+    base = Path(app_home) if app_home else Path.home() / ".scalp-app"
+    return base / "data" / "ticks"
+
+
+def journal_path(day: date, base_dir: Optional[Path] = None) -> Path:
+    return (base_dir or journal_dir()) / f"ticks_{day.strftime('%Y-%m-%d')}.bin"
+
+
+# =========================
+# Writer
+# =========================
+
+class TickJournal:
+    """
+    Append-only, memory-mapped raw tick journal.
+
+    RULES:
+    - append_batch() is called from the WS thread → NO syscalls per tick
+    - one file per day (local date), rotated on first batch after midnight
+    - NEVER raises into the caller (journal is best-effort)
+    """
+
+    def __init__(self, base_dir: Optional[Path] = None, keep_days: int = KEEP_DAYS):
+        self.base_dir = base_dir or journal_dir()
+        self.keep_days = keep_days
+
+        self._lock = threading.Lock()
+        self._fh = None
+        self._mm: Optional[mmap.mmap] = None
+        self._size = 0
+        self._offset = 0
+        self._count = 0
+        self._day: Optional[date] = None
+        self._rotate_at = 0.0
+
+        self.path: Optional[Path] = None
+        self.dropped = 0
+
+    # -------------------------------------------------
+    # Public API
+    # -------------------------------------------------
+
+    def append_batch(self, ticks: List[dict], recv_ts_ns: Optional[int] = None):
+        if not ticks:
+            return
+
+        try:
+            recv_ns = recv_ts_ns or time.time_ns()
+
+            with self._lock:
+                if self._mm is None or time.time() >= self._rotate_at:
+                    self._rotate()
+
+                need = RECORD.size * len(ticks)
+                if self._offset + need > self._size:
+                    self._grow(need)
+
+                mm = self._mm
+                off = self._offset
+                pack = RECORD.pack_into
+
+                for t in ticks:
+                    token = t.get("instrument_token")
+                    ltp = t.get("last_price")
+                    if token is None or ltp is None:
+                        continue
+
+                    ex = t.get("exchange_timestamp")
+                    ex_ms = int(ex.timestamp() * 1000) if ex else 0
+
+                    pack(
+                        mm,
+                        off,
+                        int(token),
+                        ex_ms,
+                        recv_ns,
+                        float(ltp),
+                        int(t.get("volume_traded") or 0),
+                        int(t.get("oi") or 0),
+                    )
+                    off += RECORD.size
+                    self._count += 1
+
+                self._offset = off
+                self._write_header()
+
+        except Exception as e:
+            self.dropped += len(ticks)
+            if self.dropped == len(ticks):
+                write_audit_log(f"[TICK_JOURNAL][ERROR] append failed: {e}")
+
+    def close(self):
+        with self._lock:
+            self._close_current()
+
+    def stats(self) -> dict:
+        return {
+            "path": str(self.path) if self.path else None,
+            "records": self._count,
+            "bytes": self._offset,
+            "dropped": self.dropped,
+        }
+
+    # -------------------------------------------------
+    # Internal
+    # -------------------------------------------------
+
+    def _rotate(self):
+        self._close_current()
+
+        today = date.today()
+        midnight = datetime.combine(today + timedelta(days=1), datetime.min.time())
+
+        self._day = today
+        self._rotate_at = midnight.timestamp()
+
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.path = journal_path(today, self.base_dir)
+
+        existing = self.path.exists() and self.path.stat().st_size >= HEADER.size
+        self._fh = open(self.path, "r+b" if existing else "w+b")
+
+        if existing:
+            _, _, _, count, _ = HEADER.unpack(self._fh.read(HEADER.size))
+            self._count = count
+            self._offset = HEADER.size + count * RECORD.size
+        else:
+            self._count = 0
+            self._offset = HEADER.size
+
+        self._size = max(self._offset + GROW_BYTES, os.path.getsize(self.path))
+        self._fh.truncate(self._size)
+        self._mm = mmap.mmap(self._fh.fileno(), self._size)
+        self._write_header()
+
+        write_audit_log(
+            f"[TICK_JOURNAL] Writing {self.path} (existing_records={self._count})"
+        )
+
+        self._cleanup_old()
+
+    def _grow(self, need: int):
+        self._mm.flush()
+        self._mm.close()
+        self._size = self._offset + need + GROW_BYTES
+        self._fh.truncate(self._size)
+        self._mm = mmap.mmap(self._fh.fileno(), self._size)
+
+    def _write_header(self):
+        HEADER.pack_into(
+            self._mm,
+            0,
+            MAGIC,
+            VERSION,
+            RECORD.size,
+            self._count,
+            self._day.strftime("%Y%m%d").encode(),
+        )
+
+    def _close_current(self):
+        if self._mm is None:
+            return
+        try:
+            self._write_header()
+            self._mm.flush()
+            self._mm.close()
+            # Trim preallocated tail
+            self._fh.truncate(self._offset)
+            self._fh.close()
+        finally:
+            self._mm = None
+            self._fh = None
+
+    def _cleanup_old(self):
+        cutoff = date.today() - timedelta(days=self.keep_days)
+        for f in self.base_dir.glob("ticks_*.bin"):
+            try:
+                day = datetime.strptime(f.stem[len("ticks_"):], "%Y-%m-%d").date()
+                if day < cutoff:
+                    f.unlink()
+            except Exception:
+                pass  # never crash for housekeeping
+
+
+# =========================
+# Reader
+# =========================
+
+def read_journal(path: Path) -> Iterator[JournalTick]:
+    """
+    Stream records from a journal file (live or closed).
+    """
+    with open(path, "rb") as fh:
+        head = fh.read(HEADER.size)
+        if len(head) < HEADER.size:
+            return
+
+        magic, version, rec_size, count, _ = HEADER.unpack(head)
+        if magic != MAGIC or rec_size != RECORD.size:
+            raise ValueError(f"Not a tick journal (v{version}): {path}")
+
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = min(HEADER.size + count * RECORD.size, len(mm))
+            for off in range(HEADER.size, end - RECORD.size + 1, RECORD.size):
+                yield JournalTick(*RECORD.unpack_from(mm, off))
+
+
+def iter_batches(path: Path) -> Iterator[List[JournalTick]]:
+    """
+    Group records back into WS batches (same recv_ts = same on_ticks call).
+    """
+    batch: List[JournalTick] = []
+    for rec in read_journal(path):
+        if batch and rec.recv_ts_ns != batch[0].recv_ts_ns:
+            yield batch
+            batch = []
+        batch.append(rec)
+    if batch:
+        yield batch
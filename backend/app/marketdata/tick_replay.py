@@ -0,0 +1,164 @@
+# backend/app/marketdata/tick_replay.py
+
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Set
+import time
+
+from app.event_bus.audit_logger import write_audit_log
+from app.marketdata.tick_journal import JournalTick, iter_batches
+
+
+# =========================
+# Fake KiteTicker
+# =========================
+
+class FakeKiteTicker:
+    """
+    Drop-in stand-in for kiteconnect.KiteTicker.
+
+    Exposes the callbacks + subscribe API the tick engine uses.
+    Ticks are pushed by TickReplayer, never by a socket.
+    """
+
+    MODE_FULL = "full"
+    MODE_QUOTE = "quote"
+    MODE_LTP = "ltp"
+
+    def __init__(self):
+        self.on_ticks = None
+        self.on_connect = None
+        self.on_close = None
+        self.on_error = None
+
+        self.subscribed: Set[int] = set()
+        self.modes = {}
+        self.connected = False
+
+    def subscribe(self, tokens: Iterable[int]):
+        self.subscribed.update(int(t) for t in tokens)
+
+    def unsubscribe(self, tokens: Iterable[int]):
+        for t in tokens:
+            self.subscribed.discard(int(t))
+            self.modes.pop(int(t), None)
+
+    def set_mode(self, mode: str, tokens: Iterable[int]):
+        for t in tokens:
+            self.modes[int(t)] = mode
+
+    def connect(self, threaded: bool = False):
+        self.connected = True
+        if self.on_connect:
+            self.on_connect(self, {})
+
+    def close(self, code: int = 1000, reason: str = "replay finished"):
+        if not self.connected:
+            return
+        self.connected = False
+        if self.on_close:
+            self.on_close(self, code, reason)
+
+    def emit(self, ticks: List[dict]):
+        if self.on_ticks and ticks:
+            self.on_ticks(self, ticks)
+
+
+# =========================
+# Replayer
+# =========================
+
+class TickReplayer:
+    """
+    Feeds a recorded tick journal into ZerodhaTickEngine.
+
+    speed:
+      1.0   → real time
+      N     → N× faster
+      0     → as fast as possible (benchmark)
+
+    The engine's clock is pinned to the replayed receive time so candle
+    bucketing behaves exactly as it did live.
+    """
+
+    def __init__(self, engine, ticker: FakeKiteTicker, speed: float = 0.0):
+        self.engine = engine
+        self.ticker = ticker
+        self.speed = max(0.0, float(speed))
+
+        self._replay_now = 0.0
+
+        self.batches = 0
+        self.ticks = 0
+        self.elapsed_sec = 0.0
+
+    # -------------------------------------------------
+
+    def run(self, path: Path, *, tokens: Optional[Set[int]] = None) -> dict:
+        self.engine.clock = lambda: self._replay_now
+        self.ticker.connect()
+
+        write_audit_log(f"[REPLAY] Start {path} speed={self.speed or 'max'}")
+
+        started = time.perf_counter()
+        first_recv: Optional[int] = None
+
+        for batch in iter_batches(path):
+            recv_ns = batch[0].recv_ts_ns
+
+            if first_recv is None:
+                first_recv = recv_ns
+
+            # ⏱ pacing
+            if self.speed > 0:
+                due = (recv_ns - first_recv) / 1e9 / self.speed
+                lag = due - (time.perf_counter() - started)
+                if lag > 0:
+                    time.sleep(lag)
+
+            self._replay_now = recv_ns / 1e9
+
+            ticks = [
+                _to_kite_tick(r)
+                for r in batch
+                if tokens is None or r.token in tokens
+            ]
+            if not ticks:
+                continue
+
+            self.ticker.emit(ticks)
+            self.batches += 1
+            self.ticks += len(ticks)
+
+        self.ticker.close()
+
+        # Let queued candle work finish before reporting
+        self.engine.pipeline.drain(timeout=60.0)
+        self.elapsed_sec = time.perf_counter() - started
+
+        report = self.report()
+        write_audit_log(f"[REPLAY] Done {report}")
+        return report
+
+    def report(self) -> dict:
+        total = self.elapsed_sec
+        return {
+            "batches": self.batches,
+            "ticks": self.ticks,
+            "elapsed_sec": round(total, 3),
+            "ticks_per_sec": round(self.ticks / total, 1) if total else None,
+        }
+
+
+def _to_kite_tick(r: JournalTick) -> dict:
+    return {
+        "instrument_token": r.token,
+        "last_price": r.ltp,
+        "exchange_timestamp": (
+            datetime.fromtimestamp(r.exchange_ts_ms / 1000.0)
+            if r.exchange_ts_ms
+            else None
+        ),
+        "volume_traded": r.volume,
+        "oi": r.oi,
+    }
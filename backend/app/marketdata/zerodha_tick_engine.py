@@ -1,36 +1,64 @@
-from typing import Dict, List
+from typing import Callable, Dict, Iterable, List, Optional
 import time
 from datetime import date
 import math
+import os
 import threading
 
 from kiteconnect import KiteTicker, KiteConnect
 
-from app.candles.candle_builder import CandleBuilder
+from app.candles.candle_builder import CandleBuilder, LATE_DROP
+from app.candles.timeframe_rollup import TimeframeRollup, timeframe_label
 from app.marketdata.candle import Candle, CandleSource
 from app.marketdata.ltp_store import LTPStore
 
 from app.engine.indicator_engine_pine_v1_9 import IndicatorEnginePineV19
-from app.engine.strategy_engine import StrategyEngine
-from app.engine.condition_engine_v1_9 import ConditionEngineV19
+from app.engine.indicator_checkpoint import IndicatorCheckpointStore, rows_after_checkpoint
+from app.engine.strategy_registry import (
+    V19_INDICATORS,
+    IndicatorCache,
+    StrategyRegistry,
+    strategy_registry,
+)
+from app.engine.candle_pipeline import CandlePipeline, JobPriority
+from app.engine.latency_tracker import LATENCY, LatencyHistogram
 
 from app.event_bus.audit_logger import write_audit_log
 from app.fetcher.zerodha_instruments import load_instruments_df
 from app.db import timeline_repo
 
-from app.persistence.market_timeline_writer import write_market_timeline_row
+from app.persistence.market_timeline_writer import (
+    build_strategy_signal_row,
+    build_timeline_row,
+)
+from app.persistence.timeline_writer import timeline_writer
 from app.engine.signal_router import signal_router
 from app.utils.market_hours import is_market_open
 from app.marketdata.market_indices_state import MarketIndicesState
 
-from app.db.paper_trades_repo import get_open_paper_trades_for_symbol
 from app.trading.paper_trade_recorder import PaperTradeRecorder
+from app.trading.paper_trade_index import OpenPaperTradeIndex
 
-from app.event_bus.ws_freeze import WS_MUTATION_FROZEN
+from app.event_bus import ws_freeze
+from app.marketdata.tick_journal import TickJournal
+from app.marketdata.subscription_manager import SubscriptionManager
+from app.trading.trade_state_manager import TradeStateManager
+from app.utils.candle_debug_logger import CandleDebugLogger, CandleDebugSink, candle_debug_sink
 
 # top-level (outside class)
 _WS_ENGINE_REGISTRY = []
 
+# Raw tick journal (set SCALP_TICK_JOURNAL=0 to disable)
+TICK_JOURNAL_ENABLED = os.environ.get("SCALP_TICK_JOURNAL", "1") == "1"
+
+
+def get_active_engine():
+    """
+    Latest constructed tick engine (or None).
+    Read-only accessor for API routes.
+    """
+    return _WS_ENGINE_REGISTRY[-1] if _WS_ENGINE_REGISTRY else None
+
 class ZerodhaTickEngine:
     """
     Zerodha WebSocket Engine (AUTHORITATIVE)
@@ -41,23 +69,82 @@ class ZerodhaTickEngine:
     - WS thread must stay non-blocking
     """
 
-    WARMUP_CANDLES = 500
+    WARMUP_LOOKBACK = 200      # candles fetched + replayed per token at warmup
+    PIPELINE_WORKERS = 4
+
+    # Boundary close: every open bar is closed this long after each
+    # minute boundary (exchange clock). Later ticks for it are dropped.
+    CANDLE_CLOSE_GRACE_MS = 50
+    LATE_TICK_POLICY = LATE_DROP
+    MAX_CLOCK_SKEW_SEC = 2.0
 
     def __init__(
         self,
         kite_data: KiteConnect,
         instrument_tokens: List[int],
         timeframe_sec: int = 60,
+        *,
+        ticker=None,
+        journal: Optional[TickJournal] = None,
+        live_side_effects: bool = True,
+        atm_range: int = 800,
+        strike_step: int = 50,
+        recenter_strikes: int = 2,
+        recenter: Optional[bool] = None,
+        candle_timer: bool = True,
+        rollup_minutes: Iterable[int] = (3, 5, 15),
+        checkpoints: Optional[IndicatorCheckpointStore] = None,
+        registry: Optional[StrategyRegistry] = None,
+        debug_sink: Optional[CandleDebugSink] = None,
     ):
+        """
+        ticker / journal / live_side_effects exist for OFFLINE REPLAY:
+        - ticker: FakeKiteTicker instead of a real socket
+        - journal: raw tick journal (None → default journal when enabled)
+        - live_side_effects=False: no routing, no paper exits, no DB writes
+        - candle_timer=False: no boundary timer thread (replay clock is
+          simulated; boundary closes then happen on the tick path only)
+
+        rollup_minutes: closed 1m candles are rolled up incrementally into
+        these N-minute timeframes (persisted + pushed to subscribers).
+
+        checkpoints: per-symbol indicator state on disk (None → default
+        store when live_side_effects). Warmup restores it and replays
+        only the candles after it instead of the full lookback.
+
+        registry: strategies run on every token (None → process registry).
+        Indicators are computed ONCE per (token, indicator, params) and
+        shared; the primary strategy owns market_timeline rows, the others
+        write per-strategy signal rows tagged with their version.
+
+        debug_sink: candle debug lines of every strategy go here (None →
+        the process sink under app/state/logs/debug). Offline harnesses
+        pass their own (temp dir or level=off).
+
+        atm_range / strike_step / recenter_strikes drive the ROLLING
+        universe: when NIFTY ATM drifts by `recenter_strikes` strikes the
+        window is re-centred (subscribe new, unsubscribe stale).
+        recenter: None → only with live_side_effects (a replay keeps the
+        universe it was started with; its ticks may drift anywhere).
+        """
         _WS_ENGINE_REGISTRY.append(self)
 
         self.kite_data = kite_data
 
-        self.kws = KiteTicker(
+        self.kws = ticker or KiteTicker(
             api_key=kite_data.api_key,
             access_token=kite_data.access_token,
         )
 
+        # Wall clock (replay pins this to recorded receive time)
+        self.clock = time.time
+        self.live_side_effects = live_side_effects
+
+        # Raw tick journal (append-only, per day)
+        if journal is None and ticker is None and TICK_JOURNAL_ENABLED:
+            journal = TickJournal()
+        self.journal = journal
+
         self._started = False
         self._connected = False
         self._lock = threading.Lock()
@@ -65,6 +152,28 @@ class ZerodhaTickEngine:
         # -------------------------------------------------
         # Candle queue (WS thread MUST NOT BLOCK)
         # -------------------------------------------------
+        self.pipeline = CandlePipeline(
+            workers=self.PIPELINE_WORKERS,
+            name="candle",
+        )
+
+        # -------------------------------------------------
+        # Boundary close (timer thread + tick-path sweep)
+        # -------------------------------------------------
+        self.candle_timer = candle_timer
+        self._bar_lock = threading.Lock()      # builder mutation
+        self._timer_stop = threading.Event()
+        self._timer_thread: Optional[threading.Thread] = None
+        self._next_close_ts: Optional[int] = None
+
+        # exchange clock − local clock (sec), max over last minute
+        self._clock_skew = 0.0
+        self._skew_window: Optional[float] = None
+
+        # close lag = emit time − candle end (exchange clock)
+        self.close_lag: Dict[int, LatencyHistogram] = {}
+        self.close_lag_all = LatencyHistogram()
+        self.closed_by = {"timer": 0, "sweep": 0, "tick": 0}
 
         instruments_df = load_instruments_df()
 
@@ -114,55 +223,367 @@ class ZerodhaTickEngine:
         # PER TOKEN STATE
         # -------------------------------------------------
         self.token_expiry: Dict[int, date] = {}
+        self.token_strike: Dict[int, float] = {}
+        self.symbol_token: Dict[str, int] = {}
         self.builders = {}
         self.indicators = {}
         self.strategies = {}
 
-        self.condition_engine = ConditionEngineV19()
+        # Shared indicators + secondary strategies (bound at add time)
+        self.registry = registry or strategy_registry
+        self.indicator_caches: Dict[int, IndicatorCache] = {}
+        self.extra_strategies: Dict[int, list] = {}
+
+        # Higher timeframes (rolled up from closed 1m candles)
+        self.rollup_minutes = sorted({int(m) for m in rollup_minutes if int(m) > 1})
+        self.rollups: Dict[int, TimeframeRollup] = {}
+        self._tf_subscribers: Dict[str, List[Callable]] = {}
+
+        primary = self.registry.primary
+        self.strategy_version = primary.version
+        self.primary_routes = primary.routes
+        self.condition_engine = primary.conditions
+
+        # WS mode tiers (FULL / QUOTE / LTP)
+        self.subscriptions = SubscriptionManager()
+        self._focus_symbols: set = set()
+
+        self.timeframe_sec = timeframe_sec
+        self.debug_sink = debug_sink
+
+        self.warmup_report: dict = {}
+
+        # Indicator checkpoints (restart = load state + replay the tail)
+        if checkpoints is None and live_side_effects:
+            checkpoints = IndicatorCheckpointStore()
+        self.checkpoints = checkpoints
+        self._indicator_ts: Dict[int, int] = {}     # last candle fed (end_ts = market_timeline.ts)
+        self.indicator_gaps: Dict[int, int] = {}    # closed candles never fed (SIGNAL lane full)
+
+        # ONE indexed lookup for all tokens (no per-token DataFrame scan)
+        rows_by_token = {
+            int(r["instrument_token"]): r
+            for r in instruments_df[
+                instruments_df["instrument_token"].isin(instrument_tokens)
+            ].to_dict("records")
+        }
 
-        for token in instrument_tokens:
-            row = instruments_df.loc[
-                instruments_df["instrument_token"] == token
-            ].iloc[0]
+        self._add_tokens([
+            {
+                "token": token,
+                "symbol": rows_by_token[token]["tradingsymbol"],
+                "expiry": rows_by_token[token]["expiry"],
+                "strike": float(rows_by_token[token]["strike"]),
+            }
+            for token in instrument_tokens
+        ])
 
-            symbol = row["tradingsymbol"]
+        # -------------------------------------------------
+        # ROLLING UNIVERSE (ATM-CENTRED)
+        # -------------------------------------------------
+        self.atm_range = atm_range
+        self.strike_step = strike_step
+        self.recenter_strikes = recenter_strikes
+        self.recenter = live_side_effects if recenter is None else bool(recenter)
+
+        # token → {symbol, strike, expiry} for the two nearest expiries
+        weekly_expiries = sorted(valid_expiries.unique())[:2]
+        self._candidates: Dict[int, dict] = {
+            int(r["instrument_token"]): {
+                "symbol": r["tradingsymbol"],
+                "strike": float(r["strike"]),
+                "expiry": r["expiry"],
+            }
+            for r in weekly_opts[
+                weekly_opts["expiry"].isin(weekly_expiries)
+            ].to_dict("records")
+        }
 
-            self.token_expiry[token] = row["expiry"]
+        strikes = list(self.token_strike.values())
+        self._universe_atm: Optional[float] = (
+            round((min(strikes) + max(strikes)) / 2 / strike_step) * strike_step
+            if strikes
+            else None
+        )
+        # held from the drift check (WS thread) until the recentre ends
+        self._recenter_lock = threading.Lock()
 
+        # -------------------------------------------------
+        # WS CALLBACKS
+        # -------------------------------------------------
+        self.kws.on_ticks = self._on_ticks
+        self.kws.on_connect = self._on_connect
+        self.kws.on_close = self._on_close
+        self.kws.on_error = self._on_error
+
+
+    # -------------------------------------------------
+    # PER TOKEN LIFECYCLE
+    # -------------------------------------------------
+
+    def _add_token(self, token: int, *, symbol: str, expiry, strike: float):
+        self._add_tokens([
+            {"token": token, "symbol": symbol, "expiry": expiry, "strike": strike}
+        ])
+
+    def _add_tokens(self, specs: List[dict]):
+        """
+        Build + warm per-token state for MANY tokens, THEN publish it to
+        the tick path.
+
+        - ONE warmup read for all symbols (chunked)
+        - indicator warmup runs inline: it is pure-Python CPU work,
+          threads only add GIL contention
+        - a usable checkpoint replaces the replay (only newer rows run)
+        """
+        if not specs:
+            return
+
+        t0 = time.perf_counter()
+
+        history = timeline_repo.fetch_recent_candles_for_warmup_bulk(
+            symbols=[s["symbol"] for s in specs],
+            timeframe="1m",
+            limit=self.WARMUP_LOOKBACK,
+        )
+
+        t_fetch = time.perf_counter()
+
+        strategies = self.registry.specs()
+        primary, extras = strategies[0], strategies[1:]
+        indicator_specs = self.registry.indicator_specs()
+
+        def build(spec: dict):
             builder = CandleBuilder(
-                instrument_token=token,
-                timeframe_sec=timeframe_sec,
+                instrument_token=spec["token"],
+                timeframe_sec=self.timeframe_sec,
                 last_candle_end_ts=None,
+                late_policy=self.LATE_TICK_POLICY,
             )
-
             indicator = IndicatorEnginePineV19()
-            strategy = StrategyEngine(
-                slot_name=str(token),
-                symbol=symbol,
+            cache = IndicatorCache(indicator_specs, engines={V19_INDICATORS: indicator})
+            strategy = primary.strategy_factory(
+                slot_name=str(spec["token"]),
+                symbol=spec["symbol"],
+            )
+            shadow = [
+                (s, s.strategy_factory(
+                    slot_name=f"{spec['token']}:{s.version}",
+                    symbol=spec["symbol"],
+                ))
+                for s in extras
+            ]
+            if self.debug_sink is not None:
+                for s in [strategy] + [st for _, st in shadow]:
+                    s.debug_logger = CandleDebugLogger(s.symbol, s.slot_name, sink=self.debug_sink)
+            rollup = (
+                TimeframeRollup(self.rollup_minutes)
+                if self.rollup_minutes
+                else None
             )
 
-            self.builders[token] = builder
-            self.indicators[token] = indicator
-            self.strategies[token] = strategy
-
-            # -----------------------------
-            # WARMUP (KEYWORD-ONLY SAFE)
-            # -----------------------------
-            self._warmup_symbol(
-                symbol=symbol,
-                timeframe="1m",
+            rows = history.get(spec["symbol"], [])
+            warm = self._warmup_indicator(
+                rows=rows,
                 builder=builder,
                 indicator=indicator,
+                symbol=spec["symbol"],
             )
+            if len(cache.engines) > 1 and rows:
+                # other specs have no checkpoint → full replay
+                cache.warmup(
+                    self._rows_to_candles(rows, builder.tf),
+                    skip=(V19_INDICATORS,),
+                    history_lookback=self.WARMUP_LOOKBACK,
+                )
+            return spec, builder, indicator, strategy, rollup, warm, cache, shadow
 
-        # -------------------------------------------------
-        # WS CALLBACKS
-        # -------------------------------------------------
-        self.kws.on_ticks = self._on_ticks
-        self.kws.on_connect = self._on_connect
-        self.kws.on_close = self._on_close
-        self.kws.on_error = self._on_error
+        built = [build(spec) for spec in specs]
 
+        t_warm = time.perf_counter()
+
+        with self._lock:
+            for spec, builder, indicator, strategy, rollup, warm, cache, shadow in built:
+                token = spec["token"]
+                if rollup is not None:
+                    self.rollups[token] = rollup
+                if warm["last_ts"] is not None:
+                    self._indicator_ts[token] = warm["last_ts"]
+                self.token_expiry[token] = spec["expiry"]
+                self.token_strike[token] = spec["strike"]
+                self.symbol_token[spec["symbol"]] = token
+                self.indicators[token] = indicator
+                self.indicator_caches[token] = cache
+                self.strategies[token] = strategy
+                if shadow:
+                    self.extra_strategies[token] = shadow
+                # builders LAST → tick path only sees fully built tokens
+                self.builders[token] = builder
+
+        counts = {b[0]["symbol"]: b[5]["replayed"] for b in built}
+        restored = sum(1 for b in built if b[5]["restored"])
+
+        self.warmup_report = {
+            "tokens": len(specs),
+            "restored": restored,
+            "candles": sum(counts.values()),
+            "fetch_ms": round((t_fetch - t0) * 1000, 1),
+            "warm_ms": round((t_warm - t_fetch) * 1000, 1),
+            "total_ms": round((time.perf_counter() - t0) * 1000, 1),
+            "per_symbol": counts,
+        }
+
+        cold = [sym for sym, n in counts.items() if n == 0]
+        write_audit_log(
+            f"[WARMUP] tokens={len(specs)} candles={self.warmup_report['candles']} "
+            f"fetch={self.warmup_report['fetch_ms']}ms "
+            f"warm={self.warmup_report['warm_ms']}ms "
+            f"total={self.warmup_report['total_ms']}ms "
+            f"restored={restored} cold={len(cold)}"
+        )
+
+    def _drop_token(self, token: int):
+        """
+        Stop ticks immediately; release state AFTER queued work for
+        this token has run (same lane, behind SIGNAL work).
+
+        A token re-added before the release runs owns the state again
+        (builders is published last) → release is a no-op.
+        """
+        with self._lock:
+            self.builders.pop(token, None)
+
+        def release(token=token):
+            with self._lock:
+                if token in self.builders:
+                    return
+            self._checkpoint_token(token)
+            with self._lock:
+                if token in self.builders:
+                    return
+                strategy = self.strategies.pop(token, None)
+                self.indicators.pop(token, None)
+                self.indicator_caches.pop(token, None)
+                self.extra_strategies.pop(token, None)
+                self.token_expiry.pop(token, None)
+                self.token_strike.pop(token, None)
+                self.close_lag.pop(token, None)
+                self.rollups.pop(token, None)
+                self._indicator_ts.pop(token, None)
+                self.indicator_gaps.pop(token, None)
+                if strategy is not None:
+                    self.symbol_token.pop(strategy.symbol, None)
+
+        self.pipeline.submit(
+            token,
+            release,
+            priority=JobPriority.PERSIST,
+            label=f"release:{token}",
+        )
+
+    def _protected_tokens(self) -> set:
+        """
+        Tokens that must NEVER be unsubscribed (open trades / selection).
+        """
+        symbols = set(self._focus_symbols)
+        for mgr in TradeStateManager._REGISTRY.values():
+            if mgr.active_trade:
+                symbols.add(mgr.active_trade.symbol)
+        symbols.update(OpenPaperTradeIndex.snapshot().keys())
+
+        return {self.symbol_token[s] for s in symbols if s in self.symbol_token}
+
+    # -------------------------------------------------
+    # ROLLING UNIVERSE
+    # -------------------------------------------------
+
+    def _on_index_spot(self, spot: float):
+        """
+        WS thread: cheap drift check only. Work happens on a thread.
+        """
+        if not self.recenter or self._universe_atm is None or self._recenter_lock.locked():
+            return
+
+        atm = round(spot / self.strike_step) * self.strike_step
+        if abs(atm - self._universe_atm) < self.recenter_strikes * self.strike_step:
+            return
+
+        if ws_freeze.WS_MUTATION_FROZEN:
+            return
+
+        if not self._recenter_lock.acquire(blocking=False):
+            return
+
+        try:
+            threading.Thread(
+                target=self._recenter_universe,
+                args=(atm,),
+                daemon=True,
+            ).start()
+        except Exception:
+            self._recenter_lock.release()
+            raise
+
+    def _recenter_universe(self, atm: float):
+        """
+        Runs with _recenter_lock held (taken in _on_index_spot).
+        """
+        try:
+            low = atm - self.atm_range
+            high = atm + self.atm_range
+
+            desired = {
+                t for t, c in self._candidates.items()
+                if low <= c["strike"] <= high
+            }
+            current = set(self.builders)
+
+            add = sorted(desired - current)
+            remove = sorted(current - desired - self._protected_tokens())
+
+            write_audit_log(
+                f"[UNIVERSE][RECENTER] ATM {self._universe_atm} → {atm} "
+                f"add={len(add)} remove={len(remove)}"
+            )
+
+            # 1️⃣ Build + warm new strikes (off the WS thread)
+            self._add_tokens([
+                {"token": token, **self._candidates[token]}
+                for token in add
+            ])
+
+            # 2️⃣ Socket changes (only while connected)
+            with self._lock:
+                connected = self._connected
+
+            if connected:
+                if add:
+                    self.kws.subscribe(add)
+                if remove:
+                    self.kws.unsubscribe(remove)
+                    self.subscriptions.forget(remove)
+                # removed tokens are still in builders until step 3
+                stale = set(remove)
+                self.subscriptions.apply(self.kws, {
+                    t: m for t, m in self._plan_modes().items() if t not in stale
+                })
+
+            # 3️⃣ Release stale strikes
+            for token in remove:
+                self._drop_token(token)
+
+            self._universe_atm = atm
+
+            write_audit_log(
+                f"[UNIVERSE][RECENTER] done ATM={atm} "
+                f"range=[{low}, {high}] tokens={len(self.builders)}"
+            )
+
+        except Exception as e:
+            write_audit_log(f"[UNIVERSE][RECENTER][ERROR] {e}")
+
+        finally:
+            self._recenter_lock.release()
 
     # -------------------------------------------------
     # START (CONNECT EXACTLY ONCE)
@@ -200,30 +621,66 @@ class ZerodhaTickEngine:
     # WARMUP
     # -------------------------------------------------
 
-    def _warmup_symbol(
+    def _warmup_indicator(
         self,
         *,
-        symbol: str,
-        timeframe: str,
+        rows: List[dict],
         builder: CandleBuilder,
         indicator: IndicatorEnginePineV19,
-    ):
-        rows = timeline_repo.fetch_recent_candles_for_warmup(
-            symbol=symbol,
-            timeframe=timeframe,
-            limit=self.WARMUP_CANDLES,
+        symbol: Optional[str] = None,
+    ) -> dict:
+        """
+        Restore from checkpoint + replay newer rows, else replay `rows`.
+        Returns {"restored", "replayed", "last_ts"}.
+        """
+        restored = False
+        checkpoint = (
+            self.checkpoints.load(symbol)
+            if self.checkpoints is not None and symbol
+            else None
         )
+        if checkpoint is not None:
+            tail = rows_after_checkpoint(checkpoint, rows)
+            if tail is not None:
+                try:
+                    # validate on a scratch engine first (no partial load)
+                    IndicatorEnginePineV19.from_state(checkpoint["state"])
+                    indicator.load_state(checkpoint["state"])
+                    rows = tail
+                    restored = True
+                except Exception as e:
+                    write_audit_log(f"[CHECKPOINT] {symbol} unusable → full warmup: {e}")
+
+        last_ts = int(checkpoint["last_ts"]) if restored else None
+
+        if rows:
+            candles = self._rows_to_candles(rows, builder.tf)
+
+            indicator.warmup(
+                candles,
+                use_history=True,
+                history_lookback=len(candles) if restored else self.WARMUP_LOOKBACK,
+            )
+            last_ts = candles[-1].end_ts
 
-        if not rows:
-            return
+        builder.last_emitted_end_ts = None
 
+        return {
+            "restored": restored,
+            "replayed": len(rows),
+            "last_ts": last_ts,
+        }
+
+    @staticmethod
+    def _rows_to_candles(rows: List[dict], tf: int) -> List[Candle]:
+        # market_timeline.ts is the candle END (build_timeline_row)
         candles: List[Candle] = []
         for r in rows:
             ts = int(r["ts"])
             candles.append(
                 Candle(
-                    start_ts=ts,
-                    end_ts=ts + builder.tf,
+                    start_ts=ts - tf,
+                    end_ts=ts,
                     open=float(r["open"]),
                     high=float(r["high"]),
                     low=float(r["low"]),
@@ -231,11 +688,57 @@ class ZerodhaTickEngine:
                     source=CandleSource.WARMUP,
                 )
             )
+        return candles
 
-        indicator.warmup(candles, use_history=True)
-        builder.last_emitted_end_ts = None
+    # -------------------------------------------------
+    # INDICATOR CHECKPOINTS
+    # -------------------------------------------------
 
+    def _checkpoint_token(self, token: int) -> bool:
+        """
+        Save `token`'s indicator state NOW. Must run on the token's lane
+        (or after the pipeline drained) so state and last_ts agree.
+        """
+        if self.checkpoints is None:
+            return False
+
+        indicator = self.indicators.get(token)
+        strategy = self.strategies.get(token)
+        last_ts = self._indicator_ts.get(token)
+        if indicator is None or strategy is None or last_ts is None:
+            return False
+
+        return self.checkpoints.save(
+            symbol=strategy.symbol,
+            token=token,
+            last_ts=last_ts,
+            state=indicator.get_state(),
+        )
 
+    def checkpoint_indicators(self) -> int:
+        """
+        Checkpoint every token NOW. Pipeline must be idle (shutdown).
+        Returns saved count.
+        """
+        with self._lock:
+            tokens = list(self.indicators)
+        return sum(1 for token in tokens if self._checkpoint_token(token))
+
+    def request_checkpoints(self) -> int:
+        """
+        Checkpoint every token on its own lane (safe while running).
+        Returns queued count.
+        """
+        with self._lock:
+            tokens = list(self.indicators)
+        for token in tokens:
+            self.pipeline.submit(
+                token,
+                lambda token=token: self._checkpoint_token(token),
+                priority=JobPriority.PERSIST,
+                label=f"checkpoint:{token}",
+            )
+        return len(tokens)
 
     # -------------------------------------------------
     # WS CALLBACKS
@@ -244,18 +747,65 @@ class ZerodhaTickEngine:
     def _on_connect(self, ws, response):
         write_audit_log("[WS] Connected")
 
-        tokens = list(self.builders.keys()) + list(self.index_tokens.keys())
+        with self._lock:
+            tokens = list(self.builders.keys()) + list(self.index_tokens.keys())
         ws.subscribe(tokens)
-        ws.set_mode(ws.MODE_FULL, tokens)
+
+        # Fresh socket → server-side modes reset
+        self.subscriptions.reset()
+        self.subscriptions.apply(ws, self._plan_modes())
 
         with self._lock:
             self._connected = True
 
+        self._start_candle_timer()
+
         write_audit_log(
             f"[WS] Subscribed: {len(self.builders)} options, "
-            f"{len(self.index_tokens)} indices"
+            f"{len(self.index_tokens)} indices "
+            f"modes={self.subscriptions.counts()}"
+        )
+
+    # -------------------------------------------------
+    # SUBSCRIPTION MODES
+    # -------------------------------------------------
+
+    def _plan_modes(self) -> Dict[int, str]:
+        with self._lock:
+            token_strikes = {
+                t: self.token_strike[t]
+                for t in self.builders
+                if t in self.token_strike
+            }
+
+        # Selected + anything with an open trade is always FULL
+        return self.subscriptions.plan(
+            token_strikes=token_strikes,
+            focus_tokens=self._protected_tokens(),
+            index_tokens=self.index_tokens.keys(),
+            atm=MarketIndicesState.get_ltp("NIFTY"),
         )
 
+    def refresh_subscription_modes(self, selected_symbols=None):
+        """
+        Re-tier tokens after selection / ATM changes.
+        Called from selection_loop (NOT the WS thread).
+        """
+        if selected_symbols is not None:
+            self._focus_symbols = set(selected_symbols)
+
+        with self._lock:
+            connected = self._connected
+
+        if not connected:
+            return 0
+
+        try:
+            return self.subscriptions.apply(self.kws, self._plan_modes())
+        except Exception as e:
+            write_audit_log(f"[WS][MODES][ERROR] {e}")
+            return 0
+
     def _on_close(self, ws, code, reason):
         write_audit_log(f"[WS] Closed code={code} reason={reason}")
         with self._lock:
@@ -269,6 +819,42 @@ class ZerodhaTickEngine:
     # -------------------------------------------------
 
     def _on_ticks(self, ws, ticks):
+        # ONE clock read per batch: journalled receive time == the time
+        # the candle path sees → replay reproduces it exactly
+        now = self.clock()
+
+        if self.journal is not None:
+            self.journal.append_batch(ticks, int(now * 1e9))
+
+        self.subscriptions.account(ticks)
+
+        if not LATENCY.enabled:
+            self._handle_ticks(ticks, 0, now)
+            return
+
+        t_recv = LATENCY.now()
+        self._handle_ticks(ticks, t_recv, now)
+        LATENCY.record("tick", t_recv)
+
+    def _handle_ticks(self, ticks, t_recv: int, now: Optional[float] = None):
+        # Backup boundary sweep (timer late / replay clock)
+        if now is None:
+            now = self.clock()
+        if self._next_close_ts is not None:
+            exch_due = now + self._clock_skew - self.CANDLE_CLOSE_GRACE_MS / 1000.0
+            if exch_due >= self._next_close_ts:
+                tf = self.timeframe_sec
+                self._close_due(int(exch_due) // tf * tf, origin="sweep")
+
+        # Candle clock per tier:
+        #   FULL          → exchange_timestamp
+        #   QUOTE / LTP   → receive time + clock skew (no exchange_timestamp
+        #                   in those packets) = the exchange clock estimate
+        #                   the boundary timer closes on, so their bars close
+        #                   on the same minute and near-boundary ticks are
+        #                   not dropped as late
+        recv_ts = int(now + self._clock_skew)
+
         for tick in ticks:
             token = tick.get("instrument_token")
             ltp = tick.get("last_price")
@@ -277,151 +863,543 @@ class ZerodhaTickEngine:
                 continue
 
             ts = tick.get("exchange_timestamp")
-            sys_ts = int(time.time())
 
             if ts:
                 exch_ts = int(ts.timestamp())
-                now_ts = exch_ts if exch_ts >= sys_ts - 120 else sys_ts
+                now_ts = exch_ts if exch_ts >= recv_ts - 120 else recv_ts
+
+                skew = exch_ts - now
+                if self._skew_window is None or skew > self._skew_window:
+                    self._skew_window = skew
             else:
-                now_ts = sys_ts
+                now_ts = recv_ts
 
             # -----------------------------
             # Indices
             # -----------------------------
             if token in self.index_tokens:
-                MarketIndicesState.update_ltp(
-                    self.index_tokens[token],
-                    ltp,
-                )
+                index = self.index_tokens[token]
+                MarketIndicesState.update_ltp(index, ltp)
+
+                if index == "NIFTY":
+                    self._on_index_spot(ltp)
                 continue
 
-            if token not in self.builders:
+            builder = self.builders.get(token)
+            strategy = self.strategies.get(token)
+            if builder is None or strategy is None:
                 continue
 
-            builder = self.builders[token]
-            symbol = self.strategies[token].symbol
+            symbol = strategy.symbol
 
             LTPStore.update(symbol, ltp)
 
             # -----------------------------
-            # PAPER TRADE EXIT
+            # PAPER TRADE EXIT (IN-MEMORY INDEX — NO DB READ)
             # -----------------------------
-            open_paper_trades = get_open_paper_trades_for_symbol(
-                strategy_name="1M_SCALP",
+            if self.live_side_effects:
+                self._check_paper_exits(token, symbol, ltp)
+
+            builder.last_price = ltp
+
+            with self._bar_lock:
+                candle = builder.on_tick(ltp, now_ts)
+
+                if candle:
+                    self._record_close_lag(token, candle, origin="tick")
+                    # ⚠️ WS thread only ENQUEUES — per-token lane keeps order
+                    self._submit_candle(token, symbol, candle, t_recv)
+
+            if self._next_close_ts is None:
+                self._next_close_ts = (now_ts // self.timeframe_sec + 1) * self.timeframe_sec
+
+    def _check_paper_exits(self, token: int, symbol: str, ltp: float):
+        for t, reason in OpenPaperTradeIndex.take_exits(
+            symbol,
+            ltp,
+            strategy_name=PaperTradeRecorder.STRATEGY_NAME,
+        ):
+            def exit_paper(t=t, reason=reason, ltp=ltp):
+                PaperTradeRecorder.exit_trade(
+                    paper_trade_id=t.paper_trade_id,
+                    symbol=t.symbol,
+                    exit_price=ltp,
+                    exit_reason=reason,
+                )
+
+            if not self.pipeline.submit(
+                token,
+                exit_paper,
+                priority=JobPriority.SIGNAL,
+                label=f"paper_exit:{symbol}",
+            ):
+                # SIGNAL lane full / closed → back in the index, next tick retries
+                OpenPaperTradeIndex.restore(t)
+
+    # -------------------------------------------------
+    # BOUNDARY CLOSE (TIMER — NOT NEXT TICK)
+    # -------------------------------------------------
+
+    def _start_candle_timer(self):
+        if not self.candle_timer or self._timer_thread is not None:
+            return
+
+        self._timer_thread = threading.Thread(
+            target=self._candle_timer_loop,
+            name="candle-timer",
+            daemon=True,
+        )
+        self._timer_thread.start()
+
+    def _candle_timer_loop(self):
+        """
+        Wake CANDLE_CLOSE_GRACE_MS after every boundary (exchange clock)
+        and force-close all bars that ended there.
+        """
+        tf = self.timeframe_sec
+        grace = self.CANDLE_CLOSE_GRACE_MS / 1000.0
+
+        while not self._timer_stop.is_set():
+            exch_now = self.clock() + self._clock_skew
+            boundary = (int(exch_now) // tf + 1) * tf
+
+            wait = boundary + grace - exch_now
+            if self._timer_stop.wait(max(0.0, wait)):
+                return
+
+            try:
+                self._close_due(boundary, origin="timer")
+            except Exception as e:
+                write_audit_log(f"[CANDLE][TIMER][ERROR] {e}")
+
+    def _close_due(self, boundary: int, *, origin: str):
+        """
+        Close every open bar whose bucket ended at/before `boundary`.
+        Idempotent (timer + tick sweep may both call it).
+        """
+        # re-estimate exchange clock skew once per boundary
+        if self._skew_window is not None:
+            self._clock_skew = max(
+                -self.MAX_CLOCK_SKEW_SEC,
+                min(self.MAX_CLOCK_SKEW_SEC, self._skew_window),
+            )
+            self._skew_window = None
+
+        next_close = boundary + self.timeframe_sec
+        if self._next_close_ts is None or next_close > self._next_close_ts:
+            self._next_close_ts = next_close
+
+        t_recv = LATENCY.now() if LATENCY.enabled else 0
+
+        with self._lock:
+            builders = list(self.builders.items())
+
+        with self._bar_lock:
+            for token, builder in builders:
+                candle = builder.close_due(boundary)
+                if candle is None:
+                    continue
+
+                strategy = self.strategies.get(token)
+                if strategy is None:
+                    continue
+
+                self._record_close_lag(token, candle, origin=origin)
+                self._submit_candle(token, strategy.symbol, candle, t_recv)
+
+    def _record_close_lag(self, token: int, candle: Candle, *, origin: str):
+        lag_us = int((self.clock() + self._clock_skew - candle.end_ts) * 1_000_000)
+
+        h = self.close_lag.get(token)
+        if h is None:
+            h = self.close_lag[token] = LatencyHistogram()
+        h.record(lag_us)
+        self.close_lag_all.record(lag_us)
+        self.closed_by[origin] += 1
+
+    def candle_close_stats(self, per_token: bool = False) -> dict:
+        with self._lock:
+            builders = dict(self.builders)
+            strategies = dict(self.strategies)
+
+        out = {
+            "grace_ms": self.CANDLE_CLOSE_GRACE_MS,
+            "late_tick_policy": self.LATE_TICK_POLICY,
+            "clock_skew_sec": round(self._clock_skew, 3),
+            "timer_running": self._timer_thread is not None and not self._timer_stop.is_set(),
+            "closed_by": dict(self.closed_by),
+            "late_ticks": sum(b.late_ticks for b in builders.values()),
+            "close_lag": self.close_lag_all.summary(),
+        }
+
+        if per_token:
+            tokens = {}
+            for token, h in list(self.close_lag.items()):
+                strategy = strategies.get(token)
+                builder = builders.get(token)
+                tokens[strategy.symbol if strategy else str(token)] = {
+                    **h.summary(),
+                    "late_ticks": builder.late_ticks if builder else 0,
+                }
+            out["tokens"] = tokens
+
+        return out
+
+    # -------------------------------------------------
+    # CANDLE PIPELINE (WORKER LANES — NOT WS THREAD)
+    # -------------------------------------------------
+
+    def _submit_candle(self, token: int, symbol: str, candle: Candle, t_recv: int = 0):
+        def process(
+            candle=candle,
+            symbol=symbol,
+            token=token,
+            t_recv=t_recv,
+        ):
+            self._process_candle(
+                token=token,
                 symbol=symbol,
+                candle=candle,
+                t_recv=t_recv,
             )
+            # Higher timeframes: O(1), inline → never skipped behind the 1m bar
+            if self.rollup_minutes:
+                self._roll_up(token, symbol, candle)
+
+        if not self.pipeline.submit(
+            token,
+            process,
+            priority=JobPriority.SIGNAL,
+            label=f"signal:{symbol}",
+        ):
+            # indicators skip this bar → counted, visible in pipeline_stats()
+            with self._lock:
+                self.indicator_gaps[token] = self.indicator_gaps.get(token, 0) + 1
+            write_audit_log(f"[PIPELINE][GAP] {symbol} candle {candle.end_ts} not processed")
+
+    def _process_candle(
+        self,
+        *,
+        token: int,
+        symbol: str,
+        candle: Candle,
+        t_recv: int = 0,
+    ):
+        """
+        SIGNAL priority: indicators → conditions → strategy → router.
+        The timeline row goes to timeline_writer (group-committed off-lane).
+
+        Indicators run ONCE (shared cache); the primary strategy goes
+        first, secondary strategies read the same values after it.
+        """
+        ind_engine = self.indicators.get(token)
+        cache = self.indicator_caches.get(token)
+        strategy = self.strategies.get(token)
+        token_expiry = self.token_expiry.get(token)
+
+        if ind_engine is None or strategy is None:
+            return  # token released (universe re-centred)
+
+        # ⏱ latency only when enabled (t_recv == 0 → off)
+        lat = LATENCY if (t_recv and LATENCY.enabled) else None
+        if lat:
+            lat.record("candle_queue", t_recv, token)
+            t = lat.now()
 
-            for t in open_paper_trades:
-                PaperTradeRecorder.try_exit(
-                    paper_trade_id=t["paper_trade_id"],
-                    symbol=symbol,
-                    sl_price=t["sl_price"],
-                    tp_price=t["tp_price"],
+        try:
+            # 1️⃣ INDICATORS (every unique spec, once)
+            if cache is not None:
+                cache.update(candle)
+                ind_vals = ind_engine.values
+            else:
+                ind_vals = ind_engine.update(candle)
+            # same key market_timeline stores → restart resumes after it
+            self._indicator_ts[token] = candle.end_ts
+
+            if self.checkpoints is not None and self.checkpoints.due(symbol):
+                # state captured HERE (lane order) → written at PERSIST
+                state = ind_engine.get_state()
+                self.pipeline.submit(
+                    token,
+                    lambda ts=candle.end_ts, state=state: self.checkpoints.save(
+                        symbol=symbol, token=token, last_ts=ts, state=state,
+                    ),
+                    priority=JobPriority.PERSIST,
+                    label=f"checkpoint:{symbol}",
                 )
 
-            builder.last_price = ltp
-   
-            candle = builder.on_tick(ltp, now_ts)
-
-            if candle:
-                #write_audit_log(
-                    #f"[DEBUG][CANDLE_COMPLETE] symbol={symbol} "
-                    #f"candle_end={candle.end_ts} "
-                    #f"open={candle.open} close={candle.close}"
-                #)
-                
-                # ⚠️ CAPTURE VARIABLES IN CLOSURE - don't reference loop vars
-                def write_candle_async(
-                    candle=candle,
+            if lat:
+                lat.record("indicator", t, token)
+
+            if not ind_engine.is_ready():
+                self._submit_timeline(token, symbol, candle)
+                return
+
+            # 2️⃣ CONDITIONS
+            if lat:
+                t = lat.now()
+
+            conditions = self.condition_engine.evaluate(
+                candle=candle,
+                indicators=ind_vals,
+                is_trading_time=True,
+                no_open_trade=not strategy.in_trade,
+            )
+
+            # 3️⃣ STRATEGY
+            if lat:
+                lat.record("condition", t, token)
+                t = lat.now()
+
+            signal = strategy.on_candle(
+                candle,
+                ind_engine,
+                conditions,
+            )
+
+            if lat:
+                lat.record("strategy", t, token)
+
+            # 4️⃣ ROUTE BUY SIGNAL
+            if (
+                signal.is_buy
+                and self.primary_routes
+                and self.live_side_effects
+                and self.current_week_expiry is not None
+                and token_expiry == self.current_week_expiry
+            ):
+                if lat:
+                    lat.mark_origin(symbol, t_recv)
+                    t = lat.now()
+
+                signal_router.route_buy_signal(
                     symbol=symbol,
                     token=token,
-                    ind_engine=self.indicators[token],
-                    strategy=self.strategies[token],
-                    current_week_expiry=self.current_week_expiry,
-                    token_expiry=self.token_expiry.get(token)
+                    candle_ts=candle.end_ts,
+                    entry_price=signal.entry_price,
+                    sl_price=signal.sl,
+                    tp_price=signal.tp,
+                )
+
+                if lat:
+                    lat.record("route", t, token)
+                    lat.record("tick_to_signal", t_recv, token)
+
+            # 4️⃣b SECONDARY STRATEGIES (shared indicators)
+            extras = self.extra_strategies.get(token)
+            if extras and cache is not None:
+                self._run_extra_strategies(token, symbol, candle, cache, extras)
+
+            # 5️⃣ TIMELINE (LOWER PRIORITY)
+            self._submit_timeline(
+                token,
+                symbol,
+                candle,
+                indicators={
+                    "ema8": ind_vals["ema8"],
+                    "ema20_low": ind_vals["ema20_low"],
+                    "ema20_high": ind_vals["ema20_high"],
+                    "rsi_raw": ind_vals["rsi_raw"],
+                },
+                conditions=conditions,
+                signal="BUY" if signal.is_buy else None,
+            )
+
+        except Exception as e:
+            write_audit_log(f"[ERROR] Candle processing failed for {symbol}: {e}")
+
+    def _run_extra_strategies(
+        self,
+        token: int,
+        symbol: str,
+        candle: Candle,
+        cache: IndicatorCache,
+        extras: list,
+    ):
+        """
+        Each secondary strategy: own rules + own position state, indicator
+        values from the shared cache. One failing strategy never affects
+        the others (or the primary, which already ran).
+        """
+        for spec, strategy in extras:
+            try:
+                if not cache.is_ready(spec.all_indicators):
+                    continue
+
+                conditions = spec.conditions.evaluate(
+                    candle=candle,
+                    indicators=cache.inputs(spec),
+                    is_trading_time=True,
+                    no_open_trade=not strategy.in_trade,
+                )
+                signal = strategy.on_candle(candle, cache.engine(spec.engine), conditions)
+
+                if (
+                    signal.is_buy
+                    and spec.routes
+                    and self.live_side_effects
+                    and self.current_week_expiry is not None
+                    and self.token_expiry.get(token) == self.current_week_expiry
                 ):
-                    try:
-                        # ✅ Force fresh connection in thread
-                        from app.db.sqlite import get_conn
-                        conn = get_conn()
-                        
-                        #write_audit_log(f"[DEBUG] Thread DB path: {conn.execute('PRAGMA database_list').fetchone()}")
-                        #write_audit_log(f"[DEBUG] Writing candle to DB for {symbol}")
-                        
-                        # 1️⃣ INSERT RAW CANDLE
-                        write_market_timeline_row(
-                            candle=candle,
-                            indicators={},
-                            conditions={},
-                            signal=None,
-                            symbol=symbol,
-                            timeframe="1m",
-                            strategy_version="V1.9",
-                            mode="insert",
-                        )
-                        
-                        # Force commit
-                        conn.commit()
-                        
-                        # ... rest of the code                        
-                        # 2️⃣ INDICATORS
-                        ind_vals = ind_engine.update(candle)
-
-                        if not ind_engine.is_ready():
-                            return
-
-                        # 3️⃣ CONDITIONS
-                        conditions = self.condition_engine.evaluate(
-                            candle=candle,
-                            indicators=ind_vals,
-                            is_trading_time=True,
-                            no_open_trade=not strategy.in_trade,
-                        )
-
-                        # 4️⃣ STRATEGY
-                        signal = strategy.on_candle(
-                            candle,
-                            ind_engine,
-                            conditions,
-                        )
-
-                        # 5️⃣ ROUTE BUY SIGNAL
-                        if (
-                            signal.is_buy
-                            and current_week_expiry is not None
-                            and token_expiry == current_week_expiry
-                        ):
-                            signal_router.route_buy_signal(
-                                symbol=symbol,
-                                token=token,
-                                candle_ts=candle.end_ts,
-                                entry_price=signal.entry_price,
-                                sl_price=signal.sl,
-                                tp_price=signal.tp,
-                            )
-
-                        # 6️⃣ UPDATE TIMELINE
-                        write_market_timeline_row(
-                            candle=candle,
-                            indicators={
-                                "ema8": ind_vals["ema8"],
-                                "ema20_low": ind_vals["ema20_low"],
-                                "ema20_high": ind_vals["ema20_high"],
-                                "rsi_raw": ind_vals["rsi_raw"],
-                            },
-                            conditions=conditions,
-                            signal="BUY" if signal.is_buy else None,
-                            symbol=symbol,
-                            timeframe="1m",
-                            strategy_version="V1.9",
-                            mode="update",
-                        )
-                        
-                    except Exception as e:
-                        write_audit_log(f"[ERROR] Candle processing failed for {symbol}: {e}")
-                
-                # Start background thread
-                threading.Thread(target=write_candle_async, daemon=True).start()
+                    signal_router.route_buy_signal(
+                        symbol=symbol,
+                        token=token,
+                        candle_ts=candle.end_ts,
+                        entry_price=signal.entry_price,
+                        sl_price=signal.sl,
+                        tp_price=signal.tp,
+                    )
+
+                if self.live_side_effects:
+                    timeline_writer.submit(build_strategy_signal_row(
+                        candle=candle,
+                        conditions=conditions,
+                        signal=signal,
+                        symbol=symbol,
+                        timeframe="1m",
+                        strategy_version=spec.version,
+                    ))
+
+            except Exception as e:
+                write_audit_log(
+                    f"[STRATEGY][{spec.version}][ERROR] {symbol}: {e}"
+                )
+
+    def strategy_stats(self) -> dict:
+        with self._lock:
+            caches = list(self.indicator_caches.values())
+            extras = sum(len(v) for v in self.extra_strategies.values())
+
+        return {
+            "strategies": self.registry.describe(),
+            "tokens": len(caches),
+            "indicator_engines": sum(len(c.engines) for c in caches),
+            "secondary_instances": extras,
+            "candles_computed": sum(c.updates for c in caches),
+        }
+
+    def _submit_timeline(
+        self,
+        token: int,
+        symbol: str,
+        candle: Candle,
+        *,
+        indicators: Optional[dict] = None,
+        conditions: Optional[dict] = None,
+        signal: Optional[str] = None,
+        timeframe: str = "1m",
+    ):
+        if not self.live_side_effects:
+            return
+
+        # ONE complete row per candle → group-committed per minute
+        try:
+            row = build_timeline_row(
+                candle=candle,
+                indicators=indicators,
+                conditions=conditions,
+                signal=signal,
+                symbol=symbol,
+                timeframe=timeframe,
+                strategy_version=self.strategy_version,
+            )
+        except Exception as e:
+            write_audit_log(f"[TIMELINE][ERROR] {symbol}: {e}")
+            return
+
+        timeline_writer.submit(row)
+
+    # -------------------------------------------------
+    # HIGHER TIMEFRAMES (ROLLUP)
+    # -------------------------------------------------
+
+    def subscribe_timeframe(self, timeframe, callback: Callable):
+        """
+        callback(token, symbol, candle) for every closed `timeframe` bar
+        ("5m" or 5). Runs on the token's pipeline lane — keep it short.
+        """
+        label = timeframe_label(timeframe) if isinstance(timeframe, int) else timeframe
+        with self._lock:
+            self._tf_subscribers.setdefault(label, []).append(callback)
+
+    def unsubscribe_timeframe(self, timeframe, callback: Callable):
+        label = timeframe_label(timeframe) if isinstance(timeframe, int) else timeframe
+        with self._lock:
+            subs = self._tf_subscribers.get(label, [])
+            if callback in subs:
+                subs.remove(callback)
+
+    def recent_candles(self, symbol: str, timeframe: str, n: int = 50) -> List[Candle]:
+        token = self.symbol_token.get(symbol)
+        rollup = self.rollups.get(token) if token is not None else None
+        if rollup is None or timeframe not in rollup.recent:
+            return []
+        return list(rollup.recent[timeframe])[-n:]
+
+    def _roll_up(self, token: int, symbol: str, candle: Candle):
+        """
+        End of the token's SIGNAL job: rollup state advances in 1m order.
+        Only the closed bars' timeline rows + subscribers go to PERSIST.
+        """
+        rollup = self.rollups.get(token)
+        if rollup is None:
+            return  # token released
+
+        closed = rollup.on_candle(candle)
+        if closed:
+            self.pipeline.submit(
+                token,
+                lambda: self._fan_out_rolled(token, symbol, closed),
+                priority=JobPriority.PERSIST,
+                label=f"rollup:{symbol}",
+            )
+
+    def _fan_out_rolled(self, token: int, symbol: str, closed: list):
+        for label, rolled in closed:
+            self._submit_timeline(token, symbol, rolled, timeframe=label)
+
+            for callback in list(self._tf_subscribers.get(label, ())):
+                try:
+                    callback(token, symbol, rolled)
+                except Exception as e:
+                    write_audit_log(f"[ROLLUP][SUBSCRIBER][ERROR] {label} {symbol}: {e}")
+
+    # -------------------------------------------------
+    # SHUTDOWN / STATS
+    # -------------------------------------------------
+
+    def shutdown(self, timeout: float = 10.0) -> bool:
+        """
+        Stop the WS (best-effort) and drain queued candle work.
+        """
+        self._timer_stop.set()
+
+        try:
+            self.kws.close()
+        except Exception:
+            pass
+
+        drained = self.pipeline.shutdown(drain=True, timeout=timeout)
+        timeline_writer.flush(timeout=timeout)
+        (self.debug_sink or candle_debug_sink).flush(timeout=timeout)
+
+        if self.checkpoints is not None and drained:
+            saved = self.checkpoint_indicators()
+            write_audit_log(f"[CHECKPOINT] shutdown saved={saved}")
+
+        if self.journal is not None:
+            self.journal.close()
+
+        return drained
+
+    def pipeline_stats(self) -> dict:
+        with self._lock:
+            gaps = dict(self.indicator_gaps)
+        return {
+            **self.pipeline.stats(),
+            "indicator_gaps": sum(gaps.values()),
+            "gap_tokens": len(gaps),
+        }
 
     def get_ltp(self, symbol: str):
         return LTPStore.get(symbol)
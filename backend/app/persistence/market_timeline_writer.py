@@ -1,11 +1,106 @@
 from app.db.timeline_repo import (
     insert_timeline_row,
     update_timeline_row,
+    _b,
 )
 from app.candles.candle_builder import Candle
+from app.engine.condition_engine_v1_9 import CONDITION_BITS, ConditionEngineV19
 from app.event_bus.audit_logger import write_audit_log
 from app.db.db_lock import DB_LOCK
 from typing import Optional
+import json
+import time
+
+
+# market_timeline conditions, in bit order (stored packed as cond_mask)
+CONDITION_KEYS = tuple(CONDITION_BITS)
+
+
+def build_timeline_row(
+    *,
+    candle: Candle,
+    indicators: Optional[dict],
+    conditions: Optional[dict],
+    signal: Optional[str],
+    symbol: str,
+    timeframe: str,
+    strategy_version: str,
+) -> dict:
+    """
+    ONE complete market_timeline row per candle (for upsert).
+    Indicators / conditions may be None (not ready yet).
+    """
+    if not candle or not candle.end_ts:
+        raise RuntimeError(
+            f"[TIMELINE] Invalid candle or missing end_ts | "
+            f"symbol={symbol} timeframe={timeframe}"
+        )
+
+    indicators = indicators or {}
+
+    row = {
+        "symbol": symbol,
+        "timeframe": timeframe.lower().strip(),
+        "ts": candle.end_ts,
+        "open": candle.open,
+        "high": candle.high,
+        "low": candle.low,
+        "close": candle.close,
+        "ema8": indicators.get("ema8"),
+        "ema20_low": indicators.get("ema20_low"),
+        "ema20_high": indicators.get("ema20_high"),
+        "rsi_raw": indicators.get("rsi_raw"),
+        "cond_mask": ConditionEngineV19.pack(conditions),
+        "signal": signal,
+        "strategy_version": strategy_version,
+        "created_at": int(time.time()),
+    }
+
+    return row
+
+
+# Rows for strategy_signals (secondary strategies) carry this marker
+# so the shared timeline writer can route them to their own table.
+STRATEGY_SIGNAL_KIND = "strategy_signal"
+
+
+def build_strategy_signal_row(
+    *,
+    candle: Candle,
+    conditions: dict,
+    signal,
+    symbol: str,
+    timeframe: str,
+    strategy_version: str,
+) -> dict:
+    """
+    ONE strategy_signals row per candle per secondary strategy.
+    `signal`: strategy Signal (BUY / EXIT fields).
+    """
+    if signal.is_buy:
+        label = "BUY"
+    elif signal.is_exit:
+        label = f"EXIT_{signal.exit_reason}"
+    else:
+        label = None
+
+    return {
+        "kind": STRATEGY_SIGNAL_KIND,
+        "symbol": symbol,
+        "timeframe": timeframe.lower().strip(),
+        "ts": candle.end_ts,
+        "strategy_version": strategy_version,
+        "cond_all": _b(conditions.get("cond_all")),
+        "conditions": json.dumps(
+            {k: _b(v) for k, v in conditions.items()},
+            separators=(",", ":"),
+        ),
+        "signal": label,
+        "entry_price": signal.entry_price if signal.is_buy else None,
+        "sl": signal.sl if signal.is_buy else None,
+        "tp": signal.tp if signal.is_buy else None,
+        "created_at": int(time.time()),
+    }
 
 
 def write_market_timeline_row(
@@ -88,21 +183,8 @@ def write_market_timeline_row(
                 "ema20_high": indicators.get("ema20_high"),
                 "rsi_raw": indicators.get("rsi_raw"),
 
-                # Conditions
-                "cond_close_gt_open": conditions.get("cond_close_gt_open"),
-                "cond_close_gt_ema8": conditions.get("cond_close_gt_ema8"),
-                "cond_close_ge_ema20": conditions.get("cond_close_ge_ema20"),
-                "cond_close_not_above_ema20": conditions.get("cond_close_not_above_ema20"),
-                "cond_not_touching_high": conditions.get("cond_not_touching_high"),
-
-                "cond_rsi_ge_40": conditions.get("cond_rsi_ge_40"),
-                "cond_rsi_le_65": conditions.get("cond_rsi_le_65"),
-                "cond_rsi_range": conditions.get("cond_rsi_range"),
-                "cond_rsi_rising": conditions.get("cond_rsi_rising"),
-
-                "cond_is_trading_time": conditions.get("cond_is_trading_time"),
-                "cond_no_open_trade": conditions.get("cond_no_open_trade"),
-                "cond_all": conditions.get("cond_all"),
+                # Conditions (packed)
+                "cond_mask": ConditionEngineV19.pack(conditions),
 
                 "signal": signal,
             },
@@ -140,7 +222,7 @@ def write_market_timeline_row(
                 ts=candle.end_ts,
                 data={
                     **indicators,
-                    **conditions,
+                    "cond_mask": ConditionEngineV19.pack(conditions),
                     "signal": signal,
                 },
             )
@@ -0,0 +1,193 @@
+# backend/app/persistence/timeline_writer.py
+
+from queue import Empty, Full, Queue
+from typing import List, Optional
+import threading
+import time
+
+from app.db.sqlite import db_writer
+from app.db.timeline_repo import upsert_strategy_signal_rows, upsert_timeline_rows
+from app.persistence.market_timeline_writer import STRATEGY_SIGNAL_KIND
+from app.event_bus.audit_logger import write_audit_log
+
+
+class TimelineBatchWriter:
+    """
+    Dedicated market_timeline writer (group commit).
+
+    RULES:
+    - submit() NEVER blocks (overflow → row dropped + counted)
+    - ONE upsert per candle row
+    - all rows of the same candle ts (same minute) → ONE transaction
+      (market_timeline rows + secondary-strategy strategy_signals rows),
+      committed as one job on the shared DB writer thread
+    - a batch closes when: next minute's row arrives, `linger_sec`
+      elapsed since its first row, or `max_batch` rows reached
+    """
+
+    def __init__(
+        self,
+        *,
+        linger_sec: float = 0.5,
+        max_batch: int = 500,
+        max_queue: int = 20000,
+    ):
+        self.linger_sec = linger_sec
+        self.max_batch = max_batch
+
+        self._q: "Queue[dict]" = Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stop = False
+
+        # Metrics
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.rows = 0
+        self.failed_rows = 0
+        self.dropped_rows = 0
+        self.last_batch_rows = 0
+        self.last_batch_ms = 0.0
+        self.max_batch_ms = 0.0
+        self.total_batch_ms = 0.0
+
+    # -------------------------------------------------
+    # Public API
+    # -------------------------------------------------
+
+    def submit(self, row: dict) -> bool:
+        self._ensure_started()
+        try:
+            self._q.put_nowait(row)
+            return True
+        except Full:
+            with self._stats_lock:
+                self.dropped_rows += 1
+            return False
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """
+        Wait until every submitted row has been committed (or failed).
+        """
+        deadline = time.monotonic() + timeout
+        while self._q.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def shutdown(self, timeout: float = 10.0) -> bool:
+        flushed = self.flush(timeout)
+        self._stop = True
+        return flushed
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "queue_depth": self._q.qsize(),
+                "batches": self.batches,
+                "rows": self.rows,
+                "failed_rows": self.failed_rows,
+                "dropped_rows": self.dropped_rows,
+                "last_batch_rows": self.last_batch_rows,
+                "last_batch_ms": round(self.last_batch_ms, 3),
+                "max_batch_ms": round(self.max_batch_ms, 3),
+                "avg_batch_ms": (
+                    round(self.total_batch_ms / self.batches, 3)
+                    if self.batches else 0.0
+                ),
+            }
+
+    # -------------------------------------------------
+    # Writer thread
+    # -------------------------------------------------
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="timeline-writer",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def _run(self):
+        pending: Optional[dict] = None
+
+        while not self._stop:
+            if pending is None:
+                try:
+                    pending = self._q.get(timeout=1.0)
+                except Empty:
+                    continue
+
+            batch: List[dict] = [pending]
+            bucket = pending["ts"]
+            pending = None
+            deadline = time.monotonic() + self.linger_sec
+
+            # Collect the rest of this minute
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    row = self._q.get(timeout=remaining)
+                except Empty:
+                    break
+
+                if row["ts"] != bucket:
+                    pending = row      # next minute → starts next batch
+                    break
+                batch.append(row)
+
+            self._commit(batch)
+
+    def _commit(self, batch: List[dict]):
+        t0 = time.perf_counter()
+
+        def _upsert(conn):
+            signals = [r for r in batch if r.get("kind") == STRATEGY_SIGNAL_KIND]
+            if signals:
+                upsert_timeline_rows(
+                    [r for r in batch if r.get("kind") != STRATEGY_SIGNAL_KIND],
+                    conn,
+                )
+                upsert_strategy_signal_rows(signals, conn)
+            else:
+                upsert_timeline_rows(batch, conn)
+
+        try:
+            db_writer.run(_upsert, label="timeline_batch", transaction=True)
+            ok = True
+        except Exception as e:
+            ok = False
+            write_audit_log(
+                f"[TIMELINE][BATCH][ERROR] rows={len(batch)} ts={batch[0].get('ts')} ERR={e}"
+            )
+
+        ms = (time.perf_counter() - t0) * 1000.0
+
+        with self._stats_lock:
+            if ok:
+                self.batches += 1
+                self.rows += len(batch)
+                self.last_batch_rows = len(batch)
+                self.last_batch_ms = ms
+                self.total_batch_ms += ms
+                if ms > self.max_batch_ms:
+                    self.max_batch_ms = ms
+            else:
+                self.failed_rows += len(batch)
+
+        for _ in batch:
+            self._q.task_done()
+
+
+# -------------------------
+# Singleton
+# -------------------------
+timeline_writer = TimelineBatchWriter()
@@ -5,7 +5,7 @@ from kiteconnect import KiteConnect
 from app.brokers.zerodha_auth import load_access_token
 from app.config.zerodha_credentials import API_KEY
 
-from app.config.strategy_loader import load_strategy_config
+from app.config.strategy_loader import get_strategy_config
 from app.event_bus.log_bus import log_bus
 
 # -------------------------
@@ -77,7 +77,7 @@ def check_max_loss() -> bool:
     if _halted_today:
         return True
 
-    cfg = load_strategy_config()
+    cfg = get_strategy_config()
     limit = cfg.get("risk", {}).get("max_loss_per_day")
     if not limit:
         return False
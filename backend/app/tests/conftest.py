@@ -0,0 +1,103 @@
+"""
+conftest.py
+
+Shared test fixtures (plain helpers — the tests here run as scripts
+AND under pytest)
+-----------------------------------------------------------------
+- instruments_frame()   minimal instrument dump (NIFTY 50 + weekly CEs)
+- tick_engine()         ZerodhaTickEngine on it: fake ticker, scratch DB,
+                        no side effects / timer / debug output
+- capture_candles()     record every candle the engine closes
+
+Data factories (scratch_db, synthetic_candles, session_ts,
+make_timeline_rows, timeline_dicts) live in app.tools.fixtures, shared
+with the benchmarks.
+"""
+
+import contextlib
+from datetime import date, timedelta
+
+import pandas as pd
+
+from app.tools.fixtures import scratch_db
+
+
+# =========================
+# Tick engine
+# =========================
+
+NIFTY_TOKEN = 256265
+OPTION_TOKEN0 = 10_000          # option token = OPTION_TOKEN0 + strike index
+STRIKES = tuple(range(24000, 26001, 50))
+
+
+def instruments_frame(strikes=STRIKES) -> pd.DataFrame:
+    """
+    Normalized dump (load_instruments_df() shape): the NIFTY 50 index and
+    one CE per strike on a weekly expiry a few days out.
+    """
+    expiry = date.today() + timedelta(days=3)
+    rows = [{
+        "instrument_token": NIFTY_TOKEN, "tradingsymbol": "NIFTY 50", "name": "NIFTY 50",
+        "segment": "INDICES", "expiry": None, "strike": 0.0,
+    }]
+    for i, k in enumerate(strikes):
+        rows.append({
+            "instrument_token": OPTION_TOKEN0 + i, "tradingsymbol": f"NIFTYZZ{k}CE", "name": "NIFTY",
+            "segment": "NFO-OPT", "expiry": expiry, "strike": float(k),
+        })
+    return pd.DataFrame(rows)
+
+
+def option_token(strike) -> int:
+    return OPTION_TOKEN0 + STRIKES.index(int(strike))
+
+
+@contextlib.contextmanager
+def tick_engine(strikes, **kw):
+    """
+    ZerodhaTickEngine subscribed to `strikes` (of STRIKES) on a scratch
+    DB. Defaults: FakeKiteTicker, live_side_effects=False, no candle
+    timer, debug off; `kw` overrides. Shut down + unregistered afterwards.
+    """
+    from app.marketdata import zerodha_tick_engine as zte
+    from app.marketdata.tick_replay import FakeKiteTicker
+    from app.utils.candle_debug_logger import LEVEL_OFF, CandleDebugSink
+
+    opts = {
+        "ticker": FakeKiteTicker(),
+        "live_side_effects": False,
+        "candle_timer": False,
+        "debug_sink": CandleDebugSink(level=LEVEL_OFF),
+        **kw,
+    }
+    df = instruments_frame()
+    saved = zte.load_instruments_df
+    with scratch_db():
+        zte.load_instruments_df = lambda: df
+        try:
+            engine = zte.ZerodhaTickEngine(None, [option_token(k) for k in strikes], **opts)
+        finally:
+            zte.load_instruments_df = saved
+        try:
+            yield engine
+        finally:
+            engine.shutdown(timeout=5.0)
+            if engine in zte._WS_ENGINE_REGISTRY:
+                zte._WS_ENGINE_REGISTRY.remove(engine)
+
+
+def capture_candles(engine) -> list:
+    """
+    (token, start_ts, end_ts, open, high, low, close) of every candle
+    the engine closes, in submit order (still processed as usual).
+    """
+    closed = []
+    submit = engine._submit_candle
+
+    def capture(token, symbol, candle, t_recv=0):
+        closed.append((token, candle.start_ts, candle.end_ts, candle.open, candle.high, candle.low, candle.close))
+        submit(token, symbol, candle, t_recv)
+
+    engine._submit_candle = capture
+    return closed
@@ -0,0 +1,135 @@
+"""
+test_audit_log_writer.py
+
+Queue-backed audit log writer (AuditLogWriter)
+----------------------------------------------
+✔ Same line format + IST day file as the synchronous writer
+✔ Many threads → every line written once, one handle, batched
+✔ Level from tags: INFO drops [..][DEBUG] lines, counts them
+✔ Critical lines fsync'ed and written without waiting for the interval
+✔ Queue full → non-critical dropped + counted; critical kept
+✔ After shutdown → direct append, never raises
+
+Run:
+    python -m app.tests.test_audit_log_writer
+"""
+
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from app.event_bus.audit_logger import (
+    DEBUG,
+    ERROR,
+    INFO,
+    IST_OFFSET_SEC,
+    AuditLogWriter,
+    classify,
+)
+
+
+LINE_RE = re.compile(r"^\[\d\d:\d\d:\d\d\] ")
+
+
+def _today_file(d: Path) -> Path:
+    day = time.strftime("%Y-%m-%d", time.gmtime(time.time() + IST_OFFSET_SEC))
+    return d / f"{day}.log"
+
+
+def test_classify():
+    assert classify("[ROUTER][DEBUG] ENTER route_buy_signal") == (DEBUG, False)
+    assert classify("[TRACE][TRADE_ENGINE] on_candle") == (DEBUG, False)
+    assert classify("[ENGINE] Current weekly expiry") == (INFO, False)
+    assert classify("[WS][FATAL] boom") == (ERROR, True)
+    assert classify("[ZERODHA-BUY-PLACED] NIFTY 100") == (INFO, True)
+    assert classify("[PAPER][ENTRY] X entry=1") == (INFO, True)
+    assert classify("[PAPER][SKIP] OPEN_TRADE_EXISTS")[1] is False
+
+
+def test_threads_batched_one_file():
+    with tempfile.TemporaryDirectory() as d:
+        w = AuditLogWriter(Path(d), level=DEBUG, fsync="never")
+
+        def worker(k):
+            for i in range(500):
+                w.write(f"[ENGINE] t={k} i={i}")
+
+        threads = [threading.Thread(target=worker, args=(k,)) for k in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert w.flush(5.0)
+
+        lines = _today_file(Path(d)).read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 4000
+        assert all(LINE_RE.match(x) for x in lines)
+        for k in range(8):
+            mine = [x for x in lines if f" t={k} " in x]
+            assert [int(x.rsplit("=", 1)[1]) for x in mine] == list(range(500))
+
+        st = w.stats()
+        assert st["written"] == 4000 and st["dropped"] == 0
+        assert st["batches"] < 4000
+        w.shutdown()
+
+
+def test_levels_and_critical():
+    with tempfile.TemporaryDirectory() as d:
+        w = AuditLogWriter(Path(d), level=INFO, fsync="critical", flush_interval=30.0)
+
+        w.write("[ENGINE] first")                # starts the writer, waits
+        w.write("[ROUTER][DEBUG] hidden")
+        w.write("[ZERODHA-BUY-PLACED] NIFTY 100")   # wakes the writer now
+
+        path = _today_file(Path(d))
+        deadline = time.time() + 5
+        while time.time() < deadline and w.written < 2:
+            time.sleep(0.01)
+
+        text = path.read_text(encoding="utf-8")
+        assert "first" in text and "BUY-PLACED" in text
+        assert "hidden" not in text
+        assert w.filtered == 1
+        assert w.fsyncs >= 1
+
+        w.set_level(DEBUG)
+        w.write("[ROUTER][DEBUG] shown")
+        assert w.flush(5.0)
+        assert "shown" in path.read_text(encoding="utf-8")
+        w.shutdown()
+
+
+def test_overflow_and_after_shutdown():
+    with tempfile.TemporaryDirectory() as d:
+        w = AuditLogWriter(Path(d), fsync="never", max_queue=50, flush_interval=30.0)
+
+        for i in range(200):
+            w.write(f"[ENGINE] n={i}")
+        assert w.dropped >= 100
+        w.write("[ZERODHA-GTT-PLACED] kept")       # critical: never dropped
+        assert w.flush(5.0)
+        assert "kept" in _today_file(Path(d)).read_text(encoding="utf-8")
+
+        w.shutdown()
+        w.write("[SYSTEM] after shutdown")
+        assert "after shutdown" in _today_file(Path(d)).read_text(encoding="utf-8")
+
+
+def main():
+    print("\n=== AUDIT LOG WRITER ===")
+    test_classify()
+    print("level / critical from tags ✔")
+    test_threads_batched_one_file()
+    print("8 threads × 500 lines, ordered, batched ✔")
+    test_levels_and_critical()
+    print("INFO filters DEBUG, critical fsync'ed immediately ✔")
+    test_overflow_and_after_shutdown()
+    print("bounded queue, post-shutdown direct append ✔")
+    print("\n=== TEST COMPLETE ===\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+test_candle_array_parity.py
+
+CandleArrayBuilder vs CandleBuilder.on_tick (tick-by-tick reference)
+--------------------------------------------------------------------
+✔ Bucket alignment (strict tf buckets)
+✔ Same-bucket OHLC updates across batch boundaries
+✔ Late / backwards ticks close the open bar (same as reference)
+✔ Dedup on last_emitted_end_ts (seeded + running)
+✔ Token add / remove slot reuse
+
+Run:
+    python -m app.tests.test_candle_array_parity
+"""
+
+import random
+
+from app.candles.candle_array import CandleArrayBuilder
+from app.candles.candle_builder import CandleBuilder
+
+
+TF = 60
+BASE_TS = 1_767_000_000 - (1_767_000_000 % TF)
+
+
+def _reference(builders, tokens, ltps, tss):
+    out = {}
+    for token, ltp, ts in zip(tokens, ltps, tss):
+        c = builders[token].on_tick(ltp, ts)
+        if c:
+            out.setdefault(token, []).append(
+                (c.start_ts, c.end_ts, c.open, c.high, c.low, c.close)
+            )
+    return out
+
+
+def _array(agg, tokens, ltps, tss):
+    out = {}
+    batch = agg.on_ticks(tokens, ltps, tss)
+    for i in range(len(batch)):
+        out.setdefault(int(batch.token[i]), []).append((
+            int(batch.start_ts[i]), int(batch.end_ts[i]),
+            float(batch.open[i]), float(batch.high[i]),
+            float(batch.low[i]), float(batch.close[i]),
+        ))
+    return out
+
+
+def _random_session(rng, tokens, n_ticks, late_pct):
+    ts = BASE_TS
+    rows = []
+    for _ in range(n_ticks):
+        ts += rng.choice((0, 0, 1, 2, 5, 17, 61))
+        tick_ts = ts
+        if rng.random() < late_pct:
+            tick_ts -= rng.choice((30, 60, 120, 181))
+        rows.append((
+            rng.choice(tokens),
+            round(100 + rng.uniform(-5, 5), 2),
+            tick_ts,
+        ))
+    return rows
+
+
+def check_parity(seed: int, n_tokens: int = 25, n_ticks: int = 20000, late_pct: float = 0.03):
+    rng = random.Random(seed)
+    tokens = [100000 + i for i in range(n_tokens)]
+
+    seeded = {t: BASE_TS + 120 for t in tokens[: n_tokens // 3]}
+
+    builders = {
+        t: CandleBuilder(t, TF, last_candle_end_ts=seeded.get(t))
+        for t in tokens
+    }
+    agg = CandleArrayBuilder(TF, capacity=4)   # forces growth
+    for t in tokens:
+        agg.add(t, last_candle_end_ts=seeded.get(t))
+
+    rows = _random_session(rng, tokens, n_ticks, late_pct)
+
+    i = 0
+    emitted = 0
+    while i < len(rows):
+        size = rng.choice((1, 3, 40, 250))
+        chunk = rows[i:i + size]
+        i += size
+
+        toks = [r[0] for r in chunk]
+        ltps = [r[1] for r in chunk]
+        tss = [r[2] for r in chunk]
+
+        want = _reference(builders, toks, ltps, tss)
+        got = _array(agg, toks, ltps, tss)
+
+        assert got == want, f"seed={seed} batch@{i}: {got} != {want}"
+        emitted += sum(len(v) for v in want.values())
+
+    # open bars match too
+    for t in tokens:
+        b = builders[t]
+        cur = agg.current(t)
+        if b.current_bucket_start is None:
+            assert cur is None
+        else:
+            assert cur["start_ts"] == b.current_bucket_start
+            assert (cur["open"], cur["high"], cur["low"], cur["close"]) == (b.o, b.h, b.l, b.c)
+
+    return emitted
+
+
+def check_slot_reuse():
+    agg = CandleArrayBuilder(TF, capacity=2)
+    agg.add(1)
+    agg.add(2)
+    agg.on_ticks([1, 2], [10.0, 20.0], [BASE_TS, BASE_TS])
+
+    agg.remove(1)
+    assert agg.current(1) is None
+    slot = agg.add(3)
+    assert slot == 0 and agg.current(3) is None
+
+    # unknown / removed tokens are ignored
+    batch = agg.on_ticks([1, 3, 2], [11.0, 30.0, 21.0], [BASE_TS + TF] * 3)
+    assert list(batch.token) == [2]
+    assert batch.candles()[0].close == 20.0
+
+
+def test_candle_array_parity():
+    for seed in range(5):
+        check_parity(seed)
+    check_parity(99, late_pct=0.3)
+
+
+def test_candle_array_slot_reuse():
+    check_slot_reuse()
+
+
+def main():
+    print("\n=== CANDLE ARRAY PARITY ===")
+    for seed in range(5):
+        n = check_parity(seed)
+        print(f"seed={seed} candles={n} ✔")
+    n = check_parity(99, late_pct=0.3)
+    print(f"seed=99 (30% late) candles={n} ✔")
+    check_slot_reuse()
+    print("slot reuse ✔")
+    print("\n=== TEST COMPLETE ===\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+test_candle_close.py
+
+Boundary candle close with an injected clock (no sleeps, no timer thread)
+------------------------------------------------------------------------
+✔ CandleBuilder.close_due(now): not before the bucket end, exactly at it,
+  once (idempotent); next tick starts a fresh bucket
+✔ LATE_DROP: ticks for an emitted / older bucket counted, never reopen it
+  (LATE_REOPEN: old bucket restarted, duplicate close suppressed)
+✔ Engine grace window: a straggler inside CANDLE_CLOSE_GRACE_MS still
+  lands in its bar; past it the sweep closes first and drops the tick
+✔ Timer close at boundary + grace; close_lag = close time − candle end
+  (exchange clock), per token + overall; candle_close_stats()
+
+Run:
+    python -m app.tests.test_candle_close
+"""
+
+from datetime import datetime
+
+from app.candles.candle_builder import LATE_DROP, LATE_REOPEN, CandleBuilder
+from app.tests.conftest import capture_candles, option_token, tick_engine
+from app.tools.fixtures import DAY0
+
+
+T0 = DAY0 + 60 * 10        # minute boundary
+
+
+def test_builder_close_due():
+    b = CandleBuilder(1, 60, late_policy=LATE_DROP)
+    for ts, ltp in ((T0 + 1, 100.0), (T0 + 30, 105.0), (T0 + 59, 98.0)):
+        assert b.on_tick(ltp, ts) is None
+
+    assert b.close_due(T0 + 59) is None
+    c = b.close_due(T0 + 60)
+    assert (c.start_ts, c.end_ts, c.open, c.high, c.low, c.close) == (T0, T0 + 60, 100.0, 105.0, 98.0, 98.0)
+    assert b.close_due(T0 + 60) is None and b.close_due(T0 + 120) is None
+
+    # straggler for the closed minute: dropped, bar stays closed
+    assert b.on_tick(97.0, T0 + 59) is None
+    assert b.late_ticks == 1 and b.current_bucket_start is None
+
+    # next minute opens normally; a tick behind the open bar is late too
+    assert b.on_tick(99.0, T0 + 61) is None
+    assert b.on_tick(96.0, T0 + 45) is None
+    assert b.late_ticks == 2
+    assert (b.current_bucket_start, b.o, b.l) == (T0 + 60, 99.0, 99.0)
+
+    # legacy policy: the straggler restarts the old bucket, its close is a duplicate
+    r = CandleBuilder(1, 60, late_policy=LATE_REOPEN)
+    r.on_tick(100.0, T0 + 1)
+    assert r.close_due(T0 + 60).end_ts == T0 + 60
+    r.on_tick(97.0, T0 + 59)
+    assert r.current_bucket_start == T0 and r.late_ticks == 0
+    assert r.on_tick(99.0, T0 + 61) is None
+
+
+def _tick(engine, token, ltp, exch_ts):
+    engine.kws.emit([{
+        "instrument_token": token,
+        "last_price": ltp,
+        "exchange_timestamp": datetime.fromtimestamp(exch_ts),
+    }])
+
+
+def test_engine_grace_and_lag():
+    with tick_engine([25000, 25050]) as engine:
+        engine.kws.connect()
+        grace = engine.CANDLE_CLOSE_GRACE_MS / 1000.0
+        a, b = option_token(25000), option_token(25050)
+        closed = capture_candles(engine)
+        now = [0.0]
+        engine.clock = lambda: now[0]
+
+        # received on the exchange second → measured clock skew 0
+        now[0] = T0 + 10
+        _tick(engine, a, 100.0, T0 + 10)
+        _tick(engine, b, 50.0, T0 + 10)
+        assert engine._next_close_ts == T0 + 60
+
+        # inside the grace window: no close yet, the straggler joins its bar
+        now[0] = T0 + 60 + grace * 0.6
+        _tick(engine, a, 104.0, T0 + 59)
+        assert closed == [] and engine.builders[a].h == 104.0
+
+        # past grace: the sweep closes both bars, then the straggler is late
+        now[0] = T0 + 60 + grace * 1.2
+        _tick(engine, a, 90.0, T0 + 59)
+        assert sorted(closed) == [
+            (a, T0, T0 + 60, 100.0, 104.0, 100.0, 104.0),
+            (b, T0, T0 + 60, 50.0, 50.0, 50.0, 50.0),
+        ]
+        assert engine.builders[a].late_ticks == 1
+        assert engine.closed_by == {"timer": 0, "sweep": 2, "tick": 0}
+        assert engine._next_close_ts == T0 + 120
+        assert engine._clock_skew == 0.0
+
+        lag_us = int(grace * 1.2 * 1_000_000)
+        assert abs(engine.close_lag[a].max_us - lag_us) <= 1
+
+        # timer close of the next minute, fired at boundary + grace
+        now[0] = T0 + 61
+        _tick(engine, a, 101.0, T0 + 61)
+        now[0] = T0 + 120 + grace
+        engine._close_due(T0 + 120, origin="timer")
+        assert closed[-1] == (a, T0 + 60, T0 + 120, 101.0, 101.0, 101.0, 101.0)
+        assert engine.closed_by["timer"] == 1
+        assert engine._next_close_ts == T0 + 180
+
+        # a second firing for the same boundary is a no-op
+        engine._close_due(T0 + 120, origin="sweep")
+        assert len(closed) == 3
+
+        s = engine.candle_close_stats(per_token=True)
+        assert s["late_ticks"] == 1 and s["closed_by"]["sweep"] == 2
+        assert s["close_lag"]["count"] == 3
+        assert s["tokens"]["NIFTYZZ25000CE"]["count"] == 2
+        assert s["tokens"]["NIFTYZZ25000CE"]["late_ticks"] == 1
+        assert abs(s["close_lag"]["max_ms"] - grace * 1.2 * 1000) < 0.01
+        assert engine.pipeline.drain(timeout=5.0)
+
+
+def main():
+    print("\n=== CANDLE CLOSE ===")
+    test_builder_close_due()
+    print("close_due at the boundary, late ticks dropped ✔")
+    test_engine_grace_and_lag()
+    print("grace window, sweep / timer close, close_lag ✔")
+    print("\n=== TEST COMPLETE ===\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+test_candle_debug_sink.py
+
+Shared buffered CandleDebugLogger sink
+--------------------------------------
+✔ Many loggers → ONE file per day, header once, every line written
+✔ Day rollover by line timestamp
+✔ Bounded buffer: overflow dropped + counted, never blocks
+✔ Levels (off / signals / all) and per-slot sampling
+
+Run:
+    python -m app.tests.test_candle_debug_sink
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from app.utils.candle_debug_logger import (
+    HEADER,
+    LEVEL_OFF,
+    LEVEL_SIGNALS,
+    CandleDebugLogger,
+    CandleDebugSink,
+)
+
+
+IND = {"ema8": 101.0, "ema20_low": 99.0, "ema20_high": 103.0, "rsi_smoothed": 55.5}
+
+
+def _log(logger, i, buy=False, signal=None):
+    logger.log(
+        candle_ts=1_767_000_000 + 60 * i,
+        o=100, h=101, l=99, c=100.5,
+        ind=IND,
+        checks={"cond_all": buy},
+        buy_allowed=buy,
+        signal=signal,
+    )
+
+
+def _lines(path: Path):
+    return path.read_text(encoding="utf-8").splitlines(keepends=True)
+
+
+def test_shared_sink_one_file_per_day():
+    with tempfile.TemporaryDirectory() as d:
+        sink = CandleDebugSink(Path(d))
+        loggers = [CandleDebugLogger(f"SYM{i}", f"S{i}", sink=sink) for i in range(20)]
+        for i in range(50):
+            for lg in loggers:
+                _log(lg, i)
+        assert sink.flush(5.0)
+
+        files = sorted(Path(d).glob("candle_debug_*.tsv"))
+        assert len(files) == 1
+        lines = _lines(files[0])
+        assert lines[0] == HEADER and HEADER not in lines[1:]
+        assert len(lines) == 1 + 1000
+        assert lines[1].split("\t")[2] == "SYM0"
+        assert sink.stats()["written"] == 1000
+
+        # rollover: a line stamped "tomorrow" goes to tomorrow's file
+        tomorrow = time.time() + 86400
+        rec = (tomorrow, 0, "SYMX", "SX", 1, 1, 1, 1, None, None, None, None, False, False, None)
+        sink.submit(rec)
+        assert sink.flush(5.0)
+        day = time.strftime("%Y-%m-%d", time.localtime(tomorrow))
+        nxt = Path(d) / f"candle_debug_{day}.tsv"
+        assert _lines(nxt)[0] == HEADER and len(_lines(nxt)) == 2
+
+        sink.shutdown()
+
+
+def test_overflow_dropped_not_blocking():
+    with tempfile.TemporaryDirectory() as d:
+        sink = CandleDebugSink(Path(d), max_buffer=100, flush_interval=60.0)
+        lg = CandleDebugLogger("SYM", "S", sink=sink)
+
+        t0 = time.perf_counter()
+        for i in range(500):
+            _log(lg, i)
+        assert time.perf_counter() - t0 < 1.0
+
+        assert sink.dropped == 400
+        assert sink.flush(5.0)
+        assert sink.written == 100
+        sink.shutdown()
+
+
+def test_levels_and_sampling():
+    with tempfile.TemporaryDirectory() as d:
+        sink = CandleDebugSink(Path(d), sample_every=5)
+        a = CandleDebugLogger("A", "SA", sink=sink)
+        b = CandleDebugLogger("B", "SB", sink=sink)
+
+        for i in range(20):
+            _log(a, i)
+            _log(b, i, buy=(i == 3))       # important line always kept
+        assert sink.flush(5.0)
+        assert sink.written == 4 + 5
+
+        sink.configure(level=LEVEL_SIGNALS)
+        _log(a, 100)
+        _log(a, 101, signal="BUY")
+
+        sink.configure(level=LEVEL_OFF)
+        _log(a, 102, signal="BUY")
+
+        assert sink.flush(5.0)
+        assert sink.written == 4 + 5 + 1
+        sink.shutdown()
+
+
+def main():
+    print("\n=== CANDLE DEBUG SINK ===")
+    test_shared_sink_one_file_per_day()
+    print("one handle / file per day, header once, rollover ✔")
+    test_overflow_dropped_not_blocking()
+    print("bounded buffer drops, never blocks ✔")
+    test_levels_and_sampling()
+    print("levels + sampling ✔")
+    print("\n=== TEST COMPLETE ===\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+test_candle_pipeline.py
+
+Bounded per-token candle pipeline
+---------------------------------
+✔ Per-token order kept across lanes; a token always runs on one lane
+✔ SIGNAL runs before PERSIST before DEBUG inside a lane (FIFO within)
+✔ Overflow: SIGNAL rejects the NEW job, PERSIST keeps everything
+  (counted as overflow), DEBUG evicts the OLDEST
+✔ Engine: a candle rejected by a full SIGNAL lane counts as an indicator gap
+✔ Failing job counted, lane keeps running; late waits counted
+✔ drain() times out while busy, returns once idle
+✔ shutdown(drain=True) runs queued work; later submits rejected
+✔ shutdown(drain=False) discards queued work
+
+Run:
+    python -m app.tests.test_candle_pipeline
+"""
+
+import random
+import threading
+import time
+
+from app.engine.candle_pipeline import CandlePipeline, JobPriority
+from app.marketdata.candle import Candle, CandleSource
+from app.tests.conftest import option_token, tick_engine
+from app.tools.fixtures import DAY0
+
+
+SIGNAL, PERSIST, DEBUG = JobPriority.SIGNAL, JobPriority.PERSIST, JobPriority.DEBUG
+
+
+def _hold(pipeline, gate, token=0):
+    """
+    Park the token's lane on `gate` (queued work then piles up behind it).
+    """
+    pipeline.submit(token, gate.wait, priority=SIGNAL, label="gate")
+    lane = pipeline._lanes[token % pipeline.workers]
+    while not lane.busy:
+        time.sleep(0.001)
+
+
+def test_per_token_order():
+    pipeline = CandlePipeline(workers=4, name="test")
+    seen = {}
+    lanes = {}
+    rng = random.Random(1)
+
+    def job(token, i):
+        if rng.random() < 0.01:
+            time.sleep(0.001)
+        seen.setdefault(token, []).append(i)
+        lanes.setdefault(token, set()).add(threading.current_thread().name)
+
+    try:
+        for i in range(300):
+            for token in range(10):
+                assert pipeline.submit(token, lambda t=token, i=i: job(t, i))
+        assert pipeline.drain(timeout=10.0)
+
+        assert all(seen[t] == list(range(300)) for t in range(10))
+        assert all(len(names) == 1 for names in lanes.values())
+        assert pipeline.stats()["completed"]["SIGNAL"] == 3000
+    finally:
+        pipeline.shutdown(timeout=5.0)
+
+
+def test_priority_order():
+    pipeline = CandlePipeline(workers=1, name="test")
+    gate = threading.Event()
+    ran = []
+    try:
+        _hold(pipeline, gate)
+        for label, prio in (
+            ("p1", PERSIST), ("d1", DEBUG), ("s1", SIGNAL),
+            ("p2", PERSIST), ("s2", SIGNAL), ("d2", DEBUG),
+        ):
+            pipeline.submit(7, lambda l=label: ran.append(l), priority=prio, label=label)
+
+        gate.set()
+        assert pipeline.drain(timeout=5.0)
+        assert ran == ["s1", "s2", "p1", "p2", "d1", "d2"]
+    finally:
+        gate.set()
+        pipeline.shutdown(timeout=5.0)
+
+
+def test_overflow():
+    pipeline = CandlePipeline(
+        workers=1,
+        capacity={SIGNAL: 2, PERSIST: 2, DEBUG: 1},
+        name="test",
+    )
+    gate = threading.Event()
+    ran = []
+
+    def submit(label, prio):
+        return pipeline.submit(3, lambda: ran.append(label), priority=prio, label=label)
+
+    try:
+        _hold(pipeline, gate)
+
+        assert submit("s1", SIGNAL) and submit("s2", SIGNAL)
+        assert not submit("s3", SIGNAL)                 # new SIGNAL job rejected
+        assert submit("p1", PERSIST) and submit("p2", PERSIST)
+        assert submit("p3", PERSIST)                    # past capacity, kept
+        assert submit("d1", DEBUG) and submit("d2", DEBUG)   # d1 evicted
+
+        s = pipeline.stats()
+        assert s["depth"] == {"SIGNAL": 2, "PERSIST": 3, "DEBUG": 1}
+        assert s["dropped"] == {"SIGNAL": 1, "PERSIST": 0, "DEBUG": 1}
+        assert s["overflow"] == {"SIGNAL": 0, "PERSIST": 1, "DEBUG": 0}
+
+        gate.set()
+        assert pipeline.drain(timeout=5.0)
+        assert ran == ["s1", "s2", "p1", "p2", "p3", "d2"]
+    finally:
+        gate.set()
+        pipeline.shutdown(timeout=5.0)
+
+
+def test_engine_indicator_gap():
+    with tick_engine([25000]) as engine:
+        token = option_token(25000)
+        engine.pipeline.capacity[SIGNAL] = 1
+        gate = threading.Event()
+        try:
+            _hold(engine.pipeline, gate, token=token)
+            for i in range(3):
+                candle = Candle(DAY0 + 60 * i, DAY0 + 60 * (i + 1), 100.0, 101.0, 99.0, 100.5, CandleSource.LIVE)
+                engine._submit_candle(token, "NIFTYZZ25000CE", candle)
+        finally:
+            gate.set()
+        assert engine.pipeline.drain(timeout=5.0)
+
+        s = engine.pipeline_stats()
+        assert engine.indicator_gaps == {token: 2}
+        assert s["indicator_gaps"] == 2 and s["gap_tokens"] == 1
+        assert s["dropped"]["SIGNAL"] == 2
+        assert engine._indicator_ts[token] == DAY0 + 60
+
+
+def test_drain_and_shutdown():
+    pipeline = CandlePipeline(workers=2, late_after_sec=0.05, name="test")
+    gate = threading.Event()
+    ran = []
+    try:
+        _hold(pipeline, gate)
+        pipeline.submit(0, lambda: 1 / 0, label="boom")
+        pipeline.submit(0, lambda: ran.append("after"), priority=PERSIST)
+
+        time.sleep(0.1)                                 # queued past late_after_sec
+        assert not pipeline.drain(timeout=0.05)
+
+        gate.set()
+        assert pipeline.drain(timeout=5.0)
+        s = pipeline.stats()
+        assert ran == ["after"]
+        assert s["failed"]["SIGNAL"] == 1 and s["completed"]["PERSIST"] == 1
+        assert s["late"]["SIGNAL"] >= 1 and s["max_wait_ms"] >= 50
+
+        # drain on shutdown runs what is queued
+        gate.clear()
+        _hold(pipeline, gate, token=1)
+        pipeline.submit(1, lambda: ran.append("queued"), priority=PERSIST)
+        threading.Timer(0.05, gate.set).start()
+        assert pipeline.shutdown(drain=True, timeout=5.0)
+        assert ran == ["after", "queued"]
+
+        assert not pipeline.submit(1, lambda: ran.append("late"))
+        assert pipeline.stats()["rejected"]["SIGNAL"] == 1
+        assert pipeline.shutdown() is True
+        assert all(not lane.thread.is_alive() for lane in pipeline._lanes)
+    finally:
+        gate.set()
+        pipeline.shutdown(timeout=5.0)
+
+    # no drain → queued work discarded
+    pipeline = CandlePipeline(workers=1, name="test")
+    gate = threading.Event()
+    _hold(pipeline, gate)
+    pipeline.submit(0, lambda: ran.append("discarded"), priority=PERSIST)
+    threading.Timer(0.05, gate.set).start()
+    assert pipeline.shutdown(drain=False, timeout=5.0) is False
+    assert "discarded" not in ran
+    assert pipeline.stats()["depth"]["PERSIST"] == 0
+
+
+def main():
+    print("\n=== CANDLE PIPELINE ===")
+    test_per_token_order()
+    print("per-token order, fixed lane ✔")
+    test_priority_order()
+    print("SIGNAL → PERSIST → DEBUG inside a lane ✔")
+    test_overflow()
+    print("SIGNAL rejects new, PERSIST kept, DEBUG evicts oldest ✔")
+    test_engine_indicator_gap()
+    print("rejected candle → indicator gap ✔")
+    test_drain_and_shutdown()
+    print("drain / shutdown / failures / late ✔")
+    print("\n=== TEST COMPLETE ===\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+test_condition_mask.py
+
+market_timeline.cond_mask (bit registry in ConditionEngineV19)
+--------------------------------------------------------------
+✔ Registry is stable: unique bits, covers every V1.9 condition key
+✔ pack / unpack round-trip; not-evaluated → NULL (not 0)
+✔ Migration 012 converts legacy cond_* columns row-for-row
+✔ market_timeline_decoded view == unpack(cond_mask) for every row
+✔ Live upsert path stores the packed mask
+
+Run:
+    python -m app.tests.test_condition_mask
+"""
+
+import itertools
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from app.db.migrations.runner import MIGRATIONS_DIR
+from app.db.timeline_repo import upsert_timeline_rows
+from app.engine.condition_engine_v1_9 import CONDITION_BITS, ConditionEngineV19
+from app.marketdata.candle import Candle, CandleSource
+from app.persistence.market_timeline_writer import CONDITION_KEYS, build_timeline_row
+from app.tools.fixtures import scratch_db
+
+
+KEYS = list(CONDITION_BITS)
+
+
+def test_registry():
+    assert len(set(CONDITION_BITS.values())) == len(CONDITION_BITS)
+    assert sorted(CONDITION_BITS.values()) == list(range(len(CONDITION_BITS)))
+    assert set(ConditionEngineV19().keys) == set(CONDITION_BITS)
+    assert CONDITION_KEYS == tuple(KEYS)
+
+
+def test_round_trip():
+    for bits in itertools.product((False, True), repeat=4):
+        cond = {k: False for k in KEYS}
+        for k, v in zip(("cond_close_gt_open", "cond_rsi_range", "cond_no_open_trade", "cond_all"), bits):
+            cond[k] = v
+        assert ConditionEngineV19.unpack(ConditionEngineV19.pack(cond)) == cond
+
+    assert ConditionEngineV19.pack(None) is None
+    assert ConditionEngineV19.pack({}) is None
+    assert ConditionEngineV19.pack({k: None for k in KEYS}) is None
+    assert ConditionEngineV19.pack({k: False for k in KEYS}) == 0
+    assert ConditionEngineV19.unpack(None) == {k: None for k in KEYS}
+    # keys outside the registry (secondary strategies) are ignored
+    assert ConditionEngineV19.pack({"cond_all": True, "cond_close_gt_ema50": True}) == 1 << CONDITION_BITS["cond_all"]
+
+
+def _legacy_rows():
+    """
+    (ts, {cond: 0/1/None}) — all-NULL, all-0, single bits, everything.
+    """
+    rows = [(1, {k: None for k in KEYS}), (2, {k: 0 for k in KEYS}), (3, {k: 1 for k in KEYS})]
+    for i, k in enumerate(KEYS):
+        rows.append((10 + i, {kk: int(kk == k) for kk in KEYS}))
+    return rows
+
+
+def test_migration_converts_rows():
+    files = sorted(MIGRATIONS_DIR.glob("*.sql"))
+    before = [f for f in files if f.name < "012"]
+    mask_sql = next(f for f in files if f.name.startswith("012_"))
+
+    with tempfile.TemporaryDirectory() as d:
+        conn = sqlite3.connect(Path(d) / "legacy.db", isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        for f in before:
+            conn.executescript(f.read_text(encoding="utf-8-sig"))
+
+        legacy = _legacy_rows()
+        cols = ", ".join(KEYS)
+        marks = ", ".join("?" for _ in KEYS)
+        for ts, flags in legacy:
+            conn.execute(
+                f"INSERT INTO market_timeline (symbol, timeframe, ts, close, conditions_json, {cols}) "
+                f"VALUES ('ZZTEST', '1m', ?, 100.0, '{{}}', {marks})",
+                (ts, *(flags[k] for k in KEYS)),
+            )
+
+        conn.executescript(mask_sql.read_text(encoding="utf-8-sig"))
+
+        table_cols = {r[1] for r in conn.execute("PRAGMA table_info(market_timeline)")}
+        assert "cond_mask" in table_cols
+        assert not table_cols & (set(KEYS) | {"conditions_json"})
+
+        idx = {r[1] for r in conn.execute("PRAGMA index_list(market_timeline)")}
+        assert {"uniq_market_timeline_symbol_tf_ts", "idx_market_timeline_warmup"} <= idx
+
+        got = {r["ts"]: r for r in conn.execute("SELECT * FROM market_timeline_decoded")}
+        assert len(got) == len(legacy)
+        for ts, flags in legacy:
+            r = got[ts]
+            want = ConditionEngineV19.pack(flags)
+            assert r["cond_mask"] == want, (ts, r["cond_mask"], want)
+            for k in KEYS:
+                assert r[k] == flags[k], (ts, k)
+        conn.close()
+
+
+def test_live_path_packs():
+    engine = ConditionEngineV19()
+    c = Candle(open=100.0, high=101.0, low=99.5, close=100.8, start_ts=1_767_239_100, end_ts=1_767_239_160,
+               source=CandleSource.LIVE)
+    ind = {"ema8": 100.5, "ema20_low": 100.2, "ema20_high": 101.5, "rsi_raw": 55.0, "rsi_rising": True}
+    cond = engine.evaluate(candle=c, indicators=ind, is_trading_time=True, no_open_trade=False)
+
+    row = build_timeline_row(
+        candle=c, indicators=ind, conditions=cond, signal=None,
+        symbol="ZZTEST", timeframe="1m", strategy_version="V1.9",
+    )
+    cold = build_timeline_row(
+        candle=Candle(open=1, high=1, low=1, close=1, start_ts=60, end_ts=120, source=CandleSource.LIVE),
+        indicators=None, conditions=None, signal=None,
+        symbol="ZZTEST", timeframe="1m", strategy_version="V1.9",
+    )
+
+    with scratch_db() as conn:
+        upsert_timeline_rows([row, cold], conn)
+        r = conn.execute(
+            "SELECT * FROM market_timeline_decoded WHERE ts = ?", (c.end_ts,)
+        ).fetchone()
+        assert r["cond_mask"] == ConditionEngineV19.pack(cond)
+        for k in KEYS:
+            assert r[k] == int(cond[k]), k
+        assert r["cond_all"] == 0 and r["cond_close_gt_ema8"] == 1
+
+        r = conn.execute("SELECT * FROM market_timeline_decoded WHERE ts = 120").fetchone()
+        assert r["cond_mask"] is None and r["cond_all"] is None
+
+
+def main():
+    print("\n=== CONDITION MASK ===")
+    test_registry()
+    print("bit registry stable ✔")
+    test_round_trip()
+    print("pack / unpack round-trip ✔")
+    test_migration_converts_rows()
+    print("migration 012 converts legacy rows + view decodes ✔")
+    test_live_path_packs()
+    print("live upsert stores packed mask ✔")
+    print("\n=== TEST COMPLETE ===\n")
+
+
+if __name__ == "__main__":
+    main()
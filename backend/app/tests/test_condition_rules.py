@@ -0,0 +1,232 @@
+"""
+test_condition_rules.py
+
+Declarative V1.9 rules (condition_rules + ConditionEngineV19)
+-------------------------------------------------------------
+✔ Compiled scalar evaluate() == previous hand-written V1.9 logic
+  (same keys, same order, same values) on every synthetic candle
+✔ Red / doji gate and missing-indicator paths keep context flags
+✔ Threshold edges (RSI exactly 40 / 65, EMA8 == EMA20_high)
+✔ evaluate_arrays() masks == scalar evaluate() per candle,
+  incl. per-candle context arrays
+✔ Bad rules rejected at compile time
+
+Run:
+    python -m app.tests.test_condition_rules
+"""
+
+import random
+
+import numpy as np
+
+from app.engine.condition_engine_v1_9 import V19_RULES, ConditionEngineV19
+from app.engine.condition_rules import RuleError, compile_rules
+from app.engine.indicator_batch_v1_9 import compute_v19_from_candles
+from app.marketdata.candle import Candle, CandleSource
+from app.persistence.market_timeline_writer import CONDITION_KEYS
+from app.tools.fixtures import synthetic_candles
+
+
+def _reference(candle, indicators, is_trading_time, no_open_trade):
+    """
+    The hand-written ConditionEngineV19.evaluate() this rule set replaced.
+    """
+    close, open_, high = candle.close, candle.open, candle.high
+    off = {k: False for k in CONDITION_KEYS}
+    off["cond_is_trading_time"] = is_trading_time
+    off["cond_no_open_trade"] = no_open_trade
+
+    if not close > open_:
+        return off
+
+    ema8 = indicators.get("ema8")
+    ema20_low = indicators.get("ema20_low")
+    ema20_high = indicators.get("ema20_high")
+    rsi_raw = indicators.get("rsi_raw")
+    rsi_rising = indicators.get("rsi_rising")
+
+    if any(v is None for v in (ema8, ema20_low, ema20_high, rsi_raw, rsi_rising)):
+        return {**off, "cond_close_gt_open": True}
+
+    out = {
+        "cond_close_gt_open": True,
+        "cond_close_gt_ema8": close > ema8,
+        "cond_close_ge_ema20": close >= ema20_low,
+        "cond_close_not_above_ema20": close <= ema20_high,
+        "cond_not_touching_high": high < ema20_high if ema8 < ema20_high else True,
+        "cond_rsi_ge_40": rsi_raw >= 40,
+        "cond_rsi_le_65": rsi_raw <= 65,
+    }
+    out["cond_rsi_range"] = out["cond_rsi_ge_40"] and out["cond_rsi_le_65"]
+    out["cond_rsi_rising"] = bool(rsi_rising)
+    out["cond_is_trading_time"] = is_trading_time
+    out["cond_no_open_trade"] = no_open_trade
+    out["cond_all"] = (
+        out["cond_close_gt_open"]
+        and out["cond_close_gt_ema8"]
+        and out["cond_close_ge_ema20"]
+        and out["cond_close_not_above_ema20"]
+        and out["cond_not_touching_high"]
+        and out["cond_rsi_range"]
+        and out["cond_rsi_rising"]
+        and is_trading_time
+        and no_open_trade
+    )
+    return out
+
+
+def _candle(o, h, l, c):
+    return Candle(start_ts=0, end_ts=60, open=o, high=h, low=l, close=c, source=CandleSource.LIVE)
+
+
+def _series(n=3000):
+    candles = synthetic_candles(n, seed=11)
+    return candles, compute_v19_from_candles(candles)
+
+
+def _live_values(batch, i):
+    """
+    What the live engine hands over: the values dict, with None until
+    the indicator is seeded (rsi_rising only once rsi_raw exists).
+    """
+    vals = batch.values_at(i)
+    if vals["rsi_raw"] is None:
+        vals["rsi_rising"] = None
+    return vals
+
+
+def test_scalar_matches_reference():
+    engine = ConditionEngineV19()
+    assert engine.keys == tuple(CONDITION_KEYS)
+
+    candles, batch = _series()
+    rng = random.Random(3)
+    hits = 0
+
+    for i, c in enumerate(candles):
+        ind = _live_values(batch, i)
+        for ctx in ((True, True), (rng.random() < 0.5, rng.random() < 0.5)):
+            got = engine.evaluate(
+                candle=c, indicators=ind, is_trading_time=ctx[0], no_open_trade=ctx[1],
+            )
+            want = _reference(c, ind, *ctx)
+            assert list(got) == list(want) == list(CONDITION_KEYS)
+            assert got == want, (i, ctx, got, want)
+            hits += got["cond_all"]
+
+    assert hits > 0      # the series actually exercises a full BUY
+
+
+def test_edges():
+    engine = ConditionEngineV19()
+    green = _candle(100, 102.5, 99, 102)
+    base = {"ema8": 101.0, "ema20_low": 100.0, "ema20_high": 103.0, "rsi_raw": 50.0, "rsi_rising": True}
+
+    cases = [
+        (_candle(100, 101, 99, 100), base),               # doji → gate off
+        (_candle(102, 103, 99, 100), base),               # red
+        (green, {**base, "ema20_high": None}),            # missing indicator
+        (green, {**base, "rsi_raw": 40.0}),
+        (green, {**base, "rsi_raw": 65.0}),
+        (green, {**base, "rsi_raw": 65.0000001}),
+        (green, {**base, "ema8": 103.0}),                 # ema8 == ema20_high → no touch rule
+        (green, {**base, "ema20_high": 102.0}),           # close == ema20_high
+        (green, {**base, "rsi_rising": False}),
+    ]
+    for candle, ind in cases:
+        for ctx in ((True, True), (False, True), (True, False)):
+            got = engine.evaluate(candle=candle, indicators=ind, is_trading_time=ctx[0], no_open_trade=ctx[1])
+            assert got == _reference(candle, ind, *ctx), (candle, ind, ctx)
+
+    assert engine.evaluate(candle=green, indicators={**base, "rsi_raw": 40.0},
+                           is_trading_time=True, no_open_trade=True)["cond_all"] is True
+
+
+def test_vector_matches_scalar():
+    engine = ConditionEngineV19()
+    candles, batch = _series()
+    n = len(candles)
+
+    rng = np.random.default_rng(5)
+    trading = rng.random(n) < 0.8
+    no_trade = rng.random(n) < 0.7
+
+    masks = engine.evaluate_arrays(
+        open=[c.open for c in candles],
+        high=[c.high for c in candles],
+        low=[c.low for c in candles],
+        close=[c.close for c in candles],
+        indicators=batch,
+        is_trading_time=trading,
+        no_open_trade=no_trade,
+    )
+    assert list(masks) == list(CONDITION_KEYS)
+    assert all(m.dtype == bool and m.shape == (n,) for m in masks.values())
+
+    for i, c in enumerate(candles):
+        want = engine.evaluate(
+            candle=c,
+            indicators=_live_values(batch, i),
+            is_trading_time=bool(trading[i]),
+            no_open_trade=bool(no_trade[i]),
+        )
+        got = {k: bool(m[i]) for k, m in masks.items()}
+        assert got == want, (i, got, want)
+
+    # scalar context broadcasts
+    all_on = engine.evaluate_arrays(
+        open=[c.open for c in candles], high=[c.high for c in candles],
+        low=[c.low for c in candles], close=[c.close for c in candles],
+        indicators=batch,
+    )
+    assert all_on["cond_is_trading_time"].all()
+    assert all_on["cond_all"].sum() >= masks["cond_all"].sum() > 0
+
+
+def test_bad_rules_rejected():
+    bad = [
+        {**V19_RULES, "conditions": V19_RULES["conditions"] + [
+            {"name": "x", "left": "close", "op": "=>", "right": 1}]},
+        {**V19_RULES, "conditions": V19_RULES["conditions"] + [
+            {"name": "x", "left": "close", "op": ">", "right": "__import__('os')"}]},
+        {**V19_RULES, "conditions": V19_RULES["conditions"] + [
+            {"name": "x", "left": "close", "op": ">", "right": "1e3"}]},
+        {**V19_RULES, "conditions": V19_RULES["conditions"] + [
+            {"name": "x", "all": ["not_defined_yet"]}]},
+        {**V19_RULES, "conditions": V19_RULES["conditions"] + [V19_RULES["conditions"][0]]},
+        {**V19_RULES, "gate": "cond_close_gt_ema8"},
+    ]
+    for rules in bad:
+        try:
+            compile_rules(rules)
+        except RuleError:
+            continue
+        raise AssertionError(f"accepted bad rules: {rules['conditions'][-1]}")
+
+    # thresholds are data: a tighter RSI band is just a different number
+    tight = {**V19_RULES, "conditions": [
+        {**c, "right": 60} if c["name"] == "cond_rsi_le_65" else c
+        for c in V19_RULES["conditions"]
+    ]}
+    engine = ConditionEngineV19(tight)
+    green = _candle(100, 102.5, 99, 102)
+    ind = {"ema8": 101.0, "ema20_low": 100.0, "ema20_high": 103.0, "rsi_raw": 62.0, "rsi_rising": True}
+    out = engine.evaluate(candle=green, indicators=ind, is_trading_time=True, no_open_trade=True)
+    assert out["cond_rsi_le_65"] is False and out["cond_all"] is False
+
+
+def main():
+    print("\n=== CONDITION RULES ===")
+    test_scalar_matches_reference()
+    print("compiled scalar == hand-written V1.9 on 3000 candles ✔")
+    test_edges()
+    print("gate / missing / threshold edges ✔")
+    test_vector_matches_scalar()
+    print("NumPy masks == scalar per candle ✔")
+    test_bad_rules_rejected()
+    print("bad rules rejected, thresholds are data ✔")
+    print("\n=== TEST COMPLETE ===\n")
+
+
+if __name__ == "__main__":
+    main()
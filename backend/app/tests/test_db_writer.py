@@ -0,0 +1,229 @@
+"""
+test_db_writer.py
+
+SQLite writer thread + per-thread read connections (scratch DB)
+---------------------------------------------------------------
+✔ Writes from many threads serialize on ONE writer thread (none lost)
+✔ Futures return results; errors re-raise in the caller
+✔ transaction=True rolls back the whole job on error
+✔ Nested run() from inside a job runs inline (no deadlock)
+✔ Readers get their own query_only connection per thread
+✔ A long write does not block readers (WAL snapshot)
+✔ A reader connection closes when its thread exits (open count bounded)
+✔ Write connection fails to open → queued jobs fail fast, error in stats;
+  the next submit retries
+✔ Wait / exec / query metrics recorded
+
+Run:
+    python -m app.tests.test_db_writer
+"""
+
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from app.db import sqlite as db
+
+
+_scratch = {}
+
+
+def setup_module(module=None):
+    _scratch["saved"] = db.DB_PATH
+    _scratch["dir"] = tempfile.TemporaryDirectory()
+    db.reset_connections(Path(_scratch["dir"].name) / "writer.db")
+    db.db_writer.execute(
+        "CREATE TABLE t (id INTEGER PRIMARY KEY, who TEXT, n INTEGER)",
+        label="ddl",
+    )
+
+
+def teardown_module(module=None):
+    db.reset_connections(_scratch.pop("saved"))
+    _scratch.pop("dir").cleanup()
+
+
+def test_serialized_writes():
+    writer_threads = set()
+
+    def insert(who, n):
+        def job(conn):
+            writer_threads.add(threading.get_ident())
+            return conn.execute("INSERT INTO t (who, n) VALUES (?, ?)", (who, n)).lastrowid
+        return db.db_writer.run(job, label="insert")
+
+    def worker(who):
+        for n in range(200):
+            insert(who, n)
+
+    threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(writer_threads) == 1
+    assert threading.get_ident() not in writer_threads
+
+    rows = db.db_readers.fetchall("SELECT who, COUNT(*) AS c FROM t GROUP BY who")
+    assert {r["who"]: r["c"] for r in rows} == {f"w{i}": 200 for i in range(8)}
+
+
+def test_futures_and_errors():
+    fut = db.db_writer.submit(lambda conn: conn.execute("SELECT 40 + 2").fetchone()[0])
+    assert fut.result(timeout=5) == 42
+
+    try:
+        db.db_writer.execute("INSERT INTO missing VALUES (1)")
+    except sqlite3.OperationalError:
+        pass
+    else:
+        raise AssertionError("error swallowed")
+
+    def half_then_fail(conn):
+        conn.execute("INSERT INTO t (who, n) VALUES ('tx', 1)")
+        raise RuntimeError("boom")
+
+    try:
+        db.db_writer.run(half_then_fail, transaction=True)
+    except RuntimeError:
+        pass
+    assert db.db_readers.fetchone("SELECT COUNT(*) FROM t WHERE who = 'tx'")[0] == 0
+
+    # a job calling back into the writer runs inline
+    def outer(conn):
+        return db.db_writer.execute("INSERT INTO t (who, n) VALUES ('nested', 1)")
+
+    assert db.db_writer.run(outer, transaction=True, timeout=5) == 1
+
+
+def test_readers_per_thread_and_not_blocked():
+    conns = {}
+
+    def grab(i):
+        conns[i] = db.read_conn()
+
+    threads = [threading.Thread(target=grab, args=(i,)) for i in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({id(c) for c in conns.values()}) == 3
+    assert db.read_conn() is db.read_conn()
+
+    try:
+        db.read_conn().execute("DELETE FROM t")
+    except sqlite3.OperationalError:
+        pass
+    else:
+        raise AssertionError("reader wrote")
+
+    # writer holds an open transaction for 0.5s; reads keep flowing
+    started = threading.Event()
+
+    def slow(conn):
+        conn.execute("INSERT INTO t (who, n) VALUES ('slow', 1)")
+        started.set()
+        time.sleep(0.5)
+
+    fut = db.db_writer.submit(slow, label="slow", transaction=True)
+    assert started.wait(5)
+
+    t0 = time.perf_counter()
+    n = db.db_readers.fetchone("SELECT COUNT(*) FROM t WHERE who = 'slow'")[0]
+    assert time.perf_counter() - t0 < 0.25
+    assert n == 0                       # uncommitted write invisible
+    fut.result(timeout=5)
+    assert db.db_readers.fetchone("SELECT COUNT(*) FROM t WHERE who = 'slow'")[0] == 1
+
+
+def test_reader_closed_on_thread_exit():
+    before = db.db_readers.stats()
+
+    def read():
+        assert db.db_readers.fetchone("SELECT 1")[0] == 1
+
+    for _ in range(5):
+        threads = [threading.Thread(target=read) for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    after = db.db_readers.stats()
+    assert after["opened"] - before["opened"] == 50
+    assert after["closed"] - before["closed"] == 50
+    assert after["open"] == before["open"]
+
+
+def test_writer_connect_failure():
+    writer = db.DBWriter()
+    saved = db.DB_PATH
+    db.DB_PATH = Path(_scratch["dir"].name) / "missing" / "writer.db"
+    try:
+        futs = [writer.submit(lambda conn: 1, label="doomed") for _ in range(3)]
+        for fut in futs:
+            try:
+                fut.result(timeout=5)
+            except sqlite3.OperationalError:
+                pass
+            else:
+                raise AssertionError("job ran without a connection")
+
+        t0 = time.perf_counter()
+        try:
+            writer.run(lambda conn: 1, timeout=5)
+        except sqlite3.OperationalError:
+            pass
+        else:
+            raise AssertionError("run() succeeded without a connection")
+        assert time.perf_counter() - t0 < 1.0
+
+        s = writer.stats()
+        assert s["connect_errors"] >= 1 and s["failed"] == 4
+        assert "unable to open" in s["last_error"]
+        assert not s["running"] and s["queue_depth"] == 0
+    finally:
+        db.DB_PATH = saved
+
+    # path fixed: the next submit reopens
+    assert writer.run(lambda conn: conn.execute("SELECT 7").fetchone()[0], timeout=5) == 7
+    assert writer.stop()
+
+
+def test_metrics():
+    stats = db.db_stats()
+    w = stats["writer"]
+    assert w["running"] and w["jobs"] >= 1600 and w["failed"] >= 2
+    assert w["by_label"]["insert"] == 1600
+    assert w["wait"]["count"] == w["exec"]["count"] == w["jobs"]
+    assert w["exec"]["max_ms"] >= 500
+    r = stats["readers"]
+    assert r["opened"] >= 4 and r["closed"] >= 3 and r["query"]["count"] >= 4
+
+
+def main():
+    print("\n=== DB WRITER ===")
+    setup_module()
+    try:
+        test_serialized_writes()
+        print("8 threads × 200 writes → one writer thread ✔")
+        test_futures_and_errors()
+        print("futures / errors / rollback / nested ✔")
+        test_readers_per_thread_and_not_blocked()
+        print("per-thread readers, not blocked by writer ✔")
+        test_reader_closed_on_thread_exit()
+        print("50 short-lived reader threads → no connections left open ✔")
+        test_writer_connect_failure()
+        print("write connection open failure fails queued jobs ✔")
+        test_metrics()
+        print("metrics ✔")
+    finally:
+        teardown_module()
+    print("\n=== TEST COMPLETE ===\n")
+
+
+if __name__ == "__main__":
+    main()
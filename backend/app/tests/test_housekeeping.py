@@ -0,0 +1,154 @@
+"""
+test_housekeeping.py
+
+DB housekeeping (scratch DB + temp archive root)
+------------------------------------------------
+✔ Closed trades past retention deleted in bounded batches; open / recent kept
+✔ Old market_timeline days archived, then deleted
+✔ Timeline cutoff = IST midnight KEEP_DAYS before `now` (not the host clock)
+✔ Market hours: retention only, no checkpoint / optimize / vacuum
+✔ Off hours: ANALYZE + auto_vacuum → INCREMENTAL once per IST day,
+  optimize + wal_checkpoint(TRUNCATE) every pass (WAL file emptied)
+✔ Next day: incremental vacuum returns the freelist to the OS
+✔ stats(): rows deleted, time spent, DB / WAL size history + trend
+
+Run:
+    python -m app.tests.test_housekeeping
+"""
+
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from app.db import sqlite as db
+from app.db.housekeeping import MARKET_TIMELINE_KEEP_DAYS, TRADES_KEEP_DAYS, Housekeeper
+from app.db.timeline_archive import TimelineArchive, day_bounds, trading_day
+from app.db.timeline_repo import upsert_timeline_rows
+from app.tools.fixtures import scratch_db, session_ts, timeline_dicts
+
+
+NOW = int(time.time())
+OLD_TRADES = 23
+
+
+def _insert_trades(conn):
+    old = NOW - (TRADES_KEEP_DAYS + 5) * 86400
+    rows = [(f"OLD{i}", f"S{i}", old, old + 60) for i in range(OLD_TRADES)]
+    rows += [("RECENT", "S_R", NOW - 3600, NOW - 60), ("OPEN", "S_O", NOW - 3600, None)]
+    conn.execute("BEGIN")
+    conn.executemany(
+        """
+        INSERT INTO trades (trade_id, slot, symbol, token, entry_time, entry_price, qty,
+                            buy_order_id, sl_price, tp_price, tp_mode, state, exit_time, exit_price)
+        VALUES (?, ?, 'ZZTEST', 1, ?, 100.0, 1, 'B', 90.0, 110.0, 'AUTO_RR', 'CLOSED', ?, 105.0)
+        """,
+        rows,
+    )
+    conn.execute("COMMIT")
+
+
+def _insert_timeline(conn, days=2):
+    rows = timeline_dicts("ZZTEST", session_ts(days))      # Jan 2026: well past the hot window
+    upsert_timeline_rows(rows, conn)
+    return len(rows)
+
+
+def _auto_vacuum():
+    # fresh handle: open connections keep the mode they saw at open time
+    conn = sqlite3.connect(db.DB_PATH)
+    try:
+        return conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _steps(report):
+    return [m["step"] for m in report["maintenance"]]
+
+
+def test_passes():
+    with tempfile.TemporaryDirectory() as d, scratch_db() as conn:
+        hk = Housekeeper(TimelineArchive(Path(d)), batch_rows=5, pause=0.0, vacuum_pages=50)
+        _insert_trades(conn)
+        n_timeline = _insert_timeline(conn)
+
+        # --- market hours: retention only
+        r = hk.run(market_open=True, now=NOW)
+        assert not r["errors"], r["errors"]
+        assert r["trades"]["rows"] == OLD_TRADES
+        assert r["trades"]["batches"] == OLD_TRADES // 5 + 1
+        assert r["market_timeline"]["rows_deleted"] == n_timeline
+        assert _steps(r) == []
+        assert hk.last_daily is None
+
+        left = {row[0] for row in conn.execute("SELECT trade_id FROM trades")}
+        assert left == {"RECENT", "OPEN"}
+        assert conn.execute("SELECT COUNT(*) FROM market_timeline").fetchone()[0] == 0
+
+        # --- off hours, first pass of the day: full maintenance
+        assert _auto_vacuum() == 0
+        r = hk.run(market_open=False, now=NOW)
+        assert not r["errors"], r["errors"]
+        assert _steps(r) == ["analyze", "vacuum", "optimize", "checkpoint"]
+        vac = next(m for m in r["maintenance"] if m["step"] == "vacuum")
+        assert vac["converted"]
+        assert _auto_vacuum() == 2
+        assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+        assert r["after"]["wal_bytes"] == 0
+        assert hk.last_daily is not None
+
+        # --- off hours, same day: checkpoint + optimize only
+        r = hk.run(market_open=False, now=NOW)
+        assert _steps(r) == ["optimize", "checkpoint"]
+
+        # --- next day: freed pages go back through incremental_vacuum
+        _insert_timeline(conn, days=4)
+        r = hk.run(market_open=True, now=NOW)
+        assert conn.execute("PRAGMA freelist_count").fetchone()[0] > 0
+
+        r = hk.run(market_open=False, now=NOW + 86400)
+        assert _steps(r) == ["analyze", "vacuum", "optimize", "checkpoint"]
+        vac = next(m for m in r["maintenance"] if m["step"] == "vacuum")
+        assert not vac["converted"] and vac["pages_freed"] > 0
+        assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+
+        # --- report
+        s = hk.stats()
+        assert s["runs"] == 5 and s["errors"] == 0
+        assert s["rows_deleted"]["trades"] == OLD_TRADES
+        assert s["rows_deleted"]["market_timeline"] == n_timeline + 4 * 375
+        assert len(s["history"]) == 5 and s["elapsed_ms_total"] > 0
+        assert s["trend"]["wal_bytes"] == -hk.history[0]["before"]["wal_bytes"]      # ends truncated
+        assert s["last_run"]["ts"] == NOW + 86400
+
+
+def test_cutoff_from_now():
+    ts = session_ts(4)
+    days = sorted({trading_day(t) for t in ts})
+
+    with tempfile.TemporaryDirectory() as d, scratch_db() as conn:
+        hk = Housekeeper(TimelineArchive(Path(d)), pause=0.0)
+        upsert_timeline_rows(timeline_dicts("ZZTEST", ts), conn)
+
+        # 00:30 IST, KEEP_DAYS after session 2 → sessions 0-1 leave, 2-3 stay
+        now = day_bounds(days[2])[0] + MARKET_TIMELINE_KEEP_DAYS * 86400 + 1800
+        r = hk.run(market_open=True, now=now)
+        assert r["market_timeline"]["rows_deleted"] == 2 * 375
+
+        left = conn.execute("SELECT MIN(ts) FROM market_timeline").fetchone()[0]
+        assert trading_day(left) == days[2]
+        assert hk.archive.days("ZZTEST", "1m") == days[:2]
+
+
+def main():
+    print("\n=== DB HOUSEKEEPING ===")
+    test_passes()
+    print("batched retention + off-hours maintenance + report ✔")
+    test_cutoff_from_now()
+    print("timeline cutoff from `now`, IST days ✔")
+    print("\n=== TEST COMPLETE ===\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+test_indicator_batch_parity.py
+
+Vectorized V1.9 batch engine vs IndicatorEnginePineV19 (sequential)
+-------------------------------------------------------------------
+✔ Pine `na` until seeded: NaN exactly where the engine has None
+✔ exact=True: values, rsi_rising, ready and final state bit-identical
+✔ exact=False (blocked): values within 1e-9, ready identical
+✔ Short series (< every seed length)
+✔ Sequential engine seeded from batch final state continues identically
+
+Run:
+    python -m app.tests.test_indicator_batch_parity
+"""
+
+from app.engine.indicator_batch_v1_9 import compute_v19_from_candles
+from app.engine.indicator_engine_pine_v1_9 import IndicatorEnginePineV19
+from app.tools.fixtures import synthetic_candles
+
+
+TOL = 1e-9
+KEYS = ("ema8", "ema20_low", "ema20_high", "rsi_raw", "rsi_smoothed")
+
+
+def _sequential(candles):
+    eng = IndicatorEnginePineV19()
+    eng._is_warmup = True     # no READY audit line
+    rows = []
+    for c in candles:
+        eng.update(c)
+        rows.append((dict(eng.values), eng.ready))
+    return eng, rows
+
+
+def _close(a, b, tol=TOL):
+    if a is None or b is None:
+        return a is None and b is None
+    return abs(a - b) <= tol
+
+
+def _assert_state_close(a, b, tol=TOL, path="state"):
+    if isinstance(a, dict):
+        assert set(a) == set(b), f"{path} keys {set(a)} != {set(b)}"
+        for k in a:
+            _assert_state_close(a[k], b[k], tol, f"{path}.{k}")
+    elif isinstance(a, list):
+        assert len(a) == len(b), f"{path} len {len(a)} != {len(b)}"
+        for i, (x, y) in enumerate(zip(a, b)):
+            _assert_state_close(x, y, tol, f"{path}[{i}]")
+    elif isinstance(a, float) or isinstance(b, float):
+        assert _close(a, b, tol), f"{path}: {a} != {b}"
+    else:
+        assert a == b, f"{path}: {a} != {b}"
+
+
+def check_parity(n, seed=7):
+    """
+    exact=True → every value, flag and the final state bit-identical.
+    """
+    candles = synthetic_candles(n, seed)
+    eng, rows = _sequential(candles)
+    batch = compute_v19_from_candles(candles)
+
+    assert len(batch) == n
+    for i, (values, ready) in enumerate(rows):
+        assert batch.values_at(i) == values, f"n={n} i={i}: {batch.values_at(i)} != {values}"
+        assert bool(batch.ready[i]) == ready, f"n={n} i={i} ready"
+
+    _assert_state_close(batch.state, eng.get_state(), tol=0.0)
+
+
+def check_parity_fast(n, seed=7):
+    """
+    exact=False → values within TOL; rsi_rising may flip on exact ties
+    (flat bars), so only the na pattern and ready latch must match.
+    """
+    candles = synthetic_candles(n, seed)
+    eng, rows = _sequential(candles)
+    batch = compute_v19_from_candles(candles, exact=False)
+
+    for i, (values, ready) in enumerate(rows):
+        got = batch.values_at(i)
+        for k in KEYS:
+            assert _close(got[k], values[k]), f"fast n={n} i={i} {k}: {got[k]} != {values[k]}"
+        assert bool(batch.ready[i]) == ready, f"fast n={n} i={i} ready"
+
+    state = batch.state
+    ref = eng.get_state()
+    for k in ("ema8", "ema20_low_raw", "ema20_high_raw"):
+        _assert_state_close(state[k], ref[k], path=k)
+    for k in ("ema20_low_smooth", "ema20_high_smooth"):
+        _assert_state_close(state[k]["buf"], ref[k]["buf"], path=k)
+        assert _close(state[k]["total"], ref[k]["total"], 1e-6), k
+
+
+def check_seeding(n_batch, n_live, seed=3):
+    candles = synthetic_candles(n_batch + n_live, seed)
+    head, tail = candles[:n_batch], candles[n_batch:]
+
+    ref, _ = _sequential(candles[:n_batch])
+    seeded = compute_v19_from_candles(head).to_engine()
+    seeded._is_warmup = True
+
+    for i, c in enumerate(tail):
+        a = ref.update(c)
+        b = seeded.update(c)
+        assert (a is None) == (b is None), f"seed n={n_batch} live i={i} ready"
+        if a is None:
+            continue
+        assert a == b, f"seed n={n_batch} live i={i}: {a} != {b}"
+
+
+def test_indicator_batch_parity_short_series():
+    for n in range(0, 40):
+        check_parity(n)
+
+
+def test_indicator_batch_parity_long_series():
+    check_parity(20000)
+
+
+def test_indicator_batch_parity_fast_mode():
+    for n in (0, 5, 27, 28, 29, 20000):
+        check_parity_fast(n)
+
+
+def test_indicator_batch_seeding():
+    for n in (0, 3, 6, 12, 27, 28, 500):
+        check_seeding(n, 300)
+
+
+def main():
+    print("\n=== INDICATOR BATCH PARITY ===")
+    for n in range(0, 40):
+        check_parity(n)
+    print("n=0..39 (seed edges) ✔")
+    check_parity(20000)
+    print("n=20000 ✔")
+    for n in (0, 5, 27, 28, 29, 20000):
+        check_parity_fast(n)
+    print("exact=False within 1e-9 ✔")
+    for n in (0, 3, 6, 12, 27, 28, 500):
+        check_seeding(n, 300)
+    print("seed sequential engine from batch state ✔")
+    print("\n=== TEST COMPLETE ===\n")
+
+
+if __name__ == "__main__":
+    main()
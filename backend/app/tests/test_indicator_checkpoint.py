@@ -0,0 +1,153 @@
+"""
+test_indicator_checkpoint.py
+
+Indicator checkpoint → restart → continue
+-----------------------------------------
+✔ JSON round trip through IndicatorCheckpointStore is exact
+✔ Restored engine + replayed tail == uninterrupted engine (bit-identical)
+✔ _last_red_low survives the restart
+✔ Checkpoint older than the warmup window (gap) → full warmup
+✔ Corrupt / foreign-version checkpoint → ignored, never raises
+
+Run:
+    python -m app.tests.test_indicator_checkpoint
+"""
+
+import tempfile
+from pathlib import Path
+
+from app.candles.candle_builder import CandleBuilder
+from app.engine.indicator_checkpoint import IndicatorCheckpointStore, rows_after_checkpoint
+from app.engine.indicator_engine_pine_v1_9 import IndicatorEnginePineV19
+from app.marketdata.zerodha_tick_engine import ZerodhaTickEngine
+from app.persistence.market_timeline_writer import build_timeline_row
+from app.tools.fixtures import synthetic_candles
+
+
+def _rows(candles):
+    """
+    What the warmup read returns: market_timeline rows as the live
+    path writes them (ts = candle END).
+    """
+    rows = []
+    for c in candles:
+        r = build_timeline_row(
+            candle=c, indicators=None, conditions=None, signal=None,
+            symbol="ZZTEST", timeframe="1m", strategy_version="V1.9",
+        )
+        rows.append({k: r[k] for k in ("ts", "open", "high", "low", "close")})
+    return rows
+
+
+def _engine(store):
+    # only the warmup half of the engine (no instruments / socket)
+    engine = ZerodhaTickEngine.__new__(ZerodhaTickEngine)
+    engine.checkpoints = store
+    return engine
+
+
+def test_checkpoint_restart_parity():
+    candles = synthetic_candles(900, seed=11)
+    cut = 600
+
+    # uninterrupted live engine
+    ref = IndicatorEnginePineV19()
+    ref.warmup(candles[:200], use_history=True)
+    for c in candles[200:]:
+        ref.update(c)
+
+    # live engine checkpointed at `cut`, process "restarts"
+    live = IndicatorEnginePineV19()
+    live.warmup(candles[:200], use_history=True)
+    for c in candles[200:cut]:
+        live.update(c)
+
+    with tempfile.TemporaryDirectory() as d:
+        store = IndicatorCheckpointStore(base_dir=Path(d))
+        # live path key: end_ts of the last candle fed (== its DB ts)
+        assert store.save(
+            symbol="ZZTEST",
+            token=1,
+            last_ts=candles[cut - 1].end_ts,
+            state=live.get_state(),
+        )
+
+        checkpoint = store.load("ZZTEST")
+        assert checkpoint is not None
+        assert checkpoint["state"] == live.get_state()
+
+        # warmup read = last 200 rows in DB (includes candles after cut)
+        rows = _rows(candles[cut - 150:cut + 50])
+        tail = rows_after_checkpoint(checkpoint, rows)
+        assert [r["ts"] for r in tail] == [c.end_ts for c in candles[cut:cut + 50]]
+
+        # the engine's own restore path: checkpoint + tail, nothing fed twice
+        restored = IndicatorEnginePineV19()
+        builder = CandleBuilder(instrument_token=1, timeframe_sec=60, last_candle_end_ts=None)
+        warm = _engine(store)._warmup_indicator(
+            rows=rows, builder=builder, indicator=restored, symbol="ZZTEST",
+        )
+        assert warm == {"restored": True, "replayed": 50, "last_ts": candles[cut + 49].end_ts}
+
+        replayed = ZerodhaTickEngine._rows_to_candles(tail, 60)
+        assert [(c.start_ts, c.end_ts) for c in replayed] == [
+            (c.start_ts, c.end_ts) for c in candles[cut:cut + 50]
+        ]
+
+    snap = IndicatorEnginePineV19.from_state(checkpoint["state"])
+    assert snap.find_previous_red_low() == live.find_previous_red_low()
+    assert snap.find_previous_red_low() is not None
+
+    for c in candles[cut + 50:]:
+        restored.update(c)
+
+    assert restored.get_state() == ref.get_state()
+    assert restored.snapshot() == ref.snapshot()
+
+
+def test_rows_after_checkpoint_edges():
+    rows = [{"ts": t} for t in (60, 120, 180)]
+
+    assert rows_after_checkpoint({"last_ts": 180}, rows) == []
+    assert rows_after_checkpoint({"last_ts": 240}, rows) == []     # DB behind
+    assert rows_after_checkpoint({"last_ts": 60}, rows) == rows[1:]
+    assert rows_after_checkpoint({"last_ts": 0}, rows) is None      # gap
+    assert rows_after_checkpoint({"last_ts": 60}, []) == []
+
+
+def test_bad_checkpoints_ignored():
+    with tempfile.TemporaryDirectory() as d:
+        store = IndicatorCheckpointStore(base_dir=Path(d))
+
+        assert store.load("MISSING") is None
+
+        store.path("ZZBAD").write_text("{not json", encoding="utf-8")
+        assert store.load("ZZBAD") is None
+
+        eng = IndicatorEnginePineV19()
+        state = eng.get_state()
+        state["version"] = -1
+        store.save(symbol="ZZOLD", token=2, last_ts=60, state=state)
+        checkpoint = store.load("ZZOLD")
+        try:
+            IndicatorEnginePineV19.from_state(checkpoint["state"])
+            raise AssertionError("version mismatch must raise")
+        except ValueError:
+            pass
+
+        assert store.stats()["load_errors"] == 1
+
+
+def main():
+    print("\n=== INDICATOR CHECKPOINT ===")
+    test_checkpoint_restart_parity()
+    print("restart from checkpoint + tail replay == uninterrupted ✔")
+    test_rows_after_checkpoint_edges()
+    print("tail / gap detection ✔")
+    test_bad_checkpoints_ignored()
+    print("corrupt / old checkpoints ignored ✔")
+    print("\n=== TEST COMPLETE ===\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+test_latency_tracker.py
+
+Tick-to-order latency instrumentation
+-------------------------------------
+✔ Histogram exact below 32µs, ≤ 1/16 relative error above
+✔ Percentiles of a known distribution (p50 / p95 / p99 / max)
+✔ Empty histogram, negative samples clamp to 0
+✔ Tracker: per-stage + per-token histograms, snapshot in STAGES order
+✔ Order origin consumed once (no stale tick_to_order sample)
+
+Run:
+    python -m app.tests.test_latency_tracker
+"""
+
+import random
+
+from app.engine.latency_tracker import STAGES, LatencyHistogram, LatencyTracker
+
+
+def test_histogram_buckets():
+    h = LatencyHistogram()
+    for us in range(32):
+        h.record(us)
+        assert h.percentile(100) == us
+
+    for us in (100, 1_000, 12_345, 999_999, 7_654_321):
+        h = LatencyHistogram()
+        h.record(us)
+        upper = h._upper(next(iter(h.counts)))
+        assert us <= upper <= us * (1 + 1 / 16), (us, upper)
+        assert h.percentile(50) == us          # capped at max_us
+
+    h = LatencyHistogram()
+    assert h.percentile(99) == 0
+    assert h.summary() == {
+        "count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0,
+    }
+    h.record(-5)
+    assert h.count == 1 and h.max_us == 0 and h.percentile(50) == 0
+
+
+def test_percentiles():
+    samples = list(range(1, 100_001))         # 1µs .. 100ms, uniform
+    random.Random(3).shuffle(samples)
+
+    h = LatencyHistogram()
+    for us in samples:
+        h.record(us)
+
+    for pct, exact in ((50, 50_000), (95, 95_000), (99, 99_000)):
+        got = h.percentile(pct)
+        assert exact <= got <= exact * (1 + 1 / 16), (pct, got)
+    assert h.percentile(100) == 100_000
+
+    s = h.summary()
+    assert s["count"] == 100_000 and s["max_ms"] == 100.0
+    assert s["mean_ms"] == 50.001          # 50000.5µs
+    assert s["p50_ms"] <= s["p95_ms"] <= s["p99_ms"] <= s["max_ms"]
+
+
+def test_tracker():
+    lat = LatencyTracker(enabled=True)
+    t0 = lat.now()
+    lat.record("order", t0, token=11)
+    lat.record("tick", t0)
+    lat.record("order", t0, token=12)
+
+    snap = lat.snapshot(per_token=True)
+    assert list(snap["stages"]) == [s for s in STAGES if s in ("tick", "order")]
+    assert snap["stages"]["order"]["count"] == 2
+    assert set(snap["tokens"]) == {"11", "12"}
+    assert snap["tokens"]["11"]["order"]["count"] == 1
+
+    # origin: one per routed signal, consumed by the order it produced
+    assert lat.origin("ZZTEST") is None
+    lat.mark_origin("ZZTEST", t0)
+    assert lat.origin("ZZTEST") == t0
+    assert lat.origin("ZZTEST") is None
+    assert lat._origins == {}
+
+    lat.mark_origin("ZZTEST", t0)
+    lat.reset()
+    assert lat.origin("ZZTEST") is None and lat.snapshot()["stages"] == {}
+
+
+def main():
+    print("\n=== LATENCY TRACKER ===")
+    test_histogram_buckets()
+    print("bucket precision, empty / negative ✔")
+    test_percentiles()
+    print("p50 / p95 / p99 within bucket error ✔")
+    test_tracker()
+    print("per-stage / per-token, origin consumed once ✔")
+    print("\n=== TEST COMPLETE ===\n")
+
+
+if __name__ == "__main__":
+    main()
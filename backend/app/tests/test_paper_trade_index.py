@@ -0,0 +1,108 @@
+"""
+test_paper_trade_index.py
+
+Open paper trades in memory (tick-time SL / TP)
+-----------------------------------------------
+✔ take_exits: SL / TP hits returned once and removed; others untouched
+✔ strategy filter respected
+✔ SIGNAL lane full → exit rejected → trade back in the index
+✔ next tick (lane free) exits it exactly once
+
+Run:
+    python -m app.tests.test_paper_trade_index
+"""
+
+import threading
+import time
+
+from app.engine.candle_pipeline import CandlePipeline, JobPriority
+from app.marketdata.zerodha_tick_engine import ZerodhaTickEngine
+from app.trading.paper_trade_index import OpenPaperTradeIndex
+from app.trading.paper_trade_recorder import PaperTradeRecorder
+
+
+STRATEGY = PaperTradeRecorder.STRATEGY_NAME
+
+
+def _add(trade_id, symbol="ZZTEST", sl=90.0, tp=110.0, strategy=STRATEGY):
+    OpenPaperTradeIndex.add(
+        paper_trade_id=trade_id, strategy_name=strategy, symbol=symbol,
+        token=1, sl_price=sl, tp_price=tp,
+    )
+
+
+def test_take_exits():
+    OpenPaperTradeIndex.clear()
+    try:
+        _add("A", sl=90.0, tp=110.0)
+        _add("B", sl=95.0, tp=120.0)
+        _add("C", sl=50.0, tp=60.0, strategy="OTHER")
+
+        assert OpenPaperTradeIndex.take_exits("ZZTEST", 100.0, strategy_name=STRATEGY) == []
+        assert OpenPaperTradeIndex.take_exits("NOPE", 100.0) == []
+
+        hits = OpenPaperTradeIndex.take_exits("ZZTEST", 94.0, strategy_name=STRATEGY)
+        assert [(t.paper_trade_id, r) for t, r in hits] == [("B", "SL")]
+        assert OpenPaperTradeIndex.take_exits("ZZTEST", 94.0, strategy_name=STRATEGY) == []
+
+        hits = OpenPaperTradeIndex.take_exits("ZZTEST", 111.0, strategy_name=STRATEGY)
+        assert [(t.paper_trade_id, r) for t, r in hits] == [("A", "TP")]
+
+        # other strategy's trade still indexed
+        assert [t["paper_trade_id"] for t in OpenPaperTradeIndex.snapshot()["ZZTEST"]] == ["C"]
+    finally:
+        OpenPaperTradeIndex.clear()
+
+
+def test_rejected_exit_restored():
+    OpenPaperTradeIndex.clear()
+    exits = []
+    real_exit = PaperTradeRecorder.__dict__["exit_trade"]
+    PaperTradeRecorder.exit_trade = staticmethod(lambda **kw: exits.append(kw))
+
+    pipeline = CandlePipeline(workers=1, capacity={JobPriority.SIGNAL: 1}, name="test")
+    engine = ZerodhaTickEngine.__new__(ZerodhaTickEngine)
+    engine.pipeline = pipeline
+
+    gate = threading.Event()
+    try:
+        _add("A", sl=90.0, tp=110.0)
+
+        # lane busy + SIGNAL queue full → the exit job is rejected
+        pipeline.submit(1, gate.wait, priority=JobPriority.SIGNAL)
+        while not pipeline._lanes[0].busy:
+            time.sleep(0.001)
+        assert pipeline.submit(1, lambda: None, priority=JobPriority.SIGNAL)
+
+        engine._check_paper_exits(1, "ZZTEST", 89.0)
+        assert [t["paper_trade_id"] for t in OpenPaperTradeIndex.snapshot()["ZZTEST"]] == ["A"]
+        assert pipeline.stats()["dropped"]["SIGNAL"] == 1
+
+        gate.set()
+        assert pipeline.drain(timeout=5.0)
+        assert exits == []
+
+        # lane free → next tick exits it, once
+        engine._check_paper_exits(1, "ZZTEST", 89.0)
+        engine._check_paper_exits(1, "ZZTEST", 88.0)
+        assert pipeline.drain(timeout=5.0)
+        assert [(e["paper_trade_id"], e["exit_reason"], e["exit_price"]) for e in exits] == [("A", "SL", 89.0)]
+        assert OpenPaperTradeIndex.snapshot() == {}
+    finally:
+        gate.set()
+        pipeline.shutdown(timeout=5.0)
+        PaperTradeRecorder.exit_trade = real_exit
+        OpenPaperTradeIndex.clear()
+
+
+def main():
+    print("\n=== PAPER TRADE INDEX ===")
+    test_take_exits()
+    print("SL / TP hits taken once ✔")
+    test_rejected_exit_restored()
+    print("rejected exit restored, retried next tick ✔")
+    print("\n=== TEST COMPLETE ===\n")
+
+
+if __name__ == "__main__":
+    main()
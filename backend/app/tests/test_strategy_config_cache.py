@@ -0,0 +1,105 @@
+"""
+test_strategy_config_cache.py
+
+Cached strategy config (StrategyConfigStore)
+--------------------------------------------
+✔ Parsed once: repeated get() returns the same dict, no re-read
+✔ save_strategy_config() → cache + subscribers updated immediately
+✔ Hand edit of the file picked up after CHECK_INTERVAL (stat key)
+✔ load_strategy_config() is a private copy (safe to mutate)
+✔ Missing file → defaults written, never {}
+✔ Subscriber errors never reach the caller
+
+Run:
+    python -m app.tests.test_strategy_config_cache
+"""
+
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import app.config.strategy_loader as loader
+
+
+def _with_temp_config(fn):
+    orig_path, orig_store = loader.CONFIG_PATH, loader.strategy_config
+    with tempfile.TemporaryDirectory() as d:
+        loader.CONFIG_PATH = Path(d) / "strategy_config.json"
+        loader.strategy_config = loader.StrategyConfigStore(check_interval=0.05)
+        try:
+            fn(loader.strategy_config)
+        finally:
+            loader.CONFIG_PATH, loader.strategy_config = orig_path, orig_store
+
+
+def _cache_and_notify(store):
+    # missing → defaults written back
+    cfg = loader.get_strategy_config()
+    assert cfg == loader.DEFAULT_CONFIG
+    assert loader.CONFIG_PATH.exists()
+
+    # parsed once
+    assert loader.get_strategy_config() is cfg
+    reloads = store.reloads
+
+    seen = []
+    store.subscribe(lambda new, old: seen.append((new["trade_side_mode"], old["trade_side_mode"])))
+    store.subscribe(lambda new, old: 1 / 0)      # must not propagate
+
+    # private copy
+    private = loader.load_strategy_config()
+    private["trade_side_mode"] = "CE"
+    assert loader.get_strategy_config()["trade_side_mode"] == "BOTH"
+
+    # save → cache + subscribers, no re-read
+    loader.save_strategy_config(private)
+    assert loader.get_strategy_config()["trade_side_mode"] == "CE"
+    assert seen == [("CE", "BOTH")]
+    assert store.reloads == reloads
+
+    # hand edit (different size → different stat key even on coarse mtime)
+    raw = json.loads(loader.CONFIG_PATH.read_text(encoding="utf-8"))
+    raw["trade_side_mode"] = "PE"
+    raw["min_sl_points"] = 12
+    loader.CONFIG_PATH.write_text(json.dumps(raw), encoding="utf-8")
+
+    time.sleep(0.06)
+    cfg = loader.get_strategy_config()
+    assert cfg["trade_side_mode"] == "PE" and cfg["min_sl_points"] == 12
+    assert cfg["quantity"] == loader.DEFAULT_CONFIG["quantity"]     # merged
+    assert seen[-1] == ("PE", "CE")
+
+    # unchanged file → no reload, no event
+    time.sleep(0.06)
+    reloads = store.reloads
+    assert loader.get_strategy_config() is cfg
+    assert store.reloads == reloads
+    assert len(seen) == 2
+
+
+def _corrupt_file(store):
+    loader.CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    loader.CONFIG_PATH.write_text("{broken", encoding="utf-8")
+    assert loader.get_strategy_config() == loader.DEFAULT_CONFIG
+
+
+def test_strategy_config_cache():
+    _with_temp_config(_cache_and_notify)
+
+
+def test_strategy_config_corrupt_file():
+    _with_temp_config(_corrupt_file)
+
+
+def main():
+    print("\n=== STRATEGY CONFIG CACHE ===")
+    test_strategy_config_cache()
+    print("cache / save / hand edit / subscribers ✔")
+    test_strategy_config_corrupt_file()
+    print("corrupt file → defaults ✔")
+    print("\n=== TEST COMPLETE ===\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+test_strategy_registry.py
+
+Strategy registry + shared per-token indicator cache
+----------------------------------------------------
+✔ Same (indicator, params) from N strategies → ONE engine per token
+✔ Each engine updated once per candle (repeat update() is a no-op)
+✔ Shared values == standalone IndicatorEnginePineV19 (bit-identical)
+✔ Per-strategy conditions: own rules on shared values == standalone
+✔ Extra indicator outputs merged into that strategy's inputs only
+✔ Duplicate / unknown / primary-removal registrations rejected
+
+Run:
+    python -m app.tests.test_strategy_registry
+"""
+
+from app.engine.condition_engine_v1_9 import V19_RULES, ConditionEngineV19
+from app.engine.indicator_engine_pine_v1_9 import IndicatorEnginePineV19
+from app.engine.strategy_registry import (
+    V19_INDICATORS,
+    IndicatorCache,
+    IndicatorSpec,
+    StrategyRegistry,
+    StrategySpec,
+)
+from app.indicators.ema import EMA
+from app.tools.fixtures import synthetic_candles
+
+
+EMA50 = IndicatorSpec.of("ema", length=50)
+
+RSI70_RULES = {
+    **V19_RULES,
+    "conditions": [
+        {**c, "right": 70} if c["name"] == "cond_rsi_le_65" else c
+        for c in V19_RULES["conditions"]
+    ],
+}
+
+EMA50_RULES = {
+    **V19_RULES,
+    "requires": V19_RULES["requires"] + ["ema50"],
+    "conditions": V19_RULES["conditions"][:-2] + [
+        {"name": "cond_close_gt_ema50", "left": "close", "op": ">", "right": "ema50"},
+    ] + V19_RULES["conditions"][-2:],
+}
+
+
+class CountingEngine(IndicatorEnginePineV19):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def update(self, candle):
+        self.calls += 1
+        return super().update(candle)
+
+
+def _registry():
+    reg = StrategyRegistry()
+    reg.register(StrategySpec(version="V1.9", routes=True))
+    reg.register(StrategySpec(version="V1.9-RSI70", rules=RSI70_RULES))
+    reg.register(StrategySpec(version="V1.9-EMA50", indicators=(EMA50,), rules=EMA50_RULES))
+    return reg
+
+
+def test_specs_deduplicated():
+    assert IndicatorSpec.of("ema", length=50, source="close") == IndicatorSpec.of("ema", source="close", length=50)
+    assert IndicatorSpec.of("ema", length=50) != IndicatorSpec.of("ema", length=20)
+
+    reg = _registry()
+    assert reg.primary.version == "V1.9"
+    assert reg.indicator_specs() == [V19_INDICATORS, EMA50]
+
+    cache = IndicatorCache(reg.indicator_specs())
+    assert len(cache.engines) == 2      # 3 strategies, 2 unique specs
+
+
+def test_shared_values_and_conditions():
+    reg = _registry()
+    candles = synthetic_candles(1500, seed=4)
+
+    primary = CountingEngine()
+    cache = IndicatorCache(reg.indicator_specs(), engines={V19_INDICATORS: primary})
+    assert cache.engine(V19_INDICATORS) is primary
+
+    # standalone references: one engine + one rule set per strategy
+    ref_engine = IndicatorEnginePineV19()
+    ref_ema = EMA(50)
+    ref_rules = {s.version: ConditionEngineV19(s.rules) for s in reg.specs()}
+
+    fired = {s.version: 0 for s in reg.specs()}
+
+    for c in candles:
+        for _ in reg.specs():          # every strategy asks; engines run once
+            cache.update(c)
+        ref_engine.update(c)
+        ema50 = ref_ema.update(c.close)
+
+        assert primary.values == ref_engine.values
+        assert cache.engine(EMA50).values["ema50"] == ema50
+
+        if not ref_engine.is_ready():
+            continue
+
+        for spec in reg.specs():
+            if not cache.is_ready(spec.all_indicators):
+                continue
+            inputs = cache.inputs(spec)
+            got = spec.conditions.evaluate(
+                candle=c, indicators=inputs, is_trading_time=True, no_open_trade=True,
+            )
+            want = ref_rules[spec.version].evaluate(
+                candle=c,
+                indicators={**ref_engine.values, "ema50": ema50},
+                is_trading_time=True,
+                no_open_trade=True,
+            )
+            assert got == want
+            fired[spec.version] += got["cond_all"]
+
+    assert primary.calls == len(candles)
+    assert cache.updates == len(candles)
+    assert cache.reuses == 2 * len(candles)
+
+    # only the EMA50 strategy sees ema50; the others read the live dict
+    v19 = reg.specs()[0]
+    assert "ema50" not in cache.inputs(v19)
+    assert cache.inputs(v19) is primary.values
+
+    # wider RSI band fires at least as often; extra filter at most as often
+    assert fired["V1.9-RSI70"] >= fired["V1.9"] >= fired["V1.9-EMA50"]
+    assert fired["V1.9"] > 0
+
+
+def test_bad_registrations():
+    reg = _registry()
+
+    for spec in (
+        StrategySpec(version="V1.9"),                                        # duplicate
+        StrategySpec(version="X", indicators=(IndicatorSpec.of("vwap"),)),    # unknown
+        StrategySpec(version="Y", engine=EMA50),                             # no SL helper
+    ):
+        try:
+            reg.register(spec)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {spec.version}")
+
+    try:
+        reg.unregister("V1.9")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("primary removed")
+
+    assert reg.unregister("V1.9-RSI70")
+    assert [s.version for s in reg.specs()] == ["V1.9", "V1.9-EMA50"]
+
+
+def main():
+    print("\n=== STRATEGY REGISTRY ===")
+    test_specs_deduplicated()
+    print("unique (indicator, params) → one engine ✔")
+    test_shared_values_and_conditions()
+    print("3 strategies on 1500 candles: one update each, parity ✔")
+    test_bad_registrations()
+    print("bad registrations rejected ✔")
+    print("\n=== TEST COMPLETE ===\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+test_subscription_manager.py
+
+WS mode tiers (FULL / QUOTE / LTP)
+----------------------------------
+✔ plan(): focus → FULL, near-ATM band → QUOTE, wings → LTP, indices → LTP;
+  no spot yet → QUOTE
+✔ apply(): only changed tokens sent to set_mode; re-apply is a no-op
+✔ Focus change promotes the new symbol to FULL, demotes the old one
+✔ forget() / reset(): removed or reconnected tokens are re-sent
+✔ account(): ticks + byte estimates per tier
+✔ Engine: selection refresh re-tiers live; QUOTE / LTP ticks (no
+  exchange_timestamp) bucket on receive time + clock skew
+
+Run:
+    python -m app.tests.test_subscription_manager
+"""
+
+from datetime import datetime
+
+from app.marketdata.market_indices_state import MarketIndicesState
+from app.marketdata.subscription_manager import MODE_FULL, MODE_LTP, MODE_QUOTE, SubscriptionManager
+from app.marketdata.tick_replay import FakeKiteTicker
+from app.tests.conftest import NIFTY_TOKEN, option_token, tick_engine
+from app.tools.fixtures import DAY0
+
+
+STRIKES = range(24700, 25301, 50)
+
+
+def _plan(mgr, focus=(), atm=25000.0):
+    return mgr.plan(
+        token_strikes={option_token(k): k for k in STRIKES},
+        focus_tokens={option_token(k) for k in focus},
+        index_tokens=[NIFTY_TOKEN],
+        atm=atm,
+    )
+
+
+def _tiers(plan):
+    out = {}
+    for token, mode in plan.items():
+        out.setdefault(mode, set()).add(token)
+    return out
+
+
+def test_plan():
+    mgr = SubscriptionManager(strike_step=50, near_atm_strikes=2)
+
+    tiers = _tiers(_plan(mgr, focus=[24700]))
+    assert tiers[MODE_FULL] == {option_token(24700)}
+    assert tiers[MODE_QUOTE] == {option_token(k) for k in range(24900, 25101, 50)}
+    assert tiers[MODE_LTP] == {option_token(k) for k in (24750, 24800, 24850, 25150, 25200, 25250, 25300)} | {NIFTY_TOKEN}
+
+    # no spot yet: everything but focus in the middle tier
+    tiers = _tiers(_plan(mgr, focus=[25300], atm=None))
+    assert tiers[MODE_FULL] == {option_token(25300)}
+    assert len(tiers[MODE_QUOTE]) == len(STRIKES) - 1
+    assert tiers[MODE_LTP] == {NIFTY_TOKEN}
+
+
+def test_apply_promote_demote():
+    mgr = SubscriptionManager(strike_step=50, near_atm_strikes=2)
+    ws = FakeKiteTicker()
+    calls = []
+    set_mode = ws.set_mode
+    ws.set_mode = lambda mode, tokens: (calls.append((mode, sorted(tokens))), set_mode(mode, tokens))
+
+    assert mgr.apply(ws, _plan(mgr)) == len(STRIKES) + 1
+    assert mgr.counts() == {MODE_LTP: 9, MODE_QUOTE: 5, MODE_FULL: 0}
+    calls.clear()
+    assert mgr.apply(ws, _plan(mgr)) == 0 and calls == []
+
+    # select a wing strike → FULL; then switch selection to an ATM strike
+    assert mgr.apply(ws, _plan(mgr, focus=[24700])) == 1
+    assert calls == [(ws.MODE_FULL, [option_token(24700)])]
+    assert ws.modes[option_token(24700)] == MODE_FULL
+
+    calls.clear()
+    assert mgr.apply(ws, _plan(mgr, focus=[25000])) == 2
+    assert sorted(calls) == sorted([
+        (ws.MODE_FULL, [option_token(25000)]),
+        (ws.MODE_LTP, [option_token(24700)]),
+    ])
+    assert mgr.mode_of(option_token(24700)) == MODE_LTP
+    assert mgr.mode_of(option_token(25000)) == MODE_FULL
+
+    # ATM moves 200 → the QUOTE band follows it
+    changed = mgr.apply(ws, _plan(mgr, focus=[25000], atm=25200.0))
+    assert changed == 7                     # 24900-25050 → LTP, 25150-25300 → QUOTE
+    assert mgr.mode_of(option_token(25300)) == MODE_QUOTE
+    assert mgr.mode_of(option_token(24900)) == MODE_LTP
+
+    # forgotten / reconnected tokens are sent again
+    mgr.forget([option_token(25300)])
+    assert mgr.apply(ws, _plan(mgr, focus=[25000], atm=25200.0)) == 1
+    mgr.reset()
+    assert mgr.apply(ws, _plan(mgr, focus=[25000], atm=25200.0)) == len(STRIKES) + 1
+
+    # accounting by current tier
+    mgr.account([
+        {"instrument_token": option_token(25000)},
+        {"instrument_token": option_token(25300)},
+        {"instrument_token": NIFTY_TOKEN},
+        {"instrument_token": 1},                            # unknown → ignored
+    ])
+    s = mgr.stats()
+    assert s["ticks"] == {MODE_LTP: 1, MODE_QUOTE: 1, MODE_FULL: 1}
+    assert s["bytes_est"] == {MODE_LTP: 8, MODE_QUOTE: 44, MODE_FULL: 184}
+
+
+def test_engine_tiers_and_clock():
+    MarketIndicesState.update_ltp("NIFTY", 25000.0)
+    with tick_engine(STRIKES) as engine:
+        engine.subscriptions.near_atm_strikes = 2
+        ws = engine.kws
+        ws.connect()
+        assert ws.modes[option_token(24700)] == MODE_LTP
+        assert ws.modes[option_token(25000)] == MODE_QUOTE
+
+        engine.refresh_subscription_modes({"NIFTYZZ24700CE"})
+        assert ws.modes[option_token(24700)] == MODE_FULL
+        engine.refresh_subscription_modes({"NIFTYZZ25050CE"})
+        assert ws.modes[option_token(24700)] == MODE_LTP
+        assert ws.modes[option_token(25050)] == MODE_FULL
+
+        # exchange clock 0.5s ahead: a QUOTE tick received 0.3s before the
+        # minute (local) is already in the next exchange minute
+        boundary = DAY0 + 60
+        engine._clock_skew = 0.5
+        engine.clock = lambda: boundary - 0.3
+
+        quote, full = option_token(25000), option_token(25050)
+        ws.emit([
+            {"instrument_token": quote, "last_price": 100.0},
+            {"instrument_token": full, "last_price": 90.0,
+             "exchange_timestamp": datetime.fromtimestamp(boundary - 1)},
+        ])
+        assert engine.builders[quote].current_bucket_start == boundary
+        assert engine.builders[full].current_bucket_start == boundary - 60
+
+
+def main():
+    print("\n=== SUBSCRIPTION TIERS ===")
+    test_plan()
+    print("FULL / QUOTE / LTP plan ✔")
+    test_apply_promote_demote()
+    print("changed-only apply, promote / demote, accounting ✔")
+    test_engine_tiers_and_clock()
+    print("engine re-tiers on selection, per-tier candle clock ✔")
+    print("\n=== TEST COMPLETE ===\n")
+
+
+if __name__ == "__main__":
+    main()
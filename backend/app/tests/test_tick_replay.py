@@ -0,0 +1,124 @@
+"""
+test_tick_replay.py
+
+Tick journal → offline replay round trip (synthetic instruments)
+---------------------------------------------------------------
+✔ Ticks recorded by the live path (journal) replay into the SAME
+  closed candles (token, bucket, OHLC) and the same close origins
+✔ Journal keeps exchange ts (ms), receive time, ltp, volume, oi
+✔ live_side_effects=False → NIFTY drift never re-centres the universe
+
+Run:
+    python -m app.tests.test_tick_replay
+"""
+
+import random
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from app.marketdata.tick_journal import TickJournal, iter_batches, read_journal
+from app.marketdata.tick_replay import TickReplayer
+from app.tests.conftest import NIFTY_TOKEN, capture_candles, option_token, tick_engine
+from app.tools.fixtures import DAY0
+
+
+STRIKES = (25000, 25050)
+MINUTES = 6
+
+
+def _batches(seed=11):
+    """
+    WS-like batches: every ~0.7s both options tick (exchange ts in whole
+    seconds, received ~200ms later); NIFTY drifts 10 strikes away.
+    """
+    rng = random.Random(seed)
+    prices = {option_token(k): 100.0 + i * 20 for i, k in enumerate(STRIKES)}
+    volume = 0
+    spot = 25010.0
+    out = []
+    t = DAY0 + 0.3
+    while t < DAY0 + MINUTES * 60:
+        ticks = []
+        for token in prices:
+            if rng.random() < 0.15:
+                continue                        # quiet token this batch
+            prices[token] = round(max(0.05, prices[token] + rng.gauss(0, 0.8)), 2)
+            volume += rng.randint(1, 50) * 75
+            ticks.append({
+                "instrument_token": token,
+                "last_price": prices[token],
+                "exchange_timestamp": datetime.fromtimestamp(int(t)),
+                "volume_traded": volume,
+                "oi": 1000 + volume // 10,
+            })
+        spot += 2.0
+        ticks.append({"instrument_token": NIFTY_TOKEN, "last_price": spot, "exchange_timestamp": None})
+        out.append((t + 0.2, ticks))
+        t += rng.uniform(0.4, 1.0)
+    return out
+
+
+def _no_recenter(engine, tokens):
+    with engine._recenter_lock:
+        pass
+    assert not engine.recenter
+    assert engine._universe_atm == 25000
+    assert set(engine.builders) == tokens
+
+
+def test_round_trip():
+    batches = _batches()
+    tokens = {option_token(k) for k in STRIKES}
+
+    with tempfile.TemporaryDirectory() as d:
+        # --- live path: FakeKiteTicker + journal, clock = batch receive time
+        with tick_engine(STRIKES, journal=TickJournal(Path(d))) as live:
+            now = [0.0]
+            live.clock = lambda: now[0]
+            live_closed = capture_candles(live)
+            live.kws.connect()
+
+            for recv, ticks in batches:
+                now[0] = recv
+                live.kws.emit(ticks)
+            assert live.pipeline.drain(timeout=10.0)
+
+            path = live.journal.path
+            live_by = dict(live.closed_by)
+            _no_recenter(live, tokens)
+
+        n_ticks = sum(len(t) for _, t in batches)
+        records = list(read_journal(path))
+        assert len(records) == n_ticks
+        assert len(list(iter_batches(path))) == len(batches)
+        first = batches[0][1][0]
+        assert records[0].token == first["instrument_token"]
+        assert records[0].exchange_ts_ms == int(first["exchange_timestamp"].timestamp() * 1000)
+        assert records[0].ltp == first["last_price"]
+        assert (records[0].volume, records[0].oi) == (first["volume_traded"], first["oi"])
+        assert records[-1].exchange_ts_ms == 0                  # NIFTY: no exchange ts
+
+        # --- offline replay of the journal
+        with tick_engine(STRIKES) as replay:
+            replay_closed = capture_candles(replay)
+            report = TickReplayer(replay, replay.kws).run(path)
+            assert report["batches"] == len(batches) and report["ticks"] == n_ticks
+
+            assert replay_closed == live_closed
+            assert dict(replay.closed_by) == live_by
+            _no_recenter(replay, tokens)
+
+        # every token closed every full minute but the last (still open)
+        assert len(live_closed) == len(tokens) * (MINUTES - 1)
+
+
+def main():
+    print("\n=== TICK JOURNAL REPLAY ===")
+    test_round_trip()
+    print("journal → replay == live candles, no recentre offline ✔")
+    print("\n=== TEST COMPLETE ===\n")
+
+
+if __name__ == "__main__":
+    main()
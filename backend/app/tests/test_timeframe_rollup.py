@@ -0,0 +1,153 @@
+"""
+test_timeframe_rollup.py
+
+TimeframeRollup vs direct N-minute aggregation of 1m candles
+------------------------------------------------------------
+✔ 3m / 5m / 15m / 7m buckets anchored at 09:15 IST
+✔ Bar emitted on its LAST minute (no waiting for the next bar)
+✔ Last bar of the session closes at 15:30 (N not dividing 375)
+✔ Missing minutes (illiquid strike) → bar still closes
+✔ Start mid-bucket → first partial bar dropped
+✔ Engine: rollup advances inside the 1m SIGNAL job; only the fan-out
+  (timeline row + subscribers) is queued behind it at PERSIST
+
+Run:
+    python -m app.tests.test_timeframe_rollup
+"""
+
+import random
+import threading
+from datetime import datetime, timezone, timedelta
+
+from app.candles.timeframe_rollup import TimeframeRollup
+from app.engine.candle_pipeline import JobPriority
+from app.marketdata.candle import Candle, CandleSource
+from app.tests.conftest import option_token, tick_engine
+from app.tools.fixtures import DAY0
+
+
+IST = timezone(timedelta(hours=5, minutes=30))
+SESSION_OPEN = int(datetime(2026, 1, 15, 9, 15, tzinfo=IST).timestamp())
+SESSION_MINUTES = 375
+MINUTES = (3, 5, 7, 15)
+
+
+def _session(rng, skip_pct=0.0, start_minute=0):
+    out = []
+    px = 100.0
+    for i in range(start_minute, SESSION_MINUTES):
+        o = px
+        px = round(px + rng.uniform(-1, 1), 2)
+        if rng.random() < skip_pct:
+            continue
+        ts = SESSION_OPEN + i * 60
+        out.append(Candle(
+            start_ts=ts,
+            end_ts=ts + 60,
+            open=o,
+            high=max(o, px) + 0.5,
+            low=min(o, px) - 0.5,
+            close=px,
+            source=CandleSource.LIVE,
+        ))
+    return out
+
+
+def _direct(candles, minutes, drop_first_partial):
+    size = minutes * 60
+    close = SESSION_OPEN + SESSION_MINUTES * 60
+    groups = {}
+    for c in candles:
+        start = SESSION_OPEN + (c.start_ts - SESSION_OPEN) // size * size
+        groups.setdefault(start, []).append(c)
+
+    out = []
+    for start in sorted(groups):
+        g = groups[start]
+        if drop_first_partial and not out and g[0].start_ts != start:
+            continue
+        out.append((
+            start,
+            min(start + size, close),
+            g[0].open,
+            max(c.high for c in g),
+            min(c.low for c in g),
+            g[-1].close,
+        ))
+    return out
+
+
+def check(seed, skip_pct=0.0, start_minute=0):
+    rng = random.Random(seed)
+    candles = _session(rng, skip_pct, start_minute)
+
+    rollup = TimeframeRollup(MINUTES)
+    got = {f"{m}m": [] for m in MINUTES}
+
+    for c in candles:
+        for label, bar in rollup.on_candle(c):
+            # emitted on the minute that completes it (or a later one on gaps)
+            assert bar.end_ts <= c.end_ts
+            got[label].append((bar.start_ts, bar.end_ts, bar.open, bar.high, bar.low, bar.close))
+
+    for m in MINUTES:
+        want = _direct(candles, m, drop_first_partial=True)
+        assert got[f"{m}m"] == want, f"seed={seed} {m}m mismatch"
+
+    return sum(len(v) for v in got.values())
+
+
+def test_timeframe_rollup_full_session():
+    check(1)
+
+
+def test_timeframe_rollup_gaps():
+    check(2, skip_pct=0.2)
+
+
+def test_timeframe_rollup_mid_bucket_start():
+    check(3, start_minute=7)
+
+
+def test_engine_rollup_inline():
+    with tick_engine([25000], rollup_minutes=(3,)) as engine:
+        token, symbol = option_token(25000), "NIFTYZZ25000CE"
+        got, seen = [], []
+        engine.subscribe_timeframe(3, lambda t, s, bar: got.append((t, bar.start_ts, bar.end_ts)))
+
+        # lane parked → the three 1m jobs and the probe queue up together
+        gate = threading.Event()
+        engine.pipeline.submit(token, gate.wait, priority=JobPriority.SIGNAL)
+        try:
+            for i in range(3):
+                candle = Candle(DAY0 + 60 * i, DAY0 + 60 * (i + 1), 100.0 + i, 102.0, 99.0, 101.0, CandleSource.LIVE)
+                engine._submit_candle(token, symbol, candle)
+
+            # next SIGNAL job on the lane: 3m bar already rolled, fan-out still queued
+            engine.pipeline.submit(
+                token,
+                lambda: seen.append((len(engine.recent_candles(symbol, "3m")), len(got))),
+                priority=JobPriority.SIGNAL,
+            )
+        finally:
+            gate.set()
+        assert engine.pipeline.drain(timeout=5.0)
+
+        assert seen == [(1, 0)]
+        assert got == [(token, DAY0, DAY0 + 180)]
+        bar = engine.recent_candles(symbol, "3m")[0]
+        assert (bar.open, bar.high, bar.low, bar.close) == (100.0, 102.0, 99.0, 101.0)
+
+
+def main():
+    print("\n=== TIMEFRAME ROLLUP ===")
+    print(f"full session bars={check(1)} ✔")
+    print(f"20% missing minutes bars={check(2, skip_pct=0.2)} ✔")
+    print(f"start mid-bucket bars={check(3, start_minute=7)} ✔")
+    test_engine_rollup_inline()
+    print("engine: rollup inline in SIGNAL, fan-out at PERSIST ✔")
+    print("\n=== TEST COMPLETE ===\n")
+
+
+if __name__ == "__main__":
+    main()
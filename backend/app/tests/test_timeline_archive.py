@@ -0,0 +1,160 @@
+"""
+test_timeline_archive.py
+
+market_timeline archive tier (scratch DB + temp archive root)
+-------------------------------------------------------------
+✔ Rows older than the cutoff → one .npz per (timeframe, IST day, symbol)
+✔ Archived rows deleted from SQLite; hot rows untouched
+✔ load() stitches archive + SQLite == the original series (all columns)
+✔ Re-archiving a day merges (idempotent); hot row wins on the same ts
+✔ Symbols with unsafe filename characters round-trip
+✔ NULL cond_mask / created_at round-trip as NULL (not -1 / all True);
+  0 stays a real all-False mask; validity arrays stored in the day file
+
+Run:
+    python -m app.tests.test_timeline_archive
+"""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from app.db.timeline_archive import (
+    STORED_COLUMNS,
+    TimelineArchive,
+    column_values,
+    day_bounds,
+    trading_day,
+)
+from app.engine.condition_engine_v1_9 import CONDITION_BITS, ConditionEngineV19
+from app.db.timeline_repo import upsert_timeline_rows
+from app.tools.fixtures import TF, scratch_db, session_ts, timeline_dicts
+
+
+SYMBOLS = ("ZZTEST", "ZZ M&M/24")
+
+
+def _load_all(conn, symbols):
+    for i, sym in enumerate(symbols):
+        upsert_timeline_rows(timeline_dicts(sym, session_ts(4), seed=i), conn)
+
+
+def _equal(a, b):
+    assert len(a["ts"]) == len(b["ts"]), (len(a["ts"]), len(b["ts"]))
+    for c in STORED_COLUMNS:
+        if a[c].dtype.kind == "f":
+            assert np.array_equal(a[c], b[c], equal_nan=True), c
+        else:
+            assert np.array_equal(a[c], b[c]), c
+
+
+def test_archive_and_stitch():
+    with tempfile.TemporaryDirectory() as d, scratch_db() as conn:
+        archive = TimelineArchive(Path(d))
+        _load_all(conn, SYMBOLS)
+
+        before = {s: archive.load(s, TF) for s in SYMBOLS}
+        assert all(len(v["ts"]) == 4 * 375 for v in before.values())
+
+        days = sorted({trading_day(t) for t in session_ts(4)})
+        cutoff = day_bounds(days[2])[0]          # archive 2 of 4 sessions
+
+        r = archive.archive_before(cutoff)
+        assert r["errors"] == 0 and r["series"] == len(SYMBOLS)
+        assert r["rows_archived"] == r["rows_deleted"] == 2 * 375 * len(SYMBOLS)
+        assert r["files"] == 2 * len(SYMBOLS)
+
+        for s in SYMBOLS:
+            assert archive.days(s, TF) == days[:2]
+            assert s in archive.symbols(TF, days[0])
+
+        left = conn.execute("SELECT COUNT(*), MIN(ts) FROM market_timeline").fetchone()
+        assert left[0] == 2 * 375 * len(SYMBOLS) and left[1] >= cutoff
+
+        # stitched read == original, full range and a window across the cut
+        for s in SYMBOLS:
+            _equal(archive.load(s, TF), before[s])
+
+            lo, hi = cutoff - 600, cutoff + 86400
+            got = archive.load(s, TF, start_ts=lo, end_ts=hi)
+            keep = (before[s]["ts"] >= lo) & (before[s]["ts"] < hi)
+            _equal(got, {c: a[keep] for c, a in before[s].items()})
+
+        # nothing left to move → no-op
+        assert archive.archive_before(cutoff)["rows_archived"] == 0
+
+
+def test_merge_and_hot_wins():
+    with tempfile.TemporaryDirectory() as d, scratch_db() as conn:
+        archive = TimelineArchive(Path(d))
+        _load_all(conn, SYMBOLS[:1])
+        sym = SYMBOLS[0]
+        ts = session_ts(4)
+        day0 = trading_day(ts[0])
+
+        # archive the first half of day 0, then the rest
+        mid = int(ts[187])
+        archive.archive_before(mid)
+        archive.archive_before(day_bounds(day0)[1])
+        arr = archive.read_day(sym, TF, day0)
+        assert len(arr["ts"]) == 375 and np.all(np.diff(arr["ts"]) > 0)
+
+        # a late hot row for an archived ts shadows the archived one
+        row = timeline_dicts(sym, ts[:1], seed=9)[0]
+        row["close"] = 12345.0
+        upsert_timeline_rows([row], conn)
+
+        got = archive.load(sym, TF, start_ts=int(ts[0]), end_ts=int(ts[0]) + 1)
+        assert len(got["ts"]) == 1 and got["close"][0] == 12345.0
+
+        # re-archiving it merges into the day file (still 375 rows)
+        archive.archive_before(day_bounds(day0)[1])
+        arr = archive.read_day(sym, TF, day0)
+        assert len(arr["ts"]) == 375 and arr["close"][0] == 12345.0
+
+
+def test_null_round_trip():
+    with tempfile.TemporaryDirectory() as d, scratch_db() as conn:
+        archive = TimelineArchive(Path(d))
+        sym = SYMBOLS[0]
+        ts = session_ts(2)
+        rows = timeline_dicts(sym, ts)
+        rows[0]["cond_mask"] = None          # indicators not ready
+        rows[1]["cond_mask"] = 0             # evaluated, all False
+        rows[2]["cond_mask"] = (1 << len(CONDITION_BITS)) - 1
+        rows[3]["created_at"] = None
+        upsert_timeline_rows(rows, conn)
+
+        day0 = trading_day(ts[0])
+        archive.archive_before(day_bounds(day0)[1])
+        got = archive.load(sym, TF)
+        assert len(got["ts"]) == len(rows)
+
+        masks = column_values(got, "cond_mask")
+        assert masks == [r["cond_mask"] for r in rows]
+        assert column_values(got, "created_at")[3] is None
+        assert column_values(got, "signal") == [r["signal"] for r in rows]
+
+        assert set(ConditionEngineV19.unpack(masks[0]).values()) == {None}
+        assert set(ConditionEngineV19.unpack(masks[1]).values()) == {False}
+
+        # validity arrays stored next to the values
+        with np.load(archive.path(sym, TF, day0), allow_pickle=False) as z:
+            assert set(z.files) == set(STORED_COLUMNS)
+            assert not z["cond_mask_valid"][0] and z["cond_mask_valid"][1]
+
+
+def main():
+    print("\n=== TIMELINE ARCHIVE ===")
+    test_archive_and_stitch()
+    print("archive → delete → stitched read == original ✔")
+    test_merge_and_hot_wins()
+    print("day merge idempotent, hot row wins ✔")
+    test_null_round_trip()
+    print("NULL cond_mask round-trips as NULL ✔")
+    print("\n=== TEST COMPLETE ===\n")
+
+
+if __name__ == "__main__":
+    main()
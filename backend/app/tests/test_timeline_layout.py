@@ -0,0 +1,113 @@
+"""
+test_timeline_layout.py
+
+market_timeline indexes after the full migration set (scratch DB)
+-----------------------------------------------------------------
+✔ UNIQUE (symbol, timeframe, ts) present; legacy (symbol, ts) index dropped
+✔ Warmup query plan = COVERING INDEX idx_market_timeline_warmup
+✔ Duplicate (symbol, timeframe, ts) insert rejected
+✔ Warmup read returns the newest N candles, oldest first
+✔ Bulk warmup read == per-symbol read across chunk boundaries;
+  symbols without rows → [], other timeframes ignored
+
+Run:
+    python -m app.tests.test_timeline_layout
+"""
+
+import sqlite3
+
+import numpy as np
+
+from app.db import sqlite as db
+from app.db.timeline_repo import (
+    WARMUP_SQL,
+    fetch_recent_candles_for_warmup,
+    fetch_recent_candles_for_warmup_bulk,
+)
+from app.tools.fixtures import TF, make_timeline_rows, scratch_db, session_ts
+from app.tools.bench_timeline_layout import INSERT_SQL
+
+
+def _indexes(conn):
+    return {
+        r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='market_timeline'"
+        )
+    }
+
+
+def test_layout():
+    with scratch_db() as conn:
+        idx = _indexes(conn)
+        assert "uniq_market_timeline_symbol_tf_ts" in idx
+        assert "idx_market_timeline_warmup" in idx
+        assert "idx_market_timeline_symbol_ts" not in idx
+
+        ts = session_ts(1)
+        rows = make_timeline_rows("ZZTEST", ts, np.random.default_rng(3))
+        conn.executemany(INSERT_SQL, rows)
+
+        detail = " ".join(
+            r[3] for r in db.read_conn().execute(
+                "EXPLAIN QUERY PLAN " + WARMUP_SQL, ("ZZTEST", TF, 50)
+            )
+        )
+        assert "COVERING INDEX idx_market_timeline_warmup" in detail, detail
+
+        try:
+            conn.execute(INSERT_SQL, rows[-1])
+        except sqlite3.IntegrityError:
+            pass
+        else:
+            raise AssertionError("duplicate key accepted")
+
+        got = fetch_recent_candles_for_warmup(symbol="ZZTEST", timeframe=TF, limit=50)
+        assert [c["ts"] for c in got] == [int(t) for t in ts[-50:]]
+        assert got[-1]["close"] == rows[-1][6]
+
+
+def test_warmup_bulk():
+    with scratch_db() as conn:
+        ts = session_ts(1)
+        rng = np.random.default_rng(5)
+
+        # 7 symbols, chunk_size=3 → chunks of 3 / 3 / 1; two empty, one short
+        symbols = [f"ZZ{i}" for i in range(7)]
+        empty = {"ZZ2", "ZZ3"}
+        for sym in symbols:
+            if sym in empty:
+                continue
+            n = 20 if sym == "ZZ5" else len(ts)
+            conn.executemany(INSERT_SQL, make_timeline_rows(sym, ts[:n], rng))
+        # same symbol, other timeframe: never returned
+        conn.executemany(
+            INSERT_SQL,
+            [(r[0], "5m") + r[2:] for r in make_timeline_rows("ZZ0", ts[:10] + 7, rng)],
+        )
+
+        got = fetch_recent_candles_for_warmup_bulk(symbols=symbols, timeframe=TF, limit=50, chunk_size=3)
+        assert list(got) == symbols
+
+        for sym in symbols:
+            rows = got[sym]
+            if sym in empty:
+                assert rows == []
+                continue
+            assert rows == fetch_recent_candles_for_warmup(symbol=sym, timeframe=TF, limit=50)
+            expect = ts[:20] if sym == "ZZ5" else ts[-50:]
+            assert [c["ts"] for c in rows] == [int(t) for t in expect]
+
+        assert fetch_recent_candles_for_warmup_bulk(symbols=[], timeframe=TF, limit=50) == {}
+
+
+def main():
+    print("\n=== TIMELINE LAYOUT ===")
+    test_layout()
+    print("unique key + covering warmup index ✔")
+    test_warmup_bulk()
+    print("bulk warmup read: chunks, empty symbols, order ✔")
+    print("\n=== TEST COMPLETE ===\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+test_timeline_writer.py
+
+market_timeline group commit (scratch DB)
+-----------------------------------------
+✔ Rows of one candle ts → ONE transaction; next minute → next batch
+✔ max_batch splits a large minute
+✔ Commits run on the DB writer's own connection (never get_conn())
+✔ flush() waits for every submitted row; times out while the writer is held
+✔ Re-submitting the same candles upserts in place (no duplicates)
+
+Run:
+    python -m app.tests.test_timeline_writer
+"""
+
+import threading
+
+from app.db import sqlite as db
+from app.persistence import timeline_writer as tw
+from app.tools.fixtures import TF, scratch_db, session_ts, timeline_dicts
+
+
+SYMBOLS = ("ZZA", "ZZB", "ZZC")
+
+
+def _minute_rows(ts, seed=0):
+    return [
+        timeline_dicts(sym, ts[i:i + 1], seed=seed + j)[0]
+        for i in range(len(ts))
+        for j, sym in enumerate(SYMBOLS)
+    ]
+
+
+def _count(conn):
+    return conn.execute("SELECT COUNT(*) FROM market_timeline WHERE timeframe = ?", (TF,)).fetchone()[0]
+
+
+def test_batching():
+    conns = []
+    real_upsert = tw.upsert_timeline_rows
+
+    def upsert(rows, conn=None):
+        conns.append((conn, db.db_writer.on_writer_thread(), conn.in_transaction))
+        return real_upsert(rows, conn)
+
+    with scratch_db() as conn:
+        writer = tw.TimelineBatchWriter(linger_sec=0.5, max_batch=500)
+        jobs = db.db_writer.stats()["by_label"].get("timeline_batch", 0)
+        tw.upsert_timeline_rows = upsert
+        try:
+            for row in _minute_rows(session_ts(1)[:2]):
+                assert writer.submit(row)
+            assert writer.flush(timeout=5.0)
+
+            s = writer.stats()
+            assert s["batches"] == 2 and s["rows"] == 6 and s["failed_rows"] == 0
+            assert db.db_writer.stats()["by_label"]["timeline_batch"] == jobs + 2
+            assert _count(conn) == 6
+
+            # writer thread, inside BEGIN, never the shared connection
+            assert len(conns) == 2
+            for c, on_writer, in_tx in conns:
+                assert c is not conn and on_writer and in_tx
+            assert not conn.in_transaction
+
+            # max_batch splits one large minute
+            writer.max_batch = 2
+            for row in _minute_rows(session_ts(1)[2:3]):
+                writer.submit(row)
+            assert writer.flush(timeout=5.0)
+            assert writer.stats()["batches"] == 4 and writer.last_batch_rows == 1
+            assert _count(conn) == 9
+        finally:
+            tw.upsert_timeline_rows = real_upsert
+            writer.shutdown()
+
+
+def test_flush_and_upsert():
+    with scratch_db() as conn:
+        writer = tw.TimelineBatchWriter(linger_sec=0.05)
+        ts = session_ts(1)[:5]
+        gate = threading.Event()
+        try:
+            # DB writer held → rows cannot commit yet
+            db.db_writer.submit(lambda c: gate.wait(), label="gate")
+            for row in _minute_rows(ts):
+                writer.submit(row)
+            assert not writer.flush(timeout=0.2)
+            assert _count(conn) == 0
+
+            gate.set()
+            assert writer.flush(timeout=5.0)
+            assert _count(conn) == 15
+
+            # same candles again, new close → updated in place
+            rows = _minute_rows(ts, seed=5)
+            for row in rows:
+                row["close"] = 999.0
+                writer.submit(row)
+            assert writer.flush(timeout=5.0)
+            assert _count(conn) == 15
+            closes = {r[0] for r in conn.execute("SELECT close FROM market_timeline")}
+            assert closes == {999.0}
+            assert writer.stats()["rows"] == 30
+        finally:
+            gate.set()
+            writer.shutdown()
+
+
+def main():
+    print("\n=== TIMELINE WRITER ===")
+    test_batching()
+    print("one transaction per minute on the writer connection ✔")
+    test_flush_and_upsert()
+    print("flush waits for commits, upsert idempotent ✔")
+    print("\n=== TEST COMPLETE ===\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+test_tv_fixture_parity.py
+
+Bar-by-bar parity against stored exports (app/tests/fixtures/tv/)
+-----------------------------------------------------------------
+✔ Every checked-in fixture replays with zero mismatches
+✔ A perturbed value / flipped BUY in a copy is reported (bar + column)
+✔ TradingView layout: ISO time, `NaN` plots before seeding, column aliases
+
+Run:
+    python -m app.tests.test_tv_fixture_parity
+"""
+
+import csv
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.tools.bench_suite import FIXTURE_DIR, check_parity
+
+
+def test_checked_in_fixtures():
+    files = sorted(FIXTURE_DIR.glob("*.csv"))
+    assert files, f"no fixtures in {FIXTURE_DIR}"
+    for path in files:
+        r = check_parity(path, tol=1e-6)
+        assert r["ok"], r
+        assert "cond_all" in r["columns"] and r["compared"] > 0
+
+
+def _rewrite(src: Path, dst: Path, fn):
+    with src.open(newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    header, body = rows[0], rows[1:]
+    fn(header, body)
+    with dst.open("w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows([header] + body)
+
+
+def test_mismatch_reported():
+    src = sorted(FIXTURE_DIR.glob("*.csv"))[0]
+
+    def perturb(header, body):
+        ema8 = header.index("EMA8")
+        buy = header.index("BUY")
+        body[200][ema8] = repr(float(body[200][ema8]) + 0.01)
+        seeded = [r for r in body if r[buy] != ""]
+        seeded[-1][buy] = "0" if seeded[-1][buy] == "1" else "1"
+
+    with tempfile.TemporaryDirectory() as d:
+        dst = Path(d) / "bad.csv"
+        _rewrite(src, dst, perturb)
+        r = check_parity(dst, tol=1e-6)
+
+    assert not r["ok"] and r["mismatches"] == 2
+    assert {m["column"] for m in r["first_mismatches"]} == {"ema8", "cond_all"}
+    assert r["first_mismatches"][0]["bar"] == 200
+
+
+def test_tradingview_layout():
+    src = sorted(FIXTURE_DIR.glob("*.csv"))[0]
+
+    def tv_style(header, body):
+        header[header.index("RSI Smoothed")] = "rsi_smoothed"
+        for r in body:
+            r[0] = datetime.fromtimestamp(int(r[0]), tz=timezone.utc).isoformat()
+            r[5:] = [v if v != "" else "NaN" for v in r[5:]]
+
+    with tempfile.TemporaryDirectory() as d:
+        dst = Path(d) / "tv.csv"
+        _rewrite(src, dst, tv_style)
+        r = check_parity(dst, tol=1e-6)
+
+    assert r["ok"], r
+    assert "rsi_smoothed" in r["columns"]
+
+
+def main():
+    print("\n=== TV FIXTURE PARITY ===")
+    test_checked_in_fixtures()
+    print("checked-in fixtures: zero mismatches ✔")
+    test_mismatch_reported()
+    print("perturbed copy → bar + column reported ✔")
+    test_tradingview_layout()
+    print("ISO time / NaN / aliases ✔")
+    print("\n=== TEST COMPLETE ===\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+test_universe_recenter.py
+
+Rolling ATM universe (synthetic instruments, fake ticker, scratch DB)
+--------------------------------------------------------------------
+✔ ATM drift below recenter_strikes × strike_step → no recentre
+✔ Drift past it → new strikes built + subscribed, stale ones dropped
+✔ Protected (focus / open trade) tokens are never dropped
+✔ A drift check while a recentre holds the lock is ignored
+✔ Token re-added before its queued release keeps its state
+
+Run:
+    python -m app.tests.test_universe_recenter
+"""
+
+import threading
+
+from app.engine.candle_pipeline import JobPriority
+from app.tests.conftest import option_token, tick_engine
+
+
+STRIKES = range(24800, 25201, 50)        # ATM 25000 ± 200
+
+
+def _strikes(engine, tokens):
+    return sorted(int(engine._candidates[t]["strike"]) for t in tokens)
+
+
+def _wait_recenter(engine):
+    with engine._recenter_lock:          # held until the recentre thread ends
+        pass
+    assert engine.pipeline.drain(timeout=5.0)
+
+
+def test_recenter():
+    with tick_engine(STRIKES, atm_range=200, strike_step=50, recenter_strikes=2, recenter=True) as engine:
+        ticker = engine.kws
+        ticker.connect()
+        assert engine._universe_atm == 25000
+        assert ticker.subscribed >= set(engine.builders)
+
+        # 25060 → ATM 25050: one strike of drift, below the threshold
+        engine._on_index_spot(25060.0)
+        _wait_recenter(engine)
+        assert engine._universe_atm == 25000
+        assert _strikes(engine, engine.builders) == list(STRIKES)
+
+        # a drift check while a recentre is running does nothing
+        with engine._recenter_lock:
+            engine._on_index_spot(26000.0)
+        assert engine._universe_atm == 25000
+
+        # 25090 → ATM 25100: window 24900..25300, 24800 protected
+        engine._focus_symbols = {"NIFTYZZ24800CE"}
+        engine._on_index_spot(25090.0)
+        _wait_recenter(engine)
+
+        assert engine._universe_atm == 25100
+        assert _strikes(engine, engine.builders) == [24800] + list(range(24900, 25301, 50))
+
+        for k in (25250, 25300):
+            t = option_token(k)
+            assert t in ticker.subscribed and t in engine.strategies
+            assert engine.symbol_token[f"NIFTYZZ{k}CE"] == t
+
+        gone = option_token(24850)
+        assert gone not in ticker.subscribed and gone not in ticker.modes
+        assert gone not in engine.strategies and gone not in engine.indicators
+        assert "NIFTYZZ24850CE" not in engine.symbol_token
+        assert option_token(24800) in ticker.subscribed
+
+
+def test_readd_before_release():
+    with tick_engine(STRIKES) as engine:
+        token = option_token(24800)
+        spec = {"symbol": "NIFTYZZ24800CE", "expiry": engine.token_expiry[token], "strike": 24800.0}
+        gate = threading.Event()
+
+        # release queued behind a blocked job on the token's lane
+        engine.pipeline.submit(token, gate.wait, priority=JobPriority.PERSIST)
+        engine._drop_token(token)
+        assert token not in engine.builders
+
+        engine._add_token(token, **spec)
+        strategy = engine.strategies[token]
+
+        gate.set()
+        assert engine.pipeline.drain(timeout=5.0)
+
+        # the stale release left the new owner's state alone
+        assert token in engine.builders and token in engine.indicators
+        assert engine.strategies[token] is strategy
+        assert engine.symbol_token[spec["symbol"]] == token
+
+        # a plain drop still releases everything
+        engine._drop_token(token)
+        assert engine.pipeline.drain(timeout=5.0)
+        assert token not in engine.strategies and spec["symbol"] not in engine.symbol_token
+
+
+def main():
+    print("\n=== UNIVERSE RECENTER ===")
+    test_recenter()
+    print("drift threshold, add / remove, protected tokens ✔")
+    test_readd_before_release()
+    print("re-added token survives its stale release ✔")
+    print("\n=== TEST COMPLETE ===\n")
+
+
+if __name__ == "__main__":
+    main()
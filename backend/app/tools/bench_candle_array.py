@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark: CandleBuilder.on_tick (per-token objects) vs CandleArrayBuilder
+(struct-of-arrays, one call per WS batch).
+
+Synthetic session — no DB, no broker.
+
+Usage:
+    python -m app.tools.bench_candle_array --tokens 400 --ticks 2000000 --batch 200
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from app.candles.candle_array import CandleArrayBuilder
+from app.candles.candle_builder import CandleBuilder
+
+
+TF = 60
+
+
+def make_session(n_tokens: int, n_ticks: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    tokens = rng.integers(0, n_tokens, n_ticks, dtype=np.int64) + 100000
+    ltps = np.round(100 + rng.normal(0, 2, n_ticks), 2)
+    # ~ n_tokens ticks per second, monotonic
+    ts = 1_767_000_000 + (np.arange(n_ticks, dtype=np.int64) // max(1, n_tokens))
+    return tokens, ltps, ts
+
+
+def bench_reference(tokens, ltps, ts, batch: int) -> dict:
+    builders = {int(t): CandleBuilder(int(t), TF) for t in np.unique(tokens)}
+
+    tok_l, ltp_l, ts_l = tokens.tolist(), ltps.tolist(), ts.tolist()
+
+    t0 = time.perf_counter()
+    candles = 0
+    for i in range(0, len(tok_l), batch):
+        for tok, ltp, t in zip(tok_l[i:i + batch], ltp_l[i:i + batch], ts_l[i:i + batch]):
+            if builders[tok].on_tick(ltp, t):
+                candles += 1
+    elapsed = time.perf_counter() - t0
+
+    return _result("CandleBuilder", len(tok_l), candles, elapsed)
+
+
+def bench_array(tokens, ltps, ts, batch: int) -> dict:
+    agg = CandleArrayBuilder(TF)
+    for t in np.unique(tokens):
+        agg.add(int(t))
+
+    t0 = time.perf_counter()
+    candles = 0
+    for i in range(0, len(tokens), batch):
+        # raw tokens → slots is part of the cost (WS gives raw tokens)
+        out = agg.on_ticks(tokens[i:i + batch], ltps[i:i + batch], ts[i:i + batch])
+        candles += len(out)
+    elapsed = time.perf_counter() - t0
+
+    return _result("CandleArrayBuilder", len(tokens), candles, elapsed)
+
+
+def _result(name, ticks, candles, elapsed) -> dict:
+    return {
+        "impl": name,
+        "ticks": ticks,
+        "candles": candles,
+        "elapsed_sec": round(elapsed, 3),
+        "ticks_per_sec": round(ticks / elapsed, 1) if elapsed else None,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tokens", type=int, default=400)
+    ap.add_argument("--ticks", type=int, default=1_000_000)
+    ap.add_argument("--batch", type=int, default=200, help="ticks per WS batch")
+    args = ap.parse_args()
+
+    tokens, ltps, ts = make_session(args.tokens, args.ticks)
+
+    ref = bench_reference(tokens, ltps, ts, args.batch)
+    arr = bench_array(tokens, ltps, ts, args.batch)
+
+    if ref["candles"] != arr["candles"]:
+        raise SystemExit(f"candle count mismatch: {ref['candles']} != {arr['candles']}")
+
+    print(json.dumps({
+        "tokens": args.tokens,
+        "batch": args.batch,
+        "results": [ref, arr],
+        "speedup": round(ref["elapsed_sec"] / arr["elapsed_sec"], 2) if arr["elapsed_sec"] else None,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
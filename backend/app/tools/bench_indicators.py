@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+"""
+Micro-benchmark: indicator updates/sec, previous implementation
+(sum() per update, dict per update) vs running sums + __slots__,
+plus the vectorized batch engine (exact / blocked) vs sequential.
+
+Usage:
+    python -m app.tools.bench_indicators --candles 200000
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from app.engine.indicator_batch_v1_9 import compute_v19
+from app.indicators.ema import SMA
+from app.engine.indicator_engine_pine_v1_9 import IndicatorEnginePineV19
+from app.tools.fixtures import ReferenceIndicatorEngine, ReferenceSMA, synthetic_candles
+
+
+def _rate(n, fn) -> dict:
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    return {
+        "updates": n,
+        "elapsed_sec": round(elapsed, 4),
+        "updates_per_sec": round(n / elapsed, 1) if elapsed else None,
+    }
+
+
+def bench_engine(cls, candles) -> dict:
+    eng = cls()
+    if isinstance(eng, IndicatorEnginePineV19):
+        eng._is_warmup = True     # no READY audit line
+    update = eng.update
+
+    def run():
+        for c in candles:
+            update(c)
+
+    return _rate(len(candles), run)
+
+
+def bench_sma(cls, values, length) -> dict:
+    sma = cls(length)
+    update = sma.update
+
+    def run():
+        for v in values:
+            update(v)
+
+    return _rate(len(values), run)
+
+
+def bench_batch(candles, exact) -> dict:
+    high = np.array([c.high for c in candles])
+    low = np.array([c.low for c in candles])
+    close = np.array([c.close for c in candles])
+    return _rate(len(candles), lambda: compute_v19(high, low, close, exact=exact))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--candles", type=int, default=200_000)
+    ap.add_argument("--sma-length", type=int, default=9)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    candles = synthetic_candles(args.candles)
+    closes = [c.close for c in candles]
+
+    def best(fn):
+        runs = [fn() for _ in range(args.repeat)]
+        return max(runs, key=lambda r: r["updates_per_sec"] or 0)
+
+    out = {
+        "engine": {
+            "before": best(lambda: bench_engine(ReferenceIndicatorEngine, candles)),
+            "after": best(lambda: bench_engine(IndicatorEnginePineV19, candles)),
+        },
+        f"sma{args.sma_length}": {
+            "before": best(lambda: bench_sma(ReferenceSMA, closes, args.sma_length)),
+            "after": best(lambda: bench_sma(SMA, closes, args.sma_length)),
+        },
+    }
+
+    for v in out.values():
+        v["speedup"] = round(
+            v["after"]["updates_per_sec"] / v["before"]["updates_per_sec"], 2
+        )
+
+    seq = out["engine"]["after"]
+    out["batch"] = {"sequential": seq}
+    for mode, exact in (("exact", True), ("blocked", False)):
+        r = best(lambda: bench_batch(candles, exact))
+        r["speedup"] = round(r["updates_per_sec"] / seq["updates_per_sec"], 2)
+        out["batch"][mode] = r
+
+    print(json.dumps(out, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+
+"""
+Offline Pine-parity + hot-path throughput suite (no Kite login, no live DB).
+
+Throughput (synthetic, seeded):
+- candles/sec: IndicatorEnginePineV19 → ConditionEngineV19 → StrategyEngine
+- ticks/sec:   CandleBuilder.on_tick
+- rows/sec:    write_market_timeline_row (insert + update, the legacy
+               path) and upsert_timeline_rows (batched live path),
+               against a throwaway SQLite file
+
+Parity (bar by bar):
+- every CSV in app/tests/fixtures/tv/ — TradingView "Export chart data"
+  files (time, OHLC + the V1.9 plots) or golden files written by
+  --write-golden. Candles are replayed through the engines and each
+  exported column is compared within --tol.
+
+Output: ONE JSON document (stdout or --out). With --baseline, any
+*_per_sec more than --max-regression below the baseline, or any parity
+mismatch, exits 1 (CI / pre-deploy gate).
+
+Usage:
+    python -m app.tools.bench_suite --out bench.json
+    python -m app.tools.bench_suite --baseline bench.json --max-regression 0.25
+    python -m app.tools.bench_suite --write-golden app/tests/fixtures/tv/golden_v1_9_synthetic.csv
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import math
+import platform
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.candles.candle_builder import CandleBuilder, LATE_DROP
+from app.engine.condition_engine_v1_9 import ConditionEngineV19
+from app.engine.indicator_engine_pine_v1_9 import IndicatorEnginePineV19
+from app.engine.strategy_engine import StrategyEngine
+from app.marketdata.candle import Candle, CandleSource
+from app.tools.fixtures import scratch_db, synthetic_candles
+from app.tools.bench_candle_array import make_session
+from app.utils.candle_debug_logger import LEVELS, CandleDebugLogger, CandleDebugSink
+
+
+FIXTURE_DIR = Path(__file__).resolve().parents[1] / "tests" / "fixtures" / "tv"
+
+# exported column (lower-cased) → engine value key
+COLUMN_ALIASES = {
+    "ema8": "ema8",
+    "ema 8": "ema8",
+    "ema20 low": "ema20_low",
+    "ema20_low": "ema20_low",
+    "ema20 high": "ema20_high",
+    "ema20_high": "ema20_high",
+    "rsi": "rsi_raw",
+    "rsi_raw": "rsi_raw",
+    "rsi smoothed": "rsi_smoothed",
+    "rsi_smoothed": "rsi_smoothed",
+    "buy": "cond_all",
+    "cond_all": "cond_all",
+}
+
+GOLDEN_COLUMNS = ("EMA8", "EMA20 Low", "EMA20 High", "RSI", "RSI Smoothed", "BUY")
+
+
+def _rate(n, elapsed, unit) -> dict:
+    return {
+        unit: n,
+        "elapsed_sec": round(elapsed, 4),
+        f"{unit}_per_sec": round(n / elapsed, 1) if elapsed else None,
+    }
+
+
+# =========================
+# Throughput
+# =========================
+
+def bench_pipeline(candles: List[Candle], *, debug_level: str) -> dict:
+    """
+    Per candle, exactly the live lane order: indicators → conditions →
+    strategy (candle debug line included, into a temp sink).
+    """
+    yy = date.today().year % 100
+    symbol = f"NIFTY{yy}BENCH100CE"      # passes the current-expiry check
+
+    ind = IndicatorEnginePineV19()       # live mode: tracks red lows (SL)
+    cond = ConditionEngineV19()
+
+    with tempfile.TemporaryDirectory() as d:
+        sink = CandleDebugSink(Path(d), level=LEVELS[debug_level])
+        strat = StrategyEngine(slot_name="bench", symbol=symbol)
+        strat.debug_logger = CandleDebugLogger(symbol, "bench", sink=sink)
+
+        buys = 0
+        try:
+            t0 = time.perf_counter()
+            for c in candles:
+                vals = ind.update(c)
+                if vals is None:
+                    continue
+                conditions = cond.evaluate(
+                    candle=c,
+                    indicators=vals,
+                    is_trading_time=True,
+                    no_open_trade=not strat.in_trade,
+                )
+                buys += strat.on_candle(c, ind, conditions).is_buy
+            elapsed = time.perf_counter() - t0
+        finally:
+            sink.shutdown()
+
+    out = _rate(len(candles), elapsed, "candles")
+    out["buy_signals"] = buys
+    out["candle_debug"] = debug_level
+    return out
+
+
+def bench_candle_builder(n_tokens: int, n_ticks: int) -> dict:
+    tokens, ltps, ts = make_session(n_tokens, n_ticks)
+    builders = {int(t): CandleBuilder(int(t), 60, late_policy=LATE_DROP) for t in np.unique(tokens)}
+    tok_l, ltp_l, ts_l = tokens.tolist(), ltps.tolist(), ts.tolist()
+
+    candles = 0
+    t0 = time.perf_counter()
+    for tok, ltp, t in zip(tok_l, ltp_l, ts_l):
+        if builders[tok].on_tick(ltp, t) is not None:
+            candles += 1
+    elapsed = time.perf_counter() - t0
+
+    out = _rate(len(tok_l), elapsed, "ticks")
+    out["tokens"] = n_tokens
+    out["candles"] = candles
+    return out
+
+
+@contextlib.contextmanager
+def _quiet_audit():
+    """
+    Bench BUY / EXIT / migration lines stay out of the real audit log
+    (critical lines still pass, by design of the writer).
+    """
+    from app.event_bus.audit_logger import ERROR, audit_log
+
+    level = audit_log.level
+    audit_log.set_level(ERROR)
+    try:
+        yield
+    finally:
+        audit_log.set_level(level)
+
+
+def bench_timeline_writes(candles: List[Candle], *, symbols: int, batch: int) -> dict:
+    from app.db.timeline_repo import upsert_timeline_rows
+    from app.persistence.market_timeline_writer import (
+        CONDITION_KEYS,
+        build_timeline_row,
+        write_market_timeline_row,
+    )
+
+    ind = {"ema8": 1.0, "ema20_low": 1.0, "ema20_high": 1.0, "rsi_raw": 50.0}
+    cond = {k: True for k in CONDITION_KEYS}
+    names = [f"BENCH{i}" for i in range(symbols)]
+    out = {}
+
+    # legacy: INSERT (OHLC) + UPDATE per candle, autocommit, print per row
+    with scratch_db():
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for c in candles:
+                for s in names:
+                    for mode in ("insert", "update"):
+                        write_market_timeline_row(
+                            candle=c, indicators=ind, conditions=cond, signal=None,
+                            symbol=s, timeframe="1m", strategy_version="BENCH", mode=mode,
+                        )
+        out["write_market_timeline_row"] = _rate(len(candles) * symbols, time.perf_counter() - t0, "rows")
+
+    # live: one upsert per row, one transaction per `batch` rows
+    with scratch_db() as conn:
+        rows = [
+            build_timeline_row(
+                candle=c, indicators=ind, conditions=cond, signal=None,
+                symbol=s, timeframe="1m", strategy_version="BENCH",
+            )
+            for c in candles
+            for s in names
+        ]
+        t0 = time.perf_counter()
+        for i in range(0, len(rows), batch):
+            conn.execute("BEGIN")
+            upsert_timeline_rows(rows[i:i + batch], conn)
+            conn.execute("COMMIT")
+        out["upsert_timeline_rows"] = _rate(len(rows), time.perf_counter() - t0, "rows")
+        out["upsert_timeline_rows"]["batch"] = batch
+
+    return out
+
+
+# =========================
+# Parity (TradingView exports / golden files)
+# =========================
+
+def _parse_time(v: str) -> int:
+    v = v.strip()
+    try:
+        return int(float(v))
+    except ValueError:
+        return int(datetime.fromisoformat(v.replace("Z", "+00:00")).timestamp())
+
+
+def _parse_value(v: str) -> Optional[float]:
+    v = (v or "").strip()
+    if v == "" or v.lower() in ("nan", "na"):
+        return None
+    if v.lower() in ("true", "buy"):
+        return 1.0
+    if v.lower() == "false":
+        return 0.0
+    return float(v)
+
+
+def load_export(path: Path):
+    """
+    TradingView CSV → (candles, {engine_key: [value|None per bar]}).
+    `time` is the bar OPEN (unix seconds or ISO-8601).
+    """
+    candles: List[Candle] = []
+    expected: Dict[str, list] = {}
+
+    with path.open(newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        mapped = {
+            col: COLUMN_ALIASES[col.strip().lower()]
+            for col in reader.fieldnames or ()
+            if col.strip().lower() in COLUMN_ALIASES
+        }
+        for key in mapped.values():
+            expected[key] = []
+
+        for r in reader:
+            ts = _parse_time(r["time"])
+            candles.append(Candle(
+                start_ts=ts,
+                end_ts=ts + 60,
+                open=float(r["open"]),
+                high=float(r["high"]),
+                low=float(r["low"]),
+                close=float(r["close"]),
+                source=CandleSource.WARMUP,
+            ))
+            for col, key in mapped.items():
+                expected[key].append(_parse_value(r[col]))
+
+    return candles, expected
+
+
+def replay_bars(candles: List[Candle]) -> List[Optional[dict]]:
+    """
+    Engine output per bar (None until ready): indicator values +
+    cond_all (signal conditions; no position state).
+    """
+    ind = IndicatorEnginePineV19()
+    ind._is_warmup = True
+    cond = ConditionEngineV19()
+
+    out: List[Optional[dict]] = []
+    for c in candles:
+        vals = ind.update(c)
+        if vals is None:
+            out.append(None)
+            continue
+        row = dict(vals)
+        row["cond_all"] = cond.evaluate(
+            candle=c, indicators=vals, is_trading_time=True, no_open_trade=True,
+        )["cond_all"]
+        out.append(row)
+    return out
+
+
+def check_parity(path: Path, *, tol: float) -> dict:
+    candles, expected = load_export(path)
+    got = replay_bars(candles)
+
+    mismatches = []
+    compared = 0
+    max_abs = 0.0
+
+    for key, values in expected.items():
+        for i, want in enumerate(values):
+            row = got[i]
+            if want is None:
+                continue            # na in export: not seeded there yet
+            if row is None or row.get(key) is None:
+                mismatches.append({"bar": i, "time": candles[i].start_ts, "column": key, "want": want, "got": None})
+                continue
+
+            compared += 1
+            have = float(row[key])
+            if key == "cond_all":
+                ok = bool(have) == bool(want)
+            else:
+                diff = abs(have - want)
+                max_abs = max(max_abs, diff)
+                ok = diff <= tol or math.isclose(have, want, rel_tol=tol)
+            if not ok:
+                mismatches.append({"bar": i, "time": candles[i].start_ts, "column": key, "want": want, "got": have})
+
+    return {
+        "file": path.name,
+        "bars": len(candles),
+        "columns": sorted(expected),
+        "compared": compared,
+        "max_abs_diff": max_abs,
+        "mismatches": len(mismatches),
+        "first_mismatches": mismatches[:5],
+        "ok": not mismatches and compared > 0,
+    }
+
+
+def write_golden(path: Path, candles: List[Candle]):
+    """
+    Golden file in TradingView export layout from the CURRENT engines
+    (regression reference, not TradingView truth).
+    """
+    rows = replay_bars(candles)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f, lineterminator="\n")
+        w.writerow(("time", "open", "high", "low", "close") + GOLDEN_COLUMNS)
+        for c, r in zip(candles, rows):
+            vals = (
+                ("", "", "", "", "", "")
+                if r is None
+                else (
+                    _g(r["ema8"]), _g(r["ema20_low"]), _g(r["ema20_high"]),
+                    _g(r["rsi_raw"]), _g(r["rsi_smoothed"]), int(bool(r["cond_all"])),
+                )
+            )
+            w.writerow((c.start_ts, repr(c.open), repr(c.high), repr(c.low), repr(c.close)) + vals)
+
+
+def _g(v) -> str:
+    return "" if v is None else repr(float(v))
+
+
+# =========================
+# Baseline gate
+# =========================
+
+def _rates(doc: dict, prefix: str = "") -> Dict[str, float]:
+    out = {}
+    for k, v in doc.items():
+        if isinstance(v, dict):
+            out.update(_rates(v, f"{prefix}{k}."))
+        elif k.endswith("_per_sec") and isinstance(v, (int, float)):
+            out[prefix + k] = float(v)
+    return out
+
+
+def compare_baseline(result: dict, baseline: dict, max_regression: float) -> List[dict]:
+    now = _rates(result["throughput"])
+    before = _rates(baseline.get("throughput", {}))
+    regressions = []
+    for key, old in before.items():
+        new = now.get(key)
+        if new is None or old <= 0:
+            continue
+        if new < old * (1.0 - max_regression):
+            regressions.append({
+                "metric": key,
+                "baseline": old,
+                "current": new,
+                "change": round(new / old - 1.0, 3),
+            })
+    return regressions
+
+
+# =========================
+# Entry point
+# =========================
+
+def run(args) -> dict:
+    candles = synthetic_candles(args.candles, seed=args.seed)
+
+    throughput = {
+        "pipeline": bench_pipeline(candles, debug_level=args.candle_debug),
+        "candle_builder": bench_candle_builder(args.tokens, args.ticks),
+        "timeline": bench_timeline_writes(
+            synthetic_candles(args.timeline_candles, seed=args.seed),
+            symbols=args.timeline_symbols,
+            batch=args.timeline_batch,
+        ),
+    }
+
+    fixtures = sorted(Path(args.fixtures).glob("*.csv")) if Path(args.fixtures).is_dir() else []
+    parity = [check_parity(p, tol=args.tol) for p in fixtures]
+
+    return {
+        "meta": {
+            "ts": int(time.time()),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "seed": args.seed,
+        },
+        "throughput": throughput,
+        "parity": {
+            "fixtures": len(parity),
+            "ok": all(p["ok"] for p in parity),
+            "files": parity,
+        },
+    }
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--candles", type=int, default=50_000)
+    ap.add_argument("--candle-debug", choices=("off", "signals", "all"), default="all")
+    ap.add_argument("--tokens", type=int, default=200)
+    ap.add_argument("--ticks", type=int, default=500_000)
+    ap.add_argument("--timeline-candles", type=int, default=60)
+    ap.add_argument("--timeline-symbols", type=int, default=50)
+    ap.add_argument("--timeline-batch", type=int, default=500)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--fixtures", default=str(FIXTURE_DIR))
+    ap.add_argument("--tol", type=float, default=1e-6)
+    ap.add_argument("--out")
+    ap.add_argument("--baseline")
+    ap.add_argument("--max-regression", type=float, default=0.25)
+    ap.add_argument("--write-golden", metavar="CSV")
+    ap.add_argument("--golden-candles", type=int, default=600)
+    ap.add_argument("--golden-seed", type=int, default=4)
+    args = ap.parse_args(argv)
+
+    if args.write_golden:
+        write_golden(Path(args.write_golden), synthetic_candles(args.golden_candles, seed=args.golden_seed))
+        print(json.dumps({"golden": args.write_golden, "bars": args.golden_candles}))
+        return 0
+
+    with _quiet_audit():
+        result = run(args)
+    status = 0
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare_baseline(result, baseline, args.max_regression)
+        result["baseline"] = {
+            "file": args.baseline,
+            "max_regression": args.max_regression,
+            "regressions": regressions,
+        }
+        if regressions:
+            status = 1
+
+    if not result["parity"]["ok"]:
+        status = 1
+
+    text = json.dumps(result, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
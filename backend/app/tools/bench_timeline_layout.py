@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark: market_timeline index layouts on a realistic dataset
+(default 8 sessions × 375 one-minute candles × 130 symbols ≈ 390k rows).
+
+Layouts (same table, same rows):
+    legacy    002 only        (symbol, ts)
+    unique    + 009           (symbol, ts) + UNIQUE (symbol, timeframe, ts)
+    covering  + 011 (current) UNIQUE (symbol, timeframe, ts)
+                              + (symbol, timeframe, ts, open, high, low, close)
+
+Measured through the live code paths (scratch DB, real migrations):
+    warmup        fetch_recent_candles_for_warmup, every symbol (read conn)
+    warmup_bulk   fetch_recent_candles_for_warmup_bulk, all symbols
+    update        update_timeline_row, last minutes × all symbols (writer)
+    upsert        one minute of rows per transaction (writer, as live)
+
+Usage:
+    python -m app.tools.bench_timeline_layout --days 8 --symbols 130
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.db import sqlite as db
+from app.db.migrations.runner import run_migrations
+from app.db.timeline_repo import (
+    TIMELINE_COLUMNS,
+    WARMUP_SQL,
+    fetch_recent_candles_for_warmup,
+    fetch_recent_candles_for_warmup_bulk,
+    update_timeline_row,
+    upsert_timeline_rows,
+)
+from app.engine.condition_engine_v1_9 import CONDITION_BITS
+from app.engine.latency_tracker import LatencyHistogram
+from app.tools.fixtures import SESSION_MINUTES, TF, make_timeline_rows, session_ts
+
+
+ALL_BIT = 1 << CONDITION_BITS["cond_all"]
+
+LAYOUTS = ("legacy", "unique", "covering")
+
+# Applied on top of the full migration set
+LAYOUT_SQL = {
+    "legacy": (
+        "DROP INDEX IF EXISTS idx_market_timeline_warmup",
+        "DROP INDEX IF EXISTS uniq_market_timeline_symbol_tf_ts",
+        "CREATE INDEX IF NOT EXISTS idx_market_timeline_symbol_ts ON market_timeline(symbol, ts)",
+    ),
+    "unique": (
+        "DROP INDEX IF EXISTS idx_market_timeline_warmup",
+        "CREATE INDEX IF NOT EXISTS idx_market_timeline_symbol_ts ON market_timeline(symbol, ts)",
+    ),
+    "covering": (),
+}
+
+INSERT_SQL = (
+    f"INSERT INTO market_timeline ({', '.join(TIMELINE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in TIMELINE_COLUMNS)})"
+)
+
+
+# -------------------------
+# Dataset (shared with the tests)
+# -------------------------
+
+def symbols_for(n: int) -> list:
+    return [f"SYM{i:03d}" for i in range(n)]
+
+
+# -------------------------
+# Build one layout
+# -------------------------
+
+def build(path: Path, layout: str, *, days: int, symbols: list, seed: int) -> dict:
+    db.reset_connections(path)
+    conn = db.get_conn()
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_migrations(conn)
+    for sql in LAYOUT_SQL[layout]:
+        conn.execute(sql)
+
+    ts = session_ts(days)
+    rng = np.random.default_rng(seed)
+
+    per_symbol = [make_timeline_rows(sym, ts, rng) for sym in symbols]
+
+    # time-major, one transaction per session: the live arrival order
+    # (a symbol's candles end up scattered across table pages)
+    t0 = time.perf_counter()
+    rows = 0
+    for day in range(days):
+        lo, hi = day * SESSION_MINUTES, (day + 1) * SESSION_MINUTES
+        batch = [r[i] for i in range(lo, hi) for r in per_symbol]
+        conn.execute("BEGIN")
+        conn.executemany(INSERT_SQL, batch)
+        conn.execute("COMMIT")
+        rows += len(batch)
+    load_sec = time.perf_counter() - t0
+
+    conn.execute("ANALYZE market_timeline")
+
+    indexes = [
+        r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='market_timeline' "
+            "AND name NOT LIKE 'sqlite_%' ORDER BY name"
+        )
+    ]
+
+    return {
+        "rows": rows,
+        "indexes": indexes,
+        "load_sec": round(load_sec, 3),
+        "db_mb": round(path.stat().st_size / 1e6, 1),
+    }
+
+
+def plan(sql: str, params) -> str:
+    rows = db.read_conn().execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    return " | ".join(r[3] for r in rows)
+
+
+def _timed(hist: LatencyHistogram, fn, *args, **kwargs):
+    t0 = time.perf_counter_ns()
+    out = fn(*args, **kwargs)
+    hist.record((time.perf_counter_ns() - t0) // 1000)
+    return out
+
+
+# -------------------------
+# Measurements
+# -------------------------
+
+def measure(layout: str, *, symbols: list, ts: np.ndarray, limit: int, rounds: int, minutes: int) -> dict:
+    out = {}
+
+    warm = LatencyHistogram()
+    for _ in range(rounds):
+        for sym in symbols:
+            got = _timed(warm, fetch_recent_candles_for_warmup, symbol=sym, timeframe=TF, limit=limit)
+            assert len(got) == limit
+    out["warmup"] = warm.summary()
+
+    bulk = LatencyHistogram()
+    for _ in range(rounds):
+        got = _timed(bulk, fetch_recent_candles_for_warmup_bulk, symbols=symbols, timeframe=TF, limit=limit)
+        assert all(len(v) == limit for v in got.values())
+    out["warmup_bulk"] = bulk.summary()
+
+    # rewrite the last `minutes` candles as the live path would
+    rng = np.random.default_rng(1)
+    tail = ts[-minutes:]
+
+    upd = LatencyHistogram()
+    for t in tail:
+        for sym in symbols:
+            data = {"ema8": float(rng.random()), "rsi_raw": 50.0, "cond_mask": ALL_BIT, "signal": None}
+            n = _timed(upd, update_timeline_row, symbol=sym, timeframe=TF, ts=int(t), data=data)
+            assert n == 1
+    out["update"] = upd.summary()
+
+    if layout == "legacy":
+        out["upsert_minute"] = None      # ON CONFLICT needs the unique key
+    else:
+        keyed = {sym: make_timeline_rows(sym, tail, rng) for sym in symbols}
+        ups = LatencyHistogram()
+        for i in range(len(tail)):
+            minute = [dict(zip(TIMELINE_COLUMNS, keyed[sym][i])) for sym in symbols]
+            _timed(
+                ups,
+                db.db_writer.run,
+                lambda conn, rows=minute: upsert_timeline_rows(rows, conn),
+                label="bench_upsert",
+                transaction=True,
+            )
+        out["upsert_minute"] = {**ups.summary(), "rows_per_batch": len(symbols)}
+
+    out["plan"] = {
+        "warmup": plan(WARMUP_SQL, (symbols[0], TF, limit)),
+        "update": plan(
+            "UPDATE market_timeline SET ema8 = ? WHERE symbol = ? AND timeframe = ? AND ts = ?",
+            (1.0, symbols[0], TF, int(ts[-1])),
+        ),
+    }
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--days", type=int, default=8)
+    ap.add_argument("--symbols", type=int, default=130)
+    ap.add_argument("--limit", type=int, default=200, help="warmup candles per symbol")
+    ap.add_argument("--rounds", type=int, default=3)
+    ap.add_argument("--minutes", type=int, default=10, help="trailing minutes rewritten")
+    ap.add_argument("--layouts", default=",".join(LAYOUTS))
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    symbols = symbols_for(args.symbols)
+    ts = session_ts(args.days)
+    layouts = [l for l in args.layouts.split(",") if l]
+    for l in layouts:
+        if l not in LAYOUT_SQL:
+            raise SystemExit(f"unknown layout {l} (choose from {', '.join(LAYOUTS)})")
+
+    saved = db.DB_PATH
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory() as d:
+            for layout in layouts:
+                path = Path(d) / f"{layout}.db"
+                info = build(path, layout, days=args.days, symbols=symbols, seed=args.seed)
+                results[layout] = {
+                    **info,
+                    **measure(
+                        layout,
+                        symbols=symbols,
+                        ts=ts,
+                        limit=args.limit,
+                        rounds=args.rounds,
+                        minutes=args.minutes,
+                    ),
+                }
+                db.reset_connections()
+    finally:
+        db.reset_connections(saved)
+
+    speedup = {}
+    if "legacy" in results and "covering" in results:
+        for k in ("warmup", "warmup_bulk", "update"):
+            new = results["covering"][k]["mean_ms"]
+            speedup[k] = round(results["legacy"][k]["mean_ms"] / new, 2) if new else None
+
+    print(json.dumps({
+        "days": args.days,
+        "symbols": args.symbols,
+        "candles_per_symbol": len(ts),
+        "warmup_limit": args.limit,
+        "layouts": results,
+        "speedup_legacy_to_covering": speedup,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+# backend/app/tools/fixtures.py
+
+"""
+Seeded data factories shared by app/tests and the app/tools benchmarks
+(bench and test datasets stay the same)
+------------------------------------------------------------------
+- scratch_db()          every process connection on a throwaway DB
+                        with the real schema (migrations)
+- synthetic_candles()   seeded 1m candle walk (indicator / strategy tests)
+- session_ts()          candle END ts of N 375-minute NSE sessions
+- make_timeline_rows()  full market_timeline rows (TIMELINE_COLUMNS order)
+- timeline_dicts()      the same rows as upsert_timeline_rows() input
+- ReferenceIndicatorEngine / ReferenceSMA
+                        frozen pre-running-sum indicator code (parity
+                        reference, "before" side of bench_indicators)
+"""
+
+import contextlib
+import io
+import random
+import tempfile
+import time
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+from app.marketdata.candle import Candle, CandleSource
+
+
+TF = "1m"
+SESSION_MINUTES = 375
+DAY0 = 1_767_239_100        # session open (09:15 IST), candles end on the minute
+
+
+# =========================
+# DB
+# =========================
+
+@contextlib.contextmanager
+def scratch_db():
+    """
+    Point every process DB connection (shared, writer, readers) at a
+    throwaway file with the real schema (migrations), restore afterwards.
+    Yields the shared connection.
+    """
+    from app.db import sqlite as db
+    from app.db.migrations.runner import run_migrations
+
+    saved = db.DB_PATH
+    with tempfile.TemporaryDirectory() as d:
+        db.reset_connections(Path(d) / "scratch.db")
+        try:
+            conn = db.get_conn()
+            with contextlib.redirect_stdout(io.StringIO()):
+                run_migrations(conn)
+            yield conn
+        finally:
+            db.reset_connections(saved)
+
+
+# =========================
+# Candles
+# =========================
+
+def synthetic_candles(n, seed=7, start_ts=1_767_000_000, price=150.0):
+    rng = random.Random(seed)
+    out = []
+    for i in range(n):
+        o = price
+        price = max(0.05, round(price + rng.gauss(0, 1.5), 2))
+        c = price
+        # flat bars exercise avg_loss == 0 / equal-RSI edges
+        if rng.random() < 0.05:
+            c = o
+        out.append(Candle(
+            start_ts=start_ts + 60 * i,
+            end_ts=start_ts + 60 * (i + 1),
+            open=o,
+            high=max(o, c) + round(rng.random(), 2),
+            low=max(0.05, min(o, c) - round(rng.random(), 2)),
+            close=c,
+            source=CandleSource.WARMUP,
+        ))
+    return out
+
+
+# =========================
+# market_timeline rows
+# =========================
+
+def session_ts(days: int) -> np.ndarray:
+    minute = np.arange(1, SESSION_MINUTES + 1, dtype=np.int64) * 60
+    return np.concatenate([DAY0 + d * 86400 + minute for d in range(days)])
+
+
+def make_timeline_rows(symbol: str, ts: np.ndarray, rng) -> list:
+    """
+    Full rows (OHLC + indicators + cond_mask) in TIMELINE_COLUMNS order.
+    """
+    from app.engine.condition_engine_v1_9 import CONDITION_BITS
+
+    all_bit = 1 << CONDITION_BITS["cond_all"]
+
+    n = len(ts)
+    close = 200 + np.cumsum(rng.normal(0, 0.4, n))
+    open_ = close + rng.normal(0, 0.3, n)
+    high = np.maximum(open_, close) + rng.random(n)
+    low = np.minimum(open_, close) - rng.random(n)
+    ema8 = close + rng.normal(0, 0.5, n)
+    ema20_low = low + rng.normal(0, 0.5, n)
+    ema20_high = high + rng.normal(0, 0.5, n)
+    rsi = rng.uniform(20, 80, n)
+    masks = rng.integers(0, 1 << len(CONDITION_BITS), n)
+    created = int(time.time())
+
+    rows = []
+    for i in range(n):
+        rows.append((
+            symbol, TF, int(ts[i]),
+            float(open_[i]), float(high[i]), float(low[i]), float(close[i]),
+            float(ema8[i]), float(ema20_low[i]), float(ema20_high[i]), float(rsi[i]),
+            int(masks[i]),
+            "BUY" if masks[i] & all_bit and rng.random() < 0.05 else None,
+            "V1.9",
+            created,
+        ))
+    return rows
+
+
+def timeline_dicts(symbol: str, ts: np.ndarray, seed: int = 0) -> list:
+    from app.db.timeline_repo import TIMELINE_COLUMNS
+
+    rows = make_timeline_rows(symbol, ts, np.random.default_rng(seed))
+    return [dict(zip(TIMELINE_COLUMNS, r)) for r in rows]
+
+
+# =========================
+# Frozen indicator reference
+# =========================
+# Pre-running-sum implementation (same math, sum(deque) every update,
+# dict per update): parity reference + "before" in bench_indicators.
+
+class _RefEMA:
+    def __init__(self, length):
+        self.length = length
+        self.alpha = 2 / (length + 1)
+        self.value = None
+        self._buf = deque(maxlen=length)
+
+    def update(self, price):
+        if self.value is None:
+            self._buf.append(price)
+            if len(self._buf) < self.length:
+                return None
+            self.value = sum(self._buf) / self.length
+            return self.value
+        self.value = self.alpha * price + (1 - self.alpha) * self.value
+        return self.value
+
+
+class ReferenceSMA:
+    def __init__(self, length):
+        self.length = length
+        self.buf = deque(maxlen=length)
+
+    def update(self, value):
+        self.buf.append(value)
+        if len(self.buf) < self.length:
+            return None
+        return sum(self.buf) / self.length
+
+
+class _RefRSI:
+    def __init__(self, rsi_length=5, smooth_length=5):
+        self.rsi_length = rsi_length
+        self.smooth_length = smooth_length
+        self.prev_close = None
+        self.avg_gain = None
+        self.avg_loss = None
+        self.rsi_raw = None
+        self.prev_rsi_raw = None
+        self.rsi_sma_buf = deque(maxlen=smooth_length)
+        self.rsi_smoothed = None
+        self._init_gains = []
+        self._init_losses = []
+
+    def update(self, close):
+        if self.prev_close is None:
+            self.prev_close = close
+            return {"rsi_raw": self.rsi_raw, "rsi_smoothed": self.rsi_smoothed}
+        delta = close - self.prev_close
+        gain = max(delta, 0.0)
+        loss = max(-delta, 0.0)
+        self.prev_close = close
+        if self.avg_gain is None or self.avg_loss is None:
+            self._init_gains.append(gain)
+            self._init_losses.append(loss)
+            if len(self._init_gains) < self.rsi_length:
+                return {"rsi_raw": self.rsi_raw, "rsi_smoothed": self.rsi_smoothed}
+            self.avg_gain = sum(self._init_gains) / self.rsi_length
+            self.avg_loss = sum(self._init_losses) / self.rsi_length
+        else:
+            self.avg_gain = ((self.avg_gain * (self.rsi_length - 1)) + gain) / self.rsi_length
+            self.avg_loss = ((self.avg_loss * (self.rsi_length - 1)) + loss) / self.rsi_length
+        self.prev_rsi_raw = self.rsi_raw
+        if self.avg_loss == 0:
+            self.rsi_raw = 100.0
+        else:
+            self.rsi_raw = 100.0 - (100.0 / (1.0 + self.avg_gain / self.avg_loss))
+        self.rsi_sma_buf.append(self.rsi_raw)
+        if len(self.rsi_sma_buf) == self.smooth_length:
+            self.rsi_smoothed = sum(self.rsi_sma_buf) / self.smooth_length
+        return {"rsi_raw": self.rsi_raw, "rsi_smoothed": self.rsi_smoothed}
+
+
+class ReferenceIndicatorEngine:
+    def __init__(self):
+        self.ema8 = _RefEMA(8)
+        self.ema20_low_raw = _RefEMA(20)
+        self.ema20_high_raw = _RefEMA(20)
+        self.ema20_low_smooth = ReferenceSMA(9)
+        self.ema20_high_smooth = ReferenceSMA(9)
+        self.rsi_engine = _RefRSI(5, 5)
+        self._prev_rsi_raw = None
+        self.values = {}
+        self.ready = False
+
+    def update(self, candle):
+        o, h, l, c = float(candle.open), float(candle.high), float(candle.low), float(candle.close)
+        ema8_val = self.ema8.update(c)
+        lo = self.ema20_low_raw.update(l)
+        hi = self.ema20_high_raw.update(h)
+        ema20_low = self.ema20_low_smooth.update(lo) if lo is not None else None
+        ema20_high = self.ema20_high_smooth.update(hi) if hi is not None else None
+        rsi_out = self.rsi_engine.update(c)
+        rsi_raw = rsi_out["rsi_raw"]
+        rsi_rising = (
+            self._prev_rsi_raw is not None
+            and rsi_raw is not None
+            and rsi_raw > self._prev_rsi_raw
+        )
+        self._prev_rsi_raw = rsi_raw
+        self.values = {
+            "ema8": ema8_val,
+            "ema20_low": ema20_low,
+            "ema20_high": ema20_high,
+            "rsi_raw": rsi_raw,
+            "rsi_smoothed": rsi_out["rsi_smoothed"],
+            "rsi_rising": rsi_rising,
+        }
+        if not self.ready:
+            self.ready = all(v is not None for v in self.values.values())
+        return self.values if self.ready else None
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+"""
+Replay a recorded tick journal through ZerodhaTickEngine (OFFLINE).
+
+- No broker login, no order routing, no DB writes
+- Candle debug lines only with --debug-dir (never into app/state/logs)
+- Uses the same candle / indicator / strategy path as live
+
+Usage:
+    python -m app.tools.replay_tick_journal --date 2026-01-15 --speed 0
+    python -m app.tools.replay_tick_journal --file /path/ticks.bin --speed 10
+    python -m app.tools.replay_tick_journal --date 2026-01-15 --debug-dir /tmp/replay_debug
+"""
+
+import argparse
+import json
+from datetime import datetime
+from pathlib import Path
+
+from app.fetcher.zerodha_instruments import load_instruments_df
+from app.marketdata.tick_journal import journal_path, read_journal
+from app.marketdata.tick_replay import FakeKiteTicker, TickReplayer
+from app.marketdata.zerodha_tick_engine import ZerodhaTickEngine
+from app.utils.candle_debug_logger import LEVEL_ALL, LEVEL_OFF, CandleDebugSink
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--date", help="YYYY-MM-DD (default journal dir)")
+    ap.add_argument("--file", help="explicit journal path")
+    ap.add_argument("--speed", type=float, default=0.0, help="1=real time, N=N×, 0=max")
+    ap.add_argument("--tokens", help="comma-separated token filter")
+    ap.add_argument("--debug-dir", help="write candle debug TSVs here (default: off)")
+    args = ap.parse_args()
+
+    if args.file:
+        path = Path(args.file)
+    elif args.date:
+        path = journal_path(datetime.strptime(args.date, "%Y-%m-%d").date())
+    else:
+        ap.error("--date or --file required")
+
+    token_filter = (
+        {int(t) for t in args.tokens.split(",")} if args.tokens else None
+    )
+
+    # Universe = every option token present in the journal
+    tokens = sorted({r.token for r in read_journal(path)})
+    if token_filter:
+        tokens = [t for t in tokens if t in token_filter]
+
+    # Engine builders are for OPTIONS only (indices come from instruments)
+    df = load_instruments_df()
+    option_tokens = set(
+        df[df["segment"] == "NFO-OPT"]["instrument_token"].astype(int)
+    )
+
+    ticker = FakeKiteTicker()
+
+    debug_sink = (
+        CandleDebugSink(Path(args.debug_dir), level=LEVEL_ALL)
+        if args.debug_dir
+        else CandleDebugSink(level=LEVEL_OFF)
+    )
+
+    engine = ZerodhaTickEngine(
+        kite_data=None,
+        instrument_tokens=[t for t in tokens if t in option_tokens],
+        timeframe_sec=60,
+        ticker=ticker,
+        live_side_effects=False,
+        candle_timer=False,
+        debug_sink=debug_sink,
+    )
+
+    report = TickReplayer(engine, ticker, speed=args.speed).run(
+        path,
+        tokens=token_filter,
+    )
+    report["pipeline"] = engine.pipeline_stats()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+from threading import Lock
+from typing import Dict, List, NamedTuple, Optional
+
+from app.event_bus.audit_logger import write_audit_log
+
+
+class OpenPaperTrade(NamedTuple):
+    paper_trade_id: str
+    strategy_name: str
+    symbol: str
+    token: int
+    sl_price: float
+    tp_price: float
+
+
+class OpenPaperTradeIndex:
+    """
+    🔒 In-memory index of OPEN paper trades (keyed by symbol)
+
+    Written by:
+      - PaperTradeRecorder.record_entry (add)
+      - close_paper_trade (remove)
+      - EOD square-off (remove)
+      - Startup (rebuild from DB)
+
+    Read by:
+      - ZerodhaTickEngine (tick-time SL / TP checks)
+
+    DB stays the SOURCE OF TRUTH.
+    NO DB reads on the tick path.
+    """
+
+    _by_symbol: Dict[str, Dict[str, OpenPaperTrade]] = {}
+    _lock = Lock()
+
+    # -------------------------
+    # Write APIs
+    # -------------------------
+
+    @classmethod
+    def rebuild(cls) -> int:
+        """
+        Reload OPEN trades from paper_trades.
+        Returns number of trades indexed.
+        """
+        from app.db.sqlite import db_readers
+
+        rows = db_readers.fetchall(
+            """
+            SELECT paper_trade_id, strategy_name, symbol, token, sl_price, tp_price
+            FROM paper_trades
+            WHERE state = 'OPEN'
+            """
+        )
+
+        index: Dict[str, Dict[str, OpenPaperTrade]] = {}
+        for r in rows:
+            t = OpenPaperTrade(
+                paper_trade_id=r["paper_trade_id"],
+                strategy_name=r["strategy_name"],
+                symbol=r["symbol"],
+                token=int(r["token"]),
+                sl_price=float(r["sl_price"]),
+                tp_price=float(r["tp_price"]),
+            )
+            index.setdefault(t.symbol, {})[t.paper_trade_id] = t
+
+        with cls._lock:
+            cls._by_symbol = index
+
+        write_audit_log(f"[PAPER][INDEX] Rebuilt open trades={len(rows)}")
+        return len(rows)
+
+    @classmethod
+    def add(
+        cls,
+        *,
+        paper_trade_id: str,
+        strategy_name: str,
+        symbol: str,
+        token: int,
+        sl_price: float,
+        tp_price: float,
+    ):
+        t = OpenPaperTrade(
+            paper_trade_id=paper_trade_id,
+            strategy_name=strategy_name,
+            symbol=symbol,
+            token=int(token),
+            sl_price=float(sl_price),
+            tp_price=float(tp_price),
+        )
+        with cls._lock:
+            cls._by_symbol.setdefault(symbol, {})[paper_trade_id] = t
+
+    @classmethod
+    def restore(cls, t: OpenPaperTrade):
+        """
+        Put back a trade take_exits() removed but whose exit never ran
+        (e.g. the pipeline rejected it) → the next tick retries it.
+        """
+        with cls._lock:
+            cls._by_symbol.setdefault(t.symbol, {})[t.paper_trade_id] = t
+
+    @classmethod
+    def remove(cls, paper_trade_id: str) -> Optional[OpenPaperTrade]:
+        with cls._lock:
+            for symbol, trades in cls._by_symbol.items():
+                t = trades.pop(paper_trade_id, None)
+                if t is not None:
+                    if not trades:
+                        del cls._by_symbol[symbol]
+                    return t
+        return None
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._by_symbol = {}
+
+    # -------------------------
+    # Tick path (HOT)
+    # -------------------------
+
+    @classmethod
+    def take_exits(
+        cls,
+        symbol: str,
+        ltp: float,
+        strategy_name: Optional[str] = None,
+    ) -> List[tuple]:
+        """
+        Return [(OpenPaperTrade, "SL" | "TP")] hit at `ltp` and REMOVE
+        them from the index, so the next tick cannot exit them twice.
+
+        Dict lookup + two float comparisons per open trade.
+        """
+        hits = []
+        with cls._lock:
+            # lookup under the lock: rebuild() may swap _by_symbol
+            trades = cls._by_symbol.get(symbol)
+            if not trades:
+                return hits
+
+            for t in list(trades.values()):
+                if strategy_name is not None and t.strategy_name != strategy_name:
+                    continue
+
+                if ltp <= t.sl_price:
+                    hits.append((t, "SL"))
+                elif ltp >= t.tp_price:
+                    hits.append((t, "TP"))
+                else:
+                    continue
+
+                del trades[t.paper_trade_id]
+
+            if not trades:
+                cls._by_symbol.pop(symbol, None)
+
+        return hits
+
+    # -------------------------
+    # Read APIs
+    # -------------------------
+
+    @classmethod
+    def has_open(cls, strategy_name: str, symbol: str) -> bool:
+        with cls._lock:
+            return any(
+                t.strategy_name == strategy_name
+                for t in cls._by_symbol.get(symbol, {}).values()
+            )
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, List[dict]]:
+        with cls._lock:
+            return {
+                symbol: [t._asdict() for t in trades.values()]
+                for symbol, trades in cls._by_symbol.items()
+            }
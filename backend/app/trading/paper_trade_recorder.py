@@ -1,13 +1,14 @@
 import uuid
 from app.marketdata.ltp_store import LTPStore
 from app.event_bus.audit_logger import write_audit_log
-from app.config.strategy_loader import load_strategy_config
+from app.config.strategy_loader import get_strategy_config
 from app.db.db_lock import DB_LOCK
 from app.db.paper_trades_repo import (
     insert_paper_trade,
     close_paper_trade,
     has_open_paper_trade,
 )
+from app.trading.paper_trade_index import OpenPaperTradeIndex
 
 
 class PaperTradeRecorder:
@@ -32,7 +33,7 @@ class PaperTradeRecorder:
         tp_price: float,
         candle_ts: int,
     ):
-        cfg = load_strategy_config()
+        cfg = get_strategy_config()
 
         # 🔒 Respect TRADE_ON
         if not cfg.get("trade_on", False):
@@ -74,6 +75,15 @@ class PaperTradeRecorder:
             qty=qty,
         )
 
+        OpenPaperTradeIndex.add(
+            paper_trade_id=paper_trade_id,
+            strategy_name=PaperTradeRecorder.STRATEGY_NAME,
+            symbol=symbol,
+            token=token,
+            sl_price=sl_price,
+            tp_price=tp_price,
+        )
+
         write_audit_log(
             f"[PAPER][ENTRY] {symbol} entry={entry_price} sl={sl_price} tp={tp_price}"
         )
@@ -93,17 +103,42 @@ class PaperTradeRecorder:
             return
 
         if ltp <= sl_price:
-            close_paper_trade(
+            PaperTradeRecorder.exit_trade(
                 paper_trade_id=paper_trade_id,
+                symbol=symbol,
                 exit_price=ltp,
                 exit_reason="SL",
             )
-            write_audit_log(f"[PAPER][EXIT_SL] {symbol} price={ltp}")
 
         elif ltp >= tp_price:
-            close_paper_trade(
+            PaperTradeRecorder.exit_trade(
                 paper_trade_id=paper_trade_id,
+                symbol=symbol,
                 exit_price=ltp,
                 exit_reason="TP",
             )
-            write_audit_log(f"[PAPER][EXIT_TP] {symbol} price={ltp}")
+
+    @staticmethod
+    def exit_trade(
+        *,
+        paper_trade_id: str,
+        symbol: str,
+        exit_price: float,
+        exit_reason: str,
+    ):
+        """
+        Close ONE paper trade at an already-decided price.
+        Used by the tick engine after an index hit.
+        """
+        try:
+            close_paper_trade(
+                paper_trade_id=paper_trade_id,
+                exit_price=exit_price,
+                exit_reason=exit_reason,
+            )
+        except Exception:
+            # DB write failed → trade is still OPEN in DB, restore index
+            OpenPaperTradeIndex.rebuild()
+            raise
+
+        write_audit_log(f"[PAPER][EXIT_{exit_reason}] {symbol} price={exit_price}")
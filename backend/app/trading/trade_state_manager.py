@@ -8,7 +8,7 @@ import asyncio
 import uuid
 
 from app.execution.base_executor import BaseOrderExecutor
-from app.config.strategy_loader import load_strategy_config
+from app.config.strategy_loader import get_strategy_config
 from app.utils.session_utils import is_within_session
 from app.event_bus.log_bus import log_bus
 from app.event_bus.audit_logger import write_audit_log
@@ -184,7 +184,7 @@ class TradeStateManager:
         sl_price: float,
         tp_price: float,
     ):
-        cfg = load_strategy_config()
+        cfg = get_strategy_config()
 
         if cfg["trade_on"] is not True:
             return self._skip("TRADE_OFF", symbol, entry_price)
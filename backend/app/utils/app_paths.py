@@ -34,6 +34,9 @@ ZERODHA_DIR = APP_HOME / "zerodha"
 
 DB_PATH = DATA_DIR / "app.db"
 
+# market_timeline days past the hot window (compressed .npz per day/symbol)
+TIMELINE_ARCHIVE_DIR = DATA_DIR / "timeline_archive"
+
 
 # --------------------------------------------------
 # INIT (SAFE TO CALL MULTIPLE TIMES)
@@ -1,35 +1,329 @@
+from collections import deque
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Deque, Dict, Optional
+import atexit
+import os
+import threading
+import time
 
 
-class CandleDebugLogger:
+# --------------------------------------------------
+# SINK SETTINGS
+# --------------------------------------------------
+
+DEBUG_DIR = Path("app/state/logs/debug")
+
+# Levels (SCALP_CANDLE_DEBUG=off|signals|all)
+LEVEL_OFF = 0
+LEVEL_SIGNALS = 1       # only candles with buy_allowed / a signal
+LEVEL_ALL = 2
+
+LEVELS = {"off": LEVEL_OFF, "signals": LEVEL_SIGNALS, "all": LEVEL_ALL}
+
+MAX_BUFFER = 50_000         # pending lines; beyond this lines are dropped
+FLUSH_INTERVAL_SEC = 1.0    # flusher wakes at least this often
+FLUSH_BATCH = 1024          # ... or as soon as this many lines are pending
+
+
+HEADER = (
+    "log_ts\tcandle_ts\tsymbol\tslot\t"
+    "open\thigh\tlow\tclose\t"
+    "ema8\tema20_low\tema20_high\trsi\t"
+    "cond_all\tbuy_allowed\tsignal\n"
+)
+
+
+class CandleDebugSink:
     """
-    Append-only TSV logger.
-    MUST NEVER crash the trading engine.
+    ONE shared TSV sink for every CandleDebugLogger.
+
+    RULES:
+    - submit() only appends a tuple to a bounded buffer
+      (no file IO, no formatting on the strategy path)
+    - a daemon flusher formats + writes in batches to ONE open handle
+      per day; the file is chosen by each line's local date (rollover)
+    - buffer full → line dropped + counted (caller never blocks)
+    - NEVER raises
     """
 
-    HEADER = (
-        "log_ts\tcandle_ts\tsymbol\tslot\t"
-        "open\thigh\tlow\tclose\t"
-        "ema8\tema20_low\tema20_high\trsi\t"
-        "cond_all\tbuy_allowed\tsignal\n"
-    )
+    def __init__(
+        self,
+        base_dir: Path = DEBUG_DIR,
+        *,
+        level: Optional[int] = None,
+        sample_every: int = 1,
+        max_buffer: int = MAX_BUFFER,
+        flush_interval: float = FLUSH_INTERVAL_SEC,
+    ):
+        self.base_dir = Path(base_dir)
+        self.level = (
+            level
+            if level is not None
+            else LEVELS.get(os.environ.get("SCALP_CANDLE_DEBUG", "all").lower(), LEVEL_ALL)
+        )
+        self.sample_every = max(1, int(sample_every))
+        self.max_buffer = max_buffer
+        self.flush_interval = flush_interval
 
-    def __init__(self, symbol: str, slot: str):
-        try:
-            self.symbol = symbol
-            self.slot = slot
+        self._buf: Deque[tuple] = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._wake = False
+        self._writing = False
+        self._stop = False
+        self._atexit = False
+
+        # (symbol, slot) → candles seen (sampling)
+        self._seen: Dict[tuple, int] = {}
+
+        self._fh = None
+        self._fh_day: Optional[str] = None
+
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.errors = 0
+        self.batches = 0
+
+    # -------------------------------------------------
+    # Producer side (strategy path)
+    # -------------------------------------------------
+
+    def wants(self, key: tuple, important: bool) -> bool:
+        level = self.level
+        if level == LEVEL_OFF:
+            return False
+        if important:
+            return True
+        if level == LEVEL_SIGNALS:
+            return False
+
+        if self.sample_every > 1:
+            n = self._seen.get(key, 0)
+            self._seen[key] = n + 1
+            if n % self.sample_every:
+                self.sampled_out += 1
+                return False
+        return True
+
+    def submit(self, record: tuple):
+        with self._cond:
+            if len(self._buf) >= self.max_buffer:
+                self.dropped += 1
+                return
+            self._buf.append(record)
+            self.submitted += 1
+
+            if self._thread is None:
+                self._start()
+            elif len(self._buf) >= FLUSH_BATCH:
+                self._cond.notify()
+
+    # -------------------------------------------------
+    # Control
+    # -------------------------------------------------
+
+    def configure(self, *, level: Optional[int] = None, sample_every: Optional[int] = None):
+        if level is not None:
+            self.level = int(level)
+        if sample_every is not None:
+            self.sample_every = max(1, int(sample_every))
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Block until every submitted line is on disk (or timeout).
+        """
+        with self._cond:
+            if self._thread is None:
+                return not self._buf
+            self._wake = True
+            self._cond.notify_all()
+            return self._cond.wait_for(
+                lambda: not self._buf and not self._writing,
+                timeout=timeout,
+            )
+
+    def shutdown(self, timeout: float = 5.0) -> bool:
+        done = self.flush(timeout)
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._close()
+        return done
+
+    def stats(self) -> dict:
+        with self._cond:
+            pending = len(self._buf)
+        return {
+            "level": {v: k for k, v in LEVELS.items()}.get(self.level, self.level),
+            "sample_every": self.sample_every,
+            "file": str(self._path(self._fh_day)) if self._fh_day else None,
+            "pending": pending,
+            "submitted": self.submitted,
+            "written": self.written,
+            "dropped": self.dropped,
+            "sampled_out": self.sampled_out,
+            "batches": self.batches,
+            "errors": self.errors,
+        }
+
+    # -------------------------------------------------
+    # Flusher thread
+    # -------------------------------------------------
+
+    def _start(self):
+        self._stop = False
+        self._thread = threading.Thread(
+            target=self._run,
+            name="candle-debug-flush",
+            daemon=True,
+        )
+        self._thread.start()
+        if not self._atexit:
+            atexit.register(self.shutdown, 2.0)
+            self._atexit = True
 
-            date = datetime.now().strftime("%Y-%m-%d")
-            self.path = Path(f"app/state/logs/debug/candle_debug_{date}.tsv")
-            self.path.parent.mkdir(parents=True, exist_ok=True)
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._stop or self._wake or len(self._buf) >= FLUSH_BATCH,
+                    timeout=self.flush_interval,
+                )
+                self._wake = False
+                if not self._buf:
+                    self._cond.notify_all()
+                    if self._stop:
+                        self._thread = None
+                        return
+                    continue
+                batch, self._buf = self._buf, deque()
+                self._writing = True
 
-            if not self.path.exists():
-                self.path.write_text(self.HEADER)
+            try:
+                self._write(batch)
+            except Exception:
+                self.errors += 1
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
+    def _write(self, batch: Deque[tuple]):
+        day = None
+        lines = []
+
+        for rec in batch:
+            rec_day = time.strftime("%Y-%m-%d", time.localtime(rec[0]))
+            if rec_day != day:
+                if lines:
+                    self._write_lines(day, lines)
+                    lines = []
+                day = rec_day
+            lines.append(_format(rec))
+
+        if lines:
+            self._write_lines(day, lines)
+
+    def _write_lines(self, day: str, lines: list):
+        try:
+            if day != self._fh_day:
+                self._open(day)
+            self._fh.write("".join(lines))
+            self._fh.flush()
+            self.written += len(lines)
+            self.batches += 1
         except Exception:
-            # 🔒 HARD FAILSAFE — disable logger completely
-            self.path = None
+            self.errors += 1
+            self._close()
+
+    def _open(self, day: str):
+        self._close()
+        path = self._path(day)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        new = not path.exists()
+        self._fh = path.open("a", encoding="utf-8")
+        if new:
+            self._fh.write(HEADER)
+        self._fh_day = day
+
+    def _close(self):
+        fh, self._fh = self._fh, None
+        self._fh_day = None
+        if fh is not None:
+            try:
+                fh.close()
+            except Exception:
+                pass
+
+    def _path(self, day: str) -> Path:
+        return self.base_dir / f"candle_debug_{day}.tsv"
+
+
+def _f(v) -> str:
+    try:
+        return "" if v is None else f"{float(v):.2f}"
+    except Exception:
+        return ""
+
+
+def _format(rec: tuple) -> str:
+    (
+        log_ts, candle_ts, symbol, slot,
+        o, h, l, c,
+        ema8, ema20_low, ema20_high, rsi,
+        cond_all, buy_allowed, signal,
+    ) = rec
+
+    # 🔒 Normalize candle_ts (int | str | iso)
+    candle_time = ""
+    try:
+        if isinstance(candle_ts, (int, float)):
+            candle_time = datetime.fromtimestamp(int(candle_ts)).strftime("%H:%M:%S")
+        elif isinstance(candle_ts, str):
+            # ISO / DB timestamp support
+            candle_time = datetime.fromisoformat(candle_ts).strftime("%H:%M:%S")
+    except Exception:
+        candle_time = str(candle_ts)
+
+    return (
+        f"{time.strftime('%H:%M:%S', time.localtime(log_ts))}\t"
+        f"{candle_time}\t"
+        f"{symbol}\t"
+        f"{slot}\t"
+        f"{_f(o)}\t{_f(h)}\t{_f(l)}\t{_f(c)}\t"
+        f"{_f(ema8)}\t"
+        f"{_f(ema20_low)}\t"
+        f"{_f(ema20_high)}\t"
+        f"{_f(rsi)}\t"
+        f"{cond_all}\t"
+        f"{buy_allowed}\t"
+        f"{signal or ''}\n"
+    )
+
+
+# ONE sink per process
+candle_debug_sink = CandleDebugSink()
+
+
+class CandleDebugLogger:
+    """
+    Append-only TSV logger (per strategy slot, shared sink).
+    MUST NEVER crash the trading engine.
+    """
+
+    HEADER = HEADER
+
+    def __init__(self, symbol: str, slot: str, sink: Optional[CandleDebugSink] = None):
+        self.symbol = symbol
+        self.slot = slot
+        self.sink = sink or candle_debug_sink
+        self._key = (symbol, slot)
 
     # --------------------------------------------------
 
@@ -46,53 +340,28 @@ class CandleDebugLogger:
         signal: Optional[str] = None,
     ):
         """
-        Absolutely safe logger.
+        Absolutely safe logger: snapshot the fields, hand off, return.
         Any exception here MUST be swallowed.
         """
         try:
-            if self.path is None:
+            sink = self.sink
+            if not sink.wants(self._key, bool(buy_allowed or signal)):
                 return
 
-            now_ts = datetime.now().strftime("%H:%M:%S")
-
-            # 🔒 Normalize candle_ts (int | str | iso)
-            candle_time = ""
-            try:
-                if isinstance(candle_ts, (int, float)):
-                    candle_time = datetime.fromtimestamp(
-                        int(candle_ts)
-                    ).strftime("%H:%M:%S")
-                elif isinstance(candle_ts, str):
-                    # ISO / DB timestamp support
-                    candle_time = datetime.fromisoformat(
-                        candle_ts
-                    ).strftime("%H:%M:%S")
-            except Exception:
-                candle_time = str(candle_ts)
-
-            def f(v):
-                try:
-                    return "" if v is None else f"{float(v):.2f}"
-                except Exception:
-                    return ""
-
-            line = (
-                f"{now_ts}\t"
-                f"{candle_time}\t"
-                f"{self.symbol}\t"
-                f"{self.slot}\t"
-                f"{f(o)}\t{f(h)}\t{f(l)}\t{f(c)}\t"
-                f"{f(ind.get('ema8'))}\t"
-                f"{f(ind.get('ema20_low'))}\t"
-                f"{f(ind.get('ema20_high'))}\t"
-                f"{f(ind.get('rsi_smoothed'))}\t"
-                f"{checks.get('cond_all', False)}\t"
-                f"{buy_allowed}\t"
-                f"{signal or ''}\n"
-            )
-
-            with self.path.open("a") as fh:
-                fh.write(line)
+            sink.submit((
+                time.time(),
+                candle_ts,
+                self.symbol,
+                self.slot,
+                o, h, l, c,
+                ind.get("ema8"),
+                ind.get("ema20_low"),
+                ind.get("ema20_high"),
+                ind.get("rsi_smoothed"),
+                checks.get("cond_all", False),
+                buy_allowed,
+                signal,
+            ))
 
         except Exception:
             # 🔥 NEVER propagate logging errors